@@ -8,6 +8,17 @@ load_dotenv()
 # Database Settings
 DATABASE_NAME = 'motikoc.db'
 DB_TIMEOUT = 30
+DB_MIGRATION_LOCK_FILE = f'{DATABASE_NAME}.migrate.lock'
+DB_WRITE_QUEUE_SIZE = 1000
+DB_WRITE_BATCH_SIZE = 64  # max writes per group commit
+DB_WRITE_BATCH_WINDOW = 0.005  # seconds to wait for more writes after the first
+
+# Database Instrumentation Settings
+DB_SLOW_QUERY_THRESHOLD = float(os.getenv('DB_SLOW_QUERY_THRESHOLD', '0.2'))  # seconds
+DB_SLOW_QUERY_LOG = os.getenv('DB_SLOW_QUERY_LOG', 'motikoc_slow_queries.log')  # empty: logger only
+DB_METRICS_FILE = os.getenv('DB_METRICS_FILE', 'motikoc_db_metrics.json')  # '.prom' for Prometheus text
+DB_METRICS_EXPORT_INTERVAL = 60  # seconds between snapshot exports, 0 disables
+DB_METRICS_MAX_STATEMENTS = 500
 DB_PRAGMAS = {
     'journal_mode': 'WAL',
     'cache_size': -1 * 64000,  # 64MB
@@ -16,6 +27,14 @@ DB_PRAGMAS = {
     'synchronous': 1
 }
 
+# University Data Settings
+PROGRAMS_CSV = 'programs_data_with_links.csv'
+PROGRAMS_SNAPSHOT = 'programs_data.parquet'  # typed columnar copy built from PROGRAMS_CSV
+PROGRAMS_RELOAD_INTERVAL = float(os.getenv('PROGRAMS_RELOAD_INTERVAL', '30'))  # seconds between CSV checks, 0 disables
+PROGRAMS_RELOAD_SETTLE = 2.0  # seconds the CSV must stay unchanged before a reload (copies in progress)
+# Questions the local intent parser explains at least this well skip the LLM intent call
+INTENT_PARSER_MIN_CONFIDENCE = float(os.getenv('INTENT_PARSER_MIN_CONFIDENCE', '0.8'))
+
 # API Settings
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = "gemini-1.5-pro-002"
@@ -56,6 +75,15 @@ MAX_CONCURRENT_USERS = 100
 REQUEST_TIMEOUT = 30
 MAX_RETRIES = 3
 
+# Connection Pool Settings
+# Pools open connections on demand up to their max. SQLite allows only one writer,
+# so the write pool stays small. WAL readers do not block each other, so the read
+# pool scales further with concurrent sessions.
+DB_POOL_MIN_SIZE = 1  # connections kept open even when idle
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', max(4, MAX_CONCURRENT_USERS // 10)))
+DB_READ_POOL_MAX_SIZE = int(os.getenv('DB_READ_POOL_MAX_SIZE', max(4, MAX_CONCURRENT_USERS // 5)))
+DB_POOL_IDLE_TTL = 300  # seconds an idle connection above the minimum is kept
+
 # Forum Settings
 FORUM_CONFIG = {
     'max_title_length': 100,
@@ -13,7 +13,8 @@ from config.settings import (
     LOGIN_COOLDOWN
 )
 from config.constants import ERROR_MESSAGES, SUCCESS_MESSAGES
-from core.database import db_transaction  # Remove get_db_connection import
+from core.database import db_transaction, read_snapshot, DatabaseManager, DatabaseWriter  # Remove get_db_connection import
+from core import queries
 from services.gamification import GamificationService  # Updated import
 
 # Configure logging
@@ -66,27 +67,26 @@ def login_user(username: str, password: str) -> Optional[int]:
         AuthError: If login fails or too many attempts.
     """
     try:
-        with db_transaction() as conn:
+        with read_snapshot() as conn:
             c = conn.cursor()
             # Check login attempts
             if _check_login_attempts(username, c):
                 raise AuthError("Too many login attempts. Please try again later.")
 
             # Verify credentials
-            c.execute('''
-                SELECT id, password 
-                FROM users 
-                WHERE username = ?
-            ''', (username,))
+            c.execute(queries.LOGIN_USER, (username,))
             result = c.fetchone()
 
-            if result and result['password'] == hash_password(password):
-                _reset_login_attempts(username, c)
-                return result['id']
+            authenticated = bool(result and result['password'] == hash_password(password))
 
-            # Record failed attempt
-            _record_login_attempt(username, c)
-            return None
+        # Attempt bookkeeping goes through the single writer after the read transaction
+        if authenticated:
+            _reset_login_attempts(username)
+            return result['id']
+
+        # Record failed attempt
+        _record_login_attempt(username)
+        return None
 
     except AuthError as e:
         raise
@@ -204,13 +204,7 @@ def _check_login_attempts(username: str, cursor: sqlite3.Cursor) -> bool:
         bool: True if maximum attempts exceeded, False otherwise.
     """
     try:
-        cursor.execute('''
-            SELECT COUNT(*) as attempt_count, 
-                   MAX(attempt_time) as last_attempt
-            FROM login_attempts
-            WHERE username = ?
-            AND attempt_time > datetime('now', ?)
-        ''', (username, f'-{LOGIN_COOLDOWN} seconds'))
+        cursor.execute(queries.RECENT_LOGIN_ATTEMPTS, (username, f'-{LOGIN_COOLDOWN} seconds'))
 
         result = cursor.fetchone()
         if result:
@@ -221,34 +215,32 @@ def _check_login_attempts(username: str, cursor: sqlite3.Cursor) -> bool:
         logger.error(f"Error checking login attempts for username '{username}': {e}")
         raise AuthError("Failed to check login attempts.")
 
-def _record_login_attempt(username: str, cursor: sqlite3.Cursor):
+def _record_login_attempt(username: str):
     """
-    Record a failed login attempt.
+    Record a failed login attempt on the single writer.
 
     Args:
         username (str): Username.
-        cursor (sqlite3.Cursor): Database cursor.
     """
     try:
-        cursor.execute('''
+        DatabaseWriter.wait(DatabaseManager.submit_write('''
             INSERT INTO login_attempts (username, attempt_time)
             VALUES (?, datetime('now'))
-        ''', (username,))
+        ''', (username,)))
         logger.debug(f"Recorded failed login attempt for username '{username}'.")
     except Exception as e:
         logger.error(f"Error recording login attempt for username '{username}': {e}")
         raise AuthError("Failed to record login attempt.")
 
-def _reset_login_attempts(username: str, cursor: sqlite3.Cursor):
+def _reset_login_attempts(username: str):
     """
     Reset login attempts after successful login.
 
     Args:
         username (str): Username.
-        cursor (sqlite3.Cursor): Database cursor.
     """
     try:
-        cursor.execute('''
+        DatabaseManager.submit_write('''
             DELETE FROM login_attempts
             WHERE username = ?
         ''', (username,))
@@ -2,12 +2,36 @@ import sqlite3
 import threading
 import queue
 import logging
-from typing import Optional, List, Dict, Any, Union
+import hashlib
+import itertools
+import time
+import atexit
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from contextvars import ContextVar
+from typing import Optional, List, Dict, Any, Union, Tuple, Callable
 from contextlib import contextmanager
 from datetime import datetime
 from sqlite3 import Cursor  # Added import
 
-from config.settings import DATABASE_NAME, DB_TIMEOUT, DB_PRAGMAS
+from filelock import FileLock, Timeout
+
+from config.settings import (
+    DATABASE_NAME,
+    DB_TIMEOUT,
+    DB_PRAGMAS,
+    DB_MIGRATION_LOCK_FILE,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_MAX_SIZE,
+    DB_READ_POOL_MAX_SIZE,
+    DB_POOL_IDLE_TTL,
+    DB_WRITE_QUEUE_SIZE,
+    DB_WRITE_BATCH_SIZE,
+    DB_WRITE_BATCH_WINDOW,
+)
+
+from core.db_metrics import QueryHook, normalize_sql, query_metrics
 
 from config.constants import (
     DEFAULT_SUBJECTS,
@@ -22,29 +46,167 @@ from config.constants import (
 logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Connection of the transaction currently open in this context (thread/task).
+# Nested db_transaction calls join it through savepoints instead of checking out
+# another pooled connection.
+_current_connection: ContextVar[Optional[sqlite3.Connection]] = ContextVar(
+    'motikoc_current_connection', default=None
+)
+_savepoint_ids = itertools.count(1)
+
+# Read-only connection of the read_snapshot() open in this context, if any
+_current_reader: ContextVar[Optional[sqlite3.Connection]] = ContextVar(
+    'motikoc_current_reader', default=None
+)
+
+# Held for every write transaction in this process: the writer's group commits,
+# outer db_transaction blocks and PooledConnection.transaction() blocks. SQLite
+# allows one writer per database; queuing here instead of on its file lock avoids
+# busy-timeout retries between pooled connections.
+_write_lock = threading.RLock()
+
+# Set once the schema has been migrated in this process
+_schema_ready = False
+_schema_lock = threading.Lock()
+
 class DatabaseError(Exception):
     """Custom exception for database errors"""
     pass
 
+# Instrumentation hooks notified of every statement, fetch, pool wait and lock retry.
+# Replaced wholesale on change so readers never see a half-updated sequence.
+_query_hooks: Tuple[QueryHook, ...] = (query_metrics,)
+
+def add_query_hook(hook: QueryHook):
+    """Register an additional instrumentation hook"""
+    global _query_hooks
+    _query_hooks = _query_hooks + (hook,)
+
+def remove_query_hook(hook: QueryHook):
+    """Unregister a previously added instrumentation hook"""
+    global _query_hooks
+    _query_hooks = tuple(h for h in _query_hooks if h is not hook)
+
+def _emit(event: str, *args):
+    for hook in _query_hooks:
+        try:
+            getattr(hook, event)(*args)
+        except Exception as e:
+            logger.debug(f"Query hook {hook!r} failed on {event}: {e}")
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports statement latency and returned rows to the query hooks"""
+    _statement = ''
+
+    def execute(self, sql, parameters=()):
+        self._statement = normalize_sql(sql)
+        start = time.perf_counter()
+        try:
+            result = super().execute(sql, parameters)
+        except Exception:
+            _emit('record_query', self._statement, time.perf_counter() - start, 0, True)
+            raise
+        _emit('record_query', self._statement, time.perf_counter() - start, max(self.rowcount, 0), False)
+        return result
+
+    def executemany(self, sql, seq_of_parameters):
+        self._statement = normalize_sql(sql)
+        start = time.perf_counter()
+        try:
+            result = super().executemany(sql, seq_of_parameters)
+        except Exception:
+            _emit('record_query', self._statement, time.perf_counter() - start, 0, True)
+            raise
+        _emit('record_query', self._statement, time.perf_counter() - start, max(self.rowcount, 0), False)
+        return result
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        _emit('record_fetch', self._statement, time.perf_counter() - start, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        _emit('record_fetch', self._statement, time.perf_counter() - start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        _emit('record_fetch', self._statement, time.perf_counter() - start, len(rows))
+        return rows
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (including execute shortcuts) are instrumented"""
+    _shared_cursor: Optional[InstrumentedCursor] = None
+
+    def shared_cursor(self) -> InstrumentedCursor:
+        """Cursor reused by every read on this connection; callers must fetch before releasing it"""
+        if self._shared_cursor is None:
+            self._shared_cursor = self.cursor()
+        return self._shared_cursor
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+def _acquire_write_lock():
+    if not _write_lock.acquire(timeout=DB_TIMEOUT):
+        raise DatabaseError(f"Timed out after {DB_TIMEOUT}s waiting for the database write lock")
+
 class DatabaseConnectionPool:
-    """Thread-safe database connection pool"""
+    """Thread-safe, elastic database connection pool.
+
+    Connections are opened on demand up to max_connections. Idle ones above
+    min_connections are closed after idle_ttl seconds, and every checkout is
+    health-checked first.
+    """
     _instance = None
+    _reader_instance = None
     _lock = threading.Lock()
     
-    def __init__(self, max_connections: int = 10):
-        self.pool = queue.Queue(maxsize=max_connections)
+    def __init__(self, max_connections: int = DB_POOL_MAX_SIZE, read_only: bool = False,
+                 min_connections: int = DB_POOL_MIN_SIZE, idle_ttl: float = DB_POOL_IDLE_TTL):
+        self.read_only = read_only
+        self.name = 'read' if read_only else 'write'
+        self.max_connections = max(1, max_connections)
+        self.min_connections = min(max(0, min_connections), self.max_connections)
+        self.idle_ttl = idle_ttl
+        self._cond = threading.Condition(threading.Lock())
+        # (connection, monotonic time it was returned); the newest is at the right
+        self._idle: deque = deque()
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._created = 0
+        self._evicted = 0
+        self._failed_checks = 0
         self._fill_pool()
     
     def _fill_pool(self):
-        """Initialize connection pool"""
-        while not self.pool.full():
+        """Open the minimum number of connections"""
+        while self._size < self.min_connections:
             conn = self._create_connection()
-            self.pool.put(conn)
+            self._idle.append((conn, time.monotonic()))
+            self._size += 1
+            self._created += 1
     
     def _create_connection(self) -> sqlite3.Connection:
         """Create a new database connection with proper configuration"""
         try:
-            conn = sqlite3.connect(DATABASE_NAME, timeout=DB_TIMEOUT, check_same_thread=False)
+            conn = sqlite3.connect(
+                DATABASE_NAME,
+                timeout=DB_TIMEOUT,
+                check_same_thread=False,
+                factory=InstrumentedConnection
+            )
             conn.row_factory = sqlite3.Row
             
             # Configure connection
@@ -52,6 +214,12 @@ class DatabaseConnectionPool:
             for pragma, value in DB_PRAGMAS.items():
                 conn.execute(f'PRAGMA {pragma}={value}')
             conn.execute('PRAGMA foreign_keys=ON')
+
+            if self.read_only:
+                # Autocommit: each SELECT runs in its own implicit read transaction,
+                # and query_only turns any accidental write into an error
+                conn.isolation_level = None
+                conn.execute('PRAGMA query_only=ON')
             
             return conn
         except sqlite3.Error as e:
@@ -66,66 +234,553 @@ class DatabaseConnectionPool:
                 if cls._instance is None:
                     cls._instance = DatabaseConnectionPool()
         return cls._instance
-    
-    def get_connection(self) -> sqlite3.Connection:
-        """Get a connection from the pool"""
+
+    @classmethod
+    def get_reader_instance(cls) -> 'DatabaseConnectionPool':
+        """Get singleton instance of the read-only connection pool"""
+        if cls._reader_instance is None:
+            with cls._lock:
+                if cls._reader_instance is None:
+                    cls._reader_instance = DatabaseConnectionPool(DB_READ_POOL_MAX_SIZE, read_only=True)
+        return cls._reader_instance
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        """Cheap liveness probe, bypassing the instrumented execute()"""
         try:
-            return self.pool.get(timeout=DB_TIMEOUT)
-        except queue.Empty:
-            logger.error("Connection pool timeout")
-            raise DatabaseError("Failed to get database connection from pool")
+            sqlite3.Connection.execute(conn, 'SELECT 1').fetchone()
+            return not conn.in_transaction
+        except sqlite3.Error:
+            return False
+
+    def _take_expired(self, now: float) -> List[sqlite3.Connection]:
+        """Detach idle connections past their TTL, oldest first (caller holds the lock)"""
+        expired = []
+        while (self._idle and self._size > self.min_connections
+               and now - self._idle[0][1] >= self.idle_ttl):
+            expired.append(self._idle.popleft()[0])
+            self._size -= 1
+            self._evicted += 1
+        return expired
+
+    @staticmethod
+    def _close_all(connections: List[sqlite3.Connection]):
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def _report_state(self):
+        _emit('record_pool_state', self.name, self._in_use, len(self._idle), self._waiting)
+
+    def get_connection(self, timeout: float = DB_TIMEOUT) -> sqlite3.Connection:
+        """Get a healthy connection, opening one if the pool has room"""
+        start = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        while True:
+            create = False
+            with self._cond:
+                expired = self._take_expired(time.monotonic())
+                while not self._idle and self._size >= self.max_connections:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._waiting += 1
+                    self._report_state()
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                if self._idle:
+                    conn = self._idle.pop()[0]
+                elif self._size < self.max_connections:
+                    conn = None
+                    create = True
+                    self._size += 1
+                else:
+                    self._report_state()
+                    self._close_all(expired)
+                    _emit('record_pool_wait', time.perf_counter() - start, self.name)
+                    logger.error("Connection pool timeout")
+                    raise DatabaseError("Failed to get database connection from pool")
+                self._in_use += 1
+            self._close_all(expired)
+
+            if create:
+                try:
+                    conn = self._create_connection()
+                except DatabaseError:
+                    self._discard()
+                    raise
+            elif not self._is_healthy(conn):
+                logger.warning("Discarding unhealthy pooled connection")
+                self.discard_connection(conn, failed_check=True)
+                continue
+
+            with self._cond:
+                if create:
+                    self._created += 1
+                self._report_state()
+            _emit('record_pool_wait', time.perf_counter() - start, self.name)
+            return conn
+
+    def discard_connection(self, conn: sqlite3.Connection, failed_check: bool = False):
+        """Close a checked-out connection instead of returning it, freeing its slot"""
+        self._close_all([conn])
+        self._discard(failed_check)
+
+    def _discard(self, failed_check: bool = False):
+        with self._cond:
+            self._size -= 1
+            self._in_use -= 1
+            if failed_check:
+                self._failed_checks += 1
+            self._cond.notify()
+            self._report_state()
     
     def return_connection(self, conn: sqlite3.Connection):
         """Return a connection to the pool"""
         try:
-            self.pool.put(conn, timeout=DB_TIMEOUT)
-        except queue.Full:
-            logger.warning("Connection pool full, closing connection")
-            conn.close()
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error as e:
+            logger.warning(f"Closing connection that failed to roll back: {e}")
+            self.discard_connection(conn)
+            return
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append((conn, time.monotonic()))
+            expired = self._take_expired(time.monotonic())
+            self._cond.notify()
+            self._report_state()
+        self._close_all(expired)
+
+    def evict_idle(self) -> int:
+        """Close idle connections past their TTL now; returns how many were closed"""
+        with self._cond:
+            expired = self._take_expired(time.monotonic())
+            self._report_state()
+        self._close_all(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, int]:
+        """Current pool gauges and lifetime counters"""
+        with self._cond:
+            return {
+                'size': self._size,
+                'max_size': self.max_connections,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiting': self._waiting,
+                'created': self._created,
+                'evicted': self._evicted,
+                'failed_checks': self._failed_checks,
+            }
+
+class PooledConnection:
+    """Stand-in for a raw sqlite3 connection in code that manages its own connection.
+
+    Attribute access is forwarded to a pooled connection. Leaving its `with` block
+    commits (or rolls back on error) and returns it to the pool; close() rolls back
+    anything uncommitted and returns it. Nothing is returned on garbage collection,
+    so every checkout needs one of the two. Writes belong in a transaction() block.
+    """
+
+    def __init__(self, pool: DatabaseConnectionPool, conn: sqlite3.Connection):
+        object.__setattr__(self, '_pool', pool)
+        object.__setattr__(self, '_conn', conn)
+
+    @property
+    def raw(self) -> sqlite3.Connection:
+        """The pooled sqlite3 connection, for reads through APIs that need a real one (pandas)"""
+        if self._conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return self._conn
+
+    def __getattr__(self, name: str):
+        if self._conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._conn, name, value)
+
+    @contextmanager
+    def transaction(self):
+        """One write transaction on this connection, holding the process write lock.
+
+        Commits when the block completes and rolls back on any exception (st.rerun
+        included), so the lock never outlives the block.
+        """
+        conn = self.raw
+        _acquire_write_lock()
+        try:
+            try:
+                yield self
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        finally:
+            _write_lock.release()
+
+    def __enter__(self) -> 'PooledConnection':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Commit or roll back like sqlite3, then end the checkout
+        if self._conn is None:
+            return False
+        try:
+            return self._conn.__exit__(exc_type, exc, tb)
+        finally:
+            self.close()
+
+    def close(self):
+        conn = self._conn
+        if conn is None:
+            return
+        object.__setattr__(self, '_conn', None)
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA foreign_keys=ON')
+        except sqlite3.Error as e:
+            logger.warning(f"Closing pooled connection that could not be reset: {e}")
+            self._pool.discard_connection(conn)
+            return
+        self._pool.return_connection(conn)
+
+def pooled_connection() -> PooledConnection:
+    """Check out a pooled connection with plain sqlite3 defaults.
+
+    Rows are tuples and foreign keys are not enforced, as with sqlite3.connect(),
+    so legacy callers keep their behaviour while sharing the pool's configuration.
+    Use it as ``with pooled_connection() as conn:`` or close() it in a finally, and
+    write inside ``with conn.transaction():``.
+    """
+    pool = DatabaseConnectionPool.get_instance()
+    conn = pool.get_connection()
+    conn.row_factory = None
+    conn.execute('PRAGMA foreign_keys=OFF')
+    return PooledConnection(pool, conn)
+
+@contextmanager
+def _savepoint(conn: sqlite3.Connection):
+    """Run a nested unit of work inside a savepoint of the enclosing transaction"""
+    name = f"sp_{next(_savepoint_ids)}"
+    conn.execute(f'SAVEPOINT {name}')
+    try:
+        yield
+    except BaseException:
+        conn.execute(f'ROLLBACK TO SAVEPOINT {name}')
+        conn.execute(f'RELEASE SAVEPOINT {name}')
+        raise
+    else:
+        conn.execute(f'RELEASE SAVEPOINT {name}')
+
+def current_connection() -> Optional[sqlite3.Connection]:
+    """Connection of the transaction open in the current context, if any"""
+    return _current_connection.get()
 
 @contextmanager
 def db_transaction(retries: int = 3):
-    """Enhanced context manager for database transactions with retry logic"""
+    """Enhanced context manager for database transactions with retry logic.
+
+    Nested calls join the caller's connection and transaction through a savepoint,
+    so one logical action holds exactly one pooled connection.
+    """
+    outer = _current_connection.get()
+    if outer is not None:
+        try:
+            with _savepoint(outer):
+                yield outer
+        except DatabaseError:
+            raise
+        except Exception as e:
+            logger.error(f"Nested transaction error: {e}")
+            raise DatabaseError(f"Transaction failed: {e}")
+        return
+
     pool = DatabaseConnectionPool.get_instance()
     conn = None
-    
-    for attempt in range(retries):
-        try:
-            conn = pool.get_connection()
-            yield conn
-            conn.commit()
-            break
-        except sqlite3.OperationalError as e:
-            if 'database is locked' in str(e) and attempt < retries - 1:
-                logger.warning(f"Database locked, attempt {attempt + 1} of {retries}")
+    # One write transaction per process; nested calls above already hold it
+    _acquire_write_lock()
+    try:
+        for attempt in range(retries):
+            token = None
+            try:
+                conn = pool.get_connection()
+                # Open the transaction explicitly so nested savepoints never commit early
+                conn.execute('BEGIN')
+                token = _current_connection.set(conn)
+                yield conn
+                conn.commit()
+                break
+            except sqlite3.OperationalError as e:
+                if 'database is locked' in str(e) and attempt < retries - 1:
+                    logger.warning(f"Database locked, attempt {attempt + 1} of {retries}")
+                    _emit('record_lock_retry')
+                    if conn:
+                        conn.rollback()
+                    continue
                 if conn:
                     conn.rollback()
-                continue
-            raise DatabaseError(f"Transaction failed: {e}")
+                raise DatabaseError(f"Transaction failed: {e}")
+            except Exception as e:
+                if conn:
+                    conn.rollback()
+                logger.error(f"Transaction error: {e}")
+                raise DatabaseError(f"Transaction failed: {e}")
+            except BaseException:
+                # Control-flow exceptions (e.g. st.rerun) must not leave the transaction open
+                if conn:
+                    conn.rollback()
+                raise
+            finally:
+                if token is not None:
+                    _current_connection.reset(token)
+                if conn:
+                    pool.return_connection(conn)
+    finally:
+        _write_lock.release()
+
+@contextmanager
+def db_read():
+    """Connection for pure reads: no BEGIN/COMMIT and no write-capable connection.
+
+    Reads inside an open db_transaction use its connection (and see its uncommitted
+    writes); reads inside read_snapshot() share that snapshot.
+    """
+    ambient = _current_connection.get() or _current_reader.get()
+    if ambient is not None:
+        yield ambient
+        return
+
+    pool = DatabaseConnectionPool.get_reader_instance()
+    conn = pool.get_connection()
+    try:
+        yield conn
+    finally:
+        pool.return_connection(conn)
+
+@contextmanager
+def read_snapshot():
+    """Run several reads against one consistent snapshot of the database"""
+    if _current_connection.get() is not None or _current_reader.get() is not None:
+        with db_read() as conn:
+            yield conn
+        return
+
+    pool = DatabaseConnectionPool.get_reader_instance()
+    conn = pool.get_connection()
+    token = _current_reader.set(conn)
+    try:
+        # In WAL mode the snapshot is fixed by the first read after BEGIN
+        conn.execute('BEGIN')
+        yield conn
+    except sqlite3.Error as e:
+        logger.error(f"Read snapshot error: {e}")
+        raise DatabaseError(f"Read failed: {e}")
+    finally:
+        _current_reader.reset(token)
+        if conn.in_transaction:
+            conn.execute('COMMIT')
+        pool.return_connection(conn)
+
+@dataclass
+class WriteResult:
+    """Outcome of a single queued write statement"""
+    lastrowid: Optional[int]
+    rowcount: int
+
+class DatabaseWriter:
+    """Single writer thread that applies queued writes with group commit.
+
+    SQLite has one writer lock per database. Funnelling writes through one
+    connection removes lock contention between pooled connections, and lets
+    concurrent sessions share a single COMMIT per batch. Reads keep using the pool.
+    Each batch holds the process write lock, so it never races a db_transaction
+    or a PooledConnection.transaction() block.
+    """
+    _instance = None
+    _lock = threading.Lock()
+    _STOP = object()
+
+    def __init__(self, batch_size: int = DB_WRITE_BATCH_SIZE, batch_window: float = DB_WRITE_BATCH_WINDOW):
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.queue: queue.Queue = queue.Queue(maxsize=DB_WRITE_QUEUE_SIZE)
+        self._conn = DatabaseConnectionPool.get_instance()._create_connection()
+        self._thread = threading.Thread(target=self._run, name='motikoc-db-writer', daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def get_instance(cls) -> 'DatabaseWriter':
+        """Get singleton instance of the writer"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = DatabaseWriter()
+                    atexit.register(cls._instance.close)
+        return cls._instance
+
+    def submit(self, work: Callable[[sqlite3.Cursor], Any]) -> Future:
+        """Queue a unit of work; it runs on the writer connection inside a savepoint.
+
+        Inside an open transaction (including on the writer thread itself) the work
+        runs inline on that connection so it stays atomic with the caller.
+        """
+        future: Future = Future()
+        conn = _current_connection.get()
+        if conn is not None:
+            try:
+                future.set_result(self._apply(conn, work))
+            except Exception as e:
+                future.set_exception(DatabaseError(f"Write failed: {e}"))
+            return future
+
+        try:
+            self.queue.put((work, future), timeout=DB_TIMEOUT)
+        except queue.Full:
+            logger.error("Write queue full")
+            raise DatabaseError("Write queue is full")
+        return future
+
+    @staticmethod
+    def wait(future: Future, timeout: float = DB_TIMEOUT) -> Any:
+        """Result of a submitted write, raising DatabaseError if it failed or timed out.
+
+        A write still queued when the caller gives up is cancelled, so it never
+        commits after its failure was reported. One the writer has already started
+        gets a second `timeout` to finish its batch.
+        """
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            if future.cancel():
+                raise DatabaseError(f"Write not applied: still queued after {timeout}s")
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            raise DatabaseError(f"Write outcome unknown: its batch did not commit within {2 * timeout}s")
+
+    def execute(self, query: str, params: Union[tuple, List[tuple]] = (), many: bool = False) -> Future:
+        """Queue a single statement (or executemany) and return a future WriteResult"""
+        def work(cursor: sqlite3.Cursor) -> WriteResult:
+            if many:
+                cursor.executemany(query, params)
+            else:
+                cursor.execute(query, params)
+            return WriteResult(lastrowid=cursor.lastrowid, rowcount=cursor.rowcount)
+        return self.submit(work)
+
+    def close(self, timeout: float = DB_TIMEOUT):
+        """Flush pending writes and stop the writer thread"""
+        if self._thread.is_alive():
+            self.queue.put(self._STOP)
+            self._thread.join(timeout)
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, work: Callable[[sqlite3.Cursor], Any]) -> Any:
+        with _savepoint(conn):
+            cursor = conn.cursor()
+            try:
+                return work(cursor)
+            finally:
+                cursor.close()
+
+    def _next_batch(self) -> Tuple[List[Tuple[Callable, Future]], bool]:
+        """Block for one write, then gather more until the batch window closes"""
+        batch = []
+        item = self.queue.get()
+        deadline = time.monotonic() + self.batch_window
+        while item is not self._STOP:
+            batch.append(item)
+            remaining = deadline - time.monotonic()
+            if len(batch) >= self.batch_size or remaining <= 0:
+                return batch, False
+            try:
+                item = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                return batch, False
+        return batch, True
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._commit_batch(batch)
+        self._conn.close()
+
+    @staticmethod
+    def _fail(batch: List[Tuple[Callable, Future]], error: Exception):
+        for _, future in batch:
+            # Cancelled futures were abandoned by their callers
+            if future.running() or future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    def _commit_batch(self, batch: List[Tuple[Callable, Future]]):
+        try:
+            _acquire_write_lock()
+        except DatabaseError as e:
+            logger.error(f"Write batch of {len(batch)} failed: {e}")
+            self._fail(batch, e)
+            return
+
+        outcomes = []
+        token = _current_connection.set(self._conn)
+        try:
+            self._conn.execute('BEGIN IMMEDIATE')
+            for work, future in batch:
+                # Skip work whose caller timed out while it was queued
+                if not future.set_running_or_notify_cancel():
+                    continue
+                # A failing write only rolls back its own savepoint, not the batch
+                try:
+                    outcomes.append((future, self._apply(self._conn, work), None))
+                except Exception as e:
+                    outcomes.append((future, None, e))
+            self._conn.commit()
         except Exception as e:
-            if conn:
-                conn.rollback()
-            logger.error(f"Transaction error: {e}")
-            raise DatabaseError(f"Transaction failed: {e}")
+            if self._conn.in_transaction:
+                self._conn.rollback()
+            logger.error(f"Write batch of {len(batch)} failed: {e}")
+            self._fail(batch, DatabaseError(f"Write failed: {e}"))
+            return
         finally:
-            if conn:
-                pool.return_connection(conn)
+            _write_lock.release()
+            _current_connection.reset(token)
+
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(DatabaseError(f"Write failed: {error}"))
+            else:
+                future.set_result(result)
 
 def init_db():
-    """Initialize database with enhanced error handling and logging"""
-    try:
-        with db_transaction() as conn:
-            cursor = conn.cursor()
-            
-            # Create tables with proper indexing
-            _create_tables(cursor)
-            _create_indexes(cursor)
-            _initialize_default_data(cursor)
-            
-            logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Database initialization failed: {e}")
-        raise DatabaseError(f"Database initialization failed: {e}")
+    """Bring the schema up to date once per process; later calls are a flag check"""
+    global _schema_ready
+    if _schema_ready:
+        return
+
+    with _schema_lock:
+        if _schema_ready:
+            return
+        try:
+            # The file lock serializes migrations across Streamlit worker processes
+            with FileLock(DB_MIGRATION_LOCK_FILE, timeout=DB_TIMEOUT):
+                _run_migrations()
+            _schema_ready = True
+        except Timeout:
+            logger.error("Timed out waiting for the schema migration lock")
+            raise DatabaseError("Database initialization failed: migration lock timeout")
+        except Exception as e:
+            logger.error(f"Database initialization failed: {e}")
+            raise DatabaseError(f"Database initialization failed: {e}")
 
 def _create_tables(cursor: sqlite3.Cursor):
     """Create all database tables with proper constraints and relationships"""
@@ -542,22 +1197,18 @@ def _initialize_default_data(cursor: Cursor) -> None:
         logger.info(f"Initialized {len(FORUM_CATEGORIES)} forum categories")
 
         # Initialize YKS subjects
+        yks_subjects = []
         for exam_type, categories in YKS_CATEGORIES.items():  # Ensure YKS_CATEGORIES is a dict
             if isinstance(categories, dict):
                 for category, subjects in categories.items():
-                    for subject in subjects:
-                        cursor.execute('''
-                            INSERT OR IGNORE INTO yks_subjects 
-                            (exam_type, subject, topic, difficulty, importance)
-                            VALUES (?, ?, ?, ?, ?)
-                        ''', (exam_type, subject, category, 3, 3))
+                    yks_subjects.extend((exam_type, subject, category, 3, 3) for subject in subjects)
             else:
-                for subject in categories:
-                    cursor.execute('''
-                        INSERT OR IGNORE INTO yks_subjects 
-                        (exam_type, subject, topic, difficulty, importance)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (exam_type, subject, "Genel", 3, 3))
+                yks_subjects.extend((exam_type, subject, "Genel", 3, 3) for subject in categories)
+        cursor.executemany('''
+            INSERT OR IGNORE INTO yks_subjects 
+            (exam_type, subject, topic, difficulty, importance)
+            VALUES (?, ?, ?, ?, ?)
+        ''', yks_subjects)
         logger.info("Initialized YKS subjects")
 
     except sqlite3.Error as e:
@@ -574,6 +1225,269 @@ def _create_indexes(cursor: sqlite3.Cursor):
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_forum_questions_user ON forum_questions(user_id)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_forum_answers_user ON forum_answers(user_id)')
 
+def _create_forum_extras(cursor: sqlite3.Cursor):
+    """Create forum vote and notification tables previously created by ForumView"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS forum_votes (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            content_type TEXT NOT NULL,
+            content_id INTEGER NOT NULL,
+            vote_type INTEGER NOT NULL,
+            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS forum_notifications (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            link TEXT,
+            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            is_read BOOLEAN DEFAULT FALSE,
+            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    ''')
+
+def _create_coverage_indexes(cursor: sqlite3.Cursor):
+    """Index every per-user lookup in the hot query registry (see core/query_plans.py)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS achievement_likes (
+            id INTEGER PRIMARY KEY,
+            achievement_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(achievement_id) REFERENCES achievements(id) ON DELETE CASCADE,
+            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    ''')
+
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_achievement_likes_achievement_user ON achievement_likes(achievement_id, user_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_achievements_user_date ON achievements(user_id, date)')
+    cursor.execute('DROP INDEX IF EXISTS idx_achievements_user')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_login_attempts_username_time ON login_attempts(username, attempt_time)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_friendships_friend_status ON friendships(friend_id, status)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_group_members_user ON group_members(user_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_question_stats_user_practice ON question_stats(user_id, last_practice)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_daily_tasks_user_date ON daily_tasks(user_id, date_created)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_goals_user_completed ON goals(user_id, completed)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_mood_logs_user_date ON mood_logs(user_id, date)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_saved_solutions_user ON saved_solutions(user_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_xp_bonuses_user_awarded ON xp_bonuses(user_id, awarded_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_levels_total_xp ON user_levels(total_xp)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_forum_questions_category ON forum_questions(category_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_forum_answers_question ON forum_answers(question_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_forum_votes_content ON forum_votes(content_type, content_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_forum_votes_user_content ON forum_votes(user_id, content_type, content_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_forum_notifications_user_read ON forum_notifications(user_id, is_read)')
+
+def _create_daily_stats_rollup(cursor: sqlite3.Cursor):
+    """Per-user daily study rollup kept in sync with study_logs by triggers"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_daily_stats (
+            user_id INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            session_count INTEGER NOT NULL DEFAULT 0,
+            total_duration INTEGER NOT NULL DEFAULT 0,
+            rating_sum INTEGER NOT NULL DEFAULT 0,
+            rating_count INTEGER NOT NULL DEFAULT 0,  -- sessions with a non-NULL rating
+            success_count INTEGER NOT NULL DEFAULT 0,  -- sessions rated 4 or higher
+            PRIMARY KEY(user_id, date, subject),
+            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    ''')
+
+    cursor.execute('''
+        INSERT OR REPLACE INTO user_daily_stats
+            (user_id, date, subject, session_count, total_duration, rating_sum, rating_count, success_count)
+        SELECT
+            user_id, date, subject,
+            COUNT(*),
+            SUM(COALESCE(duration, 0)),
+            SUM(COALESCE(performance_rating, 0)),
+            COUNT(performance_rating),
+            SUM(COALESCE(performance_rating >= 4, 0))
+        FROM study_logs
+        GROUP BY user_id, date, subject
+    ''')
+
+    add_session = '''
+        INSERT INTO user_daily_stats
+            (user_id, date, subject, session_count, total_duration, rating_sum, rating_count, success_count)
+        VALUES (
+            NEW.user_id, NEW.date, NEW.subject, 1,
+            COALESCE(NEW.duration, 0),
+            COALESCE(NEW.performance_rating, 0),
+            NEW.performance_rating IS NOT NULL,
+            COALESCE(NEW.performance_rating >= 4, 0)
+        )
+        ON CONFLICT(user_id, date, subject) DO UPDATE SET
+            session_count = session_count + excluded.session_count,
+            total_duration = total_duration + excluded.total_duration,
+            rating_sum = rating_sum + excluded.rating_sum,
+            rating_count = rating_count + excluded.rating_count,
+            success_count = success_count + excluded.success_count;
+    '''
+    remove_session = '''
+        UPDATE user_daily_stats SET
+            session_count = session_count - 1,
+            total_duration = total_duration - COALESCE(OLD.duration, 0),
+            rating_sum = rating_sum - COALESCE(OLD.performance_rating, 0),
+            rating_count = rating_count - (OLD.performance_rating IS NOT NULL),
+            success_count = success_count - COALESCE(OLD.performance_rating >= 4, 0)
+        WHERE user_id = OLD.user_id AND date = OLD.date AND subject = OLD.subject;
+        DELETE FROM user_daily_stats
+        WHERE user_id = OLD.user_id AND date = OLD.date AND subject = OLD.subject
+        AND session_count <= 0;
+    '''
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_study_logs_rollup_insert
+        AFTER INSERT ON study_logs
+        BEGIN {add_session} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_study_logs_rollup_delete
+        AFTER DELETE ON study_logs
+        BEGIN {remove_session} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_study_logs_rollup_update
+        AFTER UPDATE OF user_id, date, subject, duration, performance_rating ON study_logs
+        BEGIN {remove_session} {add_session} END
+    ''')
+
+def _create_mock_exam_subject_results(cursor: sqlite3.Cursor):
+    """Per-subject mock exam results derived from mock_exams.subject_results by triggers"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS mock_exam_subject_results (
+            exam_id INTEGER NOT NULL,
+            subject TEXT NOT NULL,
+            correct INTEGER NOT NULL DEFAULT 0,
+            incorrect INTEGER NOT NULL DEFAULT 0,
+            empty INTEGER NOT NULL DEFAULT 0,
+            net REAL NOT NULL DEFAULT 0,  -- correct - incorrect / 4
+            PRIMARY KEY(exam_id, subject),
+            FOREIGN KEY(exam_id) REFERENCES mock_exams(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_mock_exam_subject_results_subject ON mock_exam_subject_results(subject)')
+
+    # subject_results is {"<subject>": {"correct": n, "incorrect": n, "empty": n}, ...};
+    # malformed JSON or non-object entries are skipped rather than failing the exam write
+    explode = '''
+        INSERT OR REPLACE INTO mock_exam_subject_results (exam_id, subject, correct, incorrect, empty, net)
+        SELECT
+            {exam}.id,
+            j.key,
+            COALESCE(json_extract(j.value, '$.correct'), 0),
+            COALESCE(json_extract(j.value, '$.incorrect'), 0),
+            COALESCE(json_extract(j.value, '$.empty'), 0),
+            COALESCE(json_extract(j.value, '$.correct'), 0)
+                - COALESCE(json_extract(j.value, '$.incorrect'), 0) / 4.0
+        FROM {source}
+        json_each(CASE WHEN json_valid({exam}.subject_results) THEN {exam}.subject_results ELSE '{{}}' END) j
+        WHERE j.type = 'object';
+    '''
+    clear = '''
+        DELETE FROM mock_exam_subject_results WHERE exam_id = OLD.id;
+    '''
+
+    cursor.execute(explode.format(exam='m', source='mock_exams m,'))
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_mock_exams_subjects_insert
+        AFTER INSERT ON mock_exams
+        BEGIN {explode.format(exam='NEW', source='')} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_mock_exams_subjects_update
+        AFTER UPDATE OF id, subject_results ON mock_exams
+        BEGIN {clear} {explode.format(exam='NEW', source='')} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_mock_exams_subjects_delete
+        AFTER DELETE ON mock_exams
+        BEGIN {clear} END
+    ''')
+
+def _create_group_member_index(cursor: sqlite3.Cursor):
+    """Covering (user_id, group_id, role) index for the MY_GROUPS membership lookup"""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_group_members_user_group_role ON group_members(user_id, group_id, role)')
+    cursor.execute('DROP INDEX IF EXISTS idx_group_members_user')
+
+def _migrate_initial_schema(cursor: sqlite3.Cursor):
+    """Migration 1: base tables, indexes and default data"""
+    _create_tables(cursor)
+    _create_indexes(cursor)
+    _initialize_default_data(cursor)
+
+# Ordered schema migrations. Append new entries; never edit or reorder applied ones,
+# since the stored fingerprint covers every (version, name) pair up to that version.
+SCHEMA_MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, 'initial_schema', _migrate_initial_schema),
+    (2, 'forum_votes_notifications', _create_forum_extras),
+    (3, 'index_coverage', _create_coverage_indexes),
+    (4, 'user_daily_stats_rollup', _create_daily_stats_rollup),
+    (5, 'mock_exam_subject_results', _create_mock_exam_subject_results),
+    (6, 'group_member_index', _create_group_member_index),
+]
+
+SCHEMA_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+def schema_fingerprint(version: int = SCHEMA_VERSION) -> str:
+    """Hash of the migration history up to and including the given version"""
+    digest = hashlib.sha256()
+    for migration_version, name, _ in SCHEMA_MIGRATIONS:
+        if migration_version > version:
+            break
+        digest.update(f"{migration_version}:{name};".encode('utf-8'))
+    return digest.hexdigest()
+
+def _run_migrations():
+    """Apply pending migrations and record their version and fingerprint"""
+    with db_transaction() as conn:
+        cursor = conn.cursor()
+        current_version = cursor.execute('PRAGMA user_version').fetchone()[0]
+
+        if current_version >= SCHEMA_VERSION:
+            stored = cursor.execute(
+                'SELECT fingerprint FROM schema_migrations WHERE version = ?',
+                (current_version,)
+            ).fetchone()
+            if stored is None or stored[0] != schema_fingerprint(current_version):
+                logger.warning(f"Schema fingerprint mismatch at version {current_version}")
+            return
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        for version, name, migrate in SCHEMA_MIGRATIONS:
+            if version <= current_version:
+                continue
+            migrate(cursor)
+            cursor.execute(
+                'INSERT OR REPLACE INTO schema_migrations (version, name, fingerprint) VALUES (?, ?, ?)',
+                (version, name, schema_fingerprint(version))
+            )
+            # PRAGMA does not accept bound parameters; version is an int from the table above
+            cursor.execute(f'PRAGMA user_version = {int(version)}')
+            logger.info(f"Applied schema migration {version}: {name}")
+
+        logger.info(f"Database schema at version {SCHEMA_VERSION}")
+
+def _is_select(query: str) -> bool:
+    """True for a plain SELECT, which can never write"""
+    return query.lstrip()[:6].upper() == 'SELECT'
+
 class DatabaseManager:
     """High-level database operations manager"""
     
@@ -589,29 +1503,59 @@ class DatabaseManager:
                 cursor.close()
     
     @staticmethod
-    def execute_query(query: str, params: tuple = (), fetch_all: bool = False) -> Union[List[sqlite3.Row], Optional[sqlite3.Row]]:
-        """Execute database query with proper error handling"""
+    def read_query(query: str, params: tuple = (), fetch_all: bool = False) -> Union[List[sqlite3.Row], Optional[sqlite3.Row]]:
+        """Execute a read-only query on the read path"""
         try:
-            with DatabaseManager.get_cursor() as cursor:
+            with db_read() as conn:
+                cursor = conn.cursor() if conn is current_connection() else conn.shared_cursor()
                 cursor.execute(query, params)
                 if fetch_all:
                     return cursor.fetchall()
-                return cursor.fetchone()
+                row = cursor.fetchone()
+                # Finish the statement so the connection holds no open read
+                cursor.fetchall()
+                return row
+        except Exception as e:
+            logger.error(f"Query execution failed: {e}")
+            raise DatabaseError(f"Query execution failed: {e}")
+
+    @staticmethod
+    def execute_query(query: str, params: tuple = (), fetch_all: bool = False) -> Union[List[sqlite3.Row], Optional[sqlite3.Row]]:
+        """Execute database query with proper error handling.
+
+        SELECTs run on the read path; anything else is applied by the writer (inline
+        when called inside an open transaction) and waits for its commit.
+        """
+        if current_connection() is None and _is_select(query):
+            return DatabaseManager.read_query(query, params, fetch_all)
+
+        def work(cursor: sqlite3.Cursor):
+            cursor.execute(query, params)
+            if fetch_all:
+                return cursor.fetchall()
+            return cursor.fetchone()
+
+        try:
+            return DatabaseWriter.wait(DatabaseWriter.get_instance().submit(work))
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
             raise DatabaseError(f"Query execution failed: {e}")
     
     @staticmethod
     def insert_record(table: str, data: Dict[str, Any]) -> int:
-        """Insert record with automatic ID generation"""
+        """Insert record with automatic ID generation.
+
+        Waits for the writer's group commit so the id is final and the row is
+        visible to the caller's next read. That adds up to DB_WRITE_BATCH_WINDOW
+        (5 ms) plus the batch ahead of it; use submit_write when nothing is read back.
+        """
         placeholders = ', '.join(['?' for _ in data])
         columns = ', '.join(data.keys())
         query = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
         
         try:
-            with DatabaseManager.get_cursor() as cursor:
-                cursor.execute(query, tuple(data.values()))
-                return cursor.lastrowid or 0  # Or use another default value
+            result = DatabaseWriter.wait(DatabaseWriter.get_instance().execute(query, tuple(data.values())))
+            return result.lastrowid or 0  # Or use another default value
 
         except Exception as e:
             logger.error(f"Insert operation failed: {e}")
@@ -619,17 +1563,25 @@ class DatabaseManager:
     
     @staticmethod
     def update_record(table: str, data: Dict[str, Any], condition: str, params: tuple) -> bool:
-        """Update record with condition"""
+        """Update record with condition; waits for the group commit like insert_record"""
         set_clause = ', '.join([f"{k} = ?" for k in data.keys()])
         query = f'UPDATE {table} SET {set_clause} WHERE {condition}'
         
         try:
-            with DatabaseManager.get_cursor() as cursor:
-                cursor.execute(query, tuple(data.values()) + params)
-                return cursor.rowcount > 0
+            result = DatabaseWriter.wait(DatabaseWriter.get_instance().execute(query, tuple(data.values()) + params))
+            return result.rowcount > 0
         except Exception as e:
             logger.error(f"Update operation failed: {e}")
             raise DatabaseError(f"Update operation failed: {e}")
 
+    @staticmethod
+    def submit_write(query: str, params: tuple = ()) -> Future:
+        """Queue a write on the single writer without waiting for its commit"""
+        return DatabaseWriter.get_instance().execute(query, params)
+
 # Export the DatabaseManager for higher-level operations
-__all__ = ['DatabaseManager', 'db_transaction', 'DatabaseError', 'init_db']
+__all__ = [
+    'DatabaseManager', 'DatabaseWriter', 'WriteResult', 'db_transaction', 'db_read', 'read_snapshot',
+    'current_connection', 'pooled_connection', 'PooledConnection',
+    'DatabaseError', 'init_db', 'SCHEMA_VERSION', 'add_query_hook', 'remove_query_hook', 'query_metrics',
+]
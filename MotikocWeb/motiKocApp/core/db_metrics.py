@@ -0,0 +1,355 @@
+# core/db_metrics.py
+import bisect
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import (
+    DB_SLOW_QUERY_THRESHOLD,
+    DB_SLOW_QUERY_LOG,
+    DB_METRICS_FILE,
+    DB_METRICS_EXPORT_INTERVAL,
+    DB_METRICS_MAX_STATEMENTS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Dedicated logger so the slow-query log can be routed to its own file
+slow_query_logger = logging.getLogger('motikoc.slow_query')
+_slow_query_handler_lock = threading.Lock()
+
+
+def _log_slow_query(message: str):
+    """Log to the slow-query logger, opening DB_SLOW_QUERY_LOG on the first slow query"""
+    if DB_SLOW_QUERY_LOG and not slow_query_logger.handlers:
+        with _slow_query_handler_lock:
+            if not slow_query_logger.handlers:
+                try:
+                    handler = logging.FileHandler(DB_SLOW_QUERY_LOG, encoding='utf-8')
+                except OSError as e:
+                    logger.warning(f"Cannot open slow query log {DB_SLOW_QUERY_LOG}: {e}")
+                    handler = logging.NullHandler()
+                handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+                slow_query_logger.addHandler(handler)
+    slow_query_logger.warning(message)
+
+# Latency bucket upper bounds in seconds
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+OTHER_STATEMENTS = '<other>'
+
+_COMMENT_RE = re.compile(r'--[^\n]*|/\*.*?\*/', re.DOTALL)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(sql: str) -> str:
+    """Reduce a statement to a stable key: no comments, literals or IN-list arity"""
+    normalized = _COMMENT_RE.sub(' ', sql)
+    normalized = _STRING_RE.sub('?', normalized)
+    normalized = _NUMBER_RE.sub('?', normalized)
+    normalized = _IN_LIST_RE.sub('IN (?)', normalized)
+    return _WHITESPACE_RE.sub(' ', normalized).strip()
+
+
+class Histogram:
+    """Fixed-bucket histogram (not thread-safe; guarded by QueryMetrics)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return bound
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': round(self.total, 6),
+            'max': round(self.max, 6),
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.counts)),
+        }
+
+
+class _PoolStats:
+    __slots__ = ('wait', 'in_use', 'idle', 'waiting', 'max_waiting')
+
+    def __init__(self):
+        self.wait = Histogram()
+        self.in_use = 0
+        self.idle = 0
+        self.waiting = 0
+        self.max_waiting = 0
+
+
+class _StatementStats:
+    __slots__ = ('latency', 'rows', 'fetch_seconds', 'errors')
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.rows = 0
+        self.fetch_seconds = 0.0
+        self.errors = 0
+
+
+class QueryHook:
+    """Instrumentation hook interface; subclasses override the events they need"""
+
+    def record_query(self, sql: str, duration: float, rows: int = 0, error: bool = False):
+        pass
+
+    def record_fetch(self, sql: str, duration: float, rows: int):
+        pass
+
+    def record_pool_wait(self, seconds: float, pool: str = 'write'):
+        pass
+
+    def record_pool_state(self, pool: str, in_use: int, idle: int, waiting: int):
+        pass
+
+    def record_lock_retry(self):
+        pass
+
+
+class QueryMetrics(QueryHook):
+    """In-memory per-statement latency, row counts, pool checkouts and lock retries"""
+
+    def __init__(self, slow_threshold: float = DB_SLOW_QUERY_THRESHOLD,
+                 max_statements: int = DB_METRICS_MAX_STATEMENTS):
+        self.slow_threshold = slow_threshold
+        self.max_statements = max_statements
+        self._lock = threading.Lock()
+        self._statements: Dict[str, _StatementStats] = {}
+        self._pools: Dict[str, _PoolStats] = {}
+        self._lock_retries = 0
+        self._slow_queries = 0
+        self._started_at = time.time()
+        self._last_export = time.monotonic()
+
+    def _stats_for(self, sql: str) -> _StatementStats:
+        stats = self._statements.get(sql)
+        if stats is None:
+            # Bound cardinality so dynamic SQL cannot grow the table without limit
+            if len(self._statements) >= self.max_statements:
+                sql = OTHER_STATEMENTS
+                stats = self._statements.get(sql)
+            if stats is None:
+                stats = self._statements[sql] = _StatementStats()
+        return stats
+
+    def record_query(self, sql: str, duration: float, rows: int = 0, error: bool = False):
+        """Record one execute() of a normalized statement"""
+        with self._lock:
+            stats = self._stats_for(sql)
+            stats.latency.observe(duration)
+            stats.rows += max(rows, 0)
+            if error:
+                stats.errors += 1
+            slow = duration >= self.slow_threshold
+            if slow:
+                self._slow_queries += 1
+        if slow:
+            _log_slow_query(f"{duration * 1000:.1f} ms: {sql}")
+        self._maybe_export()
+
+    def record_fetch(self, sql: str, duration: float, rows: int):
+        """Attribute fetch time and returned rows to the statement that produced them"""
+        with self._lock:
+            stats = self._stats_for(sql)
+            stats.fetch_seconds += duration
+            stats.rows += rows
+
+    def _pool(self, pool: str) -> _PoolStats:
+        stats = self._pools.get(pool)
+        if stats is None:
+            stats = self._pools[pool] = _PoolStats()
+        return stats
+
+    def record_pool_wait(self, seconds: float, pool: str = 'write'):
+        """Record how long one checkout took, including any wait for a free connection"""
+        with self._lock:
+            self._pool(pool).wait.observe(seconds)
+
+    def record_pool_state(self, pool: str, in_use: int, idle: int, waiting: int):
+        """Update the gauges of a pool; waiting is the number of blocked checkouts"""
+        with self._lock:
+            stats = self._pool(pool)
+            stats.in_use = in_use
+            stats.idle = idle
+            stats.waiting = waiting
+            stats.max_waiting = max(stats.max_waiting, waiting)
+
+    def record_lock_retry(self):
+        with self._lock:
+            self._lock_retries += 1
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            for stats in self._pools.values():
+                stats.wait = Histogram()
+                stats.max_waiting = stats.waiting
+            self._lock_retries = 0
+            self._slow_queries = 0
+            self._started_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Point-in-time copy of all metrics, statements sorted by total latency"""
+        with self._lock:
+            statements = [
+                {
+                    'sql': sql,
+                    'latency': stats.latency.snapshot(),
+                    'rows': stats.rows,
+                    'fetch_seconds': round(stats.fetch_seconds, 6),
+                    'errors': stats.errors,
+                }
+                for sql, stats in self._statements.items()
+            ]
+            snapshot = {
+                'started_at': self._started_at,
+                'generated_at': time.time(),
+                'slow_query_threshold': self.slow_threshold,
+                'slow_queries': self._slow_queries,
+                'lock_retries': self._lock_retries,
+                'pools': {
+                    name: {
+                        'wait': stats.wait.snapshot(),
+                        'in_use': stats.in_use,
+                        'idle': stats.idle,
+                        'waiting': stats.waiting,
+                        'max_waiting': stats.max_waiting,
+                    }
+                    for name, stats in self._pools.items()
+                },
+            }
+        statements.sort(key=lambda s: s['latency']['sum'], reverse=True)
+        snapshot['statements'] = statements
+        return snapshot
+
+    def to_prometheus(self) -> str:
+        """Render the snapshot in Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        statements = [
+            (statement, statement['sql'].replace('\\', '\\\\').replace('"', '\\"'))
+            for statement in snapshot['statements']
+        ]
+        pools = snapshot['pools'].items()
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: List[str]):
+            # Each metric family is one contiguous block headed by its HELP and TYPE
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(samples)
+
+        family('motikoc_db_query_seconds', 'histogram', 'Query latency by normalized statement.', [
+            line for statement, label in statements
+            for line in _histogram_lines('motikoc_db_query_seconds', statement['latency'], f'sql="{label}"')
+        ])
+        family('motikoc_db_query_rows_total', 'counter', 'Rows returned or affected by normalized statement.', [
+            f'motikoc_db_query_rows_total{{sql="{label}"}} {statement["rows"]}'
+            for statement, label in statements
+        ])
+        family('motikoc_db_query_errors_total', 'counter', 'Failed executions by normalized statement.', [
+            f'motikoc_db_query_errors_total{{sql="{label}"}} {statement["errors"]}'
+            for statement, label in statements
+        ])
+        family('motikoc_db_pool_wait_seconds', 'histogram', 'Time spent waiting for a pooled connection.', [
+            line for name, pool in pools
+            for line in _histogram_lines('motikoc_db_pool_wait_seconds', pool['wait'], f'pool="{name}"')
+        ])
+        for gauge, help_text in (('in_use', 'Connections checked out.'),
+                                 ('idle', 'Connections idle in the pool.'),
+                                 ('waiting', 'Callers waiting for a connection.')):
+            family(f'motikoc_db_pool_{gauge}', 'gauge', help_text, [
+                f'motikoc_db_pool_{gauge}{{pool="{name}"}} {pool[gauge]}' for name, pool in pools
+            ])
+        family('motikoc_db_lock_retries_total', 'counter', 'Retries after a database-locked error.', [
+            f'motikoc_db_lock_retries_total {snapshot["lock_retries"]}'
+        ])
+        family('motikoc_db_slow_queries_total', 'counter', 'Queries slower than the slow-query threshold.', [
+            f'motikoc_db_slow_queries_total {snapshot["slow_queries"]}'
+        ])
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path: Optional[str] = DB_METRICS_FILE):
+        """Atomically write the snapshot; '.prom' files get Prometheus text, others JSON"""
+        if not path:
+            return
+        if path.endswith('.prom'):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+
+    def _maybe_export(self):
+        if not DB_METRICS_FILE or DB_METRICS_EXPORT_INTERVAL <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_export < DB_METRICS_EXPORT_INTERVAL:
+                return
+            self._last_export = now
+        try:
+            self.export()
+        except OSError as e:
+            logger.warning(f"Failed to export database metrics: {e}")
+
+
+def _histogram_lines(name: str, histogram: Dict[str, Any], labels: str = '') -> List[str]:
+    prefix = f'{labels},' if labels else ''
+    lines = []
+    cumulative = 0
+    for bound, count in histogram['buckets'].items():
+        cumulative += count
+        lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+    suffix = f'{{{labels}}}' if labels else ''
+    lines.append(f'{name}_sum{suffix} {histogram["sum"]}')
+    lines.append(f'{name}_count{suffix} {histogram["count"]}')
+    return lines
+
+
+# Process-wide collector used by the default database instrumentation hook
+query_metrics = QueryMetrics()
@@ -0,0 +1,92 @@
+# core/pool_benchmark.py
+"""Per-page connection count and latency: legacy sqlite3.connect() vs the shared pool.
+
+Run with ``python -m core.pool_benchmark [rounds]`` from the app directory. Each page
+replays its hot queries from ``core.query_plans.HOT_QUERIES`` (the SQL in
+``core.queries`` that the call sites execute), one connection per query, first with a
+fresh ``sqlite3.connect`` per query (the old code path) and then through
+``pooled_connection()``.
+"""
+import sqlite3
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from config.settings import DATABASE_NAME
+from core.database import DatabaseConnectionPool, init_db, pooled_connection
+from core.query_plans import HOT_QUERIES
+
+
+def _page_queries() -> Dict[str, List[Tuple[str, Tuple]]]:
+    """Group the registered hot queries by the page that issues them"""
+    pages: Dict[str, List[Tuple[str, Tuple]]] = {}
+    for name, query in HOT_QUERIES.items():
+        pages.setdefault(name.split('.', 1)[0], []).append((query.sql, query.params))
+    return pages
+
+
+# One entry per query the page issues, with the SQL and parameters the app runs
+PAGE_QUERIES: Dict[str, List[Tuple[str, Tuple]]] = _page_queries()
+
+
+@contextmanager
+def _count_connects() -> Iterator[List[int]]:
+    """Count sqlite3.connect() calls made inside the block"""
+    counter = [0]
+    original = sqlite3.connect
+
+    def counting_connect(*args, **kwargs):
+        counter[0] += 1
+        return original(*args, **kwargs)
+
+    sqlite3.connect = counting_connect
+    try:
+        yield counter
+    finally:
+        sqlite3.connect = original
+
+
+def _legacy_connection() -> sqlite3.Connection:
+    return sqlite3.connect(DATABASE_NAME)
+
+
+def _render_page(queries: List[Tuple[str, Tuple]], connect: Callable[[], sqlite3.Connection]):
+    for sql, params in queries:
+        conn = connect()
+        try:
+            conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+
+def measure(connect: Callable[[], sqlite3.Connection], queries: List[Tuple[str, Tuple]],
+            rounds: int) -> Tuple[float, float, float]:
+    """Return (connections opened per page, mean ms, p95 ms) over `rounds` renders"""
+    timings = []
+    with _count_connects() as counter:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            _render_page(queries, connect)
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return counter[0] / rounds, statistics.mean(timings), p95
+
+
+def main(rounds: int = 200) -> int:
+    init_db()
+    # Warm the pool so its one-off setup is not charged to the first page
+    DatabaseConnectionPool.get_instance()
+
+    print(f"{'page':<13} {'mode':<7} {'conns/page':>10} {'mean ms':>9} {'p95 ms':>8}")
+    for page, queries in PAGE_QUERIES.items():
+        for mode, connect in (('legacy', _legacy_connection), ('pooled', pooled_connection)):
+            conns, mean_ms, p95_ms = measure(connect, queries, rounds)
+            print(f"{page:<13} {mode:<7} {conns:>10.1f} {mean_ms:>9.3f} {p95_ms:>8.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -0,0 +1,449 @@
+# core/queries.py
+"""SQL of the per-user queries run on page loads.
+
+The call sites and the EXPLAIN QUERY PLAN check in ``core.query_plans`` import the
+same constants, so the check always sees the statements the app executes.
+"""
+
+# core/auth.py
+LOGIN_USER = '''
+    SELECT id, password
+    FROM users
+    WHERE username = ?
+'''
+
+RECENT_LOGIN_ATTEMPTS = '''
+    SELECT COUNT(*) as attempt_count,
+           MAX(attempt_time) as last_attempt
+    FROM login_attempts
+    WHERE username = ?
+    AND attempt_time > datetime('now', ?)
+'''
+
+# ui/pages/home.py
+DAILY_TASKS = '''
+    SELECT * FROM daily_tasks
+    WHERE user_id = ? AND date_created = date('now')
+    ORDER BY completed ASC, task_type ASC
+'''
+
+OPEN_DAILY_TASK = '''
+    SELECT xp_reward, task_type, description
+    FROM daily_tasks
+    WHERE id = ? AND user_id = ? AND completed = FALSE
+'''
+
+WEEKLY_PERFORMANCE = '''
+    WITH study AS (
+        SELECT
+            SUM(rating_sum) * 1.0 / NULLIF(SUM(rating_count), 0) as avg_performance,
+            SUM(total_duration) as total_minutes,
+            COUNT(DISTINCT date) as study_days
+        FROM user_daily_stats
+        WHERE user_id = ?
+        AND date >= date('now', '-7 days')
+    ),
+    questions AS (
+        SELECT
+            SUM(correct) as correct_questions,
+            SUM(incorrect) as incorrect_questions
+        FROM question_stats
+        WHERE user_id = ?
+        AND last_practice IN (
+            SELECT date FROM user_daily_stats
+            WHERE user_id = ?
+            AND date >= date('now', '-7 days')
+        )
+    )
+    SELECT * FROM study CROSS JOIN questions
+'''
+
+PREVIOUS_WEEK_PERFORMANCE = '''
+    WITH study AS (
+        SELECT
+            SUM(rating_sum) * 1.0 / NULLIF(SUM(rating_count), 0) as avg_performance,
+            SUM(total_duration) as total_minutes,
+            COUNT(DISTINCT date) as study_days
+        FROM user_daily_stats
+        WHERE user_id = ?
+        AND date >= date('now', '-14 days')
+        AND date < date('now', '-7 days')
+    ),
+    questions AS (
+        SELECT
+            SUM(correct) as correct_questions,
+            SUM(incorrect) as incorrect_questions
+        FROM question_stats
+        WHERE user_id = ?
+        AND last_practice IN (
+            SELECT date FROM user_daily_stats
+            WHERE user_id = ?
+            AND date >= date('now', '-14 days')
+            AND date < date('now', '-7 days')
+        )
+    )
+    SELECT * FROM study CROSS JOIN questions
+'''
+
+QUESTION_STATS_BY_TOPIC = '''
+    SELECT
+        subject,
+        topic,
+        SUM(correct) as correct,
+        SUM(incorrect) as incorrect,
+        AVG(average_time) as avg_time
+    FROM question_stats
+    WHERE user_id = ?
+    GROUP BY subject, topic
+    ORDER BY subject, topic
+'''
+
+USER_STATS = '''
+    WITH recent_activity AS (
+        SELECT
+            COUNT(DISTINCT date) as study_streak,
+            SUM(total_duration) as total_minutes,
+            SUM(rating_sum) * 1.0 / NULLIF(SUM(rating_count), 0) as avg_performance
+        FROM user_daily_stats
+        WHERE user_id = ?
+        AND date >= date('now', '-30 days')
+    ),
+    question_totals AS (
+        SELECT
+            SUM(correct) as total_correct,
+            SUM(incorrect) as total_incorrect
+        FROM question_stats
+        WHERE user_id = ?
+    ),
+    goal_stats AS (
+        SELECT COUNT(*) as active_goals
+        FROM goals
+        WHERE user_id = ?
+        AND completed = FALSE
+    ),
+    level_info AS (
+        SELECT
+            current_level,
+            current_xp
+        FROM user_levels
+        WHERE user_id = ?
+    ),
+    mock_exam_stats AS (
+        SELECT
+            COUNT(*) as total_exams,
+            MAX(exam_date) as last_exam
+        FROM mock_exams
+        WHERE user_id = ?
+    )
+    SELECT *
+    FROM recent_activity
+    CROSS JOIN question_totals
+    CROSS JOIN goal_stats
+    CROSS JOIN level_info
+    CROSS JOIN mock_exam_stats
+'''
+
+RECENT_XP_BONUSES = '''
+    SELECT
+        amount,
+        reason,
+        awarded_at
+    FROM xp_bonuses
+    WHERE user_id = ?
+    ORDER BY awarded_at DESC
+    LIMIT 3
+'''
+
+# features/calendar/study_calendar.py
+MONTHLY_STUDY_MINUTES = '''
+    SELECT date, SUM(total_duration) as total_minutes
+    FROM user_daily_stats
+    WHERE user_id = ?
+    AND date >= date('now', 'start of month')
+    AND date < date('now', 'start of month', '+1 month')
+    GROUP BY date
+'''
+
+# The period ones take the window start as a date('now', ?) modifier, e.g. '-7 days'
+PERIOD_STUDY_SUMMARY = '''
+    SELECT
+        COUNT(DISTINCT date) as total_days,
+        SUM(total_duration) as total_minutes,
+        SUM(rating_sum) * 1.0 / NULLIF(SUM(rating_count), 0) as avg_performance
+    FROM user_daily_stats
+    WHERE user_id = ? AND date >= date('now', ?)
+'''
+
+PERIOD_STUDY_BY_SUBJECT = '''
+    SELECT subject, SUM(total_duration) as total_minutes
+    FROM user_daily_stats
+    WHERE user_id = ? AND date >= date('now', ?)
+    GROUP BY subject
+'''
+
+PERIOD_STUDY_BY_DAY = '''
+    SELECT date, SUM(total_duration) as total_minutes
+    FROM user_daily_stats
+    WHERE user_id = ? AND date >= date('now', ?)
+    GROUP BY date
+    ORDER BY date
+'''
+
+# features/performance/analytics.py
+STUDY_SUMMARY_LAST_30_DAYS = '''
+    SELECT
+        COUNT(DISTINCT date) as study_days,
+        SUM(total_duration) as total_minutes,
+        SUM(rating_sum) * 1.0 / NULLIF(SUM(rating_count), 0) as avg_performance,
+        SUM(session_count) as total_questions
+    FROM user_daily_stats
+    WHERE user_id = ?
+    AND date >= date('now', '-30 days')
+'''
+
+STUDY_SUMMARY_PREVIOUS_30_DAYS = '''
+    SELECT
+        COUNT(DISTINCT date) as study_days,
+        SUM(total_duration) as total_minutes,
+        SUM(rating_sum) * 1.0 / NULLIF(SUM(rating_count), 0) as avg_performance,
+        SUM(session_count) as total_questions
+    FROM user_daily_stats
+    WHERE user_id = ?
+    AND date >= date('now', '-60 days')
+    AND date < date('now', '-30 days')
+'''
+
+SUBJECT_TOPIC_PERFORMANCE = '''
+    SELECT
+        topic,
+        AVG(performance_rating) as performance
+    FROM study_logs
+    WHERE user_id = ? AND subject = ?
+    GROUP BY topic
+    ORDER BY performance DESC
+'''
+
+MOCK_EXAMS = '''
+    SELECT *
+    FROM mock_exams
+    WHERE user_id = ?
+    ORDER BY exam_date DESC
+'''
+
+MOCK_EXAM_SUBJECT_TOTALS = '''
+    SELECT
+        r.subject,
+        SUM(r.correct) as correct,
+        SUM(r.incorrect) as incorrect,
+        SUM(r.empty) as empty,
+        COUNT(*) as exam_count
+    FROM mock_exams m
+    JOIN mock_exam_subject_results r ON r.exam_id = m.id
+    WHERE m.user_id = ?
+    GROUP BY r.subject
+    ORDER BY r.subject
+'''
+
+MOCK_EXAM_TRENDS = '''
+    SELECT
+        m.exam_date as date,
+        r.subject,
+        SUM(r.correct) as correct,
+        SUM(r.incorrect) as incorrect,
+        SUM(r.empty) as empty
+    FROM mock_exams m
+    JOIN mock_exam_subject_results r ON r.exam_id = m.id
+    WHERE m.user_id = ?
+    GROUP BY m.exam_date, r.subject
+    ORDER BY m.exam_date, r.subject
+'''
+
+# services/gamification.py
+USER_LEVEL = '''
+    SELECT current_level, current_xp, total_xp
+    FROM user_levels
+    WHERE user_id = ?
+'''
+
+LONGEST_STREAK = '''
+    WITH consecutive_days AS (
+        SELECT date,
+               date(date, '-' || ROW_NUMBER() OVER (ORDER BY date) || ' days') as group_date
+        FROM (SELECT DISTINCT date FROM user_daily_stats WHERE user_id = ?)
+    )
+    SELECT COUNT(*) as streak_length
+    FROM (
+        SELECT group_date, COUNT(*) as streak
+        FROM consecutive_days
+        GROUP BY group_date
+        ORDER BY COUNT(*) DESC
+        LIMIT 1
+    )
+'''
+
+QUESTIONS_TODAY = '''
+    SELECT COUNT(*)
+    FROM question_stats
+    WHERE user_id = ?
+    AND last_practice >= date('now')
+    AND last_practice < date('now', '+1 day')
+'''
+
+HAS_BADGE = '''
+    SELECT 1 FROM user_badges WHERE user_id = ? AND badge_id = ?
+'''
+
+# features/social/features.py
+XP_LEADERBOARD = '''
+    SELECT
+        u.id,
+        u.username,
+        ul.total_xp as value
+    FROM users u
+    JOIN user_levels ul ON u.id = ul.user_id
+    WHERE ul.total_xp > 0
+    ORDER BY value DESC
+    LIMIT 20
+'''
+
+FRIENDS = '''
+    SELECT
+        u.id, u.username, u.grade, u.study_type,
+        ul.current_level,
+        COALESCE(MAX(s.date), 'Hiç aktif değil') as last_active
+    FROM users u
+    JOIN friendships f ON
+        (f.user_id = ? AND f.friend_id = u.id) OR
+        (f.friend_id = ? AND f.user_id = u.id)
+    JOIN user_levels ul ON u.id = ul.user_id
+    LEFT JOIN user_daily_stats s ON u.id = s.user_id
+    WHERE f.status = 'accepted'
+    GROUP BY u.id
+    ORDER BY u.username
+'''
+
+FRIENDSHIP_STATUS = '''
+    SELECT status FROM friendships
+    WHERE (user_id = ? AND friend_id = ?) OR
+          (user_id = ? AND friend_id = ?)
+'''
+
+PENDING_FRIEND_REQUESTS = '''
+    SELECT f.id, u.username, f.created_at
+    FROM friendships f
+    JOIN users u ON f.user_id = u.id
+    WHERE f.friend_id = ? AND f.status = 'pending'
+    ORDER BY f.created_at DESC
+'''
+
+MY_GROUPS = '''
+    SELECT
+        g.*,
+        COUNT(DISTINCT m.user_id) as member_count,
+        m2.role as user_role
+    FROM study_groups g
+    JOIN group_members m ON g.id = m.group_id
+    JOIN group_members m2 ON g.id = m2.group_id AND m2.user_id = ?
+    GROUP BY g.id
+    ORDER BY g.name
+'''
+
+GROUP_MEMBERS = '''
+    SELECT u.username, m.role
+    FROM group_members m
+    JOIN users u ON m.user_id = u.id
+    WHERE m.group_id = ?
+    ORDER BY m.role DESC, u.username
+'''
+
+ACHIEVEMENT_FEED = '''
+    SELECT
+        a.*,
+        u.username,
+        COUNT(al.id) as likes,
+        EXISTS (
+            SELECT 1 FROM achievement_likes
+            WHERE achievement_id = a.id AND user_id = ?
+        ) as liked,
+        CASE WHEN a.user_id = ? THEN 1 ELSE 0 END as is_own
+    FROM achievements a
+    JOIN users u ON a.user_id = u.id
+    LEFT JOIN achievement_likes al ON a.id = al.achievement_id
+    WHERE a.user_id = ? OR
+          a.user_id IN (
+            SELECT CASE
+                WHEN f.user_id = ? THEN f.friend_id
+                ELSE f.user_id
+            END
+            FROM friendships f
+            WHERE (f.user_id = ? OR f.friend_id = ?)
+            AND f.status = 'accepted'
+          )
+    GROUP BY a.id
+    ORDER BY a.date DESC
+    LIMIT 50
+'''
+
+ACHIEVEMENT_LIKE = '''
+    SELECT id FROM achievement_likes
+    WHERE achievement_id = ? AND user_id = ?
+'''
+
+USER_BADGES = '''
+    SELECT
+        b.*,
+        ub.earned_date
+    FROM badges b
+    JOIN user_badges ub ON b.id = ub.badge_id
+    WHERE ub.user_id = ?
+    ORDER BY b.category, ub.earned_date DESC
+'''
+
+# features/forum/views.py
+QUESTION_DETAIL = '''
+    SELECT q.*, u.username, c.name as category_name, c.icon as category_icon
+    FROM forum_questions q
+    JOIN users u ON q.user_id = u.id
+    JOIN forum_categories c ON q.category_id = c.id
+    WHERE q.id = ?
+'''
+
+CATEGORY_QUESTION_COUNT = '''
+    SELECT COUNT(*) as count
+    FROM forum_questions
+    WHERE category_id = ?
+'''
+
+QUESTION_ANSWERS = '''
+    SELECT a.*, u.username,
+           (SELECT COUNT(*) FROM forum_votes WHERE content_type = 'answer' AND content_id = a.id AND vote_type = 1) as upvotes,
+           (SELECT COUNT(*) FROM forum_votes WHERE content_type = 'answer' AND content_id = a.id AND vote_type = -1) as downvotes
+    FROM forum_answers a
+    JOIN users u ON a.user_id = u.id
+    WHERE a.question_id = ?
+    ORDER BY a.is_accepted DESC, upvotes DESC, a.created_at ASC
+'''
+
+UNACCEPTED_ANSWERS = '''
+    SELECT a.id, a.user_id, a.content
+    FROM forum_answers a
+    WHERE a.question_id = ? AND a.is_accepted = FALSE
+'''
+
+EXISTING_VOTE = '''
+    SELECT id, vote_type
+    FROM forum_votes
+    WHERE user_id = ? AND content_type = ? AND content_id = ?
+'''
+
+UNREAD_NOTIFICATIONS = '''
+    SELECT * FROM forum_notifications
+    WHERE user_id = ? AND is_read = FALSE
+    ORDER BY created_at DESC
+'''
+
+# ui/pages/settings.py
+STUDY_PREFERENCES = '''
+    SELECT * FROM study_preferences
+    WHERE user_id = ?
+'''
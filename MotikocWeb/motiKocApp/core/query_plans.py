@@ -0,0 +1,294 @@
+# core/query_plans.py
+"""EXPLAIN QUERY PLAN regression check for the app's hot queries.
+
+Run with ``python -m core.query_plans`` from the app directory; the exit code is
+non-zero when any registered query full-scans a table that grows with users.
+"""
+import re
+import sqlite3
+import sys
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from core import queries
+from core.database import SCHEMA_MIGRATIONS
+
+# Tables whose row count grows with the number of users (or their activity)
+USER_SCALED_TABLES: Set[str] = {
+    'users', 'login_attempts', 'study_logs', 'mood_logs', 'goals', 'saved_solutions',
+    'friendships', 'achievements', 'achievement_likes', 'group_members', 'user_badges',
+    'user_levels', 'daily_tasks', 'competition_participants', 'mock_exams', 'question_stats',
+    'forum_questions', 'forum_answers', 'forum_votes', 'forum_notifications', 'xp_bonuses',
+    'achievement_progress', 'study_preferences', 'user_daily_stats', 'mock_exam_subject_results',
+    'study_groups',
+}
+
+
+class HotQuery(NamedTuple):
+    source: str
+    sql: str
+    params: Tuple
+
+
+# Per-user queries executed on page loads; the SQL is shared with the call sites in `source`
+HOT_QUERIES: Dict[str, HotQuery] = {
+    'auth.login': HotQuery(
+        'core/auth.py:login_user',
+        queries.LOGIN_USER,
+        ('user',)
+    ),
+    'auth.login_attempts': HotQuery(
+        'core/auth.py:_check_login_attempts',
+        queries.RECENT_LOGIN_ATTEMPTS,
+        ('user', '-300 seconds')
+    ),
+    'home.daily_tasks': HotQuery(
+        'ui/pages/home.py:_get_daily_tasks',
+        queries.DAILY_TASKS,
+        (1,)
+    ),
+    'home.complete_task': HotQuery(
+        'ui/pages/home.py:_complete_task',
+        queries.OPEN_DAILY_TASK,
+        (1, 1)
+    ),
+    'home.performance': HotQuery(
+        'ui/pages/home.py:_get_performance_data',
+        queries.WEEKLY_PERFORMANCE,
+        (1, 1, 1)
+    ),
+    'home.previous_performance': HotQuery(
+        'ui/pages/home.py:_get_performance_data',
+        queries.PREVIOUS_WEEK_PERFORMANCE,
+        (1, 1, 1)
+    ),
+    'home.question_stats': HotQuery(
+        'ui/pages/home.py:_get_question_stats',
+        queries.QUESTION_STATS_BY_TOPIC,
+        (1,)
+    ),
+    'home.user_stats': HotQuery(
+        'ui/pages/home.py:_get_user_stats',
+        queries.USER_STATS,
+        (1, 1, 1, 1, 1)
+    ),
+    'home.recent_bonuses': HotQuery(
+        'ui/pages/home.py:_get_recent_xp_gains',
+        queries.RECENT_XP_BONUSES,
+        (1,)
+    ),
+    'calendar.monthly': HotQuery(
+        'features/calendar/study_calendar.py:_get_monthly_study_data',
+        queries.MONTHLY_STUDY_MINUTES,
+        (1,)
+    ),
+    'calendar.period_summary': HotQuery(
+        'features/calendar/study_calendar.py:_get_study_data_by_period',
+        queries.PERIOD_STUDY_SUMMARY,
+        (1, '-1 month')
+    ),
+    'calendar.period': HotQuery(
+        'features/calendar/study_calendar.py:_get_study_data_by_period',
+        queries.PERIOD_STUDY_BY_SUBJECT,
+        (1, '-1 month')
+    ),
+    'calendar.period_daily': HotQuery(
+        'features/calendar/study_calendar.py:_get_study_data_by_period',
+        queries.PERIOD_STUDY_BY_DAY,
+        (1, '-1 month')
+    ),
+    'analytics.subject_topics': HotQuery(
+        'features/performance/analytics.py:_show_subject_analysis',
+        queries.SUBJECT_TOPIC_PERFORMANCE,
+        (1, 'Matematik')
+    ),
+    'analytics.period_summary': HotQuery(
+        'features/performance/analytics.py:_get_performance_data',
+        queries.STUDY_SUMMARY_LAST_30_DAYS,
+        (1,)
+    ),
+    'analytics.previous_period_summary': HotQuery(
+        'features/performance/analytics.py:_get_performance_data',
+        queries.STUDY_SUMMARY_PREVIOUS_30_DAYS,
+        (1,)
+    ),
+    'analytics.mock_exams': HotQuery(
+        'features/performance/analytics.py:_show_mock_exam_analysis',
+        queries.MOCK_EXAMS,
+        (1,)
+    ),
+    'analytics.mock_exam_subjects': HotQuery(
+        'features/performance/analytics.py:_get_mock_exam_data',
+        queries.MOCK_EXAM_SUBJECT_TOTALS,
+        (1,)
+    ),
+    'analytics.mock_exam_trends': HotQuery(
+        'features/performance/analytics.py:_analyze_questions',
+        queries.MOCK_EXAM_TRENDS,
+        (1,)
+    ),
+    'gamification.user_level': HotQuery(
+        'services/gamification.py:update_user_xp',
+        queries.USER_LEVEL,
+        (1,)
+    ),
+    'gamification.streak_days': HotQuery(
+        'services/gamification.py:_check_achievement_requirement',
+        queries.LONGEST_STREAK,
+        (1,)
+    ),
+    'gamification.questions_today': HotQuery(
+        'services/gamification.py:_check_achievement_requirement',
+        queries.QUESTIONS_TODAY,
+        (1,)
+    ),
+    'gamification.has_badge': HotQuery(
+        'services/gamification.py:check_and_award_badges',
+        queries.HAS_BADGE,
+        (1, 1)
+    ),
+    'gamification.leaderboard': HotQuery(
+        'features/social/features.py:_get_leaderboard_data',
+        queries.XP_LEADERBOARD,
+        ()
+    ),
+    'social.friends': HotQuery(
+        'features/social/features.py:_get_friends',
+        queries.FRIENDS,
+        (1, 1)
+    ),
+    'social.friendship_status': HotQuery(
+        'features/social/features.py:_add_friend',
+        queries.FRIENDSHIP_STATUS,
+        (1, 2, 2, 1)
+    ),
+    'social.pending_requests': HotQuery(
+        'features/social/features.py:_get_friend_requests',
+        queries.PENDING_FRIEND_REQUESTS,
+        (1,)
+    ),
+    'social.my_groups': HotQuery(
+        'features/social/features.py:_get_my_groups',
+        queries.MY_GROUPS,
+        (1,)
+    ),
+    'social.group_members': HotQuery(
+        'features/social/features.py:_get_my_groups',
+        queries.GROUP_MEMBERS,
+        (1,)
+    ),
+    'social.achievement_feed': HotQuery(
+        'features/social/features.py:_get_achievements',
+        queries.ACHIEVEMENT_FEED,
+        (1, 1, 1, 1, 1, 1)
+    ),
+    'social.achievement_like': HotQuery(
+        'features/social/features.py:_toggle_achievement_like',
+        queries.ACHIEVEMENT_LIKE,
+        (1, 1)
+    ),
+    'social.user_badges': HotQuery(
+        'features/social/features.py:_get_badges',
+        queries.USER_BADGES,
+        (1,)
+    ),
+    'forum.question_detail': HotQuery(
+        'features/forum/views.py:show_question_detail',
+        queries.QUESTION_DETAIL,
+        (1,)
+    ),
+    'forum.category_count': HotQuery(
+        'features/forum/views.py:_get_question_count',
+        queries.CATEGORY_QUESTION_COUNT,
+        (1,)
+    ),
+    'forum.answers': HotQuery(
+        'features/forum/views.py:show_answers',
+        queries.QUESTION_ANSWERS,
+        (1,)
+    ),
+    'forum.unaccepted_answers': HotQuery(
+        'features/forum/views.py:show_accept_answer_option',
+        queries.UNACCEPTED_ANSWERS,
+        (1,)
+    ),
+    'forum.existing_vote': HotQuery(
+        'features/forum/views.py:vote_content',
+        queries.EXISTING_VOTE,
+        (1, 'answer', 1)
+    ),
+    'forum.notifications': HotQuery(
+        'features/forum/views.py:show_user_notifications',
+        queries.UNREAD_NOTIFICATIONS,
+        (1,)
+    ),
+    'settings.study_preferences': HotQuery(
+        'ui/pages/settings.py:_get_study_preferences',
+        queries.STUDY_PREFERENCES,
+        (1,)
+    ),
+}
+
+_SCAN_RE = re.compile(r'^SCAN (\w+)')
+_TABLE_REF_RE = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+_SQL_KEYWORDS = {
+    'where', 'join', 'left', 'inner', 'cross', 'on', 'group', 'order', 'limit', 'using', 'natural',
+}
+
+
+def _table_aliases(sql: str) -> Dict[str, str]:
+    """Map every alias (and bare table name) in the statement to its table"""
+    aliases = {}
+    for table, alias in _TABLE_REF_RE.findall(sql):
+        aliases[table] = table
+        if alias and alias.lower() not in _SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: Tuple = ()) -> List[str]:
+    """Return the EXPLAIN QUERY PLAN detail lines for a statement"""
+    return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()]
+
+
+def full_scans(conn: sqlite3.Connection, sql: str, params: Tuple = ()) -> List[str]:
+    """Plan lines that scan a whole user-scaled table (covering-index scans included)"""
+    aliases = _table_aliases(sql)
+    offending = []
+    for detail in explain(conn, sql, params):
+        match = _SCAN_RE.match(detail)
+        if match and aliases.get(match.group(1), match.group(1)) in USER_SCALED_TABLES:
+            offending.append(detail)
+    return offending
+
+
+def build_schema() -> sqlite3.Connection:
+    """In-memory database with every schema migration applied"""
+    conn = sqlite3.connect(':memory:')
+    cursor = conn.cursor()
+    for _, _, migrate in SCHEMA_MIGRATIONS:
+        migrate(cursor)
+    conn.commit()
+    return conn
+
+
+def check_query_plans(conn: Optional[sqlite3.Connection] = None) -> Dict[str, List[str]]:
+    """Run the registry against the schema; returns offending plan lines per query name"""
+    conn = conn or build_schema()
+    failures = {}
+    for name, query in HOT_QUERIES.items():
+        offending = full_scans(conn, query.sql, query.params)
+        if offending:
+            failures[name] = offending
+    return failures
+
+
+def main() -> int:
+    failures = check_query_plans()
+    for name, offending in failures.items():
+        print(f"FAIL {name} ({HOT_QUERIES[name].source}): {'; '.join(offending)}")
+    print(f"{len(HOT_QUERIES) - len(failures)}/{len(HOT_QUERIES)} hot queries use indexes")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
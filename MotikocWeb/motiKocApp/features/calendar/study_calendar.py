@@ -5,6 +5,7 @@ from typing import Dict, List, Any, Optional, Union, Tuple, cast
 import logging
 import plotly.express as px
 from core.database import DatabaseManager, DatabaseError
+from core import queries
 from services.gamification import GamificationService
 
 # Configure logging
@@ -298,13 +299,7 @@ class StudyCalendar:
     def _get_monthly_study_data(self) -> Dict[str, Any]:
         """Get study data for current month"""
         try:
-            results = self.db.execute_query('''
-                SELECT date, SUM(duration) as total_minutes
-                FROM study_logs
-                WHERE user_id = ?
-                AND strftime('%Y-%m', date) = strftime('%Y-%m', 'now')
-                GROUP BY date
-            ''', (self.user_id,), fetch_all=True)
+            results = self.db.execute_query(queries.MONTHLY_STUDY_MINUTES, (self.user_id,), fetch_all=True)
             
             return {
                 row['date']: {
@@ -349,22 +344,15 @@ class StudyCalendar:
     def _get_study_data_by_period(self, period: str) -> Optional[Dict[str, Any]]:
         """Get study data for selected time period"""
         try:
-            # Set date filter based on period
-            date_filter = {
-                "Haftalık": "date >= date('now', '-7 days')",
-                "Aylık": "date >= date('now', '-1 month')",
-                "Yıllık": "date >= date('now', '-1 year')"
-            }.get(period, "date >= date('now', '-7 days')")
+            # Start of the period, bound as a date('now', ?) modifier
+            window = {
+                "Haftalık": '-7 days',
+                "Aylık": '-1 month',
+                "Yıllık": '-1 year'
+            }.get(period, '-7 days')
             
             # Get summary data
-            result = self.db.execute_query(f'''
-                SELECT 
-                    COUNT(DISTINCT date) as total_days,
-                    SUM(duration) as total_minutes,
-                    AVG(performance_rating) as avg_performance
-                FROM study_logs
-                WHERE user_id = ? AND {date_filter}
-            ''', (self.user_id,))
+            result = self.db.execute_query(queries.PERIOD_STUDY_SUMMARY, (self.user_id, window))
 
             # Safely handle the result
             summary = cast(Dict[str, Any], result) if result else None
@@ -372,21 +360,12 @@ class StudyCalendar:
                 return None
             
             # Get subject distribution
-            subjects = self.db.execute_query(f'''
-                SELECT subject, SUM(duration) as total_minutes
-                FROM study_logs
-                WHERE user_id = ? AND {date_filter}
-                GROUP BY subject
-            ''', (self.user_id,), fetch_all=True)
+            subjects = self.db.execute_query(
+                queries.PERIOD_STUDY_BY_SUBJECT, (self.user_id, window), fetch_all=True)
             
             # Get daily distribution
-            daily = self.db.execute_query(f'''
-                SELECT date, SUM(duration) as total_minutes
-                FROM study_logs
-                WHERE user_id = ? AND {date_filter}
-                GROUP BY date
-                ORDER BY date
-            ''', (self.user_id,), fetch_all=True)
+            daily = self.db.execute_query(
+                queries.PERIOD_STUDY_BY_DAY, (self.user_id, window), fetch_all=True)
             
             # Safely access dictionary values
             total_minutes = summary.get('total_minutes', 0)
@@ -138,8 +138,8 @@ class CareerRecommendations:
             cursor.execute('''
                 SELECT 
                     subject,
-                    AVG(performance_rating) as avg_performance
-                FROM study_logs
+                    SUM(rating_sum) * 1.0 / NULLIF(SUM(rating_count), 0) as avg_performance
+                FROM user_daily_stats
                 WHERE user_id = ?
                 GROUP BY subject
             ''', (self.user_id,))
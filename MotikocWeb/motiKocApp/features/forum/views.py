@@ -5,102 +5,27 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 from .models import ForumPost, ForumComment, ForumCategory
 from services.ai_service import AIService
+from core.database import init_db, DatabaseError, DatabaseWriter, PooledConnection, pooled_connection
+from core import queries
 import sqlite3
 import base64
 from io import BytesIO
 import time
 
 class ForumView:
-    def __init__(self, user_id: int, db_path: str = 'motikoc.db'):
+    def __init__(self, user_id: int, db_conn: PooledConnection):
         self.user_id = user_id
-        self.db_conn = sqlite3.connect(db_path)
+        self.db_conn = db_conn
         self.db_conn.row_factory = sqlite3.Row  # Enable dictionary-like cursor
         self.ai_service = AIService()
         self.init_forum_tables()
 
     def init_forum_tables(self):
-        """Initialize forum tables if they do not exist."""
+        """Ensure forum tables exist; the shared schema migration runs once per process."""
         try:
-            cursor = self.db_conn.cursor()
-            # Forum categories
-            cursor.execute('''CREATE TABLE IF NOT EXISTS forum_categories
-                             (id INTEGER PRIMARY KEY,
-                              name TEXT UNIQUE,
-                              description TEXT,
-                              icon TEXT,
-                              order_index INTEGER)''')
-            
-            # Forum questions
-            cursor.execute('''CREATE TABLE IF NOT EXISTS forum_questions
-                             (id INTEGER PRIMARY KEY,
-                              user_id INTEGER,
-                              category_id INTEGER,
-                              title TEXT,
-                              content TEXT,
-                              tags TEXT,
-                              created_at TEXT,
-                              updated_at TEXT,
-                              view_count INTEGER DEFAULT 0,
-                              is_solved BOOLEAN DEFAULT FALSE,
-                              FOREIGN KEY(user_id) REFERENCES users(id),
-                              FOREIGN KEY(category_id) REFERENCES forum_categories(id))''')
-            
-            # Forum answers
-            cursor.execute('''CREATE TABLE IF NOT EXISTS forum_answers
-                             (id INTEGER PRIMARY KEY,
-                              question_id INTEGER,
-                              user_id INTEGER,
-                              content TEXT,
-                              created_at TEXT,
-                              updated_at TEXT,
-                              is_accepted BOOLEAN DEFAULT FALSE,
-                              upvotes INTEGER DEFAULT 0,
-                              FOREIGN KEY(question_id) REFERENCES forum_questions(id),
-                              FOREIGN KEY(user_id) REFERENCES users(id))''')
-            
-            # Forum votes
-            cursor.execute('''CREATE TABLE IF NOT EXISTS forum_votes
-                             (id INTEGER PRIMARY KEY,
-                              user_id INTEGER,
-                              content_type TEXT,
-                              content_id INTEGER,
-                              vote_type INTEGER,
-                              created_at TEXT,
-                              FOREIGN KEY(user_id) REFERENCES users(id))''')
-            
-            # Forum notifications
-            cursor.execute('''CREATE TABLE IF NOT EXISTS forum_notifications
-                             (id INTEGER PRIMARY KEY,
-                              user_id INTEGER,
-                              content TEXT,
-                              link TEXT,
-                              created_at TEXT,
-                              is_read BOOLEAN DEFAULT FALSE,
-                              FOREIGN KEY(user_id) REFERENCES users(id))''')
-            
-            # Insert default categories if table is empty
-            cursor.execute("SELECT COUNT(*) FROM forum_categories")
-            if cursor.fetchone()[0] == 0:
-                default_categories = [
-                    ('TYT Matematik', 'TYT matematik konuları ve soru çözümleri', '📐', 1),
-                    ('TYT Türkçe', 'TYT Türkçe ve dil bilgisi konuları', '📚', 2),
-                    ('TYT Fen Bilimleri', 'TYT Fizik, Kimya ve Biyoloji', '🔬', 3),
-                    ('TYT Sosyal Bilimler', 'TYT Tarih, Coğrafya ve Felsefe', '🌍', 4),
-                    ('AYT Matematik', 'AYT matematik konuları ve soru çözümleri', '🧮', 5),
-                    ('AYT Fizik', 'AYT fizik konuları ve problemler', '⚡', 6),
-                    ('AYT Kimya', 'AYT kimya konuları ve deneyler', '⚗️', 7),
-                    ('AYT Biyoloji', 'AYT biyoloji konuları', '🧬', 8),
-                    ('Genel YKS', 'YKS sınavı hakkında genel konular', '📋', 9),
-                    ('Motivasyon', 'Motivasyon ve çalışma teknikleri', '💪', 10)
-                ]
-                cursor.executemany('''
-                    INSERT INTO forum_categories (name, description, icon, order_index)
-                    VALUES (?, ?, ?, ?)
-                ''', default_categories)
-                self.db_conn.commit()
-        except Exception as e:
+            init_db()
+        except DatabaseError as e:
             st.error(f"Forum tablolarını başlatırken bir hata oluştu: {str(e)}")
-            self.db_conn.rollback()
 
     def show(self):
         """Main method to display the forum interface."""
@@ -416,11 +341,7 @@ class ForumView:
             return 0  # Return a default count if category_id is None
         try:
             cursor = self.db_conn.cursor()
-            cursor.execute("""
-                SELECT COUNT(*) as count 
-                FROM forum_questions 
-                WHERE category_id = ?
-            """, (category_id,))
+            cursor.execute(queries.CATEGORY_QUESTION_COUNT, (category_id,))
             result = cursor.fetchone()
             return result['count'] if result else 0
         except Exception as e:
@@ -431,26 +352,25 @@ class ForumView:
     def _save_question(self, question_data: Dict[str, Any]) -> bool:
         """Save a new question to the database."""
         try:
-            cursor = self.db_conn.cursor()
-            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            cursor.execute('''
-                INSERT INTO forum_questions 
-                (user_id, category_id, title, content, tags, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                self.user_id,
-                question_data['category'],
-                question_data['title'],
-                question_data['content'],
-                ','.join(question_data['tags']),
-                now,
-                now
-            ))
-            self.db_conn.commit()
+            with self.db_conn.transaction():
+                cursor = self.db_conn.cursor()
+                now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                cursor.execute('''
+                    INSERT INTO forum_questions 
+                    (user_id, category_id, title, content, tags, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    self.user_id,
+                    question_data['category'],
+                    question_data['title'],
+                    question_data['content'],
+                    ','.join(question_data['tags']),
+                    now,
+                    now
+                ))
             return True
         except Exception as e:
             st.error(f"Soru kaydedilirken bir hata oluştu: {str(e)}")
-            self.db_conn.rollback()
             return False
 
     def _get_categories(self) -> List[ForumCategory]:
@@ -524,22 +444,16 @@ class ForumView:
         try:
             cursor = self.db_conn.cursor()
             
-            # Increment view count
-            cursor.execute("""
-                UPDATE forum_questions 
-                SET view_count = view_count + 1 
-                WHERE id = ?
-            """, (question_id,))
-            self.db_conn.commit()
+            with self.db_conn.transaction():
+                # Increment view count
+                cursor.execute("""
+                    UPDATE forum_questions 
+                    SET view_count = view_count + 1 
+                    WHERE id = ?
+                """, (question_id,))
             
             # Fetch question details
-            cursor.execute("""
-                SELECT q.*, u.username, c.name as category_name, c.icon as category_icon
-                FROM forum_questions q
-                JOIN users u ON q.user_id = u.id
-                JOIN forum_categories c ON q.category_id = c.id
-                WHERE q.id = ?
-            """, (question_id,))
+            cursor.execute(queries.QUESTION_DETAIL, (question_id,))
             question = cursor.fetchone()
             
             if not question:
@@ -603,15 +517,7 @@ class ForumView:
         """Display all answers for a given question."""
         try:
             cursor = self.db_conn.cursor()
-            cursor.execute("""
-                SELECT a.*, u.username,
-                       (SELECT COUNT(*) FROM forum_votes WHERE content_type = 'answer' AND content_id = a.id AND vote_type = 1) as upvotes,
-                       (SELECT COUNT(*) FROM forum_votes WHERE content_type = 'answer' AND content_id = a.id AND vote_type = -1) as downvotes
-                FROM forum_answers a
-                JOIN users u ON a.user_id = u.id
-                WHERE a.question_id = ?
-                ORDER BY a.is_accepted DESC, upvotes DESC, a.created_at ASC
-            """, (question_id,))
+            cursor.execute(queries.QUESTION_ANSWERS, (question_id,))
             answers = cursor.fetchall()
             
             st.markdown("### 💬 Cevaplar")
@@ -678,11 +584,7 @@ class ForumView:
         """Provide an option to accept an answer if the user is the question owner."""
         try:
             cursor = self.db_conn.cursor()
-            cursor.execute("""
-                SELECT a.id, a.user_id, a.content 
-                FROM forum_answers a
-                WHERE a.question_id = ? AND a.is_accepted = FALSE
-            """, (question_id,))
+            cursor.execute(queries.UNACCEPTED_ANSWERS, (question_id,))
             pending_answers = cursor.fetchall()
             
             if pending_answers:
@@ -700,34 +602,32 @@ class ForumView:
     def _accept_answer(self, question_id: int, answer_id: int):
         """Accept an answer as the correct one."""
         try:
-            cursor = self.db_conn.cursor()
-            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Reset previously accepted answers
-            cursor.execute("""
-                UPDATE forum_answers 
-                SET is_accepted = FALSE 
-                WHERE question_id = ?
-            """, (question_id,))
+            with self.db_conn.transaction():
+                cursor = self.db_conn.cursor()
+                now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            # Accept the new answer
-            cursor.execute("""
-                UPDATE forum_answers 
-                SET is_accepted = TRUE 
-                WHERE id = ?
-            """, (answer_id,))
+                # Reset previously accepted answers
+                cursor.execute("""
+                    UPDATE forum_answers 
+                    SET is_accepted = FALSE 
+                    WHERE question_id = ?
+                """, (question_id,))
             
-            # Mark the question as solved
-            cursor.execute("""
-                UPDATE forum_questions 
-                SET is_solved = TRUE 
-                WHERE id = ?
-            """, (question_id,))
+                # Accept the new answer
+                cursor.execute("""
+                    UPDATE forum_answers 
+                    SET is_accepted = TRUE 
+                    WHERE id = ?
+                """, (answer_id,))
             
-            self.db_conn.commit()
+                # Mark the question as solved
+                cursor.execute("""
+                    UPDATE forum_questions 
+                    SET is_solved = TRUE 
+                    WHERE id = ?
+                """, (question_id,))
         except Exception as e:
             st.error(f"Cevap kabul edilirken bir hata oluştu: {str(e)}")
-            self.db_conn.rollback()
 
     def vote_content(self, content_type: str, content_id: int, vote_type: int):
         """
@@ -735,21 +635,16 @@ class ForumView:
         content_type: 'question' or 'answer'
         vote_type: 1 for upvote, -1 for downvote
         """
-        try:
-            cursor = self.db_conn.cursor()
-            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Validate content_type
-            if content_type not in ['question', 'answer']:
-                st.error("Geçersiz içerik türü!")
-                return
-            
+        # Validate content_type
+        if content_type not in ['question', 'answer']:
+            st.error("Geçersiz içerik türü!")
+            return
+
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        def apply_vote(cursor: sqlite3.Cursor):
             # Check existing vote
-            cursor.execute("""
-                SELECT id, vote_type 
-                FROM forum_votes 
-                WHERE user_id = ? AND content_type = ? AND content_id = ?
-            """, (self.user_id, content_type, content_id))
+            cursor.execute(queries.EXISTING_VOTE, (self.user_id, content_type, content_id))
             existing_vote = cursor.fetchone()
             
             if existing_vote:
@@ -773,23 +668,22 @@ class ForumView:
                     (user_id, content_type, content_id, vote_type, created_at)
                     VALUES (?, ?, ?, ?, ?)
                 """, (self.user_id, content_type, content_id, vote_type, now))
-            
-            self.db_conn.commit()
-            st.success("Oylama başarıyla güncellendi!")
-            st.rerun()
+
+        try:
+            # Votes go through the single writer and share its group commit
+            DatabaseWriter.wait(DatabaseWriter.get_instance().submit(apply_vote))
         except Exception as e:
             st.error(f"Oylama işlemi sırasında bir hata oluştu: {str(e)}")
-            self.db_conn.rollback()
+            return
+
+        st.success("Oylama başarıyla güncellendi!")
+        st.rerun()
 
     def show_user_notifications(self):
         """Display user notifications in the sidebar."""
         try:
             cursor = self.db_conn.cursor()
-            cursor.execute("""
-                SELECT * FROM forum_notifications
-                WHERE user_id = ? AND is_read = FALSE
-                ORDER BY created_at DESC
-            """, (self.user_id,))
+            cursor.execute(queries.UNREAD_NOTIFICATIONS, (self.user_id,))
             notifications = cursor.fetchall()
             
             if notifications:
@@ -825,38 +719,36 @@ class ForumView:
     def _mark_notification_read(self, notification_id: int):
         """Mark a notification as read."""
         try:
-            cursor = self.db_conn.cursor()
-            cursor.execute("""
-                UPDATE forum_notifications
-                SET is_read = TRUE
-                WHERE id = ? AND user_id = ?
-            """, (notification_id, self.user_id))
-            self.db_conn.commit()
+            with self.db_conn.transaction():
+                cursor = self.db_conn.cursor()
+                cursor.execute("""
+                    UPDATE forum_notifications
+                    SET is_read = TRUE
+                    WHERE id = ? AND user_id = ?
+                """, (notification_id, self.user_id))
         except Exception as e:
             st.error(f"Bildirim güncellenirken bir hata oluştu: {str(e)}")
-            self.db_conn.rollback()
 
     def _save_answer(self, question_id: int, content: str) -> bool:
         """Save a new answer to the database."""
         try:
-            cursor = self.db_conn.cursor()
-            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            cursor.execute('''
-                INSERT INTO forum_answers 
-                (question_id, user_id, content, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                question_id,
-                self.user_id,
-                content,
-                now,
-                now
-            ))
-            self.db_conn.commit()
+            with self.db_conn.transaction():
+                cursor = self.db_conn.cursor()
+                now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                cursor.execute('''
+                    INSERT INTO forum_answers 
+                    (question_id, user_id, content, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (
+                    question_id,
+                    self.user_id,
+                    content,
+                    now,
+                    now
+                ))
             return True
         except Exception as e:
             st.error(f"Cevap kaydedilirken bir hata oluştu: {str(e)}")
-            self.db_conn.rollback()
             return False
 
     # Additional helper methods can be added here as needed
@@ -870,5 +762,7 @@ def show_forum():
         return
 
     user_id = st.session_state.user_id
-    forum_view = ForumView(user_id)
-    forum_view.show()
\ No newline at end of file
+    # One pooled connection per page run, returned when the block exits
+    with pooled_connection() as db_conn:
+        forum_view = ForumView(user_id, db_conn)
+        forum_view.show()
\ No newline at end of file
@@ -7,16 +7,23 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from services.ai_service import AIService
-import json
 import logging
 from sqlite3 import Row
 
-from core.database import DatabaseManager, DatabaseError, db_transaction
+import numpy as np
+
+from config.constants import STUDY_SUBJECTS
+from core.database import DatabaseManager, DatabaseError, read_snapshot
+from core import queries
+from features.university.score_rank import estimate_ranks, placement_scores
 
 # Configure logging
 logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger(__name__)
 
+# AYT field -> puan türü of the placement score it produces
+AYT_SCORE_TYPES = {'Sayısal': 'SAY', 'Eşit Ağırlık': 'EA', 'Sözel': 'SÖZ', 'Dil': 'DİL'}
+
 class PerformanceAnalytics:
     def __init__(self, user_id: int):
         self.user_id = user_id
@@ -352,33 +359,16 @@ class PerformanceAnalytics:
     def _get_performance_data(self) -> Optional[Dict[str, Any]]:
         """Get overall performance data"""
         try:
-            with db_transaction() as conn:
+            with read_snapshot():
                 # Get current period stats
-                current_query = cast(Optional[Row], self.db_manager.execute_query('''
-                    SELECT 
-                        COUNT(DISTINCT date) as study_days,
-                        SUM(duration) as total_minutes,
-                        AVG(performance_rating) as avg_performance,
-                        COUNT(*) as total_questions
-                    FROM study_logs
-                    WHERE user_id = ?
-                    AND date >= date('now', '-30 days')
-                ''', (self.user_id,), fetch_all=False))
+                current_query = cast(Optional[Row], self.db_manager.execute_query(
+                    queries.STUDY_SUMMARY_LAST_30_DAYS, (self.user_id,), fetch_all=False))
 
                 current = self._row_to_dict(current_query)
 
                 # Get previous period stats
-                previous_query = cast(Optional[Row], self.db_manager.execute_query('''
-                    SELECT 
-                        COUNT(DISTINCT date) as study_days,
-                        SUM(duration) as total_minutes,
-                        AVG(performance_rating) as avg_performance,
-                        COUNT(*) as total_questions
-                    FROM study_logs
-                    WHERE user_id = ?
-                    AND date >= date('now', '-60 days')
-                    AND date < date('now', '-30 days')
-                ''', (self.user_id,), fetch_all=False))
+                previous_query = cast(Optional[Row], self.db_manager.execute_query(
+                    queries.STUDY_SUMMARY_PREVIOUS_30_DAYS, (self.user_id,), fetch_all=False))
 
                 previous = self._row_to_dict(previous_query)
 
@@ -398,8 +388,8 @@ class PerformanceAnalytics:
                 )
                 # Get daily study data
                 daily_study_query = cast(Optional[List[Row]], self.db_manager.execute_query('''
-                    SELECT date, SUM(duration) / 60.0 as hours
-                    FROM study_logs
+                    SELECT date, SUM(total_duration) / 60.0 as hours
+                    FROM user_daily_stats
                     WHERE user_id = ?
                     AND date >= date('now', '-30 days')
                     GROUP BY date
@@ -439,11 +429,10 @@ class PerformanceAnalytics:
                 # Calculate success rate
                 total_attempts = current.get('total_questions', 0)
                 success_query = cast(Optional[Row], self.db_manager.execute_query('''
-                    SELECT COUNT(*) as success_count
-                    FROM study_logs
+                    SELECT COALESCE(SUM(success_count), 0) as success_count
+                    FROM user_daily_stats
                     WHERE user_id = ?
                     AND date >= date('now', '-30 days')
-                    AND performance_rating >= 4
                 ''', (self.user_id,), fetch_all=False))
 
                 successful_attempts = dict(success_query).get('success_count', 0) if success_query else 0
@@ -472,15 +461,15 @@ class PerformanceAnalytics:
     def _get_subject_performance(self, subject: str) -> Optional[Dict[str, Any]]:
         """Get subject performance data"""
         try:
-            with db_transaction() as conn:
+            with read_snapshot():
                 # Get overall subject stats
                 stats_query = cast(Optional[Row], self.db_manager.execute_query('''
                     SELECT 
-                        SUM(duration) as total_minutes,
-                        AVG(performance_rating) as avg_performance,
-                        SUM(CASE WHEN performance_rating >= 4 THEN 1 ELSE 0 END) as success_count,
-                        COUNT(*) as total_questions
-                    FROM study_logs
+                        SUM(total_duration) as total_minutes,
+                        SUM(rating_sum) * 1.0 / NULLIF(SUM(rating_count), 0) as avg_performance,
+                        SUM(success_count) as success_count,
+                        SUM(session_count) as total_questions
+                    FROM user_daily_stats
                     WHERE user_id = ? AND subject = ?
                 ''', (self.user_id, subject), fetch_all=False))
 
@@ -496,15 +485,8 @@ class PerformanceAnalytics:
                 )
 
                 # Get topic performance
-                topics_query = cast(Optional[List[Row]], self.db_manager.execute_query('''
-                    SELECT 
-                        topic,
-                        AVG(performance_rating) as performance
-                    FROM study_logs
-                    WHERE user_id = ? AND subject = ?
-                    GROUP BY topic
-                    ORDER BY performance DESC
-                ''', (self.user_id, subject), fetch_all=True))
+                topics_query = cast(Optional[List[Row]], self.db_manager.execute_query(
+                    queries.SUBJECT_TOPIC_PERFORMANCE, (self.user_id, subject), fetch_all=True))
 
                 topics = self._rows_to_dict_list(topics_query)
 
@@ -550,65 +532,77 @@ class PerformanceAnalytics:
     def _get_mock_exam_data(self) -> Dict[str, Any]:
         """Get mock exam data"""
         try:
-            with db_transaction() as conn:
+            with read_snapshot():
                 # Get all mock exams
-                exams_query = cast(Optional[List[Row]], self.db_manager.execute_query('''
-                    SELECT *
-                    FROM mock_exams
-                    WHERE user_id = ?
-                    ORDER BY exam_date DESC
-                ''', (self.user_id,), fetch_all=True))
+                exams_query = cast(Optional[List[Row]], self.db_manager.execute_query(
+                    queries.MOCK_EXAMS, (self.user_id,), fetch_all=True))
 
                 exams = self._rows_to_dict_list(exams_query)
 
                 if not exams:
                     return {'exams': []}
 
-                # Get current and previous rank
-                current_rank = exams[0].get('rank') if len(exams) >= 1 else None
-                previous_rank = exams[1].get('rank') if len(exams) >= 2 else None
+                # Aggregate subject performance
+                subject_query = cast(Optional[List[Row]], self.db_manager.execute_query(
+                    queries.MOCK_EXAM_SUBJECT_TOTALS, (self.user_id,), fetch_all=True))
 
-                # Process exam data
-                exam_trends = []
-                subject_performance = {}
+                subject_totals = self._rows_to_dict_list(subject_query)
+                subject_performance_list = [
+                    {
+                        'subject': row['subject'],
+                        'correct': row['correct'],
+                        'incorrect': row['incorrect'],
+                        'empty': row['empty']
+                    }
+                    for row in subject_totals
+                ]
+
+                # Per-exam question totals
+                exam_totals_query = cast(Optional[List[Row]], self.db_manager.execute_query('''
+                    SELECT 
+                        r.exam_id,
+                        SUM(r.correct) as correct,
+                        SUM(r.incorrect) as incorrect,
+                        SUM(r.empty) as empty,
+                        SUM(r.net) as net,
+                        GROUP_CONCAT(r.subject, '|') as subjects
+                    FROM mock_exams m
+                    JOIN mock_exam_subject_results r ON r.exam_id = m.id
+                    WHERE m.user_id = ?
+                    GROUP BY r.exam_id
+                ''', (self.user_id,), fetch_all=True))
+
+                exam_totals = {
+                    row['exam_id']: row
+                    for row in self._rows_to_dict_list(exam_totals_query)
+                }
 
-                for exam in exams:
-                    # Add to trends
-                    exam_trends.append({
+                self._estimate_exam_ranks(exams, exam_totals)
+
+                # Get current rank and the previous one of the same score type
+                current_rank = exams[0].get('rank')
+                previous_rank = next(
+                    (exam.get('rank') for exam in exams[1:]
+                     if exam.get('score_type') == exams[0].get('score_type')),
+                    None
+                )
+
+                # Process exam data
+                exam_trends = [
+                    {
                         'date': exam.get('exam_date'),
-                        'net': exam.get('total_net'),
+                        'net': exam.get('total_net', exam_totals.get(exam.get('id'), {}).get('net')),
                         'rank': exam.get('rank')
-                    })
-
-                    # Aggregate subject performance
-                    results = json.loads(exam.get('subject_results', '{}'))
-                    for subject, data in results.items():
-                        if subject not in subject_performance:
-                            subject_performance[subject] = {
-                                'correct': 0,
-                                'incorrect': 0,
-                                'empty': 0
-                            }
-
-                        subject_performance[subject]['correct'] += data.get('correct', 0)
-                        subject_performance[subject]['incorrect'] += data.get('incorrect', 0)
-                        subject_performance[subject]['empty'] += data.get('empty', 0)
-
-                # Convert subject performance to list
-                subject_performance_list = [
-                    {
-                        'subject': subject,
-                        **data
                     }
-                    for subject, data in subject_performance.items()
+                    for exam in exams
                 ]
 
                 # Get TYT and AYT analysis
-                tyt_analysis = self._analyze_exam_type(exams, 'TYT')
-                ayt_analysis = self._analyze_exam_type(exams, 'AYT')
+                tyt_analysis = self._analyze_exam_type(exams, 'TYT', exam_totals)
+                ayt_analysis = self._analyze_exam_type(exams, 'AYT', exam_totals)
 
                 # Get question analysis
-                question_analysis = self._analyze_questions(exams)
+                question_analysis = self._analyze_questions(subject_totals)
 
                 return {
                     'exams': exams,
@@ -625,8 +619,62 @@ class PerformanceAnalytics:
             logger.error(f"Error getting mock exam data: {str(e)}")
             return {'exams': []}
 
-    def _analyze_exam_type(self, exams: List[Dict[str, Any]], 
-                         exam_type: str) -> Dict[str, Any]:
+    def _estimate_exam_ranks(self, exams: List[Dict[str, Any]],
+                             exam_totals: Dict[int, Dict[str, Any]]):
+        """Fill score_type, estimated_score and (unless stored) rank of every exam in place.
+
+        AYT exams are scored together with the latest TYT net taken on or before
+        them; all exams of a score type are converted to ranks in one lookup.
+        """
+        tyt_history = sorted(
+            (exam.get('exam_date'), exam_totals.get(exam.get('id'), {}).get('net'))
+            for exam in exams if exam.get('exam_type') == 'TYT'
+        )
+        tyt_history = [(date, net) for date, net in tyt_history if net is not None]
+
+        by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for exam in exams:
+            net = exam_totals.get(exam.get('id'), {}).get('net')
+            if net is None:
+                continue
+            if exam.get('exam_type') == 'TYT':
+                exam['score_type'] = 'TYT'
+                exam['estimated_score'] = float(placement_scores([net])[0])
+            else:
+                earlier = [n for date, n in tyt_history if date <= exam.get('exam_date')]
+                tyt_net = earlier[-1] if earlier else (tyt_history[-1][1] if tyt_history else None)
+                if tyt_net is None:
+                    continue
+                exam['score_type'] = self._ayt_score_type(
+                    exam_totals.get(exam.get('id'), {}).get('subjects'))
+                exam['estimated_score'] = float(placement_scores([tyt_net], [net])[0])
+            by_type.setdefault(exam['score_type'], []).append(exam)
+
+        for score_type, typed_exams in by_type.items():
+            try:
+                ranks = estimate_ranks(score_type, [e['estimated_score'] for e in typed_exams])
+            except Exception as e:
+                logger.error(f"Error estimating {score_type} ranks: {str(e)}")
+                continue
+            for exam, rank in zip(typed_exams, ranks):
+                exam['estimated_rank'] = None if np.isnan(rank) else int(rank)
+                if exam.get('rank') is None:
+                    exam['rank'] = exam['estimated_rank']
+
+    def _ayt_score_type(self, subject_list: Optional[str]) -> str:
+        """Puan türü whose AYT subjects best overlap the exam's subjects (SAY by default).
+
+        `subject_list` is the '|'-joined subjects of the exam's mock_exam_subject_results rows.
+        """
+        subjects = set(subject_list.split('|')) if subject_list else set()
+        field = max(
+            STUDY_SUBJECTS['AYT'],
+            key=lambda name: len(subjects & set(STUDY_SUBJECTS['AYT'][name]))
+        )
+        return AYT_SCORE_TYPES[field] if subjects else 'SAY'
+
+    def _analyze_exam_type(self, exams: List[Dict[str, Any]], exam_type: str,
+                         exam_totals: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze specific exam type performance"""
         type_exams = [
             exam for exam in exams 
@@ -639,17 +687,14 @@ class PerformanceAnalytics:
         # Calculate trends
         trends = []
         for exam in type_exams:
-            results = json.loads(exam.get('subject_results', '{}'))
-            total_correct = sum(r.get('correct', 0) for r in results.values())
-            total_incorrect = sum(r.get('incorrect', 0) for r in results.values())
-            total_empty = sum(r.get('empty', 0) for r in results.values())
+            totals = exam_totals.get(exam.get('id'), {})
 
             trends.append({
                 'date': exam.get('exam_date'),
-                'correct': total_correct,
-                'incorrect': total_incorrect,
-                'empty': total_empty,
-                'net': exam.get('total_net', 0)
+                'correct': totals.get('correct', 0),
+                'incorrect': totals.get('incorrect', 0),
+                'empty': totals.get('empty', 0),
+                'net': exam.get('total_net', totals.get('net', 0))
             })
 
         # Calculate averages
@@ -668,48 +713,28 @@ class PerformanceAnalytics:
             }
         }
 
-    def _analyze_questions(self, exams: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_questions(self, subject_totals: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze question performance"""
-        all_results = []
-
-        for exam in exams:
-            results = json.loads(exam.get('subject_results', '{}'))
-            for subject, data in results.items():
-                all_results.append({
-                    'date': exam.get('exam_date'),
-                    'subject': subject,
-                    'correct': data.get('correct', 0),
-                    'incorrect': data.get('incorrect', 0),
-                    'empty': data.get('empty', 0)
-                })
-
-        if not all_results:
+        if not subject_totals:
             return {}
 
-        # Convert to DataFrame for analysis
-        df = pd.DataFrame(all_results)
-
         # Calculate success rates
-        success_rates = df.groupby('subject').apply(
-            lambda x: {
-                'correct_rate': (x['correct'].sum() / (x['correct'].sum() + x['incorrect'].sum()) * 100) 
-                               if (x['correct'].sum() + x['incorrect'].sum()) > 0 else 0,
-                'empty_rate': (x['empty'].sum() / len(x) * 100) 
-                             if len(x) > 0 else 0,
-                'total_questions': len(x)
+        success_rates = {}
+        for row in subject_totals:
+            answered = row['correct'] + row['incorrect']
+            success_rates[row['subject']] = {
+                'correct_rate': row['correct'] / answered * 100 if answered > 0 else 0,
+                'empty_rate': row['empty'] / row['exam_count'] * 100,
+                'total_questions': row['exam_count']
             }
-        ).to_dict()
 
         # Calculate trends
-        trends = df.groupby(['date', 'subject']).agg({
-            'correct': 'sum',
-            'incorrect': 'sum',
-            'empty': 'sum'
-        }).reset_index()
+        trends_query = cast(Optional[List[Row]], self.db_manager.execute_query(
+            queries.MOCK_EXAM_TRENDS, (self.user_id,), fetch_all=True))
 
         return {
             'success_rates': success_rates,
-            'trends': trends.to_dict('records')
+            'trends': self._rows_to_dict_list(trends_query)
         }
 
     # Chart creation methods remain the same as they don't involve database operations
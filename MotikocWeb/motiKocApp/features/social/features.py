@@ -5,9 +5,12 @@ from datetime import datetime
 import json
 import sqlite3  # Ensure sqlite3 is imported
 
+from core.database import DatabaseWriter, DatabaseError, PooledConnection, pooled_connection
+from core import queries
+
 
 class SocialFeatures:
-    def __init__(self, user_id: int, db_conn: sqlite3.Connection):
+    def __init__(self, user_id: int, db_conn: PooledConnection):
         self.user_id = user_id
         self.db_conn = db_conn
 
@@ -117,29 +120,13 @@ class SocialFeatures:
         """Get user's study groups"""
         try:
             cursor = self.db_conn.cursor()
-            cursor.execute('''
-                SELECT 
-                    g.*,
-                    COUNT(DISTINCT m.user_id) as member_count,
-                    m2.role as user_role
-                FROM study_groups g
-                JOIN group_members m ON g.id = m.group_id
-                JOIN group_members m2 ON g.id = m2.group_id AND m2.user_id = ?
-                GROUP BY g.id
-                ORDER BY g.name
-            ''', (self.user_id,))
+            cursor.execute(queries.MY_GROUPS, (self.user_id,))
             
             groups = cursor.fetchall()
             
             # Get members for each group
             for group in groups:
-                cursor.execute('''
-                    SELECT u.username, m.role
-                    FROM group_members m
-                    JOIN users u ON m.user_id = u.id
-                    WHERE m.group_id = ?
-                    ORDER BY m.role DESC, u.username
-                ''', (group['id'],))
+                cursor.execute(queries.GROUP_MEMBERS, (group['id'],))
                 
                 group['members'] = cursor.fetchall()
                 group['is_admin'] = group['user_role'] == 'admin'
@@ -177,13 +164,12 @@ class SocialFeatures:
     def _join_group(self, group_id: int) -> bool:
        """Join study group"""
        try:
-           cursor = self.db_conn.cursor()
-           cursor.execute('''
-               INSERT INTO group_members (group_id, user_id, role)
-               VALUES (?, ?, 'member')
-           ''', (group_id, self.user_id))
-           
-           self.db_conn.commit()
+           with self.db_conn.transaction():
+               cursor = self.db_conn.cursor()
+               cursor.execute('''
+                   INSERT INTO group_members (group_id, user_id, role)
+                   VALUES (?, ?, 'member')
+               ''', (group_id, self.user_id))
            return True
        except Exception as e:
            print(f"Error joining group: {str(e)}")
@@ -192,13 +178,12 @@ class SocialFeatures:
     def _leave_group(self, group_id: int) -> bool:
         """Leave study group"""
         try:
-            cursor = self.db_conn.cursor()
-            cursor.execute('''
-                DELETE FROM group_members
-                WHERE group_id = ? AND user_id = ?
-            ''', (group_id, self.user_id))
-            
-            self.db_conn.commit()
+            with self.db_conn.transaction():
+                cursor = self.db_conn.cursor()
+                cursor.execute('''
+                    DELETE FROM group_members
+                    WHERE group_id = ? AND user_id = ?
+                ''', (group_id, self.user_id))
             return True
         except Exception as e:
             print(f"Error leaving group: {str(e)}")
@@ -207,21 +192,20 @@ class SocialFeatures:
     def _delete_group(self, group_id: int) -> bool:
         """Delete study group"""
         try:
-            cursor = self.db_conn.cursor()
+            with self.db_conn.transaction():
+                cursor = self.db_conn.cursor()
             
-            # Delete members first
-            cursor.execute('''
-                DELETE FROM group_members
-                WHERE group_id = ?
-            ''', (group_id,))
-            
-            # Delete group
-            cursor.execute('''
-                DELETE FROM study_groups
-                WHERE id = ? AND creator_id = ?
-            ''', (group_id, self.user_id))
+                # Delete members first
+                cursor.execute('''
+                    DELETE FROM group_members
+                    WHERE group_id = ?
+                ''', (group_id,))
             
-            self.db_conn.commit()
+                # Delete group
+                cursor.execute('''
+                    DELETE FROM study_groups
+                    WHERE id = ? AND creator_id = ?
+                ''', (group_id, self.user_id))
             return cursor.rowcount > 0
         except Exception as e:
             print(f"Error deleting group: {str(e)}")
@@ -256,13 +240,13 @@ class SocialFeatures:
     def _update_group(self, group_id: int, name: str, group_type: str, description: str, max_members: int) -> bool:
         """Update group details in the database"""
         try:
-            cursor = self.db_conn.cursor()
-            cursor.execute('''
-                UPDATE study_groups
-                SET name = ?, group_type = ?, description = ?, max_members = ?
-                WHERE id = ? AND creator_id = ?
-            ''', (name, group_type, description, max_members, group_id, self.user_id))
-            self.db_conn.commit()
+            with self.db_conn.transaction():
+                cursor = self.db_conn.cursor()
+                cursor.execute('''
+                    UPDATE study_groups
+                    SET name = ?, group_type = ?, description = ?, max_members = ?
+                    WHERE id = ? AND creator_id = ?
+                ''', (name, group_type, description, max_members, group_id, self.user_id))
             return cursor.rowcount > 0
         except Exception as e:
             print(f"Error updating group: {str(e)}")
@@ -296,22 +280,21 @@ class SocialFeatures:
     def _create_group(self, name: str, group_type: str, description: str, max_members: int) -> bool:
         """Create a new study group in the database"""
         try:
-            cursor = self.db_conn.cursor()
-            cursor.execute('''
-                INSERT INTO study_groups (name, group_type, description, max_members, creator_id)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (name, group_type, description, max_members, self.user_id))
+            with self.db_conn.transaction():
+                cursor = self.db_conn.cursor()
+                cursor.execute('''
+                    INSERT INTO study_groups (name, group_type, description, max_members, creator_id)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (name, group_type, description, max_members, self.user_id))
             
-            # Get the newly created group ID
-            group_id = cursor.lastrowid
+                # Get the newly created group ID
+                group_id = cursor.lastrowid
             
-            # Add the creator as an admin member
-            cursor.execute('''
-                INSERT INTO group_members (group_id, user_id, role)
-                VALUES (?, ?, 'admin')
-            ''', (group_id, self.user_id))
-            
-            self.db_conn.commit()
+                # Add the creator as an admin member
+                cursor.execute('''
+                    INSERT INTO group_members (group_id, user_id, role)
+                    VALUES (?, ?, 'admin')
+                ''', (group_id, self.user_id))
             return True
         except Exception as e:
             print(f"Error creating group: {str(e)}")
@@ -413,21 +396,7 @@ class SocialFeatures:
         """Get user's friends"""
         try:
             cursor = self.db_conn.cursor()
-            cursor.execute('''
-                SELECT 
-                    u.id, u.username, u.grade, u.study_type,
-                    ul.current_level,
-                    COALESCE(MAX(s.date), 'Hiç aktif değil') as last_active
-                FROM users u
-                JOIN friendships f ON 
-                    (f.user_id = ? AND f.friend_id = u.id) OR
-                    (f.friend_id = ? AND f.user_id = u.id)
-                JOIN user_levels ul ON u.id = ul.user_id
-                LEFT JOIN study_logs s ON u.id = s.user_id
-                WHERE f.status = 'accepted'
-                GROUP BY u.id
-                ORDER BY u.username
-            ''', (self.user_id, self.user_id))
+            cursor.execute(queries.FRIENDS, (self.user_id, self.user_id))
             
             return cursor.fetchall()
         except Exception as e:
@@ -437,56 +406,51 @@ class SocialFeatures:
     def _add_friend(self, username: str) -> Dict[str, Any]:
         """Send friend request"""
         try:
-            cursor = self.db_conn.cursor()
+            with self.db_conn.transaction():
+                cursor = self.db_conn.cursor()
             
-            # Check if user exists
-            cursor.execute('''
-                SELECT id FROM users
-                WHERE username = ?
-            ''', (username,))
-            
-            user = cursor.fetchone()
-            if not user:
-                return {
-                    'success': False,
-                    'message': 'Kullanıcı bulunamadı.'
-                }
-            
-            friend_id = user['id']
-            
-            if friend_id == self.user_id:
-                return {
-                    'success': False,
-                    'message': 'Kendinize arkadaşlık isteği gönderemezsiniz.'
-                }
-            
-            # Check if already friends or request pending
-            cursor.execute('''
-                SELECT status FROM friendships
-                WHERE (user_id = ? AND friend_id = ?) OR
-                      (user_id = ? AND friend_id = ?)
-            ''', (self.user_id, friend_id, friend_id, self.user_id))
-            
-            friendship = cursor.fetchone()
-            if friendship:
-                if friendship['status'] == 'pending':
+                # Check if user exists
+                cursor.execute('''
+                    SELECT id FROM users
+                    WHERE username = ?
+                ''', (username,))
+            
+                user = cursor.fetchone()
+                if not user:
                     return {
                         'success': False,
-                        'message': 'Arkadaşlık isteği zaten gönderilmiş.'
+                        'message': 'Kullanıcı bulunamadı.'
                     }
-                elif friendship['status'] == 'accepted':
+            
+                friend_id = user['id']
+            
+                if friend_id == self.user_id:
                     return {
                         'success': False,
-                        'message': 'Bu kullanıcı zaten arkadaşınız.'
+                        'message': 'Kendinize arkadaşlık isteği gönderemezsiniz.'
                     }
             
-            # Send request
-            cursor.execute('''
-                INSERT INTO friendships (user_id, friend_id, status, created_at)
-                VALUES (?, ?, 'pending', ?)
-            ''', (self.user_id, friend_id, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
-            
-            self.db_conn.commit()
+                # Check if already friends or request pending
+                cursor.execute(queries.FRIENDSHIP_STATUS, (self.user_id, friend_id, friend_id, self.user_id))
+            
+                friendship = cursor.fetchone()
+                if friendship:
+                    if friendship['status'] == 'pending':
+                        return {
+                            'success': False,
+                            'message': 'Arkadaşlık isteği zaten gönderilmiş.'
+                        }
+                    elif friendship['status'] == 'accepted':
+                        return {
+                            'success': False,
+                            'message': 'Bu kullanıcı zaten arkadaşınız.'
+                        }
+            
+                # Send request
+                cursor.execute('''
+                    INSERT INTO friendships (user_id, friend_id, status, created_at)
+                    VALUES (?, ?, 'pending', ?)
+                ''', (self.user_id, friend_id, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
             
             return {
                 'success': True,
@@ -504,13 +468,7 @@ class SocialFeatures:
         """Get pending friend requests"""
         try:
             cursor = self.db_conn.cursor()
-            cursor.execute('''
-                SELECT f.id, u.username, f.created_at
-                FROM friendships f
-                JOIN users u ON f.user_id = u.id
-                WHERE f.friend_id = ? AND f.status = 'pending'
-                ORDER BY f.created_at DESC
-            ''', (self.user_id,))
+            cursor.execute(queries.PENDING_FRIEND_REQUESTS, (self.user_id,))
             
             return cursor.fetchall()
         except Exception as e:
@@ -520,21 +478,20 @@ class SocialFeatures:
     def _handle_friend_request(self, request_id: int, accept: bool) -> bool:
         """Handle friend request"""
         try:
-            cursor = self.db_conn.cursor()
-            
-            if accept:
-                cursor.execute('''
-                    UPDATE friendships
-                    SET status = 'accepted'
-                    WHERE id = ? AND friend_id = ?
-                ''', (request_id, self.user_id))
-            else:
-                cursor.execute('''
-                    DELETE FROM friendships
-                    WHERE id = ? AND friend_id = ?
-                ''', (request_id, self.user_id))
-            
-            self.db_conn.commit()
+            with self.db_conn.transaction():
+                cursor = self.db_conn.cursor()
+            
+                if accept:
+                    cursor.execute('''
+                        UPDATE friendships
+                        SET status = 'accepted'
+                        WHERE id = ? AND friend_id = ?
+                    ''', (request_id, self.user_id))
+                else:
+                    cursor.execute('''
+                        DELETE FROM friendships
+                        WHERE id = ? AND friend_id = ?
+                    ''', (request_id, self.user_id))
             return cursor.rowcount > 0
         except Exception as e:
             print(f"Error handling friend request: {str(e)}")
@@ -543,14 +500,13 @@ class SocialFeatures:
     def _remove_friend(self, friend_id: int) -> bool:
         """Remove friend"""
         try:
-            cursor = self.db_conn.cursor()
-            cursor.execute('''
-                DELETE FROM friendships
-                WHERE (user_id = ? AND friend_id = ?) OR
-                      (user_id = ? AND friend_id = ?)
-            ''', (self.user_id, friend_id, friend_id, self.user_id))
-            
-            self.db_conn.commit()
+            with self.db_conn.transaction():
+                cursor = self.db_conn.cursor()
+                cursor.execute('''
+                    DELETE FROM friendships
+                    WHERE (user_id = ? AND friend_id = ?) OR
+                          (user_id = ? AND friend_id = ?)
+                ''', (self.user_id, friend_id, friend_id, self.user_id))
             return cursor.rowcount > 0
         except Exception as e:
             print(f"Error removing friend: {str(e)}")
@@ -652,33 +608,7 @@ class SocialFeatures:
         """Get achievements feed"""
         try:
             cursor = self.db_conn.cursor()
-            cursor.execute('''
-                SELECT 
-                    a.*,
-                    u.username,
-                    COUNT(al.id) as likes,
-                    EXISTS (
-                        SELECT 1 FROM achievement_likes
-                        WHERE achievement_id = a.id AND user_id = ?
-                    ) as liked,
-                    CASE WHEN a.user_id = ? THEN 1 ELSE 0 END as is_own
-                FROM achievements a
-                JOIN users u ON a.user_id = u.id
-                LEFT JOIN achievement_likes al ON a.id = al.achievement_id
-                WHERE a.user_id = ? OR
-                      a.user_id IN (
-                        SELECT CASE
-                            WHEN f.user_id = ? THEN f.friend_id
-                            ELSE f.user_id
-                        END
-                        FROM friendships f
-                        WHERE (f.user_id = ? OR f.friend_id = ?)
-                        AND f.status = 'accepted'
-                      )
-                GROUP BY a.id
-                ORDER BY a.date DESC
-                LIMIT 50
-            ''', (
+            cursor.execute(queries.ACHIEVEMENT_FEED, (
                 self.user_id, self.user_id, 
                 self.user_id, self.user_id,
                 self.user_id, self.user_id
@@ -690,15 +620,10 @@ class SocialFeatures:
             return []
 
     def _toggle_achievement_like(self, achievement_id: int) -> bool:
-        """Toggle achievement like"""
-        try:
-            cursor = self.db_conn.cursor()
-            
+        """Toggle achievement like through the single writer"""
+        def toggle(cursor: sqlite3.Cursor):
             # Check if already liked
-            cursor.execute('''
-                SELECT id FROM achievement_likes
-                WHERE achievement_id = ? AND user_id = ?
-            ''', (achievement_id, self.user_id))
+            cursor.execute(queries.ACHIEVEMENT_LIKE, (achievement_id, self.user_id))
             
             like = cursor.fetchone()
             
@@ -714,8 +639,9 @@ class SocialFeatures:
                     INSERT INTO achievement_likes (achievement_id, user_id)
                     VALUES (?, ?)
                 ''', (achievement_id, self.user_id))
-            
-            self.db_conn.commit()
+
+        try:
+            DatabaseWriter.wait(DatabaseWriter.get_instance().submit(toggle))
             return True
         except Exception as e:
             print(f"Error toggling achievement like: {str(e)}")
@@ -725,15 +651,7 @@ class SocialFeatures:
         """Get user's badges"""
         try:
             cursor = self.db_conn.cursor()
-            cursor.execute('''
-                SELECT 
-                    b.*,
-                    ub.earned_date
-                FROM badges b
-                JOIN user_badges ub ON b.id = ub.badge_id
-                WHERE ub.user_id = ?
-                ORDER BY b.category, ub.earned_date DESC
-            ''', (self.user_id,))
+            cursor.execute(queries.USER_BADGES, (self.user_id,))
             
             badges = cursor.fetchall()
             
@@ -834,10 +752,13 @@ class SocialFeatures:
            
             # Set date filter based on timeframe
             date_filter = ""
+            exam_date_filter = ""
             if timeframe == "Haftalık":
                 date_filter = "AND date >= date('now', '-7 days')"
+                exam_date_filter = "AND m.exam_date >= date('now', '-7 days')"
             elif timeframe == "Aylık":
                 date_filter = "AND date >= date('now', '-30 days')"
+                exam_date_filter = "AND m.exam_date >= date('now', '-30 days')"
            
             # Get data based on category
             if category == "Çalışma Süresi":
@@ -845,9 +766,9 @@ class SocialFeatures:
                     SELECT 
                         u.id,
                         u.username,
-                        COALESCE(SUM(s.duration), 0) / 60.0 as value
+                        COALESCE(SUM(s.total_duration), 0) / 60.0 as value
                     FROM users u
-                    LEFT JOIN study_logs s ON 
+                    LEFT JOIN user_daily_stats s ON 
                         u.id = s.user_id {date_filter}
                     GROUP BY u.id
                     HAVING value > 0
@@ -855,17 +776,7 @@ class SocialFeatures:
                     LIMIT 20
                 ''')
             elif category == "XP":
-                cursor.execute(f'''
-                    SELECT 
-                        u.id,
-                        u.username,
-                        ul.total_xp as value
-                    FROM users u
-                    JOIN user_levels ul ON u.id = ul.user_id
-                    WHERE ul.total_xp > 0
-                    ORDER BY value DESC
-                    LIMIT 20
-                ''')
+                cursor.execute(queries.XP_LEADERBOARD)
             else:  # Soru Çözümü
                 cursor.execute(f'''
                     SELECT 
@@ -873,15 +784,14 @@ class SocialFeatures:
                         u.username,
                         COALESCE(SUM(
                             CASE 
-                                WHEN m.exam_type = 'TYT' THEN 
-                                    json_extract(m.subject_results, '$.correct') * 1.0
-                                ELSE 
-                                    json_extract(m.subject_results, '$.correct') * 1.5
+                                WHEN m.exam_type = 'TYT' THEN r.correct * 1.0
+                                ELSE r.correct * 1.5
                             END
                         ), 0) as value
                     FROM users u
                     LEFT JOIN mock_exams m ON 
-                        u.id = m.user_id {date_filter}
+                        u.id = m.user_id {exam_date_filter}
+                    LEFT JOIN mock_exam_subject_results r ON r.exam_id = m.id
                     GROUP BY u.id
                     HAVING value > 0
                     ORDER BY value DESC
@@ -927,14 +837,19 @@ def show_social_features():
     """
     Initialize and display the SocialFeatures component.
     """
-    if 'db_conn' not in st.session_state:
-        st.error("Veritabanı bağlantısı bulunamadı.")
-        return
-
     user_id = st.session_state.get('user_id')
     if user_id is None:
         st.error("Kullanıcı kimliği bulunamadı.")
         return
 
-    social = SocialFeatures(user_id=user_id, db_conn=st.session_state.db_conn)
-    social.show()
\ No newline at end of file
+    try:
+        db_conn = pooled_connection()
+    except DatabaseError:
+        st.error("Veritabanı bağlantısı bulunamadı.")
+        return
+
+    try:
+        social = SocialFeatures(user_id=user_id, db_conn=db_conn)
+        social.show()
+    finally:
+        db_conn.close()
\ No newline at end of file
@@ -0,0 +1,351 @@
+# university/data.py
+"""Typed columnar snapshot of the programs dataset, shared by every session.
+
+The CSV is parsed and cleaned once into a Parquet file next to it, together
+with the next-year cutoff forecast (see ``forecast.py``). Each process
+loads that file once, and all finder and recommender instances share the same
+DataFrame. Rebuild it by hand with ``python -m features.university.data``.
+
+When the CSV changes on disk (new cutoffs from YÖK Atlas), one background
+thread rebuilds the snapshot and warms its indexes. It then swaps the shared
+reference. Script runs pinned with ``ProgramCatalog.pinned()`` keep the version
+they started with until their next rerun.
+"""
+
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config.settings import PROGRAMS_CSV, PROGRAMS_RELOAD_INTERVAL, PROGRAMS_RELOAD_SETTLE, PROGRAMS_SNAPSHOT
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the cleaning rules change so existing snapshots are rebuilt
+SNAPSHOT_FORMAT = '2'
+
+YEARS = (2024, 2023, 2022)
+RANK_COLUMNS = [f'Başarı Sırası {year}' for year in YEARS]
+SCORE_COLUMNS = [f'Taban Puan {year}' for year in YEARS]
+QUOTA_COLUMNS = [f'Kontenjan {year}' for year in YEARS]
+PLACED_COLUMNS = [f'Yerleşen {year}' for year in YEARS]
+EXTRA_QUOTA_COLUMNS = [f'Ek Yerleştirme Kontenjan {year}' for year in YEARS]
+FEE_COLUMN = 'Ücret (KDV Hariç)'
+TEXT_COLUMNS = ['Üniversite', 'Fakülte', 'Program Adı', 'Şehir', 'Üni.Türü', 'Puan Türü']
+
+_META_FORMAT = b'motikoc.format'
+_META_SOURCE_HASH = b'motikoc.source_sha256'
+_META_SOURCE_SIZE = b'motikoc.source_size'
+_META_SOURCE_MTIME = b'motikoc.source_mtime_ns'
+
+
+def parse_turkish_number(values: pd.Series) -> pd.Series:
+    """'87.500 TL' -> 87500.0 and '77.270,9 TL' -> 77270.9; anything else -> NaN"""
+    cleaned = (
+        values.astype('string')
+        .str.replace(r'[^\d,]', '', regex=True)  # drop currency and thousands dots
+        .str.replace(',', '.', regex=False)
+    )
+    return pd.to_numeric(cleaned, errors='coerce').astype('float64')
+
+
+def parse_quota(values: pd.Series) -> pd.Series:
+    """'50 + 2' (general + school-first quota) -> 52.0; plain numbers pass through"""
+    parts = values.astype('string').str.extract(r'^\s*(\d+)(?:\s*\+\s*(\d+))?\s*$')
+    base = pd.to_numeric(parts[0], errors='coerce')
+    extra = pd.to_numeric(parts[1], errors='coerce').fillna(0)
+    return (base + extra).astype('float64')
+
+
+def clean_programs(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply the one-off typing and cleaning every consumer used to redo per page view"""
+    df = df.copy()
+    for col in TEXT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].str.strip()
+    if FEE_COLUMN in df.columns:
+        df[FEE_COLUMN] = parse_turkish_number(df[FEE_COLUMN])
+    for col in QUOTA_COLUMNS:
+        if col in df.columns:
+            df[col] = parse_quota(df[col])
+    for col in RANK_COLUMNS + SCORE_COLUMNS + PLACED_COLUMNS + EXTRA_QUOTA_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    return df.reset_index(drop=True)
+
+
+def _source_fingerprint(path: str) -> Dict[bytes, bytes]:
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return {
+        _META_SOURCE_HASH: digest.hexdigest().encode(),
+        _META_SOURCE_SIZE: str(stat.st_size).encode(),
+        _META_SOURCE_MTIME: str(stat.st_mtime_ns).encode(),
+    }
+
+
+def build_snapshot(csv_path: str = PROGRAMS_CSV,
+                   snapshot_path: str = PROGRAMS_SNAPSHOT) -> pd.DataFrame:
+    """Parse the CSV, clean it and atomically write the Parquet snapshot"""
+    from .forecast import fit_forecast
+
+    fingerprint = _source_fingerprint(csv_path)
+    df = clean_programs(pd.read_csv(csv_path))
+    # Next-year cutoff forecast, fitted once per dataset version and stored with it
+    df = df.assign(**fit_forecast(df).columns())
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata.update(fingerprint)
+    metadata[_META_FORMAT] = SNAPSHOT_FORMAT.encode()
+    table = table.replace_schema_metadata(metadata)
+
+    directory = os.path.dirname(os.path.abspath(snapshot_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.parquet.tmp')
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, snapshot_path)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+    logger.info(f"Built programs snapshot {snapshot_path} ({len(df)} rows)")
+    return df
+
+
+def _snapshot_is_current(snapshot_path: str, csv_path: str) -> bool:
+    """True when the snapshot was built by this code from the CSV as it is now"""
+    if not os.path.exists(snapshot_path):
+        return False
+    metadata = pq.read_schema(snapshot_path).metadata or {}
+    if metadata.get(_META_FORMAT) != SNAPSHOT_FORMAT.encode():
+        return False
+    if not os.path.exists(csv_path):
+        # Deployments may ship only the snapshot
+        return True
+    stat = os.stat(csv_path)
+    if (metadata.get(_META_SOURCE_SIZE) == str(stat.st_size).encode()
+            and metadata.get(_META_SOURCE_MTIME) == str(stat.st_mtime_ns).encode()):
+        return True
+    # Touched but possibly unchanged (e.g. a fresh checkout): compare contents
+    return metadata.get(_META_SOURCE_HASH) == _source_fingerprint(csv_path)[_META_SOURCE_HASH]
+
+
+@dataclass(frozen=True)
+class ProgramSnapshot:
+    """One immutable version of the programs dataset"""
+    df: pd.DataFrame
+    source_hash: str
+    loaded_at: float
+    _derived: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+    _derived_lock: Any = field(default_factory=threading.RLock, repr=False, compare=False)
+
+    def derived(self, name: str, builder: Callable[[pd.DataFrame], Any]) -> Any:
+        """Structure built from this version once (indexes etc.), dropped with it.
+
+        Builders may call derived() for their own dependencies (reentrant lock).
+        """
+        value = self._derived.get(name)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(name)
+                if value is None:
+                    value = self._derived[name] = builder(self.df)
+        return value
+
+
+def load_snapshot(csv_path: str = PROGRAMS_CSV,
+                  snapshot_path: str = PROGRAMS_SNAPSHOT) -> ProgramSnapshot:
+    """Read the Parquet snapshot, rebuilding it first if the CSV has changed"""
+    if not _snapshot_is_current(snapshot_path, csv_path):
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(csv_path)
+        build_snapshot(csv_path, snapshot_path)
+    table = pq.read_table(snapshot_path, memory_map=True)
+    source_hash = (table.schema.metadata or {}).get(_META_SOURCE_HASH, b'').decode()
+    return ProgramSnapshot(df=table.to_pandas(), source_hash=source_hash, loaded_at=time.time())
+
+
+# Snapshot pinned by ProgramCatalog.pinned() in this context (one script run)
+_pinned_snapshot: ContextVar[Optional[ProgramSnapshot]] = ContextVar(
+    'motikoc_pinned_snapshot', default=None
+)
+
+
+def _source_stat(path: str) -> Optional[Tuple[int, int]]:
+    """(size, mtime_ns) of the CSV, None when it is not there"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class ProgramCatalog:
+    """Process-wide holder of the current programs snapshot.
+
+    The DataFrame is shared across sessions and must be treated as read-only;
+    callers that need to modify it work on a copy or a filtered slice.
+    """
+    _instance = None
+    _lock = threading.Lock()
+    # Index builders run on a reloaded snapshot before it goes live
+    _warmups: List[Callable[[], Any]] = []
+
+    def __init__(self, csv_path: str = PROGRAMS_CSV, snapshot_path: str = PROGRAMS_SNAPSHOT,
+                 reload_interval: float = PROGRAMS_RELOAD_INTERVAL):
+        self.csv_path = csv_path
+        self.snapshot_path = snapshot_path
+        self.reload_interval = reload_interval
+        self._snapshot: Optional[ProgramSnapshot] = None
+        self._load_lock = threading.Lock()
+        # CSV stat the current snapshot was loaded from, and when it was last compared
+        self._loaded_stat: Optional[Tuple[int, int]] = None
+        self._checked_at = time.monotonic()
+        self._reload_lock = threading.Lock()
+        self._reload_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def get_instance(cls) -> 'ProgramCatalog':
+        """Get singleton instance of the catalog"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = ProgramCatalog()
+        return cls._instance
+
+    @classmethod
+    def register_warmup(cls, builder: Callable[[], Any]):
+        """Build `builder` (e.g. get_filter_engine) on every reloaded snapshot before the swap"""
+        if builder not in cls._warmups:
+            cls._warmups.append(builder)
+
+    def snapshot(self) -> ProgramSnapshot:
+        """Snapshot pinned in this context, else the current one (loaded on first use by one thread)"""
+        pinned = _pinned_snapshot.get()
+        if pinned is not None:
+            return pinned
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._load_lock:
+                if self._snapshot is None:
+                    self._loaded_stat = _source_stat(self.csv_path)
+                    self._snapshot = load_snapshot(self.csv_path, self.snapshot_path)
+                snapshot = self._snapshot
+        else:
+            self._check_source()
+        return snapshot
+
+    @contextmanager
+    def pinned(self) -> Iterator[ProgramSnapshot]:
+        """Serve one snapshot to everything inside, even if a reload swaps in a newer one"""
+        ambient = _pinned_snapshot.get()
+        if ambient is not None:
+            yield ambient
+            return
+        token = _pinned_snapshot.set(self.snapshot())
+        try:
+            yield _pinned_snapshot.get()
+        finally:
+            _pinned_snapshot.reset(token)
+
+    def _check_source(self):
+        """Start a background reload when the CSV changed; at most one check per interval"""
+        if self.reload_interval <= 0 or time.monotonic() - self._checked_at < self.reload_interval:
+            return
+        # Concurrent callers skip instead of queueing behind the check
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            self._checked_at = time.monotonic()
+            if self._reload_thread is not None and self._reload_thread.is_alive():
+                return
+            if _source_stat(self.csv_path) in (None, self._loaded_stat):
+                return
+            self._reload_thread = threading.Thread(target=self._reload, name='motikoc-programs-reload',
+                                                   daemon=True)
+            self._reload_thread.start()
+        finally:
+            self._reload_lock.release()
+
+    def _reload(self):
+        """Rebuild and warm a new snapshot off the request path, then swap it in"""
+        try:
+            # Wait until a copy in progress has finished
+            stat = _source_stat(self.csv_path)
+            while True:
+                time.sleep(PROGRAMS_RELOAD_SETTLE)
+                settled = _source_stat(self.csv_path)
+                if settled == stat:
+                    break
+                stat = settled
+            if stat is None:
+                return
+
+            start = time.perf_counter()
+            snapshot = load_snapshot(self.csv_path, self.snapshot_path)
+            if snapshot.source_hash == self._snapshot.source_hash:
+                # Touched but unchanged
+                self._loaded_stat = stat
+                return
+            token = _pinned_snapshot.set(snapshot)
+            try:
+                for builder in self._warmups:
+                    builder()
+            finally:
+                _pinned_snapshot.reset(token)
+            # A plain reference swap: readers see the old or the new snapshot, never a mix
+            self._snapshot = snapshot
+            self._loaded_stat = stat
+            logger.info(f"Reloaded programs snapshot ({len(snapshot.df)} rows) "
+                        f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+        except Exception as e:
+            # Keep serving the old snapshot; the next check retries
+            logger.error(f"Error reloading programs snapshot: {e}")
+
+    def reload(self, wait: bool = True):
+        """Check the CSV now instead of at the next interval"""
+        self._checked_at = float('-inf')
+        self._check_source()
+        thread = self._reload_thread
+        if wait and thread is not None:
+            thread.join()
+
+
+def get_programs() -> pd.DataFrame:
+    """Shared, read-only DataFrame of all programs"""
+    return ProgramCatalog.get_instance().snapshot().df
+
+
+def main(argv: List[str]) -> int:
+    csv_path = argv[0] if argv else PROGRAMS_CSV
+    snapshot_path = argv[1] if len(argv) > 1 else PROGRAMS_SNAPSHOT
+
+    start = time.perf_counter()
+    df = build_snapshot(csv_path, snapshot_path)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    load_snapshot(csv_path, snapshot_path)
+    loaded = time.perf_counter() - start
+    print(f"{len(df)} programs -> {snapshot_path}: built in {built * 1000:.0f} ms, "
+          f"cold load {loaded * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,147 @@
+# university/facets.py
+"""Facet index for the finder and recommender sidebars.
+
+Every facet column is factorized once per snapshot into integer codes over its
+distinct values, sorted the Turkish way. Option counts for the current filters
+are then one ``np.bincount`` over a boolean mask. Counts are disjunctive: a
+facet's counts ignore its own selection, so picking İstanbul still shows how
+many programs Ankara would add. Long option lists are not sent whole. They show
+the most common values, and a search box finds the rest.
+"""
+
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .data import ProgramCatalog
+from .search_index import fold_turkish, program_languages
+
+LANGUAGE_FACET = 'Dil'
+FACET_COLUMNS = ('Şehir', 'Üni.Türü', 'Puan Türü', 'Fakülte')
+# Options listed for a searchable facet before the user types anything
+LAZY_OPTION_LIMIT = 30
+MIN_SEARCH_LENGTH = 2
+# Bounds of the finder's ranking slider
+RANK_COLUMN = 'Başarı Sırası 2023'
+
+
+class _Facet:
+    """Row codes over the sorted distinct values of one facet (-1 = missing)"""
+
+    def __init__(self, values: pd.Series):
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        order = sorted(range(len(uniques)), key=lambda i: fold_turkish(str(uniques[i])))
+        remap = np.empty(len(uniques) + 1, dtype=np.int32)
+        remap[order] = np.arange(len(uniques), dtype=np.int32)
+        remap[-1] = -1
+        self.codes = remap[codes]
+        self.values: List[str] = [str(uniques[i]) for i in order]
+        self.folded = [fold_turkish(value) for value in self.values]
+        self.positions = {value: i for i, value in enumerate(self.values)}
+
+    def mask(self, selected: Sequence[str]) -> np.ndarray:
+        lookup = np.zeros(len(self.values) + 1, dtype=bool)
+        for value in selected:
+            if value in self.positions:
+                lookup[self.positions[value]] = True
+        return lookup[self.codes]
+
+    def counts(self, mask: np.ndarray) -> np.ndarray:
+        codes = self.codes[mask]
+        return np.bincount(codes[codes >= 0], minlength=len(self.values))
+
+
+class FacetIndex:
+    """Facets of one programs snapshot"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.size = len(df)
+        self.facets: Dict[str, _Facet] = {
+            column: _Facet(df[column]) for column in FACET_COLUMNS if column in df.columns
+        }
+        if 'Program Adı' in df.columns:
+            self.facets[LANGUAGE_FACET] = _Facet(program_languages(df['Program Adı']))
+        ranks = pd.to_numeric(df[RANK_COLUMN], errors='coerce') if RANK_COLUMN in df.columns else None
+        self.rank_range: Tuple[int, int] = (0, 100000)
+        if ranks is not None and ranks.notna().any():
+            self.rank_range = (int(ranks.min()), int(ranks.max()))
+
+    def mask(self, selections: Mapping[str, Sequence[str]], exclude: Optional[str] = None,
+             within: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rows passing every facet selection except `exclude`, inside `within` row ids"""
+        if within is None:
+            mask = np.ones(self.size, dtype=bool)
+        else:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[within] = True
+        for facet, selected in selections.items():
+            if selected and facet != exclude and facet in self.facets:
+                mask &= self.facets[facet].mask(selected)
+        return mask
+
+    def options(self, facet: str, mask: np.ndarray, query: str = '',
+                limit: Optional[int] = None, keep: Sequence[str] = ()) -> List[Tuple[str, int]]:
+        """(value, count) for values with matches under `mask`, plus the `keep` values.
+
+        With a `limit`, only the most frequent values matching `query` are returned.
+        """
+        index = self.facets[facet]
+        counts = index.counts(mask)
+        candidates = np.flatnonzero(counts)
+        if query:
+            needle = fold_turkish(query)
+            candidates = np.asarray([i for i in candidates if needle in index.folded[i]], dtype=np.int64)
+        if limit is not None and len(candidates) > limit:
+            top = np.argsort(-counts[candidates], kind='stable')[:limit]
+            candidates = np.sort(candidates[top])
+        chosen = {int(i) for i in candidates}
+        chosen.update(index.positions[value] for value in keep if value in index.positions)
+        return [(index.values[i], int(counts[i])) for i in sorted(chosen)]
+
+
+def get_facet_index() -> FacetIndex:
+    """Facet index of the current programs snapshot, built on first use"""
+    return ProgramCatalog.get_instance().snapshot().derived('facet_index', FacetIndex)
+
+
+ProgramCatalog.register_warmup(get_facet_index)
+
+
+def facet_multiselect(label: str, facet: str, key: str, selections: Mapping[str, Sequence[str]],
+                      within: Optional[np.ndarray] = None, searchable: bool = False,
+                      container=st.sidebar) -> List[str]:
+    """Multiselect over a facet, with counts under the other selections (and `within` rows).
+
+    Searchable facets send at most LAZY_OPTION_LIMIT options: the most frequent
+    ones, or the best matches once something is typed in their search box.
+    """
+    index = get_facet_index()
+    if facet not in index.facets:
+        return []
+    selected = [value for value in st.session_state.get(key, []) if value in index.facets[facet].positions]
+    if st.session_state.get(key) is not None and len(selected) != len(st.session_state[key]):
+        # Values from an older snapshot would make the widget fail
+        st.session_state[key] = selected
+
+    query, limit = '', None
+    if searchable:
+        query = container.text_input(
+            f"{label} Ara",
+            placeholder=f"En az {MIN_SEARCH_LENGTH} harf yazın",
+            key=f"{key}_search"
+        ).strip()
+        if len(query) < MIN_SEARCH_LENGTH:
+            query = ''
+        limit = LAZY_OPTION_LIMIT
+
+    mask = index.mask(selections, exclude=facet, within=within)
+    options = index.options(facet, mask, query, limit, keep=selected)
+    counts = dict(options)
+    return container.multiselect(
+        label,
+        options=[value for value, _ in options],
+        format_func=lambda value: f"{value} ({counts.get(value, 0)})",
+        key=key
+    )
@@ -0,0 +1,96 @@
+# university/filter_benchmark.py
+"""Filter latency: the old copy-and-narrow _apply_filters vs ProgramFilterEngine.
+
+Run with ``python -m features.university.filter_benchmark [rounds]`` from the app
+directory. Each query set is timed on the real dataset and on a 10x replica:
+engine row ids alone, plus materializing them with iloc, and a top-50 selection.
+"""
+
+import re
+import statistics
+import sys
+import time
+from typing import Callable, List, Tuple
+
+import pandas as pd
+
+from .data import get_programs
+from .filter_engine import ProgramFilterEngine
+from .recommender import FilterCriteria
+
+QUERIES: List[Tuple[str, FilterCriteria]] = [
+    ('city + program', FilterCriteria(cities=['İstanbul'], programs=['Bilgisayar Mühendisliği'])),
+    ('rank range', FilterCriteria(min_ranking=10000, max_ranking=80000)),
+    ('score type + fee', FilterCriteria(score_types=['SAY'], max_fee=250000)),
+    ('everything', FilterCriteria(
+        cities=['İstanbul', 'Ankara'], university_types=['DEVLET'], score_types=['EA'],
+        faculty_types=['Hukuk'], max_ranking=200000, min_quota=50, min_score=300,
+    )),
+    ('no filters', FilterCriteria()),
+]
+
+
+def legacy_apply_filters(df: pd.DataFrame, criteria: FilterCriteria) -> pd.DataFrame:
+    """The per-filter regex implementation both pages used before the engine"""
+    filtered_df = df.copy()
+    if criteria.min_ranking is not None:
+        filtered_df = filtered_df[filtered_df['Başarı Sırası 2023'] >= criteria.min_ranking]
+    if criteria.max_ranking is not None:
+        filtered_df = filtered_df[filtered_df['Başarı Sırası 2023'] <= criteria.max_ranking]
+    for column, values in (('Üniversite', criteria.universities), ('Program Adı', criteria.programs),
+                           ('Şehir', criteria.cities), ('Puan Türü', criteria.score_types),
+                           ('Program Adı', criteria.language_types), ('Fakülte', criteria.faculty_types),
+                           ('Üni.Türü', criteria.university_types)):
+        if values:
+            pattern = '|'.join(map(re.escape, values))
+            filtered_df = filtered_df[filtered_df[column].str.contains(pattern, case=False, na=False)]
+    if criteria.scholarship_percentage is not None:
+        scholarship_str = f"%{criteria.scholarship_percentage}"
+        filtered_df = filtered_df[filtered_df['Program Adı'].str.contains(scholarship_str, case=False, na=False)]
+    if criteria.max_fee is not None:
+        filtered_df['Ücret (KDV Hariç)'] = pd.to_numeric(filtered_df['Ücret (KDV Hariç)'], errors='coerce').fillna(0)
+        filtered_df = filtered_df[filtered_df['Ücret (KDV Hariç)'] <= criteria.max_fee]
+    if criteria.min_quota is not None:
+        filtered_df['Kontenjan 2023'] = pd.to_numeric(filtered_df['Kontenjan 2023'], errors='coerce').fillna(0)
+        filtered_df = filtered_df[filtered_df['Kontenjan 2023'] >= criteria.min_quota]
+    if criteria.min_score is not None:
+        filtered_df = filtered_df[filtered_df['Taban Puan 2023'] >= criteria.min_score]
+    if criteria.max_score is not None:
+        filtered_df = filtered_df[filtered_df['Taban Puan 2023'] <= criteria.max_score]
+    return filtered_df.sort_values('Başarı Sırası 2023', ascending=True)
+
+
+def _time_ms(func: Callable[[], object], rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main(rounds: int = 20) -> int:
+    base = get_programs()
+    print(f"{'data':<6} {'query':<18} {'rows':>7} {'legacy ms':>10} {'engine ms':>10} "
+          f"{'+iloc ms':>9} {'top-50 ms':>10}")
+    for scale in (1, 10):
+        df = base if scale == 1 else pd.concat([base] * scale, ignore_index=True)
+        engine = ProgramFilterEngine(df)
+        for name, criteria in QUERIES:
+            legacy = legacy_apply_filters(df, criteria)
+            rows = engine.select(criteria)
+            # Casing-sensitive regex can only miss rows the folded index finds
+            if not set(legacy.index).issubset(rows.tolist()):
+                print(f"MISMATCH {scale}x {name}")
+                return 1
+            legacy_ms = _time_ms(lambda: legacy_apply_filters(df, criteria), rounds)
+            engine_ms = _time_ms(lambda: engine.select(criteria), rounds)
+            frame_ms = _time_ms(lambda: df.iloc[engine.select(criteria)], rounds)
+            top_ms = _time_ms(lambda: engine.select(criteria, limit=50), rounds)
+            print(f"{scale:>2}x    {name:<18} {len(rows):>7} {legacy_ms:>10.2f} {engine_ms:>10.2f} "
+                  f"{frame_ms:>9.2f} {top_ms:>10.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
@@ -0,0 +1,189 @@
+# university/filter_engine.py
+"""Vectorized FilterCriteria evaluation over the typed programs snapshot.
+
+All criteria are compiled into one boolean mask over NumPy columns extracted
+once per snapshot. The engine returns ordered row ids; rows are only
+materialized (``df.iloc``) for what is actually displayed.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data import FEE_COLUMN, ProgramCatalog
+from .forecast import FORECAST_RANK_COLUMN, FORECAST_SCORE_COLUMN, FORECAST_YEAR
+from .fuzzy_match import FuzzyMatcher
+from .search_index import ProgramTokenIndex, fold_turkish, program_languages
+
+RANK_COLUMN = 'Başarı Sırası 2023'
+SCORE_COLUMN = 'Taban Puan 2023'
+QUOTA_COLUMN = 'Kontenjan 2023'
+# Low-cardinality columns matched by folded substring, as the old regex filters did
+CATEGORY_COLUMNS = ('Puan Türü', 'Üni.Türü')
+
+
+def _float_column(df: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+class _CategoryColumn:
+    """Codes plus folded distinct values, so a match is one lookup per distinct value"""
+
+    def __init__(self, values: pd.Series):
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        self.codes = codes
+        self.folded = [fold_turkish(str(value)) for value in uniques]
+
+    def mask(self, patterns: Iterable[str]) -> np.ndarray:
+        folded_patterns = [fold_turkish(p) for p in patterns if p]
+        # The extra trailing False is what code -1 (missing value) looks up
+        lookup = np.array(
+            [any(p in value for p in folded_patterns) for value in self.folded] + [False]
+        )
+        return lookup[self.codes]
+
+    def equals(self, values: Iterable[str]) -> np.ndarray:
+        """Rows whose folded value is one of `values`"""
+        wanted = {fold_turkish(v) for v in values if v}
+        lookup = np.array([value in wanted for value in self.folded] + [False])
+        return lookup[self.codes]
+
+
+class ProgramFilterEngine:
+    """Compiled filter over one programs snapshot"""
+
+    def __init__(self, df: pd.DataFrame, text_index: Optional[ProgramTokenIndex] = None,
+                 fuzzy: Optional[FuzzyMatcher] = None):
+        self.size = len(df)
+        self.text_index = text_index or ProgramTokenIndex(df)
+        self.fuzzy = fuzzy
+        self.rank = _float_column(df, RANK_COLUMN)
+        self.score = _float_column(df, SCORE_COLUMN)
+        # Rank/score bounds can target the forecast year instead of the last known one
+        self.forecast_rank = _float_column(df, FORECAST_RANK_COLUMN)
+        self.forecast_score = _float_column(df, FORECAST_SCORE_COLUMN)
+        # Missing fee/quota count as 0, matching the old fillna(0) behaviour
+        self.fee = np.nan_to_num(_float_column(df, FEE_COLUMN), nan=0.0)
+        self.quota = np.nan_to_num(_float_column(df, QUOTA_COLUMN), nan=0.0)
+        if 'Program Adı' in df.columns:
+            scholarship = df['Program Adı'].str.extract(r'%\s*(\d+)', expand=False)
+            scholarship = pd.to_numeric(scholarship, errors='coerce')
+            # '(Burslu)' without a percentage is a full scholarship
+            full = df['Program Adı'].str.contains('(Burslu)', regex=False, na=False)
+            self.scholarship = scholarship.mask(full & scholarship.isna(), 100.0).to_numpy(
+                dtype=np.float64, na_value=np.nan)
+        else:
+            self.scholarship = np.full(self.size, np.nan)
+        self.categories: Dict[str, _CategoryColumn] = {
+            column: _CategoryColumn(df[column]) for column in CATEGORY_COLUMNS if column in df.columns
+        }
+        # Same suffix codes as the 'Dil' facet, so its counts match the results
+        self.languages = _CategoryColumn(program_languages(df['Program Adı'])) \
+            if 'Program Adı' in df.columns else None
+
+    def _resolved(self, column: str, phrases: Iterable[str]) -> List[str]:
+        """Phrases that match no row replaced by their closest canonical names"""
+        if not phrases or self.fuzzy is None:
+            return list(phrases or [])
+        resolved = []
+        for phrase in phrases:
+            rows = self.text_index.match(column, [phrase])
+            if rows is None or len(rows):
+                resolved.append(phrase)
+            else:
+                resolved.extend(match.name for match in self.fuzzy.resolve(column, phrase))
+        # Nothing close either: keep the phrase so the filter still matches nothing
+        return resolved or list(phrases)
+
+    def _text_rows(self, criteria: Any) -> Optional[np.ndarray]:
+        return self.text_index.search({
+            'Üniversite': self._resolved('Üniversite', criteria.universities),
+            'Program Adı': self._resolved('Program Adı', criteria.programs),
+            'Şehir': criteria.cities,
+            'Fakülte': criteria.faculty_types,
+        })
+
+    def mask(self, criteria: Any, within: Optional[np.ndarray] = None) -> np.ndarray:
+        """One boolean flag per snapshot row; `within` restricts to those row ids"""
+        if within is None:
+            mask = np.ones(self.size, dtype=bool)
+        else:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[within] = True
+
+        forecast = criteria.target_year == FORECAST_YEAR
+        rank = self.forecast_rank if forecast else self.rank
+        score = self.forecast_score if forecast else self.score
+        # NaN compares False, so rows without a value drop out of range filters
+        with np.errstate(invalid='ignore'):
+            if criteria.min_ranking is not None:
+                mask &= rank >= criteria.min_ranking
+            if criteria.max_ranking is not None:
+                mask &= rank <= criteria.max_ranking
+            if criteria.min_score is not None:
+                mask &= score >= criteria.min_score
+            if criteria.max_score is not None:
+                mask &= score <= criteria.max_score
+            if criteria.max_fee is not None:
+                mask &= self.fee <= criteria.max_fee
+            if criteria.min_quota is not None:
+                mask &= self.quota >= criteria.min_quota
+            if criteria.scholarship_percentage is not None:
+                mask &= self.scholarship == criteria.scholarship_percentage
+
+        for column, patterns in (('Puan Türü', criteria.score_types),
+                                 ('Üni.Türü', criteria.university_types)):
+            if patterns and column in self.categories:
+                mask &= self.categories[column].mask(patterns)
+
+        if criteria.language_types and self.languages is not None:
+            mask &= self.languages.equals(criteria.language_types)
+
+        rows = self._text_rows(criteria)
+        if rows is not None:
+            text_mask = np.zeros(self.size, dtype=bool)
+            text_mask[rows] = True
+            mask &= text_mask
+        return mask
+
+    def order(self, rows: np.ndarray, limit: Optional[int] = None) -> np.ndarray:
+        """Sort row ids by rank (best first, missing last); only the top `limit` if given"""
+        keys = self.rank[rows]
+        if limit is not None and limit < len(rows):
+            # Keep every row tied with the limit-th rank, so ties break by row id
+            # exactly as in the full sort and pages of different sizes agree
+            kth = np.partition(keys, limit - 1)[limit - 1] if limit else -np.inf
+            if not np.isnan(kth):
+                top = np.flatnonzero(keys <= kth)
+                return rows[top[np.argsort(keys[top], kind='stable')][:limit]]
+        return rows[np.argsort(keys, kind='stable')][:limit]
+
+    def select(self, criteria: Any, within: Optional[np.ndarray] = None,
+               limit: Optional[int] = None) -> np.ndarray:
+        """Row ids matching `criteria`, ordered by Başarı Sırası"""
+        return self.order(np.flatnonzero(self.mask(criteria, within)), limit)
+
+
+def _build_engine(snapshot) -> ProgramFilterEngine:
+    return ProgramFilterEngine(snapshot.df, snapshot.derived('token_index', ProgramTokenIndex),
+                               snapshot.derived('fuzzy_matcher', FuzzyMatcher))
+
+
+def get_filter_engine() -> ProgramFilterEngine:
+    """Filter engine of the current programs snapshot, built on first use"""
+    snapshot = ProgramCatalog.get_instance().snapshot()
+    return snapshot.derived('filter_engine', lambda _df: _build_engine(snapshot))
+
+
+ProgramCatalog.register_warmup(get_filter_engine)
+
+
+def filter_programs(df: pd.DataFrame, criteria: Any, limit: Optional[int] = None) -> pd.DataFrame:
+    """Rows of `df` (the shared snapshot or a slice of it) matching `criteria`, best rank first"""
+    snapshot = ProgramCatalog.get_instance().snapshot()
+    engine = snapshot.derived('filter_engine', lambda _df: _build_engine(snapshot))
+    within = None if df is snapshot.df else df.index.to_numpy()
+    return snapshot.df.iloc[engine.select(criteria, within, limit)]
@@ -4,8 +4,12 @@ import streamlit as st
 import pandas as pd
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass ,field
-import re
 from .recommender import UniversityRecommenderInterface
+from .data import ProgramCatalog, get_programs
+from .facets import LANGUAGE_FACET, facet_multiselect, get_facet_index
+from .filter_engine import filter_programs
+from .forecast import FORECAST_RANK_BAND, FORECAST_RANK_COLUMN, FORECAST_YEAR
+from .results_grid import ResultSet, show_results_grid
 
 
 @dataclass
@@ -24,6 +28,8 @@ class FilterCriteria:
     language_types: List[str] = field(default_factory=list)
     min_score: Optional[float] = None
     max_score: Optional[float] = None
+    # FORECAST_YEAR: rank/score bounds apply to the forecast cutoffs
+    target_year: Optional[int] = None
     
     def __post_init__(self):
         self.universities = self.universities or []
@@ -41,15 +47,13 @@ class UniversityFinder:
 
     def _load_data(self) -> pd.DataFrame:
         """
-        Load university data from a CSV file.
+        Get the shared university data.
 
         Returns:
-            pd.DataFrame: The loaded university programs data.
+            pd.DataFrame: The loaded university programs data (read-only).
         """
         try:
-            df = pd.read_csv(r'C:\Users\pc\Desktop\danisiyorum\motiKocApp\programs_data_with_links.csv')
-            # Perform any necessary preprocessing here
-            return df
+            return get_programs()
         except FileNotFoundError:
             st.error("Veri dosyası bulunamadı: 'programs_data_with_links.csv'. Lütfen dosyanın doğru konumda olduğundan emin olun.")
             return pd.DataFrame()
@@ -68,25 +72,19 @@ class UniversityFinder:
 
         criteria = FilterCriteria()
 
-        # City Filter
-        if 'Şehir' in self.df.columns:
-            criteria.cities = st.sidebar.multiselect(
-                "Şehir Seçin",
-                options=sorted(self.df['Şehir'].dropna().unique()),
-                key="finder_city_filter"
-            )
-        else:
-            st.sidebar.warning("Veri çerçevesinde 'Şehir' sütunu bulunamadı.")
-
-        # University Type Filter
-        if 'Üni.Türü' in self.df.columns:
-            criteria.university_types = st.sidebar.multiselect(
-                "Üniversite Türü",
-                options=sorted(self.df['Üni.Türü'].dropna().unique()),
-                key="finder_university_type_filter"
-            )
-        else:
-            st.sidebar.warning("Veri çerçevesinde 'Üni.Türü' sütunu bulunamadı.")
+        # Facet counts follow the other selections
+        keys = {
+            'Şehir': "finder_city_filter",
+            'Üni.Türü': "finder_university_type_filter",
+            'Puan Türü': "finder_score_type_filter",
+            'Fakülte': "finder_faculty_type_filter",
+            LANGUAGE_FACET: "finder_language_type_filter",
+        }
+        selections = {facet: st.session_state.get(key) or [] for facet, key in keys.items()}
+
+        criteria.cities = facet_multiselect("Şehir Seçin", 'Şehir', keys['Şehir'], selections)
+        criteria.university_types = facet_multiselect(
+            "Üniversite Türü", 'Üni.Türü', keys['Üni.Türü'], selections)
 
         # Program Name Filter
         if 'Program Adı' in self.df.columns:
@@ -101,8 +99,7 @@ class UniversityFinder:
 
         # Ranking Range Slider
         if 'Başarı Sırası 2023' in self.df.columns:
-            min_ranking = int(self.df['Başarı Sırası 2023'].min()) if not self.df['Başarı Sırası 2023'].isnull().all() else 0
-            max_ranking = int(self.df['Başarı Sırası 2023'].max()) if not self.df['Başarı Sırası 2023'].isnull().all() else 100000
+            min_ranking, max_ranking = get_facet_index().rank_range
             criteria.min_ranking, criteria.max_ranking = st.sidebar.slider(
                 "Başarı Sırası Aralığı",
                 min_value=min_ranking,
@@ -110,18 +107,21 @@ class UniversityFinder:
                 value=(min_ranking, max_ranking),
                 key="finder_ranking_filter"
             )
+            if st.sidebar.checkbox(
+                f"Sıra ve puan sınırlarını {FORECAST_YEAR} tahminine uygula",
+                key="finder_forecast_filter",
+                help="Başarı sırası ve taban puan sınırları geçmiş yıl yerine tahmini taban değerlerle karşılaştırılır."
+            ):
+                criteria.target_year = FORECAST_YEAR
+                # Forecasts can fall outside the observed range; the slider's ends stay open
+                if criteria.min_ranking == min_ranking:
+                    criteria.min_ranking = None
+                if criteria.max_ranking == max_ranking:
+                    criteria.max_ranking = None
         else:
             st.sidebar.warning("Veri çerçevesinde 'Başarı Sırası 2023' sütunu bulunamadı.")
 
-        # Score Type Filter
-        if 'Puan Türü' in self.df.columns:
-            criteria.score_types = st.sidebar.multiselect(
-                "Puan Türü",
-                options=sorted(self.df['Puan Türü'].dropna().unique()),
-                key="finder_score_type_filter"
-            )
-        else:
-            st.sidebar.warning("Veri çerçevesinde 'Puan Türü' sütunu bulunamadı.")
+        criteria.score_types = facet_multiselect("Puan Türü", 'Puan Türü', keys['Puan Türü'], selections)
 
         # Scholarship Percentage
         scholarship_input = st.sidebar.text_input(
@@ -135,15 +135,8 @@ class UniversityFinder:
             except ValueError:
                 st.sidebar.warning("Geçerli bir burs yüzdesi girin.")
 
-        # Faculty Type Filter
-        if 'Fakülte' in self.df.columns:
-            criteria.faculty_types = st.sidebar.multiselect(
-                "Fakülte Türü",
-                options=sorted(self.df['Fakülte'].dropna().unique()),
-                key="finder_faculty_type_filter"
-            )
-        else:
-            st.sidebar.warning("Veri çerçevesinde 'Fakülte' sütunu bulunamadı.")
+        criteria.faculty_types = facet_multiselect(
+            "Fakülte Türü", 'Fakülte', keys['Fakülte'], selections, searchable=True)
 
         # Maximum Fee
         fee_input = st.sidebar.text_input(
@@ -169,15 +162,9 @@ class UniversityFinder:
             except ValueError:
                 st.sidebar.warning("Geçerli bir kontenjan değeri girin.")
 
-        # Language Preference
-        if 'Program Adı' in self.df.columns:
-            criteria.language_types = st.sidebar.multiselect(
-                "Dil Tercihi",
-                options=sorted(self.df['Program Adı'].dropna().unique()),  # Assuming language info is in Program Adı
-                key="finder_language_type_filter"
-            )
-        else:
-            st.sidebar.warning("Veri çerçevesinde 'Program Adı' sütunu bulunamadı.")
+        # Teaching language, from the '(İngilizce)' style program name suffixes
+        criteria.language_types = facet_multiselect(
+            "Dil Tercihi", LANGUAGE_FACET, keys[LANGUAGE_FACET], selections)
 
         # Minimum and Maximum Score
         min_score_input = st.sidebar.text_input(
@@ -215,75 +202,9 @@ class UniversityFinder:
         Returns:
             pd.DataFrame: The filtered university programs data.
         """
-        filtered_df = df.copy()
-
         try:
-            # Ranking Filters
-            if criteria.min_ranking is not None:
-                filtered_df = filtered_df[filtered_df['Başarı Sırası 2023'] >= criteria.min_ranking]
-            if criteria.max_ranking is not None:
-                filtered_df = filtered_df[filtered_df['Başarı Sırası 2023'] <= criteria.max_ranking]
-
-            # Universities Filter
-            if criteria.universities:
-                pattern = '|'.join(map(re.escape, criteria.universities))
-                filtered_df = filtered_df[filtered_df['Üniversite'].str.contains(pattern, case=False, na=False)]
-
-            # Programs Filter
-            if criteria.programs:
-                pattern = '|'.join(map(re.escape, criteria.programs))
-                filtered_df = filtered_df[filtered_df['Program Adı'].str.contains(pattern, case=False, na=False)]
-                print("after filtering programs:", len(filtered_df))
-
-            # Cities Filter
-            if criteria.cities:
-                pattern = '|'.join(map(re.escape, criteria.cities))
-                filtered_df = filtered_df[filtered_df['Şehir'].str.contains(pattern, case=False, na=False)]
-
-            # Score Types Filter
-            if criteria.score_types:
-                pattern = '|'.join(map(re.escape, criteria.score_types))
-                filtered_df = filtered_df[filtered_df['Puan Türü'].str.contains(pattern, case=False, na=False)]
-
-            # Language Types Filter
-            if criteria.language_types:
-                language_pattern = '|'.join(map(re.escape, criteria.language_types))
-                filtered_df = filtered_df[filtered_df['Program Adı'].str.contains(language_pattern, case=False, na=False)]
-
-            # Scholarship Percentage Filter
-            if criteria.scholarship_percentage is not None:
-                scholarship_str = f"%{criteria.scholarship_percentage}"
-                filtered_df = filtered_df[filtered_df['Program Adı'].str.contains(scholarship_str, case=False, na=False)]
-
-            # Faculty Types Filter
-            if criteria.faculty_types:
-                pattern = '|'.join(map(re.escape, criteria.faculty_types))
-                filtered_df = filtered_df[filtered_df['Fakülte'].str.contains(pattern, case=False, na=False)]
-
-            # University Types Filter
-            if criteria.university_types:
-                pattern = '|'.join(map(re.escape, criteria.university_types))
-                filtered_df = filtered_df[filtered_df['Üni.Türü'].str.contains(pattern, case=False, na=False)]
-
-            # Maximum Fee Filter
-            if criteria.max_fee is not None:
-                filtered_df['Ücret (KDV Hariç)'] = pd.to_numeric(filtered_df['Ücret (KDV Hariç)'], errors='coerce').fillna(0)
-                filtered_df = filtered_df[filtered_df['Ücret (KDV Hariç)'] <= criteria.max_fee]
-
-            # Minimum Quota Filter
-            if criteria.min_quota is not None:
-                filtered_df['Kontenjan 2023'] = pd.to_numeric(filtered_df['Kontenjan 2023'], errors='coerce').fillna(0)
-                filtered_df = filtered_df[filtered_df['Kontenjan 2023'] >= criteria.min_quota]
-
-            # Taban Puan Filters
-            if criteria.min_score is not None:
-                filtered_df = filtered_df[filtered_df['Taban Puan 2023'] >= criteria.min_score]
-            if criteria.max_score is not None:
-                filtered_df = filtered_df[filtered_df['Taban Puan 2023'] <= criteria.max_score]
-
-            # Sorting
-            filtered_df = filtered_df.sort_values('Başarı Sırası 2023', ascending=True)
-            return filtered_df
+            # One vectorized pass over the shared snapshot; no frame copies
+            return filter_programs(df, criteria)
 
         except Exception as e:
             print(f"Error in applying filters: {e}")
@@ -310,12 +231,36 @@ class UniversityFinder:
         if st.button("Ara"):
             with st.spinner("Sonuçlar aranıyor..."):
                 filtered_df = self._apply_filters(self.df, criteria)
-
-                if filtered_df.empty:
-                    st.warning("Arama kriterlerinize uygun üniversite veya program bulunamadı.")
-                else:
-                    st.success(f"{len(filtered_df)} sonuç bulundu.")
-                    st.dataframe(filtered_df)
+                # Keep only the row ids in the session; pages are served from the snapshot
+                st.session_state.finder_results = ResultSet.from_frame(filtered_df)
+
+        result = st.session_state.get('finder_results')
+        if result is not None:
+            if not len(result):
+                st.warning("Arama kriterlerinize uygun üniversite veya program bulunamadı.")
+            else:
+                st.success(f"{len(result)} sonuç bulundu.")
+                display_columns = [
+                    'Üniversite', 'Fakülte', 'Program Adı', 'Şehir', 'Üni.Türü', 'Puan Türü',
+                    'Başarı Sırası 2023', 'Başarı Sırası 2022', 'Taban Puan 2023', 'Taban Puan 2022',
+                    'Kontenjan 2023', 'Ücret (KDV Hariç)', 'YÖP Link'
+                ]
+                if criteria.target_year == FORECAST_YEAR:
+                    display_columns[8:8] = [FORECAST_RANK_COLUMN, *FORECAST_RANK_BAND]
+                show_results_grid(
+                    result,
+                    key="finder_results_grid",
+                    columns=display_columns,
+                    column_config={
+                        'Başarı Sırası 2023': st.column_config.NumberColumn(format='%d'),
+                        'Başarı Sırası 2022': st.column_config.NumberColumn(format='%d'),
+                        FORECAST_RANK_COLUMN: st.column_config.NumberColumn(format='%d'),
+                        FORECAST_RANK_BAND[0]: st.column_config.NumberColumn(format='%d'),
+                        FORECAST_RANK_BAND[1]: st.column_config.NumberColumn(format='%d'),
+                        'Ücret (KDV Hariç)': st.column_config.NumberColumn(format='%.2f ₺'),
+                        'YÖP Link': st.column_config.LinkColumn(),
+                    }
+                )
 
         # Footer
         st.markdown("""
@@ -331,5 +276,7 @@ def show_university_finder():
         st.error("Gemini API key is missing. Please set it in the secrets.")
         return
 
-    interface = UniversityRecommenderInterface(api_key=api_key)
-    interface.run()
\ No newline at end of file
+    # The whole run sees one dataset version, even if a reload lands meanwhile
+    with ProgramCatalog.get_instance().pinned():
+        interface = UniversityRecommenderInterface(api_key=api_key)
+        interface.run()
\ No newline at end of file
@@ -0,0 +1,205 @@
+# university/forecast.py
+"""Next-year cutoff forecast for every program, with uncertainty bands.
+
+Both the cutoff rank (in logs) and the base score are fitted by one weighted
+least-squares trend per program. All programs are fitted at once over
+(programs x years) NumPy arrays. The forecast is the recency-weighted level
+plus a damped trend. The cutoff rank also shifts with the change in quota. The
+spread is the program's own year-to-year wobble on top of a floor. It widens
+for programs that did not fill their quota, because their cutoff is just the
+last applicant who happened to apply.
+
+The forecast is fitted when the Parquet snapshot is built and stored there as
+plain columns (``Tahmini Başarı Sırası 2025`` with ``Alt``/``Üst`` bands, and
+the same for ``Tahmini Taban Puan``). Loading costs nothing, and filters and
+admission probabilities can target the year the student applies for.
+
+Backtest and benchmark with ``python -m features.university.forecast``.
+"""
+
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data import PLACED_COLUMNS, QUOTA_COLUMNS, RANK_COLUMNS, SCORE_COLUMNS, YEARS, ProgramCatalog
+
+FORECAST_YEAR = YEARS[0] + 1
+# Recency weights for YEARS (newest first); years without a value drop out
+YEAR_WEIGHTS = (0.5, 0.3, 0.2)
+# Share of the fitted trend carried into the forecast year
+TREND_DAMPING = 0.5
+# Log cutoff change per log quota change (fitted on 2022 -> 2023: ~0.14)
+QUOTA_ELASTICITY = 0.15
+# Spread of log cutoff ranks: floor for every program, and for a single year of history
+SIGMA_FLOOR = 0.15
+SIGMA_SINGLE_YEAR = 0.25
+# Same for base scores, in points (80% band covers 80% of 2024 scores fitted on 2022-2023)
+SCORE_SIGMA_FLOOR = 14.0
+SCORE_SIGMA_SINGLE_YEAR = 18.0
+# Programs placing fewer than this share of their quota did not fill
+UNDERFILLED_SHARE = 0.8
+# Extra log-rank spread of a program that did not fill
+UNDERFILLED_SIGMA = 0.35
+# Bands cover the central 80% of the forecast distribution
+BAND = 0.8
+_BAND_Z = 1.2815515655446004
+
+FORECAST_RANK_COLUMN = f'Tahmini Başarı Sırası {FORECAST_YEAR}'
+FORECAST_SCORE_COLUMN = f'Tahmini Taban Puan {FORECAST_YEAR}'
+FORECAST_RANK_BAND = (f'{FORECAST_RANK_COLUMN} Alt', f'{FORECAST_RANK_COLUMN} Üst')
+FORECAST_SCORE_BAND = (f'{FORECAST_SCORE_COLUMN} Alt', f'{FORECAST_SCORE_COLUMN} Üst')
+FORECAST_COLUMNS = (FORECAST_RANK_COLUMN, *FORECAST_RANK_BAND, FORECAST_SCORE_COLUMN, *FORECAST_SCORE_BAND)
+
+
+def _float_columns(df: pd.DataFrame, columns: Sequence[str]) -> np.ndarray:
+    """(rows x columns) float matrix; missing columns are all NaN"""
+    return np.column_stack([
+        pd.to_numeric(df[c], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        if c in df.columns else np.full(len(df), np.nan) for c in columns
+    ])
+
+
+def _trend(values: np.ndarray, years: np.ndarray, target_year: float) -> Tuple[np.ndarray, ...]:
+    """Damped weighted-trend forecast per row, its spread and the number of known years"""
+    known = ~np.isnan(values)
+    weights = np.where(known, np.asarray(YEAR_WEIGHTS[:len(years)]), 0.0)
+    history = known.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weights = weights / weights.sum(axis=1)[:, None]
+        filled = np.nan_to_num(values)
+        level = (weights * filled).sum(axis=1)
+        mean_year = (weights * years).sum(axis=1)
+        dx = np.where(known, years - mean_year[:, None], 0.0)
+        dy = np.where(known, filled - level[:, None], 0.0)
+        slope = np.where(history > 1, (weights * dx * dy).sum(axis=1) / (weights * dx * dx).sum(axis=1), 0.0)
+        spread = np.sqrt((weights * dy * dy).sum(axis=1))
+    forecast = level + TREND_DAMPING * slope * (target_year - mean_year)
+    return np.where(history > 0, forecast, np.nan), spread, history
+
+
+@dataclass
+class CutoffForecast:
+    """Per-program forecast for `year`, aligned with the snapshot rows"""
+    year: int
+    log_rank: np.ndarray
+    log_rank_sigma: np.ndarray
+    score: np.ndarray
+    score_sigma: np.ndarray
+    history_years: np.ndarray
+
+    @property
+    def rank(self) -> np.ndarray:
+        return np.exp(self.log_rank)
+
+    def rank_band(self) -> Tuple[np.ndarray, np.ndarray]:
+        return (np.exp(self.log_rank - _BAND_Z * self.log_rank_sigma),
+                np.exp(self.log_rank + _BAND_Z * self.log_rank_sigma))
+
+    def score_band(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.score - _BAND_Z * self.score_sigma, self.score + _BAND_Z * self.score_sigma
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Snapshot columns (FORECAST_COLUMNS) of this forecast"""
+        (rank_low, rank_high), (score_low, score_high) = self.rank_band(), self.score_band()
+        return dict(zip(FORECAST_COLUMNS, (self.rank, rank_low, rank_high,
+                                           self.score, score_low, score_high)))
+
+
+def fit_forecast(df: pd.DataFrame, years: Sequence[int] = YEARS,
+                 target_year: int = FORECAST_YEAR) -> CutoffForecast:
+    """Fit every program of `df` on `years` (newest first) and forecast `target_year`"""
+    columns = {year: i for i, year in enumerate(YEARS)}
+    picked = [columns[year] for year in years]
+    year_values = np.asarray(years, dtype=np.float64)
+    ranks = _float_columns(df, [RANK_COLUMNS[i] for i in picked])
+    scores = _float_columns(df, [SCORE_COLUMNS[i] for i in picked])
+    quotas = _float_columns(df, [QUOTA_COLUMNS[i] for i in picked])
+    placed = _float_columns(df, [PLACED_COLUMNS[i] for i in picked])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_ranks = np.log(np.where(ranks > 0, ranks, np.nan))
+    log_rank, spread, history = _trend(log_ranks, year_values, target_year)
+
+    # Quota change between the newest cutoff year and the newest quota we know
+    rows = np.arange(len(df))
+    reference_quota = quotas[rows, np.argmax(~np.isnan(log_ranks), axis=1)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        quota_shift = np.log(quotas[:, 0] / reference_quota)
+    log_rank += QUOTA_ELASTICITY * np.where(np.isfinite(quota_shift), quota_shift, 0.0)
+    log_rank_sigma = np.where(history > 1, np.sqrt(SIGMA_FLOOR ** 2 + spread ** 2), SIGMA_SINGLE_YEAR)
+
+    # Fill rate of the newest year with placement data
+    has_fill = ~np.isnan(placed) & (quotas > 0)
+    newest_fill = np.argmax(has_fill, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fill = np.where(has_fill.any(axis=1),
+                        placed[rows, newest_fill] / quotas[rows, newest_fill], np.nan)
+    underfilled = fill < UNDERFILLED_SHARE
+    log_rank_sigma = np.where(underfilled, np.sqrt(log_rank_sigma ** 2 + UNDERFILLED_SIGMA ** 2),
+                              log_rank_sigma)
+
+    score, score_spread, score_history = _trend(scores, year_values, target_year)
+    score_sigma = np.where(score_history > 1, np.sqrt(SCORE_SIGMA_FLOOR ** 2 + score_spread ** 2),
+                           SCORE_SIGMA_SINGLE_YEAR)
+    return CutoffForecast(year=target_year, log_rank=log_rank, log_rank_sigma=log_rank_sigma,
+                          score=score, score_sigma=np.where(score_history > 0, score_sigma, np.nan),
+                          history_years=history)
+
+
+def read_forecast(df: pd.DataFrame) -> CutoffForecast:
+    """Forecast stored in the snapshot columns; fitted on the spot for frames without them"""
+    if not all(column in df.columns for column in FORECAST_COLUMNS):
+        return fit_forecast(df)
+    rank, rank_low, rank_high, score, score_low, _ = _float_columns(df, FORECAST_COLUMNS).T
+    history = (_float_columns(df, RANK_COLUMNS) > 0).sum(axis=1)
+    return CutoffForecast(year=FORECAST_YEAR, log_rank=np.log(rank),
+                          log_rank_sigma=np.log(rank_high / rank_low) / (2 * _BAND_Z),
+                          score=score, score_sigma=(score - score_low) / _BAND_Z,
+                          history_years=history)
+
+
+def get_cutoff_forecast() -> CutoffForecast:
+    """Forecast of the current programs snapshot"""
+    return ProgramCatalog.get_instance().snapshot().derived('cutoff_forecast', read_forecast)
+
+
+def _backtest(df: pd.DataFrame, actual_column: str, target_year: int, years: Sequence[int],
+              score: bool) -> str:
+    forecast = fit_forecast(df, years, target_year)
+    actual = _float_columns(df, [actual_column])[:, 0]
+    if score:
+        predicted, (low, high) = forecast.score, forecast.score_band()
+    else:
+        predicted, (low, high) = forecast.rank, forecast.rank_band()
+    both = ~np.isnan(predicted) & (actual > 0)
+    if not both.any():
+        return f"{actual_column}: no data to backtest"
+    error = np.abs(predicted[both] - actual[both]) if score else np.abs(np.log(predicted[both] / actual[both]))
+    covered = ((actual[both] >= low[both]) & (actual[both] <= high[both])).mean()
+    unit = 'points' if score else 'log rank'
+    return (f"{actual_column} from {'/'.join(map(str, years))}: median error {np.median(error):.3f} {unit}, "
+            f"{covered * 100:.0f}% inside the {BAND * 100:.0f}% band ({both.sum()} programs)")
+
+
+def main(argv: List[str]) -> int:
+    df = ProgramCatalog.get_instance().snapshot().df
+    start = time.perf_counter()
+    forecast = fit_forecast(df)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{FORECAST_YEAR} forecast for {len(df)} programs fitted in {elapsed:.1f} ms")
+
+    print(_backtest(df, SCORE_COLUMNS[0], YEARS[0], YEARS[1:], score=True))
+    print(_backtest(df, RANK_COLUMNS[1], YEARS[1], YEARS[2:], score=False))
+
+    columns = ['Üniversite', 'Program Adı', RANK_COLUMNS[1], SCORE_COLUMNS[0]]
+    sample = df[columns].assign(**forecast.columns()).dropna(subset=[FORECAST_RANK_COLUMN]).head(5)
+    print(sample.to_string(index=False, float_format=lambda v: f"{v:,.1f}"))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,180 @@
+# university/fuzzy_match.py
+"""Typo and suffix tolerant resolution of free text to canonical names.
+
+'bilgisyar müh', 'hacetepe' or 'yazılımcılık' find no rows in the token index.
+Here every query token is matched against the folded token vocabulary of a
+column:
+
+* exactly or as a prefix ('müh' -> 'mühendisliği'), scoring 100;
+* otherwise by edit distance, in one ``process.cdist`` batch over the
+  vocabulary with a score cutoff ('hacetepe' -> 'hacettepe');
+* otherwise by its longest vocabulary stem, for Turkish derivations
+  ('yazılımcılık' -> 'yazılım').
+
+A canonical name (a university, or a program name without its '(İngilizce)'
+style suffixes) matches when every query token maps to one of its tokens. The
+vocabulary and postings are built once per snapshot, so a lookup takes a few
+milliseconds.
+
+Try it with ``python -m features.university.fuzzy_match "<metin>" ...``.
+"""
+
+import bisect
+import re
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+
+from .data import ProgramCatalog
+from .search_index import tokenize
+
+FUZZY_COLUMNS = ('Program Adı', 'Üniversite')
+# fuzz.ratio a misspelled token needs ('bilgisyar' -> 'bilgisayar' is 95)
+TOKEN_SCORE_CUTOFF = 85
+# Shorter tokens match only exactly or as a prefix; typos in them are guesses
+MIN_FUZZY_TOKEN = 4
+# Shortest vocabulary token accepted as the stem of a longer word
+MIN_STEM = 5
+# Stem matches rank below exact ones
+STEM_SCORE = 90.0
+# Names scoring this far below the best one are other words, not readings of the query
+SCORE_MARGIN = 3.0
+MAX_MATCHES = 10
+
+_SUFFIX_RE = re.compile(r'\s*\(.*?\)')
+_KPSS_RE = re.compile(r'\s*KPSS\s*$')
+
+
+@dataclass(frozen=True)
+class FuzzyMatch:
+    name: str
+    score: float
+
+
+class _ChoiceIndex:
+    """Canonical names of one column with a token vocabulary and token -> name postings"""
+
+    def __init__(self, values: Iterable[str], strip_suffixes: bool):
+        names: Dict[str, str] = {}
+        for value in values:
+            # The same program listed again with a 'KPSS' line is one name
+            if strip_suffixes:
+                value = _KPSS_RE.sub('', _SUFFIX_RE.sub('', value))
+            name = ' '.join(value.split())
+            key = ' '.join(tokenize(name))
+            if key:
+                names.setdefault(key, name)
+        self.names: List[str] = list(names.values())
+        self.lengths = np.asarray([len(key) for key in names])
+
+        token_names: Dict[str, List[int]] = {}
+        for position, key in enumerate(names):
+            for token in set(key.split()):
+                token_names.setdefault(token, []).append(position)
+        self.vocabulary: List[str] = sorted(token_names)
+        self.positions = {token: i for i, token in enumerate(self.vocabulary)}
+        self.postings = [np.asarray(token_names[token]) for token in self.vocabulary]
+
+    def _prefixed(self, token: str) -> range:
+        start = bisect.bisect_left(self.vocabulary, token)
+        return range(start, bisect.bisect_left(self.vocabulary, token + '\uffff', start))
+
+    def _stem(self, token: str) -> Optional[int]:
+        for end in range(len(token) - 1, MIN_STEM - 1, -1):
+            position = self.positions.get(token[:end])
+            if position is not None:
+                return position
+        return None
+
+    def token_scores(self, tokens: List[str]) -> List[Dict[int, float]]:
+        """Vocabulary positions and scores each query token maps to"""
+        scores: List[Dict[int, float]] = [
+            {position: 100.0 for position in self._prefixed(token)} for token in tokens
+        ]
+        misses = [i for i, token in enumerate(tokens) if not scores[i] and len(token) >= MIN_FUZZY_TOKEN]
+        if misses:
+            matrix = process.cdist([tokens[i] for i in misses], self.vocabulary, scorer=fuzz.ratio,
+                                   score_cutoff=TOKEN_SCORE_CUTOFF, dtype=np.uint8)
+            for row, i in enumerate(misses):
+                for position in np.flatnonzero(matrix[row]):
+                    scores[i][int(position)] = float(matrix[row, position])
+                if not scores[i]:
+                    stem = self._stem(tokens[i])
+                    if stem is not None:
+                        scores[i][stem] = STEM_SCORE
+        return scores
+
+    def resolve(self, text: str, limit: Optional[int] = MAX_MATCHES) -> List[FuzzyMatch]:
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+        total = np.zeros(len(self.names))
+        matched = np.zeros(len(self.names), dtype=np.int64)
+        for scores in self.token_scores(tokens):
+            if not scores:
+                return []
+            best = np.zeros(len(self.names))
+            for position, score in scores.items():
+                names = self.postings[position]
+                best[names] = np.maximum(best[names], score)
+            total += best
+            matched += best > 0
+        candidates = np.flatnonzero(matched == len(tokens))
+        score = total[candidates] / len(tokens)
+        if len(candidates):
+            # 'psikolji' means Psikoloji, not also everything 'psikolojik'
+            close = score >= score.max() - SCORE_MARGIN
+            candidates, score = candidates[close], score[close]
+        # Best score first; among equals the shortest name, the most generic reading
+        order = np.lexsort((self.lengths[candidates], -score))[:limit]
+        return [FuzzyMatch(self.names[candidates[i]], round(float(score[i]), 1)) for i in order]
+
+
+class FuzzyMatcher:
+    """Choice indexes for the fuzzy columns of one programs snapshot"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.choices: Dict[str, _ChoiceIndex] = {
+            column: _ChoiceIndex(df[column].dropna().unique(), strip_suffixes=column == 'Program Adı')
+            for column in FUZZY_COLUMNS if column in df.columns
+        }
+
+    def resolve(self, column: str, text: str, limit: Optional[int] = MAX_MATCHES) -> List[FuzzyMatch]:
+        """Canonical names in `column` for free text, best first; [] when nothing is close"""
+        index = self.choices.get(column)
+        return index.resolve(text, limit) if index is not None else []
+
+
+def get_fuzzy_matcher() -> FuzzyMatcher:
+    """Fuzzy matcher of the current programs snapshot, built on first use"""
+    return ProgramCatalog.get_instance().snapshot().derived('fuzzy_matcher', FuzzyMatcher)
+
+
+def resolve_names(column: str, text: str, limit: Optional[int] = MAX_MATCHES) -> List[str]:
+    return [match.name for match in get_fuzzy_matcher().resolve(column, text, limit)]
+
+
+def main(argv: List[str]) -> int:
+    queries = argv or ['yazılımcılık', 'bilgisyar müh', 'psikolji', 'hukukçu',
+                       'hacetepe', 'marmra üniversitesi', 'yıldız teknik üniv', 'boğaziçi']
+    start = time.perf_counter()
+    matcher = get_fuzzy_matcher()
+    print(f"choice index built in {(time.perf_counter() - start) * 1000:.0f} ms")
+    for query in queries:
+        for column in FUZZY_COLUMNS:
+            start = time.perf_counter()
+            matches = matcher.resolve(column, query, limit=3)
+            elapsed = (time.perf_counter() - start) * 1000
+            if matches:
+                print(f"{query!r} [{column}] {elapsed:.2f} ms: "
+                      + ', '.join(f"{m.name} ({m.score:.0f})" for m in matches))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,470 @@
+# university/intent_parser.py
+"""Local, rule-based intent parser that runs before the Gemini intent call.
+
+The lexicons come from the dataset itself (cities, universities, faculties and
+program names) plus a small fixed vocabulary for score types, university types,
+languages and number contexts ('sıralama', 'puan', 'TL', 'kontenjan', '%').
+Words left over are tried against the fuzzy matcher, so misspelled or derived
+names ('hacetepe', 'yazılımcılık') still resolve. Every question token is either
+explained or left unknown, and the share of explained tokens is the confidence.
+The recommender only asks the LLM when that confidence is too low.
+
+Try it with ``python -m features.university.intent_parser "<soru>"``.
+"""
+
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .data import ProgramCatalog
+from .fuzzy_match import FuzzyMatcher
+from .search_index import fold_turkish, tokenize
+
+# Folded case endings that may follow a name: 'İstanbul'da', 'psikolojide', 'hukuku'
+_SUFFIXES = frozenset({
+    'a', 'e', 'i', 'u', 'ya', 'ye', 'yi', 'yu', 'in', 'un', 'nin', 'nun', 'ni', 'nu',
+    'da', 'de', 'ta', 'te', 'nda', 'nde', 'daki', 'deki', 'taki', 'teki', 'ndaki', 'ndeki',
+    'dan', 'den', 'tan', 'ten', 'ndan', 'nden', 'si', 'su', 'sinde', 'sunde', 'sindeki',
+    'li', 'lu', 'ler', 'lar', 'leri', 'lari', 'lerde', 'larda', 'lerdeki', 'lardaki',
+    'dakiler', 'dekiler', 'takiler', 'tekiler', 'ndakiler', 'ndekiler',
+})
+
+_STOPWORDS = frozenset(
+    've veya ya ile da de ki mi mu icin olan olarak hangi hangileri ne neler nedir var '
+    'bir bu su o bana beni benim ben bize lutfen goster gosterir gosterebilir misin '
+    'listele liste oner onerir onerebilir onerin istiyorum isterim ariyorum bul bulur '
+    'bolum bolumu bolumler bolumleri bolumlerini program programi programlar programlari '
+    'programlarini universite universiteler universiteleri universitesi uni okumak okuyabilecegim '
+    'okuyabilirim girebilecegim girebilirim gidebilecegim kazanabilecegim kazanabilirim '
+    'tercih tercihi tercihler tercihleri yapabilecegim aralik araligi araliginda arasi '
+    'arasinda arasindaki en tum butun hepsi sehir sehrinde il ilinde ilindeki olsun '
+    'olmali olmasi olabilir nerede yerler yerleri sayisi gibi yer alan ama fakat'.split()
+)
+
+_SCORE_TYPES = {
+    ('say',): 'SAY', ('sayisal',): 'SAY',
+    ('ea',): 'EA', ('esit', 'agirlik'): 'EA',
+    ('soz',): 'SÖZ', ('sozel',): 'SÖZ',
+    ('dil',): 'DİL',
+    ('tyt',): 'TYT', ('onlisans',): 'TYT', ('2', 'yillik'): 'TYT', ('iki', 'yillik'): 'TYT',
+}
+_UNIVERSITY_TYPES = {
+    ('devlet',): 'DEVLET', ('vakif',): 'VAKIF', ('ozel',): 'VAKIF',
+    ('kibris',): 'KIBRIS', ('kktc',): 'KIBRIS', ('yabanci',): 'YABANCI',
+}
+_LANGUAGES = ('İngilizce', 'Almanca', 'Fransızca', 'Arapça', 'Rusça', 'İspanyolca',
+              'Çince', 'Korece', 'Türkçe')
+
+# Higher wins when the same phrase means different things
+_KIND_PRIORITY = {
+    'score_type': 6, 'university_type': 5, 'language': 5, 'city': 4,
+    'faculty': 3, 'university': 2, 'program': 1,
+}
+
+# Number contexts, keyed by token prefix
+_CONTEXT_PREFIXES = (
+    ('siralama', 'rank'), ('sira', 'rank'), ('basari', 'rank'),
+    ('puan', 'score'), ('tl', 'fee'), ('lira', 'fee'), ('ucret', 'fee'), ('fiyat', 'fee'),
+    ('kontenjan', 'quota'), ('burs', 'scholarship'), ('indirim', 'scholarship'),
+)
+# Words after a number saying the value is an upper / lower bound
+_AT_MOST = frozenset({'alti', 'altinda', 'altindaki', 'asagi', 'asagisi', 'az', 'kucuk',
+                      'dusuk', 'kadar', 'gecmeyen', 'maksimum', 'max'})
+_AT_LEAST = frozenset({'ustu', 'ustunde', 'uzeri', 'uzerinde', 'fazla', 'buyuk', 'yuksek',
+                       'minimum', 'min'})
+# For ranks 'better' means a smaller number
+_RANK_BETTER = frozenset({'iyi', 'once', 'yuksek'})
+_RANK_WORSE = frozenset({'kotu', 'sonra', 'dusuk'})
+_MULTIPLIERS = {'bin': 1_000, 'k': 1_000, 'milyon': 1_000_000}
+
+# Inflected generic nouns ('üniversitelerinde', 'sıralamam') carry no criteria of their own
+_GENERIC_PREFIXES = ('universite', 'fakulte', 'bolum', 'program', 'sira', 'basari', 'puan',
+                     'kontenjan', 'burs', 'indirim', 'ucret')
+# Well-known short names whose initials are shared with another university
+_UNIVERSITY_ALIASES = {
+    'itu': 'İSTANBUL TEKNİK ÜNİVERSİTESİ',
+    'metu': 'ORTA DOĞU TEKNİK ÜNİVERSİTESİ',
+    'boun': 'BOĞAZİÇİ ÜNİVERSİTESİ',
+}
+
+_QUERY_TOKEN_RE = re.compile(r'%|-|\d+(?:[.,]\d+)*|[a-z]+')
+_GENERIC_NAME_TOKENS = frozenset({'universitesi', 'universite', 'yuksekokulu', 'meslek'})
+
+
+@dataclass
+class ParsedIntent:
+    """FilterCriteria keyword arguments, plus how much of the question they explain"""
+    fields: Dict[str, Any] = field(default_factory=dict)
+    confidence: float = 0.0
+    unknown: List[str] = field(default_factory=list)
+
+
+def _parse_number(token: str) -> float:
+    """'50.000' -> 50000, '450,5' -> 450.5, '1.250.000' -> 1250000"""
+    groups = re.split(r'[.,]', token)
+    if len(groups) > 1 and all(len(g) == 3 for g in groups[1:]):
+        return float(''.join(groups))
+    if len(groups) == 2:
+        return float(f'{groups[0]}.{groups[1]}')
+    return float(''.join(groups))
+
+
+def _strip_suffix(token: str, stem: str) -> bool:
+    """True when `token` is `stem` followed by a case ending (k -> ğ softening included)"""
+    if token == stem:
+        return True
+    if token.startswith(stem):
+        return token[len(stem):] in _SUFFIXES
+    if stem.endswith('k') and token.startswith(stem[:-1] + 'g'):
+        return token[len(stem):] in _SUFFIXES
+    return False
+
+
+class IntentLexicon:
+    """Phrase tables built from one programs snapshot"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.phrases: Dict[Tuple[str, ...], Tuple[str, str]] = {}
+        for phrase, value in _SCORE_TYPES.items():
+            self._add(phrase, 'score_type', value)
+        for phrase, value in _UNIVERSITY_TYPES.items():
+            self._add(phrase, 'university_type', value)
+        for language in _LANGUAGES:
+            self._add(tuple(tokenize(language)), 'language', language)
+
+        cities = [c for c in df['Şehir'].dropna().unique() if c != 'YABANCI']
+        city_tokens = set()
+        for city in cities:
+            tokens = [t for t in tokenize(city) if t != 'kktc']
+            city_tokens.update(tokens)
+            self._add(tuple(tokens), 'city', city)
+
+        for faculty in df['Fakülte'].dropna().unique():
+            stem = re.sub(r'\s*(Meslek Yüksekokulu|Yüksekokulu|Fakültesi)$', '', faculty)
+            if stem != faculty and faculty.endswith('Fakültesi'):
+                self._add(tuple(tokenize(stem)) + ('fakulte',), 'faculty', stem)
+
+        programs = df['Program Adı'].dropna().str.replace(r'\s*\(.*?\)', '', regex=True).str.strip()
+        programs = programs.unique()
+        for program in programs:
+            tokens = tuple(tokenize(program))
+            if tokens:
+                self._add(tokens, 'program', program)
+        # 'bilgisayar' alone stands for every program that starts with it
+        for program in programs:
+            tokens = tuple(tokenize(program))
+            for end in range(1, len(tokens)):
+                prefix = tokens[:end]
+                if len(prefix[-1]) >= 3 and prefix[-1] not in _STOPWORDS:
+                    self._add(prefix, 'program', ' '.join(prefix), alias=True)
+
+        self._add_universities(df['Üniversite'].dropna().unique(), city_tokens)
+
+        # Phrases by first token, longest first, for greedy matching
+        self.by_first: Dict[str, List[Tuple[str, ...]]] = {}
+        for phrase in sorted(self.phrases, key=len, reverse=True):
+            self.by_first.setdefault(phrase[0], []).append(phrase)
+
+    def _add(self, phrase: Tuple[str, ...], kind: str, value: str, alias: bool = False):
+        """Register a phrase; an alias never takes over a phrase that already means something"""
+        if not phrase or (alias and phrase in self.phrases):
+            return
+        current = self.phrases.get(phrase)
+        if current is None or _KIND_PRIORITY[kind] > _KIND_PRIORITY[current[0]]:
+            self.phrases[phrase] = (kind, value)
+
+    def _add_universities(self, names: Sequence[str], city_tokens: set):
+        names = set(names)
+        acronyms: Dict[str, List[str]] = {}
+        for name in names:
+            tokens = tuple(tokenize(name))
+            self._add(tokens, 'university', name)
+            distinctive = tuple(t for t in tokens if t not in _GENERIC_NAME_TOKENS)
+            # 'ANKARA ÜNİVERSİTESİ' needs the word üniversite, bare 'Ankara' is the city
+            if distinctive and not set(distinctive) <= city_tokens:
+                self._add(distinctive, 'university', name, alias=True)
+            # 'İSTANBUL MEDİPOL' is also just 'Medipol'
+            if len(distinctive) > 1 and distinctive[0] in city_tokens:
+                self._add(distinctive[1:], 'university', name, alias=True)
+            acronyms.setdefault(''.join(t[0] for t in tokens), []).append(name)
+        for alias, name in _UNIVERSITY_ALIASES.items():
+            if name in names:
+                self._add((alias,), 'university', name)
+        for acronym, owners in acronyms.items():
+            if (len(owners) == 1 and 3 <= len(acronym) <= 4 and acronym.endswith('u')
+                    and acronym not in _STOPWORDS):
+                self._add((acronym,), 'university', owners[0], alias=True)
+
+    def match_at(self, tokens: List[str], start: int) -> Optional[Tuple[int, str, str]]:
+        """Longest phrase starting at `start`: (end, kind, value)"""
+        for phrase in self.by_first.get(tokens[start], ()):
+            end = start + len(phrase)
+            if end > len(tokens) or not _strip_suffix(tokens[end - 1], phrase[-1]):
+                continue
+            if list(phrase[:-1]) == tokens[start:end - 1]:
+                return (end, *self.phrases[phrase])
+        # The first token itself may carry the case ending ('istanbulda')
+        for phrase in self.by_first_suffixed(tokens[start]):
+            kind, value = self.phrases[phrase]
+            return start + 1, kind, value
+        return None
+
+    def by_first_suffixed(self, token: str) -> List[Tuple[str, ...]]:
+        for cut in range(len(token) - 1, 2, -1):
+            stem = token[:cut]
+            if token[cut:] in _SUFFIXES and (stem,) in self.phrases:
+                return [(stem,)]
+            if stem.endswith('g') and token[cut:] in _SUFFIXES and (stem[:-1] + 'k',) in self.phrases:
+                return [(stem[:-1] + 'k',)]
+        return []
+
+
+class IntentParser:
+    """Question -> FilterCriteria fields with a confidence in [0, 1]"""
+
+    def __init__(self, lexicon: IntentLexicon, fuzzy: Optional[FuzzyMatcher] = None):
+        self.lexicon = lexicon
+        self.fuzzy = fuzzy
+
+    def parse(self, question: str) -> ParsedIntent:
+        tokens = _QUERY_TOKEN_RE.findall(fold_turkish(question))
+        words = [t for t in tokens if t != '-']
+        if not words:
+            return ParsedIntent()
+        explained = [False] * len(tokens)
+        entities: Dict[str, List[str]] = {}
+        # Start token -> (end, value) of program phrases, for fuzzy words right before them
+        program_spans: Dict[int, Tuple[int, str]] = {}
+
+        i = 0
+        while i < len(tokens):
+            hit = self.lexicon.match_at(tokens, i)
+            # A number only starts a longer phrase ('2 yıllık'), never a name of its own
+            if hit is None or not tokens[i][0].isalpha() and hit[0] - i < 2:
+                i += 1
+                continue
+            end, kind, value = hit
+            values = entities.setdefault(kind, [])
+            if value not in values:
+                values.append(value)
+            explained[i:end] = [True] * (end - i)
+            if kind == 'program':
+                program_spans[i] = (end, value)
+            i = end
+
+        fields = self._entity_fields(entities)
+        self._number_fields(tokens, explained, fields)
+
+        for idx, token in enumerate(tokens):
+            if token in _STOPWORDS or token in _SUFFIXES or token in _AT_MOST \
+                    or token in _AT_LEAST or token in _RANK_BETTER or token in _RANK_WORSE \
+                    or token.startswith(_GENERIC_PREFIXES):
+                explained[idx] = True
+        if self.fuzzy is not None:
+            self._fuzzy_fields(tokens, explained, fields, program_spans)
+        unknown = [t for t, ok in zip(tokens, explained) if not ok and t != '-']
+        confidence = 0.0
+        if fields:
+            confidence = 1.0 - len(unknown) / len(words)
+        return ParsedIntent(fields=fields, confidence=round(confidence, 3), unknown=unknown)
+
+    def _fuzzy_fields(self, tokens: List[str], explained: List[bool], fields: Dict[str, Any],
+                      program_spans: Dict[int, Tuple[int, str]]):
+        """Resolve leftover words ('yazılımcılık', 'hacetepe') to program or university names"""
+        runs: List[List[int]] = []
+        for idx, token in enumerate(tokens):
+            if explained[idx] or not token[0].isalpha():
+                continue
+            if runs and runs[-1][-1] == idx - 1:
+                runs[-1].append(idx)
+            else:
+                runs.append([idx])
+        for run in runs:
+            spans = [run] + ([[idx] for idx in run] if len(run) > 1 else [])
+            # 'bilgisyar mühendisliği': the misspelled word belongs to the program phrase after it
+            following = program_spans.get(run[-1] + 1)
+            if following is not None:
+                spans.insert(0, run + list(range(run[-1] + 1, following[0])))
+            for span in spans:
+                if all(explained[idx] for idx in span):
+                    continue
+                text = ' '.join(tokens[idx] for idx in span)
+                names = [m.name for m in self.fuzzy.resolve('Program Adı', text)]
+                field_name = 'programs'
+                if not names:
+                    # A university needs a single clear reading, 'meslek' alone is not one
+                    matches = self.fuzzy.resolve('Üniversite', text, limit=2)
+                    names = [matches[0].name] if len(matches) == 1 else []
+                    field_name = 'universities'
+                if not names:
+                    continue
+                if following is not None and span[-1] == following[0] - 1 and field_name == 'programs':
+                    # The phrase was only part of the resolved name
+                    others = [v for start, v in program_spans.items() if start != run[-1] + 1]
+                    if following[1] not in others:
+                        fields['programs'].remove(following[1])
+                values = fields.setdefault(field_name, [])
+                values.extend(name for name in names if name not in values)
+                for idx in span:
+                    explained[idx] = True
+
+    @staticmethod
+    def _entity_fields(entities: Dict[str, List[str]]) -> Dict[str, Any]:
+        fields: Dict[str, Any] = {}
+        for kind, name in (('program', 'programs'), ('university', 'universities'),
+                           ('city', 'cities'), ('faculty', 'faculty_types'),
+                           ('score_type', 'score_types'), ('university_type', 'university_types'),
+                           ('language', 'language_types')):
+            if entities.get(kind):
+                fields[name] = list(entities[kind])
+        return fields
+
+    def _number_fields(self, tokens: List[str], explained: List[bool], fields: Dict[str, Any]):
+        for start, end, low, high in self._numbers(tokens):
+            context, at = self._context(tokens, start, end)
+            if context is None or explained[start]:
+                continue
+            explained[start:end] = [True] * (end - start)
+            explained[at] = True
+            if context == 'fee' and tokens[at] == 'ucretsiz':
+                continue
+            self._apply(context, low, high, self._bound(tokens, start, end), fields)
+        for idx, token in enumerate(tokens):
+            if token == 'ucretsiz' and 'max_fee' not in fields:
+                fields['max_fee'] = 0.0
+                explained[idx] = True
+            elif token.startswith('burslu') and 'scholarship_percentage' not in fields \
+                    and idx > 0 and tokens[idx - 1] == 'tam':
+                fields['scholarship_percentage'] = 100
+                explained[idx - 1:idx + 1] = [True, True]
+
+    @staticmethod
+    def _numbers(tokens: List[str]):
+        """(start, end, low, high) per number mention; ranges have low != high"""
+        mentions = []
+        i = 0
+        while i < len(tokens):
+            if not tokens[i][0].isdigit():
+                i += 1
+                continue
+            value, end = _parse_number(tokens[i]), i + 1
+            if end < len(tokens) and tokens[end] in _MULTIPLIERS:
+                value *= _MULTIPLIERS[tokens[end]]
+                end += 1
+            mentions.append([i, end, value, value])
+            i = end
+        # '400-500', '10 bin ile 50 bin arası'
+        merged = []
+        for mention in mentions:
+            if merged:
+                previous = merged[-1]
+                between = tokens[previous[1]:mention[0]]
+                if between in (['-'], ['ile'], ['ve']) and (
+                        between == ['-'] or any(t.startswith('aras') for t in tokens[mention[1]:mention[1] + 3])):
+                    previous[1], previous[3] = mention[1], mention[3]
+                    continue
+            merged.append(mention)
+        return [tuple(m) for m in merged]
+
+    @staticmethod
+    def _context(tokens: List[str], start: int, end: int) -> Tuple[Optional[str], int]:
+        """Nearest context word within three tokens, preferring the following one"""
+        if start > 0 and tokens[start - 1] == '%' or start > 0 and tokens[start - 1] == 'yuzde':
+            return 'scholarship', start - 1
+        candidates = [(distance, 0, end + distance - 1) for distance in range(1, 4)]
+        candidates += [(distance, 1, start - distance) for distance in range(1, 4)]
+        for _, _, at in sorted(candidates):
+            if 0 <= at < len(tokens):
+                for prefix, context in _CONTEXT_PREFIXES:
+                    if tokens[at].startswith(prefix):
+                        return context, at
+                if tokens[at] == 'ucretsiz':
+                    return 'fee', at
+        return None, -1
+
+    @staticmethod
+    def _bound(tokens: List[str], start: int, end: int) -> Optional[str]:
+        """'max', 'min', 'better' or 'worse' from words around the number"""
+        before = tokens[max(0, start - 2):start]
+        if before[-2:] == ['en', 'az'] or (before and before[-1] in ('minimum', 'min')):
+            return 'min'
+        if before[-2:] in (['en', 'fazla'], ['en', 'cok']) or (before and before[-1] in ('maksimum', 'max')):
+            return 'max'
+        for token in tokens[end:end + 4]:
+            if token in _RANK_BETTER:
+                return 'better'
+            if token in _RANK_WORSE:
+                return 'worse'
+            if token in _AT_MOST:
+                return 'max'
+            if token in _AT_LEAST:
+                return 'min'
+        return None
+
+    @staticmethod
+    def _apply(context: str, low: float, high: float, bound: Optional[str], fields: Dict[str, Any]):
+        if context == 'rank':
+            if low != high:
+                fields['min_ranking'], fields['max_ranking'] = int(low), int(high)
+            elif bound in ('better', 'max'):
+                fields['max_ranking'] = int(low)
+            else:
+                # A student's own rank: programs whose cutoff is at or after it are reachable
+                fields['min_ranking'] = int(low)
+        elif context == 'score':
+            if low != high:
+                fields['min_score'], fields['max_score'] = low, high
+            elif bound in ('min', 'better'):
+                fields['min_score'] = low
+            else:
+                fields['max_score'] = low
+        elif context == 'fee':
+            fields['max_fee'] = high
+        elif context == 'quota':
+            if bound == 'max':
+                return
+            fields['min_quota'] = int(low)
+        elif context == 'scholarship':
+            fields['scholarship_percentage'] = int(low)
+
+
+def get_intent_parser() -> IntentParser:
+    """Parser over the current programs snapshot, built on first use"""
+    snapshot = ProgramCatalog.get_instance().snapshot()
+    return snapshot.derived('intent_parser', lambda df: IntentParser(
+        IntentLexicon(df), snapshot.derived('fuzzy_matcher', FuzzyMatcher)))
+
+
+def parse_intent(question: str) -> ParsedIntent:
+    return get_intent_parser().parse(question)
+
+
+def main(argv: List[str]) -> int:
+    questions = argv or [
+        "İstanbul'da bilgisayar mühendisliği SAY 50000 sıralama",
+        "Tıp fakültesi için başarı sıralamam 5000'den iyi olan programlar",
+        "Eşit ağırlık ile %50 burslu, 400-500 puan aralığında hukuk bölümleri",
+        "ODTÜ veya İTÜ'de İngilizce makine mühendisliği",
+        "Ankara'da devlet üniversitelerinde psikoloji",
+        "Bana gelecek vadeden meslekleri anlatır mısın?",
+        "Hacetepe yazılımcılık veya bilgisyar mühendisliği",
+        "2 yıllık bilgisayar programcılığı",
+    ]
+    start = time.perf_counter()
+    get_intent_parser()
+    print(f"lexicon built in {(time.perf_counter() - start) * 1000:.0f} ms")
+    for question in questions:
+        start = time.perf_counter()
+        parsed = parse_intent(question)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"\n{question}\n  confidence={parsed.confidence:.2f} ({elapsed:.2f} ms) "
+              f"unknown={parsed.unknown}\n  {parsed.fields}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
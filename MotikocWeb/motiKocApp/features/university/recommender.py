@@ -1,9 +1,10 @@
 # university/recommender.py
 
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 import google.generativeai as genai
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 import re
 from enum import Enum, auto
 import json
@@ -15,6 +16,20 @@ from datetime import datetime
 import nest_asyncio
 import logging
 
+from config.settings import INTENT_PARSER_MIN_CONFIDENCE
+from .admission import admission_columns
+from .data import get_programs
+from .facets import LANGUAGE_FACET, facet_multiselect
+from .filter_engine import filter_programs
+from .forecast import FORECAST_RANK_BAND, FORECAST_RANK_COLUMN, FORECAST_YEAR
+from .intent_parser import parse_intent
+from .preference_list import MAX_PREFERENCES, PreferenceProfile, build_preference_list, preference_table
+from .refinement import (RefinementDelta, RefinementSession, RefinementStep, criteria_fields,
+                         describe_refinement, parse_refinement, refine)
+from .results_grid import ResultSet, show_results_grid
+from .similar import DEFAULT_NEIGHBOURS, similar_programs
+from .summary import commentary_prompt, render_summary, summarize_rows
+
 # Apply nest_asyncio to allow nested event loops
 nest_asyncio.apply()
 
@@ -22,6 +37,14 @@ nest_asyncio.apply()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Programs of a result offered in the "similar programs" picker
+SIMILAR_PICK_LIMIT = 200
+# Columns the result charts read
+VISUALIZATION_COLUMNS = [
+    'Üniversite', 'Program Adı', 'Puan Türü', 'Üni.Türü',
+    'Başarı Sırası 2023', 'Taban Puan 2023', 'Kontenjan 2023'
+]
+
 # Define Intent Types
 class IntentType(Enum):
     PROGRAM = auto()
@@ -52,6 +75,8 @@ class FilterCriteria:
     language_types: List[str] = field(default_factory=list)
     min_score: Optional[float] = None
     max_score: Optional[float] = None
+    # FORECAST_YEAR: rank/score bounds apply to the forecast cutoffs
+    target_year: Optional[int] = None
     
     def __post_init__(self):
         self.universities = self.universities or []
@@ -72,6 +97,8 @@ class UniversityRecommender:
         
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(model)
+        # Criteria behind the last process_question answer, the base for follow-ups
+        self.last_criteria: Optional[FilterCriteria] = None
         self.system_prompt = """
 Sen bir üniversite öneri sistemi asistanısın. Kullanıcının verdiği soruyu analiz et ve kullanıcının tercih kriterlerini ayrıştırarak aşağıdaki bilgileri çıkar. 
 Kullanıcının ifadesini en yalın haliyle anla. Örneğin, "yazılımcılık" ifadesi geldiğinde bunu "yazılım mühendisi" olarak algıla.
@@ -260,6 +287,25 @@ Kullanıcının sorusunu analiz ederek, bu bilgileri doğru JSON formatında ver
 
         return criteria
 
+    def _local_criteria(self, question: str) -> Optional[FilterCriteria]:
+        """
+        Parse the question with the local intent parser.
+
+        Returns:
+            Optional[FilterCriteria]: The criteria, or None when the parser is not
+            confident enough and the LLM should analyze the question instead.
+        """
+        try:
+            parsed = parse_intent(question)
+        except Exception as e:
+            logger.warning(f"Local intent parsing failed, falling back to LLM: {e}")
+            return None
+        if parsed.confidence < INTENT_PARSER_MIN_CONFIDENCE:
+            logger.info(f"Local intent confidence {parsed.confidence:.2f}, unknown words: {parsed.unknown}")
+            return None
+        logger.info(f"Local intent ({parsed.confidence:.2f}): {parsed.fields}")
+        return FilterCriteria(**parsed.fields)
+
     def _apply_filters(self, df: pd.DataFrame, criteria: FilterCriteria) -> pd.DataFrame:
         """
         Apply filtering criteria to the dataframe.
@@ -271,75 +317,9 @@ Kullanıcının sorusunu analiz ederek, bu bilgileri doğru JSON formatında ver
         Returns:
             pd.DataFrame: The filtered university programs data.
         """
-        filtered_df = df.copy()
-        
         try:
-            # Ranking Filters
-            if criteria.min_ranking is not None:
-                filtered_df = filtered_df[filtered_df['Başarı Sırası 2023'] >= criteria.min_ranking]
-            if criteria.max_ranking is not None:
-                filtered_df = filtered_df[filtered_df['Başarı Sırası 2023'] <= criteria.max_ranking]
-
-            # Universities Filter
-            if criteria.universities:
-                pattern = '|'.join(map(re.escape, criteria.universities))
-                filtered_df = filtered_df[filtered_df['Üniversite'].str.contains(pattern, case=False, na=False)]
-
-            # Programs Filter
-            if criteria.programs:
-                pattern = '|'.join(map(re.escape, criteria.programs))
-                filtered_df = filtered_df[filtered_df['Program Adı'].str.contains(pattern, case=False, na=False)]
-                logger.info(f"After filtering programs: {len(filtered_df)}")
-
-            # Cities Filter
-            if criteria.cities:
-                pattern = '|'.join(map(re.escape, criteria.cities))
-                filtered_df = filtered_df[filtered_df['Şehir'].str.contains(pattern, case=False, na=False)]
-
-            # Score Types Filter
-            if criteria.score_types:
-                pattern = '|'.join(map(re.escape, criteria.score_types))
-                filtered_df = filtered_df[filtered_df['Puan Türü'].str.contains(pattern, case=False, na=False)]
-
-            # Language Types Filter
-            if criteria.language_types:
-                language_pattern = '|'.join(map(re.escape, criteria.language_types))
-                filtered_df = filtered_df[filtered_df['Program Adı'].str.contains(language_pattern, case=False, na=False)]
-
-            # Scholarship Percentage Filter
-            if criteria.scholarship_percentage is not None:
-                scholarship_str = f"%{criteria.scholarship_percentage}"
-                filtered_df = filtered_df[filtered_df['Program Adı'].str.contains(scholarship_str, case=False, na=False)]
-
-            # Faculty Types Filter
-            if criteria.faculty_types:
-                pattern = '|'.join(map(re.escape, criteria.faculty_types))
-                filtered_df = filtered_df[filtered_df['Fakülte'].str.contains(pattern, case=False, na=False)]
-
-            # University Types Filter
-            if criteria.university_types:
-                pattern = '|'.join(map(re.escape, criteria.university_types))
-                filtered_df = filtered_df[filtered_df['Üni.Türü'].str.contains(pattern, case=False, na=False)]
-
-            # Maximum Fee Filter
-            if criteria.max_fee is not None:
-                filtered_df['Ücret (KDV Hariç)'] = pd.to_numeric(filtered_df['Ücret (KDV Hariç)'], errors='coerce').fillna(0)
-                filtered_df = filtered_df[filtered_df['Ücret (KDV Hariç)'] <= criteria.max_fee]
-
-            # Minimum Quota Filter
-            if criteria.min_quota is not None:
-                filtered_df['Kontenjan 2023'] = pd.to_numeric(filtered_df['Kontenjan 2023'], errors='coerce').fillna(0)
-                filtered_df = filtered_df[filtered_df['Kontenjan 2023'] >= criteria.min_quota]
-
-            # Taban Puan Filters
-            if criteria.min_score is not None:
-                filtered_df = filtered_df[filtered_df['Taban Puan 2023'] >= criteria.min_score]
-            if criteria.max_score is not None:
-                filtered_df = filtered_df[filtered_df['Taban Puan 2023'] <= criteria.max_score]
-
-            # Sorting
-            filtered_df = filtered_df.sort_values('Başarı Sırası 2023', ascending=True)
-            return filtered_df
+            # One vectorized pass over the shared snapshot; no frame copies
+            return filter_programs(df, criteria)
 
         except Exception as e:
             logger.error(f"Error in applying filters: {e}")
@@ -347,61 +327,65 @@ Kullanıcının sorusunu analiz ederek, bu bilgileri doğru JSON formatında ver
 
     def _generate_response(self, filtered_df: pd.DataFrame, question: str) -> str:
         """
-        Generate a natural language response based on the filtered results.
+        Summarize the filtered results from templates, without an LLM call.
 
         Args:
             filtered_df (pd.DataFrame): The filtered university programs data.
             question (str): The user's original question.
 
         Returns:
-            str: The AI-generated response.
+            str: Key findings (rank/score spread, city mix, fees, quota trends) as markdown.
         """
         try:
-            if filtered_df.empty:
-                return "Üzgünüm, arama kriterlerinize uygun bir program bulamadım."
-
-            results_summary = filtered_df.head(20).to_dict('records')
-
-            prompt = f"""
-Kullanıcının sorusu: {question}
-
-En iyi 5 sonuç:
-{json.dumps(results_summary, ensure_ascii=False, indent=2)}
-
-Lütfen bu sonuçları analiz ederek Türkçe olarak detaylı ve yardımcı bir cevap ver:
-1. Ana bulguları özetle.
-2. Önemli eğilimleri veya kalıpları vurgula.
-3. Spesifik önerilerde bulun.
-4. Önemli dikkat edilmesi gereken noktaları belirt.
-5. Öğrenciye sonraki adımlar için tavsiyeler ver.
+            return render_summary(summarize_rows(filtered_df.index.to_numpy()))
+        except Exception as e:
+            logger.error(f"Error in generating response: {e}")
+            return "Sonuçları değerlendirirken bir hata oluştu. Lütfen daha sonra tekrar deneyin."
 
-Cevabı doğal ve samimi bir üslupla yaz, ancak kısa ve odaklı tut.
-"""
+    def stream_commentary(self, rows: np.ndarray, question: str) -> Iterator[str]:
+        """
+        Stream an LLM commentary on the results, built from a compact payload.
 
-            response = self.model.generate_content(prompt)
-            return response.text
+        Args:
+            rows (np.ndarray): Row ids of the results, in display order.
+            question (str): The user's original question.
 
+        Yields:
+            str: Pieces of the commentary as they arrive.
+        """
+        try:
+            prompt = commentary_prompt(question, rows)
+            for chunk in self.model.generate_content(prompt, stream=True):
+                if chunk.text:
+                    yield chunk.text
         except Exception as e:
-            logger.error(f"Error in generating response: {e}")
-            return "Sonuçları değerlendirirken bir hata oluştu. Lütfen daha sonra tekrar deneyin."
+            logger.error(f"Error in streaming commentary: {e}")
+            yield "Yorum oluşturulurken bir hata oluştu. Lütfen daha sonra tekrar deneyin."
 
-    def process_question(self, question: str, df: pd.DataFrame) -> Tuple[pd.DataFrame, str]:
+    def process_question(self, question: str, df: pd.DataFrame,
+                         target_year: Optional[int] = None) -> Tuple[pd.DataFrame, str]:
         """
         Process user question and return filtered results with explanation.
 
         Args:
             question (str): The user's natural language query.
             df (pd.DataFrame): The original university programs data.
+            target_year (Optional[int]): FORECAST_YEAR to apply rank/score bounds to the forecast cutoffs.
 
         Returns:
             Tuple[pd.DataFrame, str]: The filtered data and the AI-generated response.
         """
         try:
-            intent_data = self._analyze_intent(question)
-            if not intent_data:
-                return df, "Sorunuzu anlamakta zorlanıyorum. Lütfen daha net bir ifade kullanın."
+            self.last_criteria = None
+            criteria = self._local_criteria(question)
+            if criteria is None:
+                intent_data = self._analyze_intent(question)
+                if not intent_data:
+                    return df, "Sorunuzu anlamakta zorlanıyorum. Lütfen daha net bir ifade kullanın."
+                criteria = self._create_filter_criteria(intent_data)
+            criteria.target_year = target_year
+            self.last_criteria = criteria
 
-            criteria = self._create_filter_criteria(intent_data)
             filtered_df = self._apply_filters(df, criteria)
             response = self._generate_response(filtered_df, question)
             return filtered_df, response
@@ -410,6 +394,90 @@ Cevabı doğal ve samimi bir üslupla yaz, ancak kısa ve odaklı tut.
             logger.error(f"Error in processing question: {e}")
             return df, "İşlem sırasında bir hata oluştu. Lütfen daha sonra tekrar deneyin."
 
+    def refine_question(self, question: str, step: RefinementStep,
+                        manual: Optional[FilterCriteria] = None) -> Tuple[Optional[RefinementStep], str]:
+        """
+        Apply a follow-up question to the current answer instead of searching again.
+
+        Args:
+            question (str): The follow-up, e.g. "sadece devlet olanlar" or "İstanbul dışı".
+            step (RefinementStep): The answer being refined.
+            manual (Optional[FilterCriteria]): Sidebar filters, re-applied when the whole data is re-filtered.
+
+        Returns:
+            Tuple[Optional[RefinementStep], str]: The refined answer (None if the question
+            was not understood) and a short summary of what changed.
+        """
+        try:
+            if not step.is_current():
+                return None, "Veri seti güncellendi, lütfen yeni bir arama yapın."
+            delta = parse_refinement(question)
+            if delta is None:
+                intent_data = self._analyze_intent(question)
+                if not intent_data:
+                    return None, "Sorunuzu anlamakta zorlanıyorum. Lütfen daha net bir ifade kullanın."
+                delta = RefinementDelta(include=criteria_fields(self._create_filter_criteria(intent_data)))
+            if manual is not None and manual.target_year != step.criteria.target_year:
+                # The forecast toggle changed since the last answer
+                delta.include['target_year'] = manual.target_year
+
+            refined = refine(step, delta, question, manual)
+            response = describe_refinement(step, refined, delta)
+            response += "\n\n" + render_summary(summarize_rows(np.flatnonzero(refined.mask())))
+            return replace(refined, response=response), response
+        except Exception as e:
+            logger.error(f"Error in refining question: {e}")
+            return None, "İşlem sırasında bir hata oluştu. Lütfen daha sonra tekrar deneyin."
+
+    def build_preference_list(self, rank: int, profile: PreferenceProfile,
+                              df: Optional[pd.DataFrame] = None, rank_sigma: float = 0.0,
+                              size: int = MAX_PREFERENCES) -> Tuple[pd.DataFrame, str]:
+        """
+        Build the ordered tercih list that maximizes expected utility.
+
+        Args:
+            rank (int): The student's success ranking.
+            profile (PreferenceProfile): Program interests and city/type/fee preferences.
+            df (Optional[pd.DataFrame]): Rows to choose from (e.g. filtered results); all programs if None.
+            rank_sigma (float): Log-normal uncertainty of the ranking.
+            size (int): Maximum number of preferences.
+
+        Returns:
+            Tuple[pd.DataFrame, str]: The ordered list and a short summary.
+        """
+        try:
+            within = None if df is None else df.index.to_numpy()
+            preferences = build_preference_list(rank, profile, rank_sigma, size, within)
+            if not len(preferences.rows):
+                return pd.DataFrame(), "Tercihlerinize uyan ve yerleşme şansı olan program bulunamadı."
+            summary = (
+                f"{len(preferences.rows)} programlık tercih listesi hazırlandı. "
+                f"Listeden bir programa yerleşme olasılığınız %{preferences.placement_probability * 100:.0f}."
+            )
+            return preference_table(preferences), summary
+        except Exception as e:
+            logger.error(f"Error in building preference list: {e}")
+            return pd.DataFrame(), "Tercih listesi oluşturulurken bir hata oluştu."
+
+    def similar_programs(self, row: int, k: int = DEFAULT_NEIGHBOURS,
+                         other_universities: bool = True) -> pd.DataFrame:
+        """
+        Find the programs closest to a program in cutoff rank, score type, fee, city and faculty.
+
+        Args:
+            row (int): Row id of the program in the programs snapshot.
+            k (int): Number of similar programs.
+            other_universities (bool): Leave out programs of the same university.
+
+        Returns:
+            pd.DataFrame: The similar programs, nearest first, with a 'Benzerlik' column.
+        """
+        try:
+            return similar_programs(row, k, other_universities=other_universities)
+        except Exception as e:
+            logger.error(f"Error in finding similar programs: {e}")
+            return pd.DataFrame()
+
 class UniversityRecommenderInterface:
     def __init__(self, api_key: str):
         """Initialize the interface with necessary configurations and session state."""
@@ -425,6 +493,10 @@ class UniversityRecommenderInterface:
             st.session_state.filtered_results = None
         if 'current_response' not in st.session_state:
             st.session_state.current_response = None
+        if 'current_commentary' not in st.session_state:
+            st.session_state.current_commentary = None
+        if 'refinement' not in st.session_state:
+            st.session_state.refinement = RefinementSession()
 
     def _initialize_recommender(self, api_key: str) -> UniversityRecommender:
         """Initialize the UniversityRecommender with the provided API key."""
@@ -432,35 +504,13 @@ class UniversityRecommenderInterface:
 
     def _load_data(self) -> pd.DataFrame:
         """
-        Load and preprocess the university data.
+        Get the shared, pre-typed university data.
 
         Returns:
-            pd.DataFrame: The processed university programs data.
+            pd.DataFrame: The processed university programs data (read-only).
         """
         try:
-            df = pd.read_csv('programs_data_with_links.csv')
-
-            # Clean and convert 'Ücret (KDV Hariç)' to a numeric format
-            if 'Ücret (KDV Hariç)' in df.columns:
-                df['Ücret (KDV Hariç)'] = (
-                    df['Ücret (KDV Hariç)']
-                    .replace(r'[^\d.]', '', regex=True)  # Remove any non-digit characters except dot
-                    .astype(float)
-                )
-            else:
-                st.warning("Veri çerçevesinde 'Ücret (KDV Hariç)' sütunu bulunamadı.")
-
-            numeric_columns = [
-                'Başarı Sırası 2023', 'Taban Puan 2023', 'Kontenjan 2023',
-                'Yerleşen 2023'
-            ]
-            for col in numeric_columns:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-                else:
-                    st.warning(f"Veri çerçevesinde '{col}' sütunu bulunamadı.")
-
-            return df
+            return get_programs()
         except FileNotFoundError:
             st.error("Veri dosyası bulunamadı: 'programs_data_with_links.csv'. Lütfen dosyanın doğru konumda olduğundan emin olun.")
             return pd.DataFrame()
@@ -587,39 +637,114 @@ class UniversityRecommenderInterface:
             else:
                 st.metric("Ortalama Taban Puan", "Veri yok")
 
-    def _display_results_table(self, df: pd.DataFrame):
+    def _display_results_table(self, result: ResultSet, student_rank: Optional[int] = None):
         """
-        Display the filtered results in an interactive table.
+        Display the filtered results as a paginated, sortable grid.
 
         Args:
-            df (pd.DataFrame): The filtered university programs data.
+            result (ResultSet): Row ids of the filtered university programs.
+            student_rank (Optional[int]): The student's rank; adds placement probabilities.
         """
-        if df.empty:
-            st.warning("Arama kriterlerinize uygun sonuç bulunamadı.")
-            return
-
         display_columns = [
             'Üniversite', 'Program Adı', 'Şehir', 'Puan Türü',
-            'Başarı Sırası 2023','Başarı Sırası 2022', 'Taban Puan 2023','Taban Puan 2022','Kontenjan 2023',
+            'Başarı Sırası 2023','Başarı Sırası 2022', FORECAST_RANK_COLUMN, *FORECAST_RANK_BAND,
+            'Taban Puan 2023','Taban Puan 2022','Kontenjan 2023',
             'Üni.Türü','Yıl','Ücret (KDV Hariç)','YKS Net Ort. Link','University Link','YÖP Link'
         ]
+        extra = None
+        if student_rank:
+            # Probabilities only for the rows on the visible page
+            extra = lambda rows: admission_columns(rows, student_rank)
+
+        show_results_grid(
+            result,
+            key="recommender_results",
+            columns=display_columns,
+            extra=extra,
+            column_config={
+                'Başarı Sırası 2023': st.column_config.NumberColumn(format='%d'),
+                'Başarı Sırası 2022': st.column_config.NumberColumn(format='%d'),
+                'Taban Puan 2023': st.column_config.NumberColumn(format='%.2f'),
+                'Ücret (KDV Hariç)': st.column_config.NumberColumn(format='%.2f ₺'),
+                'Yerleşme Olasılığı': st.column_config.NumberColumn(format='percent'),
+                FORECAST_RANK_COLUMN: st.column_config.NumberColumn(format='%d'),
+                FORECAST_RANK_BAND[0]: st.column_config.NumberColumn(format='%d'),
+                FORECAST_RANK_BAND[1]: st.column_config.NumberColumn(format='%d'),
+                'YKS Net Ort. Link': st.column_config.LinkColumn(),
+                'University Link': st.column_config.LinkColumn(),
+                'YÖP Link': st.column_config.LinkColumn(),
+            }
+        )
 
-        available_display_columns = [col for col in display_columns if col in df.columns]
+    def _show_similar_programs(self, result: ResultSet):
+        """
+        Let the user pick a program from the results and list programs similar to it.
 
-        if not available_display_columns:
-            st.warning("Gösterilecek uygun sütun bulunamadı.")
+        Args:
+            result (ResultSet): Row ids of the displayed results.
+        """
+        # Only the best rows are offered, so the select box stays light for large results
+        rows = result.rows[:SIMILAR_PICK_LIMIT]
+        if not len(rows):
             return
-
+        df = self.df
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            row = st.selectbox(
+                "Program seçin",
+                rows.tolist(),
+                format_func=lambda r: f"{df.at[r, 'Üniversite']} – {' '.join(str(df.at[r, 'Program Adı']).split())}",
+                key="recommender_similar_program"
+            )
+        with col2:
+            other_universities = st.checkbox("Başka üniversiteler", value=True,
+                                             key="recommender_similar_other")
+        similar = self.recommender.similar_programs(int(row), other_universities=other_universities)
+        if similar.empty:
+            st.info("Benzer program bulunamadı.")
+            return
+        columns = ['Üniversite', 'Program Adı', 'Şehir', 'Puan Türü', 'Başarı Sırası 2023',
+                   'Taban Puan 2023', 'Ücret (KDV Hariç)', 'Benzerlik']
         st.dataframe(
-            df[available_display_columns].style.format({
-                'Başarı Sırası 2023': '{:,.0f}',
-                'Taban Puan 2023': '{:.2f}',
-                'Ücret (KDV Hariç)': '{:,.2f} ₺'
-            }),
-            use_container_width=True,
-            height=400
+            similar[[c for c in columns if c in similar.columns]],
+            hide_index=True,
+            column_config={
+                'Başarı Sırası 2023': st.column_config.NumberColumn(format='%d'),
+                'Taban Puan 2023': st.column_config.NumberColumn(format='%.2f'),
+                'Ücret (KDV Hariç)': st.column_config.NumberColumn(format='%.2f ₺'),
+                'Benzerlik': st.column_config.ProgressColumn(format='%.2f', min_value=0.0, max_value=1.0),
+            }
         )
 
+    def _show_refinement_step(self, step: RefinementStep):
+        """Make a conversation step the displayed answer."""
+        st.session_state.filtered_results = ResultSet(rows=step.rows(), source_hash=step.source_hash)
+        st.session_state.current_response = step.response
+        st.session_state.current_commentary = None
+
+    def _show_refinement_controls(self, session: RefinementSession):
+        """
+        Show the conversation so far with undo/redo buttons.
+
+        Args:
+            session (RefinementSession): The refinement stack of this session.
+        """
+        if len(session.steps) < 2:
+            return
+        col1, col2, col3 = st.columns([1, 1, 6])
+        # Callbacks run before the next rerun, so the buttons' state is never one click behind
+        with col1:
+            st.button("↶ Geri Al", disabled=not session.can_undo, key="recommender_undo",
+                      on_click=lambda: self._show_refinement_step(session.undo()))
+        with col2:
+            st.button("↷ Yinele", disabled=not session.can_redo, key="recommender_redo",
+                      on_click=lambda: self._show_refinement_step(session.redo()))
+        with col3:
+            st.caption(" → ".join(
+                f"**{step.question} ({step.count})**" if i == session.position else f"{step.question} ({step.count})"
+                for i, step in enumerate(session.steps)
+            ))
+
     def _add_to_search_history(self, question: str, results_count: int):
         """
         Add search query to history with timestamp.
@@ -658,58 +783,30 @@ class UniversityRecommenderInterface:
 
         criteria = FilterCriteria()
 
-        # City Filter
-        if 'Şehir' in self.df.columns:
-            criteria.cities = st.sidebar.multiselect(
-                "Şehir Seçin",
-                options=sorted(self.df['Şehir'].dropna().unique()),
-                key="recommender_city_filter"
-            )
-        else:
-            st.sidebar.warning("Veri çerçevesinde 'Şehir' sütunu bulunamadı.")
-
-        # University Type Filter
-        if 'Üni.Türü' in self.df.columns:
-            criteria.university_types = st.sidebar.multiselect(
-                "Üniversite Türü",
-                options=sorted(self.df['Üni.Türü'].dropna().unique()),
-                key="recommender_university_type_filter"
-            )
-        else:
-            st.sidebar.warning("Veri çerçevesinde 'Üni.Türü' sütunu bulunamadı.")
-
-        # Score Type Filter
-        if 'Puan Türü' in self.df.columns:
-            criteria.score_types = st.sidebar.multiselect(
-                "Puan Türü",
-                options=sorted(self.df['Puan Türü'].dropna().unique()),
-                key="recommender_score_type_filter"
-            )
-        else:
-            st.sidebar.warning("Veri çerçevesinde 'Puan Türü' sütunu bulunamadı.")
-
-        # Language Preference
-        if 'Program Adı' in self.df.columns:
-            # Assuming language information is embedded in 'Program Adı', else adjust accordingly
-            # You might need a separate column for language preferences
-            language_options = sorted(set(re.findall(r'\b\w+\b', ' '.join(self.df['Program Adı'].dropna().unique()))))
-            criteria.language_types = st.sidebar.multiselect(
-                "Dil Tercihi",
-                options=language_options,
-                key="recommender_language_type_filter"
-            )
-        else:
-            st.sidebar.warning("Veri çerçevesinde 'Program Adı' sütunu bulunamadı.")
-
-        # Faculty Type Filter
-        if 'Fakülte' in self.df.columns:
-            criteria.faculty_types = st.sidebar.multiselect(
-                "Fakülte Türü",
-                options=sorted(self.df['Fakülte'].dropna().unique()),
-                key="recommender_faculty_type_filter"
-            )
-        else:
-            st.sidebar.warning("Veri çerçevesinde 'Fakülte' sütunu bulunamadı.")
+        # Facet counts follow the other selections; a follow-up question only narrows
+        # the current answer, so its counts stay inside it
+        keys = {
+            'Şehir': "recommender_city_filter",
+            'Üni.Türü': "recommender_university_type_filter",
+            'Puan Türü': "recommender_score_type_filter",
+            LANGUAGE_FACET: "recommender_language_type_filter",
+            'Fakülte': "recommender_faculty_type_filter",
+        }
+        selections = {facet: st.session_state.get(key) or [] for facet, key in keys.items()}
+        results = st.session_state.get('filtered_results')
+        # The refine toggle is drawn after the sidebar and defaults to on
+        refining = st.session_state.get("recommender_refine_mode", True)
+        within = results.rows if refining and results is not None and results.is_current() else None
+
+        criteria.cities = facet_multiselect("Şehir Seçin", 'Şehir', keys['Şehir'], selections, within)
+        criteria.university_types = facet_multiselect(
+            "Üniversite Türü", 'Üni.Türü', keys['Üni.Türü'], selections, within)
+        criteria.score_types = facet_multiselect(
+            "Puan Türü", 'Puan Türü', keys['Puan Türü'], selections, within)
+        criteria.language_types = facet_multiselect(
+            "Dil Tercihi", LANGUAGE_FACET, keys[LANGUAGE_FACET], selections, within)
+        criteria.faculty_types = facet_multiselect(
+            "Fakülte Türü", 'Fakülte', keys['Fakülte'], selections, within, searchable=True)
 
         # Scholarship Percentage
         scholarship_input = st.sidebar.text_input(
@@ -770,6 +867,13 @@ class UniversityRecommenderInterface:
             except ValueError:
                 st.sidebar.warning("Geçerli bir taban puan girin.")
 
+        if st.sidebar.checkbox(
+            f"Sıra ve puan sınırlarını {FORECAST_YEAR} tahminine uygula",
+            key="recommender_forecast_filter",
+            help="Başarı sırası ve taban puan sınırları geçmiş yıl yerine tahmini taban değerlerle karşılaştırılır."
+        ):
+            criteria.target_year = FORECAST_YEAR
+
         return criteria
 
     def _apply_filters(self, df: pd.DataFrame, criteria: FilterCriteria) -> pd.DataFrame:
@@ -783,75 +887,9 @@ class UniversityRecommenderInterface:
         Returns:
             pd.DataFrame: The further filtered university programs data.
         """
-        filtered_df = df.copy()
-        
         try:
-            # Ranking Filters
-            if criteria.min_ranking is not None:
-                filtered_df = filtered_df[filtered_df['Başarı Sırası 2023'] >= criteria.min_ranking]
-            if criteria.max_ranking is not None:
-                filtered_df = filtered_df[filtered_df['Başarı Sırası 2023'] <= criteria.max_ranking]
-
-            # Universities Filter
-            if criteria.universities:
-                pattern = '|'.join(map(re.escape, criteria.universities))
-                filtered_df = filtered_df[filtered_df['Üniversite'].str.contains(pattern, case=False, na=False)]
-
-            # Programs Filter
-            if criteria.programs:
-                pattern = '|'.join(map(re.escape, criteria.programs))
-                filtered_df = filtered_df[filtered_df['Program Adı'].str.contains(pattern, case=False, na=False)]
-                logger.info(f"After filtering programs: {len(filtered_df)}")
-
-            # Cities Filter
-            if criteria.cities:
-                pattern = '|'.join(map(re.escape, criteria.cities))
-                filtered_df = filtered_df[filtered_df['Şehir'].str.contains(pattern, case=False, na=False)]
-
-            # Score Types Filter
-            if criteria.score_types:
-                pattern = '|'.join(map(re.escape, criteria.score_types))
-                filtered_df = filtered_df[filtered_df['Puan Türü'].str.contains(pattern, case=False, na=False)]
-
-            # Language Types Filter
-            if criteria.language_types:
-                language_pattern = '|'.join(map(re.escape, criteria.language_types))
-                filtered_df = filtered_df[filtered_df['Program Adı'].str.contains(language_pattern, case=False, na=False)]
-
-            # Scholarship Percentage Filter
-            if criteria.scholarship_percentage is not None:
-                scholarship_str = f"%{criteria.scholarship_percentage}"
-                filtered_df = filtered_df[filtered_df['Program Adı'].str.contains(scholarship_str, case=False, na=False)]
-
-            # Faculty Types Filter
-            if criteria.faculty_types:
-                pattern = '|'.join(map(re.escape, criteria.faculty_types))
-                filtered_df = filtered_df[filtered_df['Fakülte'].str.contains(pattern, case=False, na=False)]
-
-            # University Types Filter
-            if criteria.university_types:
-                pattern = '|'.join(map(re.escape, criteria.university_types))
-                filtered_df = filtered_df[filtered_df['Üni.Türü'].str.contains(pattern, case=False, na=False)]
-
-            # Maximum Fee Filter
-            if criteria.max_fee is not None:
-                filtered_df['Ücret (KDV Hariç)'] = pd.to_numeric(filtered_df['Ücret (KDV Hariç)'], errors='coerce').fillna(0)
-                filtered_df = filtered_df[filtered_df['Ücret (KDV Hariç)'] <= criteria.max_fee]
-
-            # Minimum Quota Filter
-            if criteria.min_quota is not None:
-                filtered_df['Kontenjan 2023'] = pd.to_numeric(filtered_df['Kontenjan 2023'], errors='coerce').fillna(0)
-                filtered_df = filtered_df[filtered_df['Kontenjan 2023'] >= criteria.min_quota]
-
-            # Taban Puan Filters
-            if criteria.min_score is not None:
-                filtered_df = filtered_df[filtered_df['Taban Puan 2023'] >= criteria.min_score]
-            if criteria.max_score is not None:
-                filtered_df = filtered_df[filtered_df['Taban Puan 2023'] <= criteria.max_score]
-
-            # Sorting
-            filtered_df = filtered_df.sort_values('Başarı Sırası 2023', ascending=True)
-            return filtered_df
+            # One vectorized pass over the shared snapshot; no frame copies
+            return filter_programs(df, criteria)
 
         except Exception as e:
             logger.error(f"Error in applying manual filters: {e}")
@@ -874,6 +912,13 @@ class UniversityRecommenderInterface:
 
         # Create sidebar filters
         criteria = self._create_filters_sidebar()
+        student_rank = st.sidebar.number_input(
+            "Başarı Sıranız (yerleşme olasılığı için)",
+            min_value=0,
+            step=1000,
+            value=0,
+            key="recommender_student_rank"
+        )
 
         # Main search interface
         question = st.text_input(
@@ -881,23 +926,57 @@ class UniversityRecommenderInterface:
             placeholder="Örnek: İstanbul'da başarı sırası 50000'den iyi olan bilgisayar mühendisliği bölümlerini göster"
         )
 
+        results = st.session_state.filtered_results
+        if results is not None and not results.is_current():
+            # The dataset was reloaded; row ids of the old version mean nothing now
+            st.info("Veri seti güncellendi, lütfen aramayı tekrarlayın.")
+            st.session_state.filtered_results = None
+            st.session_state.refinement = RefinementSession()
+
+        session: RefinementSession = st.session_state.refinement
+        refine_mode = False
+        if session.current is not None:
+            refine_mode = st.toggle(
+                "Takip sorusu: mevcut sonuçları daralt",
+                value=True,
+                key="recommender_refine_mode",
+                help="Örneğin: \"sadece devlet olanlar\", \"İstanbul dışı\""
+            )
+
         if st.button("Ara", type="primary"):
             if not question.strip():
                 st.warning("Lütfen bir soru girin.")
                 return
 
             with st.spinner("Sonuçlar hazırlanıyor..."):
-                filtered_df, response = self.recommender.process_question(question, self.df)
+                if refine_mode:
+                    step, response = self.recommender.refine_question(question, session.current, criteria)
+                    if step is None:
+                        st.warning(response)
+                    else:
+                        session.push(step)
+                        self._show_refinement_step(step)
+                        self._add_to_search_history(question, step.count)
+                else:
+                    filtered_df, response = self.recommender.process_question(
+                        question, self.df, criteria.target_year)
+
+                    # Apply manual filters
+                    filtered_df = self._apply_filters(filtered_df, criteria)
 
-                # Apply manual filters
-                filtered_df = self._apply_filters(filtered_df, criteria)
+                    # Keep only the row ids in the session; the answer starts a new conversation
+                    session.reset(RefinementStep.from_rows(
+                        question, self.recommender.last_criteria or FilterCriteria(),
+                        filtered_df.index.to_numpy(), response=response
+                    ))
+                    st.session_state.filtered_results = ResultSet.from_frame(filtered_df)
+                    st.session_state.current_response = response
+                    st.session_state.current_commentary = None
 
-                # Store results in session state
-                st.session_state.filtered_results = filtered_df
-                st.session_state.current_response = response
+                    # Add to search history
+                    self._add_to_search_history(question, len(filtered_df))
 
-                # Add to search history
-                self._add_to_search_history(question, len(filtered_df))
+        self._show_refinement_controls(session)
 
         # Display results if available
         if st.session_state.filtered_results is not None:
@@ -905,15 +984,29 @@ class UniversityRecommenderInterface:
 
             # Display AI response
             if st.session_state.current_response:
-                with st.expander("AI Değerlendirmesi", expanded=True):
-                    st.write(st.session_state.current_response)
+                with st.expander("Sonuç Özeti", expanded=True):
+                    st.markdown(st.session_state.current_response)
+                    # The LLM commentary is optional and streams below the instant summary
+                    if st.session_state.current_commentary:
+                        st.markdown(st.session_state.current_commentary)
+                    elif len(st.session_state.filtered_results) and st.button(
+                            "🤖 Yapay zeka yorumu ekle", key="recommender_commentary"):
+                        st.session_state.current_commentary = st.write_stream(
+                            self.recommender.stream_commentary(
+                                st.session_state.filtered_results.rows, session.current.question
+                            )
+                        )
 
             # Display results table
-            self._display_results_table(st.session_state.filtered_results)
+            self._display_results_table(st.session_state.filtered_results, int(student_rank))
+
+            with st.expander("🔁 Benzer Programlar"):
+                self._show_similar_programs(st.session_state.filtered_results)
 
-            # Create visualizations
-            with st.expander("📊 Görselleştirmeler", expanded=True):
-                self._create_visualizations(st.session_state.filtered_results)
+            # Charts plot every row, so the result is only materialized when asked for
+            if st.toggle("📊 Görselleştirmeleri göster", key="recommender_show_charts"):
+                self._create_visualizations(
+                    st.session_state.filtered_results.frame(VISUALIZATION_COLUMNS))
 
         # Show search history
         self._show_search_history()
@@ -0,0 +1,260 @@
+# university/refinement.py
+"""Conversational refinement of a recommender answer.
+
+A follow-up question ('sadece devlet olanlar', 'İstanbul dışı') is parsed into a
+delta. Included criteria narrow the current answer, and criteria next to a
+negation word ('dışı', 'hariç', 'olmayan') exclude rows. A delta that only
+narrows is evaluated inside the current candidate rows. Only a delta that
+replaces an earlier value (İstanbul -> Ankara) re-filters the whole snapshot.
+
+Each step keeps its merged criteria and its rows as a packed bitset (about 1 KB
+for the full dataset). Steps live on an undo/redo stack in the session.
+
+Try it with ``python -m features.university.refinement "<soru>" "<takip>" ...``.
+"""
+
+import re
+import sys
+import time
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import INTENT_PARSER_MIN_CONFIDENCE
+from .data import ProgramCatalog
+from .filter_engine import get_filter_engine
+from .intent_parser import parse_intent
+from .search_index import fold_turkish
+
+MAX_REFINEMENT_STEPS = 20
+
+# A clause with one of these excludes what it names: 'İstanbul dışı', 'vakıf olmayanlar'
+_NEGATION_RE = re.compile(r"\b(?:disi|disin|haric|olmayan|olmasin|degil|istemiyorum)\w*")
+# Follow-up filler that points back at the current answer
+_FOLLOW_UP_RE = re.compile(
+    r"\b(?:sadece|yalnizca|yalniz|bunlar\w*|onlar\w*|olan\w*|olsun|kalsin|"
+    r"goster\w*|listele\w*|filtrele\w*|daralt\w*|getir\w*)\b"
+)
+_CLAUSE_RE = re.compile(r"[,;]|\b(?:ve|ama|fakat|ancak)\b")
+
+_LIST_FIELDS = ('universities', 'programs', 'cities', 'score_types', 'faculty_types',
+                'university_types', 'language_types')
+# Bounds that only narrow when they move inward
+_LOWER_BOUNDS = ('min_ranking', 'min_score', 'min_quota')
+_UPPER_BOUNDS = ('max_ranking', 'max_score', 'max_fee')
+
+FIELD_NAMES = {
+    'universities': 'Üniversite', 'programs': 'Program', 'cities': 'Şehir',
+    'score_types': 'Puan Türü', 'faculty_types': 'Fakülte', 'university_types': 'Üniversite Türü',
+    'language_types': 'Dil', 'min_ranking': 'En iyi sıra', 'max_ranking': 'En kötü sıra',
+    'min_score': 'En düşük puan', 'max_score': 'En yüksek puan', 'max_fee': 'En yüksek ücret',
+    'min_quota': 'En az kontenjan', 'scholarship_percentage': 'Burs', 'target_year': 'Hedef yıl',
+}
+
+
+@dataclass
+class RefinementDelta:
+    """Criteria fields a follow-up adds (`include`) and values it rules out (`exclude`)"""
+    include: Dict[str, Any] = field(default_factory=dict)
+    exclude: Dict[str, List[str]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.include or self.exclude)
+
+
+@dataclass(frozen=True)
+class RefinementStep:
+    """One answer in the conversation: its merged criteria and its rows as a bitset"""
+    question: str
+    criteria: Any
+    excluded: Dict[str, Tuple[str, ...]]
+    bits: bytes
+    count: int
+    source_hash: str
+    response: str = ''
+
+    @classmethod
+    def from_rows(cls, question: str, criteria: Any, rows: np.ndarray,
+                  excluded: Optional[Dict[str, Tuple[str, ...]]] = None,
+                  response: str = '') -> 'RefinementStep':
+        snapshot = ProgramCatalog.get_instance().snapshot()
+        mask = np.zeros(len(snapshot.df), dtype=bool)
+        mask[rows] = True
+        return cls(question=question, criteria=criteria, excluded=excluded or {},
+                   bits=np.packbits(mask).tobytes(), count=int(len(rows)),
+                   source_hash=snapshot.source_hash, response=response)
+
+    def mask(self) -> np.ndarray:
+        size = len(ProgramCatalog.get_instance().snapshot().df)
+        return np.unpackbits(np.frombuffer(self.bits, dtype=np.uint8), count=size).astype(bool)
+
+    def rows(self) -> np.ndarray:
+        """Row ids, best rank first"""
+        return get_filter_engine().order(np.flatnonzero(self.mask()).astype(np.int32))
+
+    def is_current(self) -> bool:
+        return self.source_hash == ProgramCatalog.get_instance().snapshot().source_hash
+
+
+@dataclass
+class RefinementSession:
+    """Undo/redo stack of answers; `position` is the step on screen"""
+    steps: List[RefinementStep] = field(default_factory=list)
+    position: int = -1
+
+    @property
+    def current(self) -> Optional[RefinementStep]:
+        return self.steps[self.position] if self.steps else None
+
+    def push(self, step: RefinementStep):
+        """Make `step` current; steps that were undone are dropped"""
+        self.steps = self.steps[:self.position + 1] + [step]
+        if len(self.steps) > MAX_REFINEMENT_STEPS:
+            self.steps = self.steps[-MAX_REFINEMENT_STEPS:]
+        self.position = len(self.steps) - 1
+
+    def reset(self, step: RefinementStep):
+        self.steps = [step]
+        self.position = 0
+
+    @property
+    def can_undo(self) -> bool:
+        return self.position > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self.position < len(self.steps) - 1
+
+    def undo(self) -> Optional[RefinementStep]:
+        if self.can_undo:
+            self.position -= 1
+        return self.current
+
+    def redo(self) -> Optional[RefinementStep]:
+        if self.can_redo:
+            self.position += 1
+        return self.current
+
+
+def criteria_fields(criteria: Any) -> Dict[str, Any]:
+    """Fields of a FilterCriteria that are set"""
+    return {f.name: getattr(criteria, f.name) for f in fields(criteria)
+            if getattr(criteria, f.name) not in (None, [], '')}
+
+
+def parse_refinement(question: str) -> Optional[RefinementDelta]:
+    """Delta of a follow-up question, or None when the local parser cannot read it"""
+    delta = RefinementDelta()
+    for clause in _CLAUSE_RE.split(fold_turkish(question)):
+        negated = bool(_NEGATION_RE.search(clause))
+        text = _FOLLOW_UP_RE.sub(' ', _NEGATION_RE.sub(' ', clause)).strip()
+        if not text:
+            continue
+        parsed = parse_intent(text)
+        if parsed.confidence < INTENT_PARSER_MIN_CONFIDENCE:
+            return None
+        if negated:
+            for name, values in parsed.fields.items():
+                if name in _LIST_FIELDS:
+                    delta.exclude.setdefault(name, []).extend(values)
+        else:
+            for name, value in parsed.fields.items():
+                if name in _LIST_FIELDS and name in delta.include:
+                    # 'Ankara ve İzmir' comes in as two clauses
+                    delta.include[name] = list(dict.fromkeys(delta.include[name] + value))
+                else:
+                    delta.include[name] = value
+    return delta or None
+
+
+def _narrows(name: str, old: Any, new: Any) -> bool:
+    """Whether replacing `old` by `new` can only remove rows"""
+    if name == 'target_year':
+        # Bounds against another year's cutoffs select different rows
+        return new == old
+    if old in (None, []):
+        return True
+    if name in _LIST_FIELDS:
+        # Keeping a subset of the earlier values narrows, anything else replaces
+        return {fold_turkish(str(v)) for v in new} <= {fold_turkish(str(v)) for v in old}
+    if name in _LOWER_BOUNDS:
+        return new >= old
+    if name in _UPPER_BOUNDS:
+        return new <= old
+    return new == old
+
+
+def refine(step: RefinementStep, delta: RefinementDelta, question: str,
+           manual: Optional[Any] = None) -> RefinementStep:
+    """Next step: `delta` merged into `step`; `manual` (sidebar criteria) applies on re-filters"""
+    engine = get_filter_engine()
+    criteria_type = type(step.criteria)
+    merged = replace(step.criteria, **delta.include)
+    excluded = dict(step.excluded)
+    for name, values in delta.exclude.items():
+        excluded[name] = tuple(dict.fromkeys(excluded.get(name, ()) + tuple(values)))
+
+    if all(_narrows(name, getattr(step.criteria, name), value) for name, value in delta.include.items()):
+        # Only the current candidates can survive, so filter just those
+        narrowing = criteria_type(**{'target_year': step.criteria.target_year, **delta.include})
+        mask = engine.mask(narrowing, within=np.flatnonzero(step.mask()))
+        exclusions = delta.exclude.items()
+    else:
+        mask = engine.mask(merged)
+        if manual is not None:
+            mask &= engine.mask(manual)
+        exclusions = excluded.items()
+    for name, values in exclusions:
+        mask &= ~engine.mask(criteria_type(**{name: list(values)}))
+    return RefinementStep.from_rows(question, merged, np.flatnonzero(mask), excluded)
+
+
+def describe_refinement(previous: RefinementStep, step: RefinementStep, delta: RefinementDelta) -> str:
+    """Short Turkish summary of what a follow-up changed"""
+    changes = []
+    for name, value in delta.include.items():
+        if isinstance(value, list):
+            shown = ', '.join(map(str, value))
+        else:
+            shown = str(value) if name == 'target_year' else f"{value:,}".replace(',', '.')
+        changes.append(f"{FIELD_NAMES.get(name, name)}: {shown}")
+    for name, values in delta.exclude.items():
+        changes.append(f"{FIELD_NAMES.get(name, name)}: {', '.join(values)} hariç")
+    return (f"Önceki {previous.count} sonuç {step.count} sonuca güncellendi"
+            + (f" ({'; '.join(changes)})." if changes else "."))
+
+
+def main(argv: List[str]) -> int:
+    from .recommender import FilterCriteria
+
+    questions = argv or ["bilgisayar mühendisliği", "sadece devlet olanlar", "İstanbul dışı",
+                         "50000'den iyi olanlar", "Ankara'dakiler"]
+    parsed = parse_intent(questions[0])
+    criteria = FilterCriteria(**parsed.fields)
+    start = time.perf_counter()
+    rows = get_filter_engine().select(criteria)
+    session = RefinementSession()
+    session.reset(RefinementStep.from_rows(questions[0], criteria, rows))
+    print(f"{questions[0]!r}: {len(rows)} rows in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    for question in questions[1:]:
+        start = time.perf_counter()
+        delta = parse_refinement(question)
+        if delta is None:
+            print(f"{question!r}: not understood locally")
+            continue
+        step = refine(session.current, delta, question)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{question!r} ({elapsed:.2f} ms): {describe_refinement(session.current, step, delta)}")
+        session.push(step)
+
+    session.undo()
+    print(f"undo -> {session.current.question!r} ({session.current.count} rows)")
+    session.redo()
+    print(f"redo -> {session.current.question!r} ({session.current.count} rows)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,143 @@
+# university/results_grid.py
+"""Paginated results grid over the shared programs snapshot.
+
+Sessions keep only a ResultSet: the matching snapshot row ids, in result order.
+Each rerun sorts those ids server-side against per-column sort positions, which
+are computed once per snapshot. It then takes one page of the projected columns
+from a shared Arrow table and hands that pyarrow Table straight to
+``st.dataframe``. No DataFrame is copied per session, and only the visible page
+goes over the websocket.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from .data import ProgramCatalog
+from .search_index import fold_turkish
+
+PAGE_SIZES = (25, 50, 100)
+DEFAULT_ORDER = 'Varsayılan'
+
+# Extra per-page columns: page row ids -> {column name: values}
+ExtraColumns = Callable[[np.ndarray], Dict[str, np.ndarray]]
+
+
+@dataclass(frozen=True)
+class ResultSet:
+    """Row ids of a result inside one snapshot version"""
+    rows: np.ndarray
+    source_hash: str
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'ResultSet':
+        """Result from a slice of the shared snapshot (its index holds the row ids)"""
+        snapshot = ProgramCatalog.get_instance().snapshot()
+        return cls(rows=df.index.to_numpy(dtype=np.int32), source_hash=snapshot.source_hash)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def is_current(self) -> bool:
+        return self.source_hash == ProgramCatalog.get_instance().snapshot().source_hash
+
+    def frame(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Materialize the rows, for consumers that need the whole result (charts)"""
+        df = ProgramCatalog.get_instance().snapshot().df
+        if columns is None:
+            return df.iloc[self.rows]
+        return df.iloc[self.rows, df.columns.get_indexer([c for c in columns if c in df.columns])]
+
+
+class SortKeys:
+    """Position of every row in each column's sort order, computed per column on first use"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._positions: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def _build(self, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        values = self.df[column]
+        key = None
+        if not pd.api.types.is_numeric_dtype(values):
+            key = lambda s: s.map(lambda v: fold_turkish(str(v)) if pd.notna(v) else v)
+        order = values.sort_values(kind='stable', na_position='last', key=key).index.to_numpy()
+        positions = np.empty(len(values), dtype=np.int64)
+        positions[order] = np.arange(len(values))
+        return positions, values.isna().to_numpy()
+
+    def sort(self, rows: np.ndarray, column: str, ascending: bool = True) -> np.ndarray:
+        """`rows` ordered by `column`; missing values last in both directions"""
+        entry = self._positions.get(column)
+        if entry is None:
+            with self._lock:
+                entry = self._positions.get(column)
+                if entry is None:
+                    entry = self._positions[column] = self._build(column)
+        positions, missing = entry
+        keys = positions[rows]
+        if not ascending:
+            keys = np.where(missing[rows], len(positions) + keys, -keys)
+        return rows[np.argsort(keys, kind='stable')]
+
+
+def _arrow_table(df: pd.DataFrame) -> pa.Table:
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def page_table(result: ResultSet, columns: Sequence[str], page: int = 0,
+               page_size: int = PAGE_SIZES[0], sort: Optional[str] = None,
+               ascending: bool = True, extra: Optional[ExtraColumns] = None) -> pa.Table:
+    """One page of `result` as an Arrow table with the projected (and extra) columns"""
+    snapshot = ProgramCatalog.get_instance().snapshot()
+    rows = result.rows
+    if sort:
+        rows = snapshot.derived('sort_keys', SortKeys).sort(rows, sort, ascending)
+    page_rows = rows[page * page_size:(page + 1) * page_size]
+
+    table = snapshot.derived('arrow_table', _arrow_table)
+    table = table.select([c for c in columns if c in table.column_names]).take(pa.array(page_rows))
+    if extra is not None:
+        for position, (name, values) in enumerate(extra(page_rows).items()):
+            table = table.add_column(position, name, pa.array(values, from_pandas=True))
+    return table
+
+
+def show_results_grid(result: ResultSet, key: str, columns: Sequence[str],
+                      extra: Optional[ExtraColumns] = None,
+                      column_config: Optional[Dict[str, object]] = None):
+    """Sort and paging controls plus the current page of `result`"""
+    if not len(result):
+        st.warning("Arama kriterlerinize uygun sonuç bulunamadı.")
+        return
+    if not result.is_current():
+        st.info("Veri seti güncellendi, lütfen aramayı tekrarlayın.")
+        return
+
+    sortable = [c for c in columns if c in ProgramCatalog.get_instance().snapshot().df.columns]
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        sort = st.selectbox("Sırala", [DEFAULT_ORDER] + sortable, key=f"{key}_sort")
+    with col2:
+        direction = st.radio("Yön", ["Artan", "Azalan"], horizontal=True, key=f"{key}_direction")
+    with col3:
+        page_size = st.selectbox("Satır", PAGE_SIZES, key=f"{key}_page_size")
+    pages = max(1, -(-len(result) // page_size))
+    with col4:
+        page = st.number_input("Sayfa", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+
+    table = page_table(
+        result, columns, int(page) - 1, page_size,
+        sort=None if sort == DEFAULT_ORDER else sort,
+        ascending=direction == "Artan",
+        extra=extra,
+    )
+    st.dataframe(table, use_container_width=True, hide_index=True, column_config=column_config)
+    start = (int(page) - 1) * page_size
+    st.caption(f"{start + 1}-{start + table.num_rows} / {len(result)} sonuç (sayfa {page}/{pages})")
@@ -0,0 +1,169 @@
+# university/score_rank.py
+"""Score -> rank curves per puan türü, fitted on the programs dataset.
+
+Every program contributes one (Taban Puan, Başarı Sırası) pair per year. For each
+score type the pairs are fitted with a non-increasing isotonic regression of
+log rank on score (pool-adjacent-violators). The fit is then sampled into a
+dense lookup table, so turning any number of scores into ranks is a single
+indexing operation. Beyond the best and worst program cutoffs the curve is
+continued log-linearly with the slope of its last EXTRAPOLATION_SPAN points.
+
+Mock exam nets are turned into placement scores with the ÖSYM weighting:
+TYT carries 40% and AYT/YDT 60% of the 400 points above the 100 base. The
+diploma grade (OBP) is optional.
+
+Check the curves with ``python -m features.university.score_rank``.
+"""
+
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .data import RANK_COLUMNS, SCORE_COLUMNS, YEARS, ProgramCatalog
+from .search_index import fold_turkish
+
+SCORE_TYPES = ('TYT', 'SAY', 'EA', 'SÖZ', 'DİL')
+# Curves with fewer distinct scores than this are not trusted
+MIN_CURVE_POINTS = 20
+# Lookup table resolution in score points
+TABLE_STEP = 0.01
+# Score points at each end of a curve whose log-linear slope extends it past the fitted range
+EXTRAPOLATION_SPAN = 40.0
+
+BASE_SCORE = 100.0
+TYT_QUESTIONS = 120
+AYT_QUESTIONS = 80
+# Placement score points per net
+TYT_ONLY_POINTS_PER_NET = 400.0 / TYT_QUESTIONS
+TYT_POINTS_PER_NET = 0.4 * 400.0 / TYT_QUESTIONS
+AYT_POINTS_PER_NET = 0.6 * 400.0 / AYT_QUESTIONS
+
+
+def isotonic_decreasing(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted least-squares non-increasing fit of `values` (already ordered by x)"""
+    means: List[float] = []
+    totals: List[float] = []
+    sizes: List[int] = []
+    for value, weight in zip(values.tolist(), weights.tolist()):
+        means.append(value)
+        totals.append(weight)
+        sizes.append(1)
+        # Pool adjacent violators: merge while a block is above the one before it
+        while len(means) > 1 and means[-2] < means[-1]:
+            weight = totals[-2] + totals[-1]
+            means[-2] = (means[-2] * totals[-2] + means[-1] * totals[-1]) / weight
+            totals[-2] = weight
+            sizes[-2] += sizes[-1]
+            del means[-1], totals[-1], sizes[-1]
+    return np.repeat(means, sizes)
+
+
+class ScoreRankCurve:
+    """Monotone score -> rank lookup for one score type and year"""
+
+    def __init__(self, scores: np.ndarray, ranks: np.ndarray):
+        # One point per distinct score (mean log rank), weighted by how many programs share it
+        knots, inverse, counts = np.unique(np.round(scores, 2), return_inverse=True, return_counts=True)
+        log_ranks = np.bincount(inverse, weights=np.log(ranks)) / counts
+        fitted = isotonic_decreasing(log_ranks, counts.astype(np.float64))
+
+        self.low, self.high = float(knots[0]), float(knots[-1])
+        grid = np.arange(self.low, self.high + TABLE_STEP, TABLE_STEP)
+        self.table = np.exp(np.interp(grid, knots, fitted))
+        self.points = len(knots)
+        # d log rank / d score at both ends; must fall for extrapolation to make sense
+        log_table = np.log(self.table)
+        grid = grid[:len(log_table)]
+        top = grid >= self.high - EXTRAPOLATION_SPAN
+        bottom = grid <= self.low + EXTRAPOLATION_SPAN
+        self.high_slope = float(np.polyfit(grid[top], log_table[top], 1)[0]) if top.sum() > 1 else np.nan
+        self.low_slope = float(np.polyfit(grid[bottom], log_table[bottom], 1)[0]) if bottom.sum() > 1 else np.nan
+
+    def ranks(self, scores: np.ndarray) -> np.ndarray:
+        """Estimated rank per score, extrapolated outside the fitted range; NaN stays NaN"""
+        scores = np.asarray(scores, dtype=np.float64)
+        index = np.rint((np.clip(scores, self.low, self.high) - self.low) / TABLE_STEP)
+        index = np.clip(np.nan_to_num(index), 0, len(self.table) - 1).astype(np.intp)
+        ranks = self.table[index]
+        # Clamping would give every score above the best cutoff that cutoff's rank
+        with np.errstate(invalid='ignore', over='ignore'):
+            above = scores > self.high
+            below = scores < self.low
+            slope_high = self.high_slope if self.high_slope < 0 else np.nan
+            slope_low = self.low_slope if self.low_slope < 0 else np.nan
+            ranks = np.where(above, self.table[-1] * np.exp(slope_high * (scores - self.high)), ranks)
+            ranks = np.where(below, self.table[0] * np.exp(slope_low * (scores - self.low)), ranks)
+        return np.where(np.isnan(scores), np.nan, np.maximum(ranks, 1.0))
+
+
+class ScoreRankCurves:
+    """Curves for every score type and year that has enough programs"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.curves: Dict[tuple, ScoreRankCurve] = {}
+        types = df['Puan Türü'].map(lambda v: fold_turkish(str(v)))
+        for year, score_column, rank_column in zip(YEARS, SCORE_COLUMNS, RANK_COLUMNS):
+            if score_column not in df.columns or rank_column not in df.columns:
+                continue
+            scores = pd.to_numeric(df[score_column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            ranks = pd.to_numeric(df[rank_column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = ~np.isnan(scores) & ~np.isnan(ranks) & (ranks > 0)
+            for score_type in SCORE_TYPES:
+                rows = valid & (types == fold_turkish(score_type)).to_numpy()
+                if np.unique(scores[rows]).size >= MIN_CURVE_POINTS:
+                    self.curves[(score_type, year)] = ScoreRankCurve(scores[rows], ranks[rows])
+
+    def latest_year(self, score_type: str) -> Optional[int]:
+        years = [year for (kind, year) in self.curves if kind == score_type]
+        return max(years) if years else None
+
+    def ranks(self, score_type: str, scores: Sequence[float], year: Optional[int] = None) -> np.ndarray:
+        """Estimated ranks for `scores` of one score type (newest fitted year by default)"""
+        year = year or self.latest_year(score_type)
+        curve = self.curves.get((score_type, year))
+        if curve is None:
+            return np.full(len(scores), np.nan)
+        return curve.ranks(np.asarray(scores, dtype=np.float64))
+
+
+def placement_scores(tyt_nets: Sequence[float], field_nets: Optional[Sequence[float]] = None,
+                     obp: float = 0.0) -> np.ndarray:
+    """Estimated placement scores; TYT only when `field_nets` (AYT/YDT) is None"""
+    tyt = np.asarray(tyt_nets, dtype=np.float64)
+    if field_nets is None:
+        return BASE_SCORE + TYT_ONLY_POINTS_PER_NET * tyt + obp
+    field = np.asarray(field_nets, dtype=np.float64)
+    return BASE_SCORE + TYT_POINTS_PER_NET * tyt + AYT_POINTS_PER_NET * field + obp
+
+
+def get_score_rank_curves() -> ScoreRankCurves:
+    """Score -> rank curves of the current programs snapshot, built on first use"""
+    return ProgramCatalog.get_instance().snapshot().derived('score_rank_curves', ScoreRankCurves)
+
+
+def estimate_ranks(score_type: str, scores: Sequence[float]) -> np.ndarray:
+    return get_score_rank_curves().ranks(score_type, scores)
+
+
+def main(argv: List[str]) -> int:
+    start = time.perf_counter()
+    curves = get_score_rank_curves()
+    print(f"{len(curves.curves)} curves fitted in {(time.perf_counter() - start) * 1000:.0f} ms")
+    probe = np.array([200, 250, 300, 350, 400, 450, 500], dtype=np.float64)
+    for (score_type, year), curve in sorted(curves.curves.items()):
+        ranks = curve.ranks(probe)
+        print(f"{score_type:<4} {year}: {curve.points:>5} points, "
+              + ', '.join(f"{s:.0f}->{r:,.0f}" for s, r in zip(probe, ranks)))
+
+    scores = np.random.default_rng(0).uniform(150, 550, 100_000)
+    start = time.perf_counter()
+    curves.ranks('SAY', scores)
+    print(f"100k scores -> ranks in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
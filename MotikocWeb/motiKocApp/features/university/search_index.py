@@ -0,0 +1,183 @@
+# university/search_index.py
+"""Inverted token index over the program text columns.
+
+Text is folded the Turkish way ('İ'/'I'/'ı' -> 'i', 'ş' -> 's', ...) so 'istanbul',
+'İSTANBUL' and 'Istanbul' all match. Postings are sorted row-id arrays, and every
+lookup costs time proportional to the postings it touches, not to the dataset.
+"""
+
+import bisect
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .data import ProgramCatalog
+
+INDEXED_COLUMNS = ('Program Adı', 'Üniversite', 'Fakülte', 'Şehir')
+# Columns where a phrase equal to a whole value means that value only:
+# 'ANKARA ÜNİVERSİTESİ' should not also match 'ANKARA MEDİPOL ÜNİVERSİTESİ'
+WHOLE_VALUE_COLUMNS = ('Üniversite',)
+
+# Dotted and dotless I both fold to 'i' before lowercasing, so str.lower() never
+# sees 'İ' (which it would turn into 'i' + combining dot)
+_TURKISH_FOLD = str.maketrans({
+    'İ': 'i', 'I': 'i', 'ı': 'i', 'î': 'i', 'Î': 'i',
+    'Ç': 'c', 'ç': 'c',
+    'Ğ': 'g', 'ğ': 'g',
+    'Ö': 'o', 'ö': 'o',
+    'Ş': 's', 'ş': 's',
+    'Ü': 'u', 'ü': 'u', 'û': 'u', 'Û': 'u',
+    'Â': 'a', 'â': 'a',
+})
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+# Teaching language is the '(İngilizce)' style suffix of the program name
+_LANGUAGE_RE = re.compile(r'\(([A-ZÇĞİÖŞÜ][a-zçğıöşü]+(?:ca|ce|ça|çe))\)')
+
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+def fold_turkish(text: str) -> str:
+    """Casefold with Turkish rules and strip diacritics: 'Mühendisliği' -> 'muhendisligi'"""
+    return text.translate(_TURKISH_FOLD).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Folded alphanumeric tokens of a value or query"""
+    return _TOKEN_RE.findall(fold_turkish(text))
+
+
+def program_languages(names: pd.Series) -> pd.Series:
+    """Teaching language of each program from its name suffix; NaN without one"""
+    return names.str.extract(_LANGUAGE_RE, expand=False)
+
+
+def intersect(row_sets: Iterable[np.ndarray]) -> np.ndarray:
+    """Intersect sorted row-id arrays, smallest first so work stops early"""
+    ordered = sorted(row_sets, key=len)
+    if not ordered:
+        return _EMPTY
+    result = ordered[0]
+    for rows in ordered[1:]:
+        if not len(result):
+            break
+        result = np.intersect1d(result, rows, assume_unique=True)
+    return result
+
+
+def union(row_sets: Iterable[np.ndarray]) -> np.ndarray:
+    row_sets = [rows for rows in row_sets if len(rows)]
+    if not row_sets:
+        return _EMPTY
+    if len(row_sets) == 1:
+        return row_sets[0]
+    rows = np.concatenate(row_sets)
+    if len(rows) < 1024:
+        return np.unique(rows)
+    # Large unions: scatter into a mask instead of sorting
+    seen = np.zeros(max(r[-1] for r in row_sets) + 1, dtype=bool)
+    seen[rows] = True
+    return np.flatnonzero(seen).astype(np.int32)
+
+
+class _ColumnIndex:
+    """Token -> sorted row ids for one column, with a sorted vocabulary for prefixes"""
+
+    def __init__(self, values: pd.Series):
+        # Tokenize each distinct value once; most columns repeat heavily
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        order = np.argsort(codes, kind='stable').astype(np.int32)
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        rows_by_value = [order[bounds[i]:bounds[i + 1]] for i in range(len(uniques))]
+
+        self.values: Dict[str, np.ndarray] = {
+            ' '.join(tokenize(str(value))): rows_by_value[code] for code, value in enumerate(uniques)
+        }
+        token_values: Dict[str, List[int]] = {}
+        for code, value in enumerate(uniques):
+            for token in set(tokenize(str(value))):
+                token_values.setdefault(token, []).append(code)
+
+        self.postings: Dict[str, np.ndarray] = {
+            token: union(rows_by_value[code] for code in codes_)
+            if len(codes_) > 1 else rows_by_value[codes_[0]]
+            for token, codes_ in token_values.items()
+        }
+        self.vocabulary: List[str] = sorted(self.postings)
+        self._prefix_cache: Dict[str, np.ndarray] = {}
+
+    def exact(self, token: str) -> np.ndarray:
+        return self.postings.get(token, _EMPTY)
+
+    def prefix(self, token: str) -> np.ndarray:
+        """Rows containing any token that starts with `token`"""
+        cached = self._prefix_cache.get(token)
+        if cached is None:
+            start = bisect.bisect_left(self.vocabulary, token)
+            end = bisect.bisect_left(self.vocabulary, token + '\uffff')
+            cached = union(self.postings[t] for t in self.vocabulary[start:end])
+            self._prefix_cache[token] = cached
+        return cached
+
+    def whole(self, text: str) -> Optional[np.ndarray]:
+        """Rows whose value is exactly `text` (folded), or None if no value is"""
+        return self.values.get(' '.join(tokenize(text)))
+
+    def phrase(self, text: str) -> Optional[np.ndarray]:
+        """Rows containing every word of `text`; the last word may be unfinished
+
+        Returns None for text without any searchable token.
+        """
+        tokens = tokenize(text)
+        if not tokens:
+            return None
+        *whole, last = tokens
+        return intersect([self.exact(token) for token in whole] + [self.prefix(last)])
+
+
+class ProgramTokenIndex:
+    """Inverted index over the searchable text columns of one programs snapshot"""
+
+    def __init__(self, df: pd.DataFrame, columns: Sequence[str] = INDEXED_COLUMNS):
+        self.size = len(df)
+        self.columns: Dict[str, _ColumnIndex] = {
+            column: _ColumnIndex(df[column]) for column in columns if column in df.columns
+        }
+
+    def match(self, column: str, phrases: Iterable[str]) -> Optional[np.ndarray]:
+        """Rows where `column` matches any of the phrases; None when nothing to filter on"""
+        index = self.columns[column]
+        matches = []
+        for phrase in phrases:
+            rows = index.whole(phrase) if column in WHOLE_VALUE_COLUMNS else None
+            if rows is None:
+                rows = index.phrase(phrase)
+            if rows is not None:
+                matches.append(rows)
+        return union(matches) if matches else None
+
+    def search(self, terms: Mapping[str, Iterable[str]]) -> Optional[np.ndarray]:
+        """AND across columns, OR within a column: {'Şehir': ['İstanbul', 'Ankara'], ...}
+
+        Returns sorted row ids, or None when no column constrains the result.
+        """
+        per_column = [
+            rows for rows in (self.match(column, phrases) for column, phrases in terms.items() if phrases)
+            if rows is not None
+        ]
+        if not per_column:
+            return None
+        return intersect(per_column)
+
+    def as_mask(self, rows: np.ndarray) -> np.ndarray:
+        """Boolean row mask (one flag per snapshot row) for a set of row ids"""
+        mask = np.zeros(self.size, dtype=bool)
+        mask[rows] = True
+        return mask
+
+
+def get_token_index() -> ProgramTokenIndex:
+    """Token index of the current programs snapshot, built on first use"""
+    return ProgramCatalog.get_instance().snapshot().derived('token_index', ProgramTokenIndex)
+
@@ -0,0 +1,219 @@
+# university/summary.py
+"""Deterministic summary of a result set, plus a compact payload for LLM commentary.
+
+The key findings of a result are computed locally over NumPy columns extracted
+once per snapshot: rank and score spread, city and university type mix, fee
+ranges and quota and cutoff trends. They are rendered from Turkish templates,
+so an answer appears as soon as the rows are filtered. An LLM only writes
+optional commentary. It gets these findings and a few projected rows as
+compact text, not whole records with every link.
+
+Compare prompt sizes with ``python -m features.university.summary "<soru>"``.
+"""
+
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data import FEE_COLUMN, QUOTA_COLUMNS, RANK_COLUMNS, YEARS, ProgramCatalog
+
+RANK_COLUMN = 'Başarı Sırası 2023'
+SCORE_COLUMN = 'Taban Puan 2023'
+TOP_GROUPS = 3
+# Rows sent to the LLM, with only the columns it needs to comment
+PAYLOAD_ROWS = 10
+PAYLOAD_COLUMNS = ('Üniversite', 'Program Adı', 'Şehir', 'Üni.Türü', 'Puan Türü',
+                   RANK_COLUMN, SCORE_COLUMN, 'Kontenjan 2024', FEE_COLUMN)
+
+COMMENTARY_PROMPT = """Kullanıcının sorusu: {question}
+
+Sonuçların özeti:
+{findings}
+
+İlk {shown} sonuç (CSV):
+{rows}
+
+Bu bulgulara dayanarak Türkçe, kısa ve samimi bir yorum yaz: öne çıkan seçenekleri,
+dikkat edilmesi gereken noktaları ve öğrencinin sonraki adımlarını belirt.
+Özetteki sayıları tekrar etme, yorumla."""
+
+
+def _float_column(df: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+class SummaryColumns:
+    """Numeric columns and category codes of one snapshot, for summaries over row ids"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.rank = _float_column(df, RANK_COLUMN)
+        self.score = _float_column(df, SCORE_COLUMN)
+        self.fee = _float_column(df, FEE_COLUMN)
+        self.ranks = {year: _float_column(df, c) for year, c in zip(YEARS, RANK_COLUMNS)}
+        self.quotas = {year: _float_column(df, c) for year, c in zip(YEARS, QUOTA_COLUMNS)}
+        self.categories: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for column in ('Şehir', 'Üni.Türü', 'Puan Türü', 'Üniversite'):
+            if column in df.columns:
+                codes, uniques = pd.factorize(df[column], use_na_sentinel=True)
+                self.categories[column] = (codes, np.asarray(uniques, dtype=object))
+
+
+@dataclass
+class ResultSummary:
+    """Key findings of a result; None/empty where the rows have no data"""
+    count: int
+    universities: int = 0
+    rank_range: Optional[Tuple[float, float, float]] = None
+    score_range: Optional[Tuple[float, float, float]] = None
+    groups: Dict[str, List[Tuple[str, int]]] = field(default_factory=dict)
+    paid: int = 0
+    fee_range: Optional[Tuple[float, float, float]] = None
+    quota_change: Optional[Tuple[int, float, float]] = None
+    rank_change: Optional[Tuple[int, int, float]] = None
+
+
+def _spread(values: np.ndarray) -> Optional[Tuple[float, float, float]]:
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+    return float(values.min()), float(np.median(values)), float(values.max())
+
+
+def _top(codes: np.ndarray, labels: np.ndarray, limit: int = TOP_GROUPS) -> List[Tuple[str, int]]:
+    codes = codes[codes >= 0]
+    if not len(codes):
+        return []
+    counts = np.bincount(codes, minlength=len(labels))
+    top = np.argsort(-counts, kind='stable')[:limit]
+    return [(str(labels[i]), int(counts[i])) for i in top if counts[i]]
+
+
+def summarize_rows(rows: Sequence[int]) -> ResultSummary:
+    """Findings for snapshot row ids, computed with a few vectorized passes"""
+    columns = ProgramCatalog.get_instance().snapshot().derived('summary_columns', SummaryColumns)
+    rows = np.asarray(rows, dtype=np.int64)
+    summary = ResultSummary(count=len(rows))
+    if not len(rows):
+        return summary
+
+    summary.rank_range = _spread(columns.rank[rows])
+    summary.score_range = _spread(columns.score[rows])
+    for column, (codes, labels) in columns.categories.items():
+        if column == 'Üniversite':
+            summary.universities = int(np.unique(codes[rows][codes[rows] >= 0]).size)
+        else:
+            summary.groups[column] = _top(codes[rows], labels)
+
+    fee = columns.fee[rows]
+    paid = fee[fee > 0]
+    summary.paid = int(len(paid))
+    summary.fee_range = _spread(paid)
+
+    # Trends only over programs that have both years
+    new_year, old_year = YEARS[0], YEARS[1]
+    quota_new, quota_old = columns.quotas[new_year][rows], columns.quotas[old_year][rows]
+    both = ~np.isnan(quota_new) & ~np.isnan(quota_old)
+    if both.any():
+        summary.quota_change = (int(both.sum()), float(quota_old[both].sum()), float(quota_new[both].sum()))
+    rank_new, rank_old = columns.ranks[YEARS[1]][rows], columns.ranks[YEARS[2]][rows]
+    both = (rank_new > 0) & (rank_old > 0)
+    if both.any():
+        ratio = rank_new[both] / rank_old[both]
+        summary.rank_change = (int(both.sum()), int((ratio < 1).sum()), float(np.median(ratio)))
+    return summary
+
+
+def _number(value: float, decimals: int = 0) -> str:
+    """Turkish number format: 12.345 / 456,78"""
+    text = f"{value:,.{decimals}f}"
+    return text.replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+def render_summary(summary: ResultSummary) -> str:
+    """Markdown findings in Turkish"""
+    if not summary.count:
+        return "Üzgünüm, arama kriterlerinize uygun bir program bulamadım."
+    lines = [f"**{summary.count} program** bulundu ({summary.universities} üniversite)."]
+    if summary.rank_range:
+        low, median, high = summary.rank_range
+        lines.append(f"- Başarı sırası (2023): en iyi {_number(low)}, ortanca {_number(median)}, "
+                     f"en düşük {_number(high)}.")
+    if summary.score_range:
+        low, median, high = summary.score_range
+        lines.append(f"- Taban puan (2023): {_number(low, 2)} – {_number(high, 2)}, "
+                     f"ortanca {_number(median, 2)}.")
+    for column, title in (('Şehir', 'Şehirler'), ('Üni.Türü', 'Üniversite türü'), ('Puan Türü', 'Puan türü')):
+        groups = summary.groups.get(column)
+        if groups:
+            shown = ', '.join(f"{name} %{count * 100 / summary.count:.0f}" for name, count in groups)
+            lines.append(f"- {title}: {shown}.")
+    if summary.fee_range:
+        low, median, high = summary.fee_range
+        free = summary.count - summary.paid
+        lines.append(f"- Ücretli {summary.paid} program: {_number(low)} ₺ – {_number(high)} ₺, "
+                     f"ortanca {_number(median)} ₺" + (f"; {free} program ücretsiz." if free else "."))
+    elif summary.count:
+        lines.append("- Sonuçların hiçbiri ücretli değil.")
+    if summary.quota_change:
+        programs, old, new = summary.quota_change
+        change = (new - old) * 100 / old if old else 0.0
+        direction = 'arttı' if change > 0.5 else 'azaldı' if change < -0.5 else 'değişmedi'
+        lines.append(f"- Kontenjan {YEARS[1]} → {YEARS[0]}: {_number(old)} → {_number(new)} "
+                     f"(%{abs(change):.0f} {direction}, {programs} program).")
+    if summary.rank_change:
+        programs, harder, median = summary.rank_change
+        lines.append(f"- {YEARS[2]} → {YEARS[1]}: {programs} programın {harder} tanesinde başarı sırası "
+                     f"yükseldi (ortanca oran {_number(median, 2)}; 1'in altı rekabetin arttığını gösterir).")
+    return '\n'.join(lines)
+
+
+def compact_payload(rows: Sequence[int], limit: int = PAYLOAD_ROWS) -> str:
+    """First `limit` rows as CSV with only PAYLOAD_COLUMNS"""
+    df = ProgramCatalog.get_instance().snapshot().df
+    columns = [c for c in PAYLOAD_COLUMNS if c in df.columns]
+    shown = df.iloc[np.asarray(rows[:limit], dtype=np.int64)][columns]
+    return shown.to_csv(index=False, float_format='%.10g').strip()
+
+
+def commentary_prompt(question: str, rows: Sequence[int], summary: Optional[ResultSummary] = None) -> str:
+    summary = summary or summarize_rows(rows)
+    return COMMENTARY_PROMPT.format(
+        question=question,
+        findings=render_summary(summary),
+        shown=min(PAYLOAD_ROWS, summary.count),
+        rows=compact_payload(rows),
+    )
+
+
+def main(argv: List[str]) -> int:
+    import time
+
+    from .filter_engine import get_filter_engine
+    from .intent_parser import parse_intent
+    from .recommender import FilterCriteria
+
+    question = argv[0] if argv else "İstanbul'da bilgisayar mühendisliği"
+    rows = get_filter_engine().select(FilterCriteria(**parse_intent(question).fields))
+    summarize_rows(rows)
+    start = time.perf_counter()
+    summary = summarize_rows(rows)
+    text = render_summary(summary)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{text}\n\n({elapsed:.2f} ms for {len(rows)} rows)")
+
+    df = ProgramCatalog.get_instance().snapshot().df
+    old_payload = json.dumps(df.iloc[rows[:20]].to_dict('records'), ensure_ascii=False, indent=2, default=str)
+    prompt = commentary_prompt(question, rows, summary)
+    print(f"old prompt payload {len(old_payload):,} chars, new prompt {len(prompt):,} chars "
+          f"({len(old_payload) / max(len(prompt), 1):.1f}x smaller)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -7,6 +7,7 @@ from datetime import datetime
 import time
 
 from services.ai_service import AIService  # Import AIService
+from core.database import db_read
 
 # Initialize AIService
 ai_service = AIService()
@@ -126,13 +127,11 @@ def show_voice_guidance():
             """, unsafe_allow_html=True)
             
             # Fetch user data for personalized motivation
-            conn = sqlite3.connect('motikoc.db')
-            user_data = pd.read_sql_query('''
-            SELECT name, grade, target_university, target_department, target_rank
-            FROM users WHERE id = ?
-        ''', conn, params=(st.session_state.user_id,))
-    
-            conn.close()
+            with db_read() as conn:
+                user_data = pd.read_sql_query('''
+                SELECT name, grade, target_university, target_department, target_rank
+                FROM users WHERE id = ?
+            ''', conn, params=(st.session_state.user_id,))
             
             days_to_exam = (datetime(2025, 6, 15) - datetime.now()).days
             
@@ -18,6 +18,9 @@ import nest_asyncio
 from dotenv import load_dotenv
 import os
 
+from core.database import pooled_connection
+from features.university.data import get_programs
+
 
 # Load environment variables
 load_dotenv()
@@ -301,264 +304,256 @@ st.markdown("""
 
 # Database Setup
 def init_db():
-    conn = sqlite3.connect('motikoc.db')
-    c = conn.cursor()
-    
-    # Users table
-    c.execute('''CREATE TABLE IF NOT EXISTS users
-                 (id INTEGER PRIMARY KEY, 
-                  username TEXT UNIQUE,
-                  password TEXT,
-                  name TEXT,
-                  email TEXT,
-                  grade TEXT,
-                  city TEXT,
-                  target_university TEXT,
-                  target_department TEXT,
-                  target_rank INTEGER,
-                  study_type TEXT)''')
-    
-    # Study logs
-    c.execute('''CREATE TABLE IF NOT EXISTS study_logs
-                 (id INTEGER PRIMARY KEY,
-                  user_id INTEGER,
-                  subject TEXT,
-                  topic TEXT,
-                  duration INTEGER,
-                  date TEXT,
-                  performance_rating INTEGER,
-                  notes TEXT,
-                  FOREIGN KEY(user_id) REFERENCES users(id))''')
-    
-    # Mood logs
-    c.execute('''CREATE TABLE IF NOT EXISTS mood_logs
-                 (id INTEGER PRIMARY KEY,
-                  user_id INTEGER,
-                  mood TEXT,
-                  stress_level INTEGER,
-                  notes TEXT,
-                  date TEXT,
-                  FOREIGN KEY(user_id) REFERENCES users(id))''')
-    
-    # Goals
-    c.execute('''CREATE TABLE IF NOT EXISTS goals
-                 (id INTEGER PRIMARY KEY,
-                  user_id INTEGER,
-                  title TEXT,
-                  deadline TEXT,
-                  progress INTEGER,
-                  completed BOOLEAN,
-                  FOREIGN KEY(user_id) REFERENCES users(id))''')
-    
-    # Subjects and Topics
-    c.execute('''CREATE TABLE IF NOT EXISTS subjects
-                 (id INTEGER PRIMARY KEY,
-                  name TEXT,
-                  category TEXT)''')
-    
-    # Default subjects
-    subjects = [
-        ('Türkçe', 'TYT'),
-        ('Matematik', 'TYT'),
-        ('Fizik', 'AYT'),
-        ('Kimya', 'AYT'),
-        ('Biyoloji', 'AYT'),
-        ('Tarih', 'TYT'),
-        ('Coğrafya', 'TYT'),
-        ('Felsefe', 'TYT')
-    ]
+    with pooled_connection() as conn, conn.transaction():
+        c = conn.cursor()
+    
+        # Users table
+        c.execute('''CREATE TABLE IF NOT EXISTS users
+                     (id INTEGER PRIMARY KEY, 
+                      username TEXT UNIQUE,
+                      password TEXT,
+                      name TEXT,
+                      email TEXT,
+                      grade TEXT,
+                      city TEXT,
+                      target_university TEXT,
+                      target_department TEXT,
+                      target_rank INTEGER,
+                      study_type TEXT)''')
+    
+        # Study logs
+        c.execute('''CREATE TABLE IF NOT EXISTS study_logs
+                     (id INTEGER PRIMARY KEY,
+                      user_id INTEGER,
+                      subject TEXT,
+                      topic TEXT,
+                      duration INTEGER,
+                      date TEXT,
+                      performance_rating INTEGER,
+                      notes TEXT,
+                      FOREIGN KEY(user_id) REFERENCES users(id))''')
+    
+        # Mood logs
+        c.execute('''CREATE TABLE IF NOT EXISTS mood_logs
+                     (id INTEGER PRIMARY KEY,
+                      user_id INTEGER,
+                      mood TEXT,
+                      stress_level INTEGER,
+                      notes TEXT,
+                      date TEXT,
+                      FOREIGN KEY(user_id) REFERENCES users(id))''')
+    
+        # Goals
+        c.execute('''CREATE TABLE IF NOT EXISTS goals
+                     (id INTEGER PRIMARY KEY,
+                      user_id INTEGER,
+                      title TEXT,
+                      deadline TEXT,
+                      progress INTEGER,
+                      completed BOOLEAN,
+                      FOREIGN KEY(user_id) REFERENCES users(id))''')
     
-    c.executemany('''INSERT OR IGNORE INTO subjects (name, category)
-                     VALUES (?, ?)''', subjects)
-    # Saved Solutions table - YENİ EKLENEN TABLO
-    c.execute('''CREATE TABLE IF NOT EXISTS saved_solutions
-               (id INTEGER PRIMARY KEY,
-                user_id INTEGER,
-                subject TEXT,
-                question TEXT,
-                solution TEXT,
-                date TEXT,
-                FOREIGN KEY(user_id) REFERENCES users(id))''')
-    
-    
-    # Social features
-    c.execute('''CREATE TABLE IF NOT EXISTS friendships
-                 (id INTEGER PRIMARY KEY,
-                  user_id INTEGER,
-                  friend_id INTEGER,
-                  status TEXT,
-                  FOREIGN KEY(user_id) REFERENCES users(id),
-                  FOREIGN KEY(friend_id) REFERENCES users(id))''')
-    
-    c.execute('''CREATE TABLE IF NOT EXISTS achievements
-                 (id INTEGER PRIMARY KEY,
-                  user_id INTEGER,
-                  title TEXT,
-                  description TEXT,
-                  date TEXT,
-                  FOREIGN KEY(user_id) REFERENCES users(id))''')
-    
-    # Additional Tables for YKS Features
-    # Study Groups
-    c.execute('''CREATE TABLE IF NOT EXISTS study_groups
-                 (id INTEGER PRIMARY KEY,
-                  creator_id INTEGER,
-                  name TEXT,
-                  group_type TEXT,
-                  max_members INTEGER,
-                  description TEXT,
-                  subjects TEXT,
-                  FOREIGN KEY(creator_id) REFERENCES users(id))''')
-    
-    # Group Members
-    c.execute('''CREATE TABLE IF NOT EXISTS group_members
-                 (id INTEGER PRIMARY KEY,
-                  group_id INTEGER,
-                  user_id INTEGER,
-                  role TEXT,
-                  FOREIGN KEY(group_id) REFERENCES study_groups(id),
-                  FOREIGN KEY(user_id) REFERENCES users(id))''')
-    
-    # Mock Exams
-    c.execute('''CREATE TABLE IF NOT EXISTS mock_exams
-                 (id INTEGER PRIMARY KEY,
-                  user_id INTEGER,
-                  exam_type TEXT,
-                  exam_date TEXT,
-                  total_time INTEGER,
-                  subject_results TEXT,
-                  analysis TEXT,
-                  FOREIGN KEY(user_id) REFERENCES users(id))''')
-    
-    # Question Stats
-    c.execute('''CREATE TABLE IF NOT EXISTS question_stats
-                 (id INTEGER PRIMARY KEY,
-                  user_id INTEGER,
-                  subject TEXT,
-                  topic TEXT,
-                  correct INTEGER,
-                  incorrect INTEGER,
-                  unanswered INTEGER,
-                  average_time INTEGER,
-                  last_practice TEXT,
-                  FOREIGN KEY(user_id) REFERENCES users(id))''')
-    
-    # YKS Subjects
-    c.execute('''CREATE TABLE IF NOT EXISTS yks_subjects
-                 (id INTEGER PRIMARY KEY,
-                  exam_type TEXT,  -- TYT/AYT
-                  subject TEXT,
-                  topic TEXT,
-                  subtopic TEXT,
-                  difficulty INTEGER,
-                  importance INTEGER)''')
-    
-    conn.commit()
-    conn.close()
+        # Subjects and Topics
+        c.execute('''CREATE TABLE IF NOT EXISTS subjects
+                     (id INTEGER PRIMARY KEY,
+                      name TEXT,
+                      category TEXT)''')
+    
+        # Default subjects
+        subjects = [
+            ('Türkçe', 'TYT'),
+            ('Matematik', 'TYT'),
+            ('Fizik', 'AYT'),
+            ('Kimya', 'AYT'),
+            ('Biyoloji', 'AYT'),
+            ('Tarih', 'TYT'),
+            ('Coğrafya', 'TYT'),
+            ('Felsefe', 'TYT')
+        ]
+    
+        c.executemany('''INSERT OR IGNORE INTO subjects (name, category)
+                         VALUES (?, ?)''', subjects)
+        # Saved Solutions table - YENİ EKLENEN TABLO
+        c.execute('''CREATE TABLE IF NOT EXISTS saved_solutions
+                   (id INTEGER PRIMARY KEY,
+                    user_id INTEGER,
+                    subject TEXT,
+                    question TEXT,
+                    solution TEXT,
+                    date TEXT,
+                    FOREIGN KEY(user_id) REFERENCES users(id))''')
+    
+    
+        # Social features
+        c.execute('''CREATE TABLE IF NOT EXISTS friendships
+                     (id INTEGER PRIMARY KEY,
+                      user_id INTEGER,
+                      friend_id INTEGER,
+                      status TEXT,
+                      FOREIGN KEY(user_id) REFERENCES users(id),
+                      FOREIGN KEY(friend_id) REFERENCES users(id))''')
+    
+        c.execute('''CREATE TABLE IF NOT EXISTS achievements
+                     (id INTEGER PRIMARY KEY,
+                      user_id INTEGER,
+                      title TEXT,
+                      description TEXT,
+                      date TEXT,
+                      FOREIGN KEY(user_id) REFERENCES users(id))''')
+    
+        # Additional Tables for YKS Features
+        # Study Groups
+        c.execute('''CREATE TABLE IF NOT EXISTS study_groups
+                     (id INTEGER PRIMARY KEY,
+                      creator_id INTEGER,
+                      name TEXT,
+                      group_type TEXT,
+                      max_members INTEGER,
+                      description TEXT,
+                      subjects TEXT,
+                      FOREIGN KEY(creator_id) REFERENCES users(id))''')
+    
+        # Group Members
+        c.execute('''CREATE TABLE IF NOT EXISTS group_members
+                     (id INTEGER PRIMARY KEY,
+                      group_id INTEGER,
+                      user_id INTEGER,
+                      role TEXT,
+                      FOREIGN KEY(group_id) REFERENCES study_groups(id),
+                      FOREIGN KEY(user_id) REFERENCES users(id))''')
+    
+        # Mock Exams
+        c.execute('''CREATE TABLE IF NOT EXISTS mock_exams
+                     (id INTEGER PRIMARY KEY,
+                      user_id INTEGER,
+                      exam_type TEXT,
+                      exam_date TEXT,
+                      total_time INTEGER,
+                      subject_results TEXT,
+                      analysis TEXT,
+                      FOREIGN KEY(user_id) REFERENCES users(id))''')
+    
+        # Question Stats
+        c.execute('''CREATE TABLE IF NOT EXISTS question_stats
+                     (id INTEGER PRIMARY KEY,
+                      user_id INTEGER,
+                      subject TEXT,
+                      topic TEXT,
+                      correct INTEGER,
+                      incorrect INTEGER,
+                      unanswered INTEGER,
+                      average_time INTEGER,
+                      last_practice TEXT,
+                      FOREIGN KEY(user_id) REFERENCES users(id))''')
+    
+        # YKS Subjects
+        c.execute('''CREATE TABLE IF NOT EXISTS yks_subjects
+                     (id INTEGER PRIMARY KEY,
+                      exam_type TEXT,  -- TYT/AYT
+                      subject TEXT,
+                      topic TEXT,
+                      subtopic TEXT,
+                      difficulty INTEGER,
+                      importance INTEGER)''')
 
 def update_database_schema():
-    conn = sqlite3.connect('motikoc.db')
-    c = conn.cursor()
-    
-    # Badges table
-    c.execute('''CREATE TABLE IF NOT EXISTS badges
-                 (id INTEGER PRIMARY KEY,
-                  name TEXT,
-                  description TEXT,
-                  icon TEXT,
-                  category TEXT,
-                  requirement_type TEXT,
-                  requirement_value INTEGER)''')
-    
-    # User badges
-    c.execute('''CREATE TABLE IF NOT EXISTS user_badges
-                 (id INTEGER PRIMARY KEY,
-                  user_id INTEGER,
-                  badge_id INTEGER,
-                  earned_date TEXT,
-                  FOREIGN KEY(user_id) REFERENCES users(id),
-                  FOREIGN KEY(badge_id) REFERENCES badges(id))''')
-    
-    # User level system
-    c.execute('''CREATE TABLE IF NOT EXISTS user_levels
-                 (id INTEGER PRIMARY KEY,
-                  user_id INTEGER,
-                  current_level INTEGER DEFAULT 1,
-                  current_xp INTEGER DEFAULT 0,
-                  total_xp INTEGER DEFAULT 0,
-                  FOREIGN KEY(user_id) REFERENCES users(id))''')
-    
-    # Daily tasks table
-    c.execute('''CREATE TABLE IF NOT EXISTS daily_tasks
-                 (id INTEGER PRIMARY KEY,
-                  user_id INTEGER,
-                  task_type TEXT,
-                  description TEXT,
-                  xp_reward INTEGER,
-                  completed BOOLEAN DEFAULT FALSE,
-                  date_created TEXT,
-                  date_completed TEXT,
-                  FOREIGN KEY(user_id) REFERENCES users(id))''')
-    
-    # Competitions tables
-    c.execute('''CREATE TABLE IF NOT EXISTS competitions
-                 (id INTEGER PRIMARY KEY,
-                  name TEXT,
-                  description TEXT,
-                  competition_type TEXT,
-                  start_date TEXT,
-                  end_date TEXT,
-                  status TEXT)''')
-    
-    c.execute('''CREATE TABLE IF NOT EXISTS competition_participants
-                 (id INTEGER PRIMARY KEY,
-                  competition_id INTEGER,
-                  user_id INTEGER,
-                  score INTEGER DEFAULT 0,
-                  FOREIGN KEY(competition_id) REFERENCES competitions(id),
-                  FOREIGN KEY(user_id) REFERENCES users(id))''')
-    
-   # Updated default badges with easier requirements
-    default_badges = [
-        ('Hoş Geldin!', 'MotiKoç ailesine katıldın', '👋', 'başlangıç', 'registration', 1),
-        ('İlk Adım', 'İlk çalışma seansını tamamla', '🎯', 'başlangıç', 'study_sessions', 1),
-        ('Günün Kahramanı', 'Bir günde 2 saat çalış', '⭐', 'çalışma', 'daily_hours', 2),
-        ('Azimli Öğrenci', '5 saat çalış', '📚', 'çalışma', 'study_hours', 5),
-        ('Matematik Sever', 'Matematik konularında 3 saat çalış', '🔢', 'matematik', 'math_hours', 3),
-        ('Sosyal Kelebek', '3 arkadaş edin', '🦋', 'sosyal', 'friends', 3),
-        ('Devamlılık', '3 gün üst üste çalış', '🎯', 'devamlılık', 'streak_days', 3),
-        ('Planlı Çalışan', '5 günlük çalışma planı oluştur', '📅', 'planlama', 'study_plans', 5),
-        ('Hedef Odaklı', 'İlk hedefini belirle', '🎯', 'hedefler', 'set_goals', 1),
-        ('Motivasyon Ustası', '3 motivasyon seansı tamamla', '💪', 'motivasyon', 'motivation_sessions', 3),
-        ('YKS Savaşçısı', 'Toplam 20 saat çalış', '⚔️', 'ileri', 'total_hours', 20),
-        ('Deneme Uzmanı', 'İlk deneme sınavını gir', '📝', 'sınav', 'mock_exams', 1),
-        ('Geri Bildirim', 'İlk performans değerlendirmeni yap', '📊', 'analiz', 'performance_review', 1)
-    ]
+    with pooled_connection() as conn, conn.transaction():
+        c = conn.cursor()
     
-    c.executemany('''INSERT OR IGNORE INTO badges 
-                     (name, description, icon, category, requirement_type, requirement_value)
-                     VALUES (?, ?, ?, ?, ?, ?)''', default_badges)
+        # Badges table
+        c.execute('''CREATE TABLE IF NOT EXISTS badges
+                     (id INTEGER PRIMARY KEY,
+                      name TEXT,
+                      description TEXT,
+                      icon TEXT,
+                      category TEXT,
+                      requirement_type TEXT,
+                      requirement_value INTEGER)''')
+    
+        # User badges
+        c.execute('''CREATE TABLE IF NOT EXISTS user_badges
+                     (id INTEGER PRIMARY KEY,
+                      user_id INTEGER,
+                      badge_id INTEGER,
+                      earned_date TEXT,
+                      FOREIGN KEY(user_id) REFERENCES users(id),
+                      FOREIGN KEY(badge_id) REFERENCES badges(id))''')
+    
+        # User level system
+        c.execute('''CREATE TABLE IF NOT EXISTS user_levels
+                     (id INTEGER PRIMARY KEY,
+                      user_id INTEGER,
+                      current_level INTEGER DEFAULT 1,
+                      current_xp INTEGER DEFAULT 0,
+                      total_xp INTEGER DEFAULT 0,
+                      FOREIGN KEY(user_id) REFERENCES users(id))''')
+    
+        # Daily tasks table
+        c.execute('''CREATE TABLE IF NOT EXISTS daily_tasks
+                     (id INTEGER PRIMARY KEY,
+                      user_id INTEGER,
+                      task_type TEXT,
+                      description TEXT,
+                      xp_reward INTEGER,
+                      completed BOOLEAN DEFAULT FALSE,
+                      date_created TEXT,
+                      date_completed TEXT,
+                      FOREIGN KEY(user_id) REFERENCES users(id))''')
+    
+        # Competitions tables
+        c.execute('''CREATE TABLE IF NOT EXISTS competitions
+                     (id INTEGER PRIMARY KEY,
+                      name TEXT,
+                      description TEXT,
+                      competition_type TEXT,
+                      start_date TEXT,
+                      end_date TEXT,
+                      status TEXT)''')
+    
+        c.execute('''CREATE TABLE IF NOT EXISTS competition_participants
+                     (id INTEGER PRIMARY KEY,
+                      competition_id INTEGER,
+                      user_id INTEGER,
+                      score INTEGER DEFAULT 0,
+                      FOREIGN KEY(competition_id) REFERENCES competitions(id),
+                      FOREIGN KEY(user_id) REFERENCES users(id))''')
+    
+       # Updated default badges with easier requirements
+        default_badges = [
+            ('Hoş Geldin!', 'MotiKoç ailesine katıldın', '👋', 'başlangıç', 'registration', 1),
+            ('İlk Adım', 'İlk çalışma seansını tamamla', '🎯', 'başlangıç', 'study_sessions', 1),
+            ('Günün Kahramanı', 'Bir günde 2 saat çalış', '⭐', 'çalışma', 'daily_hours', 2),
+            ('Azimli Öğrenci', '5 saat çalış', '📚', 'çalışma', 'study_hours', 5),
+            ('Matematik Sever', 'Matematik konularında 3 saat çalış', '🔢', 'matematik', 'math_hours', 3),
+            ('Sosyal Kelebek', '3 arkadaş edin', '🦋', 'sosyal', 'friends', 3),
+            ('Devamlılık', '3 gün üst üste çalış', '🎯', 'devamlılık', 'streak_days', 3),
+            ('Planlı Çalışan', '5 günlük çalışma planı oluştur', '📅', 'planlama', 'study_plans', 5),
+            ('Hedef Odaklı', 'İlk hedefini belirle', '🎯', 'hedefler', 'set_goals', 1),
+            ('Motivasyon Ustası', '3 motivasyon seansı tamamla', '💪', 'motivasyon', 'motivation_sessions', 3),
+            ('YKS Savaşçısı', 'Toplam 20 saat çalış', '⚔️', 'ileri', 'total_hours', 20),
+            ('Deneme Uzmanı', 'İlk deneme sınavını gir', '📝', 'sınav', 'mock_exams', 1),
+            ('Geri Bildirim', 'İlk performans değerlendirmeni yap', '📊', 'analiz', 'performance_review', 1)
+        ]
     
-    conn.commit()
-    conn.close()
+        c.executemany('''INSERT OR IGNORE INTO badges 
+                         (name, description, icon, category, requirement_type, requirement_value)
+                         VALUES (?, ?, ?, ?, ?, ?)''', default_badges)
 
 def update_database_for_tasks():
-    conn = sqlite3.connect('motikoc.db')
-    c = conn.cursor()
-    
-    # Daily tasks table
-    c.execute('''CREATE TABLE IF NOT EXISTS daily_tasks
-                 (id INTEGER PRIMARY KEY,
-                  user_id INTEGER,
-                  task_type TEXT,
-                  description TEXT,
-                  xp_reward INTEGER,
-                  completed BOOLEAN DEFAULT FALSE,
-                  date_created TEXT,
-                  date_completed TEXT,
-                  FOREIGN KEY(user_id) REFERENCES users(id))''')
-    conn.commit()
-    conn.close()
+    with pooled_connection() as conn, conn.transaction():
+        c = conn.cursor()
+    
+        # Daily tasks table
+        c.execute('''CREATE TABLE IF NOT EXISTS daily_tasks
+                     (id INTEGER PRIMARY KEY,
+                      user_id INTEGER,
+                      task_type TEXT,
+                      description TEXT,
+                      xp_reward INTEGER,
+                      completed BOOLEAN DEFAULT FALSE,
+                      date_created TEXT,
+                      date_completed TEXT,
+                      FOREIGN KEY(user_id) REFERENCES users(id))''')
 
 # Initialize all database tables
 init_db()
@@ -585,11 +580,10 @@ def hash_password(password):
     return hashlib.sha256(password.encode()).hexdigest()
 
 def login_user(username, password):
-    conn = sqlite3.connect('motikoc.db')
-    c = conn.cursor()
-    c.execute('SELECT id, password FROM users WHERE username = ?', (username,))
-    result = c.fetchone()
-    conn.close()
+    with pooled_connection() as conn:
+        c = conn.cursor()
+        c.execute('SELECT id, password FROM users WHERE username = ?', (username,))
+        result = c.fetchone()
     
     if result and result[1] == hash_password(password):
         return result[0]
@@ -598,40 +592,38 @@ def login_user(username, password):
 def register_user(username, password, name, email, grade, city,
                  target_university, target_department, target_rank, study_type):
     try:
-        conn = sqlite3.connect('motikoc.db')
-        c = conn.cursor()
-        hashed_password = hash_password(password)
-        
-        # Insert user
-        c.execute('''INSERT INTO users 
-                    (username, password, name, email, grade, city,
-                     target_university, target_department, target_rank, study_type)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                 (username, hashed_password, name, email, grade, city,
-                  target_university, target_department, target_rank, study_type))
-        
-        user_id = c.lastrowid
-        
-        # Initialize user_levels for the new user
-        c.execute('''INSERT INTO user_levels 
-                    (user_id, current_level, current_xp, total_xp)
-                    VALUES (?, 1, 0, 0)''', (user_id,))
-        
-        # Find and award welcome badge
-        c.execute('''SELECT id FROM badges WHERE requirement_type = 'registration' LIMIT 1''')
-        welcome_badge = c.fetchone()
-        if welcome_badge:
-            c.execute('''INSERT INTO user_badges (user_id, badge_id, earned_date)
-                        VALUES (?, ?, ?)''',
-                     (user_id, welcome_badge[0], datetime.now().strftime('%Y-%m-%d')))
-            
-            # Award XP for first badge
-            c.execute('''UPDATE user_levels 
-                        SET current_xp = current_xp + 100, total_xp = total_xp + 100
-                        WHERE user_id = ?''', (user_id,))
+        with pooled_connection() as conn, conn.transaction():
+            c = conn.cursor()
+            hashed_password = hash_password(password)
+        
+            # Insert user
+            c.execute('''INSERT INTO users 
+                        (username, password, name, email, grade, city,
+                         target_university, target_department, target_rank, study_type)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                     (username, hashed_password, name, email, grade, city,
+                      target_university, target_department, target_rank, study_type))
+        
+            user_id = c.lastrowid
+        
+            # Initialize user_levels for the new user
+            c.execute('''INSERT INTO user_levels 
+                        (user_id, current_level, current_xp, total_xp)
+                        VALUES (?, 1, 0, 0)''', (user_id,))
+        
+            # Find and award welcome badge
+            c.execute('''SELECT id FROM badges WHERE requirement_type = 'registration' LIMIT 1''')
+            welcome_badge = c.fetchone()
+            if welcome_badge:
+                c.execute('''INSERT INTO user_badges (user_id, badge_id, earned_date)
+                            VALUES (?, ?, ?)''',
+                         (user_id, welcome_badge[0], datetime.now().strftime('%Y-%m-%d')))
+            
+                # Award XP for first badge
+                c.execute('''UPDATE user_levels 
+                            SET current_xp = current_xp + 100, total_xp = total_xp + 100
+                            WHERE user_id = ?''', (user_id,))
         
-        conn.commit()
-        conn.close()
         return user_id
     except sqlite3.IntegrityError:
         return None
@@ -733,20 +725,19 @@ def show_home_page():
     st.title(f"Hoş Geldin, {st.session_state.username}! 👋")
     
     # Fetch user data
-    conn = sqlite3.connect('motikoc.db')
-    user_data = pd.read_sql_query('''
-        SELECT grade, target_university, target_department, target_rank, study_type
-        FROM users WHERE id = ?
-    ''', conn, params=(st.session_state.user_id,))
-    
-    # Fetch recent study stats
-    study_stats = pd.read_sql_query('''
-        SELECT subject, SUM(duration) as total_duration
-        FROM study_logs
-        WHERE user_id = ? AND date >= date('now', '-7 days')
-        GROUP BY subject
-    ''', conn, params=(st.session_state.user_id,))
-    conn.close()
+    with pooled_connection() as conn:
+        user_data = pd.read_sql_query('''
+            SELECT grade, target_university, target_department, target_rank, study_type
+            FROM users WHERE id = ?
+        ''', conn.raw, params=(st.session_state.user_id,))
+    
+        # Fetch recent study stats
+        study_stats = pd.read_sql_query('''
+            SELECT subject, SUM(duration) as total_duration
+            FROM study_logs
+            WHERE user_id = ? AND date >= date('now', '-7 days')
+            GROUP BY subject
+        ''', conn.raw, params=(st.session_state.user_id,))
     
     col1, col2 = st.columns([2, 1])
     
@@ -853,14 +844,13 @@ def show_study_calendar():
     """, unsafe_allow_html=True)
     
     # Fetch study logs
-    conn = sqlite3.connect('motikoc.db')
-    study_logs = pd.read_sql_query('''
-        SELECT subject, topic, duration, date, performance_rating
-        FROM study_logs 
-        WHERE user_id = ?
-        ORDER BY date DESC
-    ''', conn, params=(st.session_state.user_id,))
-    conn.close()
+    with pooled_connection() as conn:
+        study_logs = pd.read_sql_query('''
+            SELECT subject, topic, duration, date, performance_rating
+            FROM study_logs 
+            WHERE user_id = ?
+            ORDER BY date DESC
+        ''', conn.raw, params=(st.session_state.user_id,))
     
     # Group by date for calendar view
     daily_logs = study_logs.groupby('date').agg({
@@ -985,20 +975,19 @@ def show_performance_analytics():
     st.title("📊 Performans Analizi")
     
     # Fetch user data and study logs
-    conn = sqlite3.connect('motikoc.db')
-    study_data = pd.read_sql_query('''
-        SELECT subject, topic, duration, performance_rating, date
-        FROM study_logs
-        WHERE user_id = ?
-        ORDER BY date DESC
-    ''', conn, params=(st.session_state.user_id,))
-    
-    user_data = pd.read_sql_query('''
-        SELECT grade, target_university, target_department, target_rank
-        FROM users
-        WHERE id = ?
-    ''', conn, params=(st.session_state.user_id,))
-    conn.close()
+    with pooled_connection() as conn:
+        study_data = pd.read_sql_query('''
+            SELECT subject, topic, duration, performance_rating, date
+            FROM study_logs
+            WHERE user_id = ?
+            ORDER BY date DESC
+        ''', conn.raw, params=(st.session_state.user_id,))
+    
+        user_data = pd.read_sql_query('''
+            SELECT grade, target_university, target_department, target_rank
+            FROM users
+            WHERE id = ?
+        ''', conn.raw, params=(st.session_state.user_id,))
     
     if not study_data.empty:
         # Overview Metrics
@@ -1167,35 +1156,33 @@ def show_social_features():
                 submit = st.form_submit_button("Arkadaş Ekle")
                 
                 if submit and username:
-                    conn = sqlite3.connect('motikoc.db')
-                    c = conn.cursor()
+                    with pooled_connection() as conn:
+                        c = conn.cursor()
                     
-                    # Check if user exists
-                    c.execute('SELECT id FROM users WHERE username = ?', (username,))
-                    friend = c.fetchone()
+                        # Check if user exists
+                        c.execute('SELECT id FROM users WHERE username = ?', (username,))
+                        friend = c.fetchone()
                     
-                    if friend:
-                        # Check if friendship already exists
-                        c.execute('''
-                            SELECT * FROM friendships 
-                            WHERE (user_id = ? AND friend_id = ?) 
-                            OR (user_id = ? AND friend_id = ?)
-                        ''', (st.session_state.user_id, friend[0], 
-                             friend[0], st.session_state.user_id))
-                        
-                        if not c.fetchone():
+                        if friend:
+                            # Check if friendship already exists
                             c.execute('''
-                                INSERT INTO friendships (user_id, friend_id, status)
-                                VALUES (?, ?, 'pending')
-                            ''', (st.session_state.user_id, friend[0]))
-                            conn.commit()
-                            st.success("Arkadaşlık isteği gönderildi!")
+                                SELECT * FROM friendships 
+                                WHERE (user_id = ? AND friend_id = ?) 
+                                OR (user_id = ? AND friend_id = ?)
+                            ''', (st.session_state.user_id, friend[0], 
+                                 friend[0], st.session_state.user_id))
+                        
+                            if not c.fetchone():
+                                with conn.transaction():
+                                    c.execute('''
+                                        INSERT INTO friendships (user_id, friend_id, status)
+                                        VALUES (?, ?, 'pending')
+                                    ''', (st.session_state.user_id, friend[0]))
+                                st.success("Arkadaşlık isteği gönderildi!")
+                            else:
+                                st.warning("Bu kullanıcı zaten arkadaş listenizde!")
                         else:
-                            st.warning("Bu kullanıcı zaten arkadaş listenizde!")
-                    else:
-                        st.error("Kullanıcı bulunamadı!")
-                    
-                    conn.close()
+                            st.error("Kullanıcı bulunamadı!")
         
         with col2:
             st.markdown("""
@@ -1204,21 +1191,20 @@ def show_social_features():
             </div>
             """, unsafe_allow_html=True)
             
-            conn = sqlite3.connect('motikoc.db')
-            # Fetch confirmed friends
-            friends = pd.read_sql_query('''
-                SELECT u.username, f.status
-                FROM friendships f
-                JOIN users u ON u.id = CASE 
-                                        WHEN f.user_id = ? THEN f.friend_id
-                                        ELSE f.user_id
-                                      END
-                WHERE f.user_id = ? OR f.friend_id = ?
-                AND f.status = 'confirmed'
-            ''', conn, params=(st.session_state.user_id,
-                               st.session_state.user_id,
-                               st.session_state.user_id))
-            conn.close()
+            with pooled_connection() as conn:
+                # Fetch confirmed friends
+                friends = pd.read_sql_query('''
+                    SELECT u.username, f.status
+                    FROM friendships f
+                    JOIN users u ON u.id = CASE 
+                                            WHEN f.user_id = ? THEN f.friend_id
+                                            ELSE f.user_id
+                                          END
+                    WHERE f.user_id = ? OR f.friend_id = ?
+                    AND f.status = 'confirmed'
+                ''', conn.raw, params=(st.session_state.user_id,
+                                   st.session_state.user_id,
+                                   st.session_state.user_id))
             
             if not friends.empty:
                 for _, friend in friends.iterrows():
@@ -1243,15 +1229,13 @@ def show_social_features():
             submit = st.form_submit_button("Paylaş")
             
             if submit and achievement:
-                conn = sqlite3.connect('motikoc.db')
-                c = conn.cursor()
-                c.execute('''
-                    INSERT INTO achievements (user_id, title, description, date)
-                    VALUES (?, ?, ?, ?)
-                ''', (st.session_state.user_id, achievement, description,
-                      datetime.now().strftime('%Y-%m-%d')))
-                conn.commit()
-                conn.close()
+                with pooled_connection() as conn, conn.transaction():
+                    c = conn.cursor()
+                    c.execute('''
+                        INSERT INTO achievements (user_id, title, description, date)
+                        VALUES (?, ?, ?, ?)
+                    ''', (st.session_state.user_id, achievement, description,
+                          datetime.now().strftime('%Y-%m-%d')))
                 
                 # Award XP for sharing achievement
                 update_user_xp(st.session_state.user_id, calculate_xp_for_activity('achievement_shared'))
@@ -1259,14 +1243,13 @@ def show_social_features():
                 st.success("Başarı paylaşıldı!")
         
         # Display achievements
-        conn = sqlite3.connect('motikoc.db')
-        achievements = pd.read_sql_query('''
-            SELECT title, description, date
-            FROM achievements
-            WHERE user_id = ?
-            ORDER BY date DESC
-        ''', conn, params=(st.session_state.user_id,))
-        conn.close()
+        with pooled_connection() as conn:
+            achievements = pd.read_sql_query('''
+                SELECT title, description, date
+                FROM achievements
+                WHERE user_id = ?
+                ORDER BY date DESC
+            ''', conn.raw, params=(st.session_state.user_id,))
         
         if not achievements.empty:
             for _, achievement in achievements.iterrows():
@@ -1288,19 +1271,18 @@ def show_social_features():
         """, unsafe_allow_html=True)
         
         # Calculate user scores based on study time and performance
-        conn = sqlite3.connect('motikoc.db')
-        leaderboard_data = pd.read_sql_query('''
-            SELECT u.username,
-                   COUNT(s.id) as study_sessions,
-                   COALESCE(SUM(s.duration), 0) as total_duration,
-                   COALESCE(AVG(s.performance_rating), 0) as avg_performance
-            FROM users u
-            LEFT JOIN study_logs s ON u.id = s.user_id
-            GROUP BY u.id, u.username
-            ORDER BY total_duration DESC
-            LIMIT 10
-        ''', conn)
-        conn.close()
+        with pooled_connection() as conn:
+            leaderboard_data = pd.read_sql_query('''
+                SELECT u.username,
+                       COUNT(s.id) as study_sessions,
+                       COALESCE(SUM(s.duration), 0) as total_duration,
+                       COALESCE(AVG(s.performance_rating), 0) as avg_performance
+                FROM users u
+                LEFT JOIN study_logs s ON u.id = s.user_id
+                GROUP BY u.id, u.username
+                ORDER BY total_duration DESC
+                LIMIT 10
+            ''', conn.raw)
         
         if not leaderboard_data.empty:
             # Calculate score
@@ -1446,13 +1428,11 @@ def show_voice_guidance():
             """, unsafe_allow_html=True)
             
             # Fetch user data for personalized motivation
-            conn = sqlite3.connect('motikoc.db')
-            user_data = pd.read_sql_query('''
-            SELECT name, grade, target_university, target_department, target_rank
-            FROM users WHERE id = ?
-        ''', conn, params=(st.session_state.user_id,))
-
-            conn.close()
+            with pooled_connection() as conn:
+                user_data = pd.read_sql_query('''
+                SELECT name, grade, target_university, target_department, target_rank
+                FROM users WHERE id = ?
+            ''', conn.raw, params=(st.session_state.user_id,))
             
             days_to_exam = (datetime(2025, 6, 15) - datetime.now()).days
             
@@ -1519,9 +1499,8 @@ def show_voice_guidance():
 
 # Database connection manager
 def get_db_connection():
-    """Get a database connection with proper timeout and isolation level"""
-    conn = sqlite3.connect('motikoc.db', timeout=30)
-    conn.execute('PRAGMA journal_mode=WAL')  # Write-Ahead Logging mode
+    """Get a pooled database connection (WAL, timeout and PRAGMAs come from the pool)"""
+    conn = pooled_connection()
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -1633,14 +1612,14 @@ def show_gamification_stats():
     </div>
     """, unsafe_allow_html=True)
     
-    conn = sqlite3.connect('motikoc.db')
+    conn = pooled_connection()
     
     try:
         # Get user level info
         level_data = pd.read_sql_query('''
             SELECT current_level, current_xp, total_xp
             FROM user_levels WHERE user_id = ?
-        ''', conn, params=(st.session_state.user_id,))
+        ''', conn.raw, params=(st.session_state.user_id,))
         
         if level_data.empty:
             # Initialize user levels if not exists
@@ -1651,7 +1630,7 @@ def show_gamification_stats():
             level_data = pd.read_sql_query('''
                 SELECT current_level, current_xp, total_xp
                 FROM user_levels WHERE user_id = ?
-            ''', conn, params=(st.session_state.user_id,))
+            ''', conn.raw, params=(st.session_state.user_id,))
         
         current_level = level_data.iloc[0]['current_level']
         current_xp = level_data.iloc[0]['current_xp']
@@ -1676,7 +1655,7 @@ def show_gamification_stats():
                     COALESCE(AVG(performance_rating), 0) as avg_performance
                 FROM study_logs 
                 WHERE user_id = ?
-            ''', conn, params=(st.session_state.user_id,))
+            ''', conn.raw, params=(st.session_state.user_id,))
             
             if not study_stats.empty:
                 stats = study_stats.iloc[0]
@@ -1700,7 +1679,7 @@ def show_gamification_stats():
                 WHERE ub.user_id = ?
                 GROUP BY b.id
                 ORDER BY ub.earned_date DESC
-            ''', conn, params=(st.session_state.user_id,))
+            ''', conn.raw, params=(st.session_state.user_id,))
             
             if not badges.empty:
                 # Group badges by category
@@ -1738,7 +1717,7 @@ def show_gamification_stats():
                         WHERE id NOT IN (
                             SELECT badge_id FROM user_badges WHERE user_id = ?
                         )
-                    ''', conn, params=(st.session_state.user_id,))
+                    ''', conn.raw, params=(st.session_state.user_id,))
                     
                     for _, badge in available_badges.iterrows():
                         st.markdown(f"""
@@ -1761,7 +1740,7 @@ def show_gamification_stats():
                 # Calculate completion percentage
                 total_possible_badges = pd.read_sql_query('''
                     SELECT COUNT(*) as total FROM badges
-                ''', conn).iloc[0]['total']
+                ''', conn.raw).iloc[0]['total']
                 
                 completion = (total_badges / total_possible_badges) * 100
                 st.progress(completion / 100)
@@ -1801,7 +1780,7 @@ def calculate_xp_for_activity(activity_type, duration=None):
 
 def update_user_xp(user_id, xp_earned):
     """Update user XP with level progression handling"""
-    with sqlite3.connect('motikoc.db') as conn:
+    with pooled_connection() as conn:
         c = conn.cursor()
         
         # Get current level and XP
@@ -1842,10 +1821,9 @@ def update_user_xp(user_id, xp_earned):
 # Badge checking function
 def check_and_award_badges(user_id):
     """Enhanced badge checking function with duplicate prevention"""
-    conn = sqlite3.connect('motikoc.db')
-    c = conn.cursor()
-    
+    conn = pooled_connection()
     try:
+        c = conn.cursor()
         # Get badges that haven't been earned yet
         c.execute('''SELECT b.* FROM badges b
                      WHERE NOT EXISTS (
@@ -1952,7 +1930,7 @@ def check_and_award_badges(user_id):
 
 def show_badges(user_id):
     """Improved badge display function"""
-    conn = sqlite3.connect('motikoc.db')
+    conn = pooled_connection()
     try:
         # Get earned badges with no duplicates
         badges = pd.read_sql_query('''
@@ -1963,7 +1941,7 @@ def show_badges(user_id):
             WHERE ub.user_id = ?
             GROUP BY b.id
             ORDER BY ub.earned_date DESC
-        ''', conn, params=(user_id,))
+        ''', conn.raw, params=(user_id,))
         
         if not badges.empty:
             for _, badge in badges.iterrows():
@@ -1980,22 +1958,21 @@ def show_badges(user_id):
 
 # Daily Tasks Functions
 def generate_daily_tasks(user_id):
-    conn = sqlite3.connect('motikoc.db')
-    print("conn")
-    # Get user's study history and preferences
-    user_data = pd.read_sql_query('''
-        SELECT u.grade, u.study_type, u.target_university,
-               GROUP_CONCAT(DISTINCT s.subject) as recent_subjects,
-               COALESCE(AVG(s.performance_rating), 0.0) as avg_performance
-        FROM users u
-        LEFT JOIN study_logs s ON u.id = s.user_id
-        WHERE u.id = ?
-        GROUP BY u.id
-    ''', conn, params=(user_id,))
+    with pooled_connection() as conn:
+        print("conn")
+        # Get user's study history and preferences
+        user_data = pd.read_sql_query('''
+            SELECT u.grade, u.study_type, u.target_university,
+                   GROUP_CONCAT(DISTINCT s.subject) as recent_subjects,
+                   COALESCE(AVG(s.performance_rating), 0.0) as avg_performance
+            FROM users u
+            LEFT JOIN study_logs s ON u.id = s.user_id
+            WHERE u.id = ?
+            GROUP BY u.id
+        ''', conn.raw, params=(user_id,))
     print(user_data)
 
     if user_data.empty:
-        conn.close()
         return []
     
     user_info = user_data.iloc[0]
@@ -2051,38 +2028,37 @@ def generate_daily_tasks(user_id):
             raise ValueError("Görev listesi oluşturulamadı veya beklenen formatta değil.")
         
         # Insert tasks into database
-        c = conn.cursor()
-        today = datetime.now().strftime('%Y-%m-%d')
-        valid_tasks = []
-        for task in tasks:
-            task_type = task.get('type')
-            description = task.get('description')
-            xp_reward = task.get('xp_reward')
-            
-            # Zorunlu alanların kontrolü
-            if not task_type or not description:
-                print(f"Invalid task: {task}")
-                continue  # Eksik alan varsa atla
-            
-            # XP Reward'ın doğrulanması
-            if not isinstance(xp_reward, int) or not (50 <= xp_reward <= 200):
-                print(f"Invalid or missing xp_reward for task: {task}")
-                xp_reward = 50  # Varsayılan XP değeri
-            
-            valid_tasks.append({
-                'type': task_type,
-                'description': description,
-                'xp_reward': xp_reward
-            })
+        with pooled_connection() as conn, conn.transaction():
+            c = conn.cursor()
+            today = datetime.now().strftime('%Y-%m-%d')
+            valid_tasks = []
+            for task in tasks:
+                task_type = task.get('type')
+                description = task.get('description')
+                xp_reward = task.get('xp_reward')
+            
+                # Zorunlu alanların kontrolü
+                if not task_type or not description:
+                    print(f"Invalid task: {task}")
+                    continue  # Eksik alan varsa atla
+            
+                # XP Reward'ın doğrulanması
+                if not isinstance(xp_reward, int) or not (50 <= xp_reward <= 200):
+                    print(f"Invalid or missing xp_reward for task: {task}")
+                    xp_reward = 50  # Varsayılan XP değeri
+            
+                valid_tasks.append({
+                    'type': task_type,
+                    'description': description,
+                    'xp_reward': xp_reward
+                })
             
-            c.execute('''
-                INSERT INTO daily_tasks 
-                (user_id, task_type, description, xp_reward, date_created)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (user_id, task_type, description, xp_reward, today))
+                c.execute('''
+                    INSERT INTO daily_tasks 
+                    (user_id, task_type, description, xp_reward, date_created)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (user_id, task_type, description, xp_reward, today))
         
-        conn.commit()
-        conn.close()
         return valid_tasks
         
     except Exception as e:
@@ -2092,12 +2068,10 @@ def generate_daily_tasks(user_id):
             print(f"AI Response: {response}")  # Debugging için
         except NameError:
             print("AI yanıtı alınamadı.")
-        conn.close()
         return []
         
-@st.cache_resource
 def get_connection():
-    return sqlite3.connect('motikoc.db', check_same_thread=False)
+    return pooled_connection()
 
 def safe_show_daily_tasks():
     try:
@@ -2110,65 +2084,65 @@ def safe_show_daily_tasks():
         today = datetime.now().strftime('%Y-%m-%d')
         
         # Tek bir bağlantı kullanın
-        conn = get_connection()
-        c = conn.cursor()
+        with get_connection() as conn:
+            c = conn.cursor()
         
-        tasks = pd.read_sql_query('''
-            SELECT * FROM daily_tasks
-            WHERE user_id = ? AND date_created = ?
-            ORDER BY completed ASC, task_type ASC
-        ''', conn, params=(st.session_state.user_id, today))
+            tasks = pd.read_sql_query('''
+                SELECT * FROM daily_tasks
+                WHERE user_id = ? AND date_created = ?
+                ORDER BY completed ASC, task_type ASC
+            ''', conn.raw, params=(st.session_state.user_id, today))
         
-        if tasks.empty:
-            # Görev oluşturma işlemi
-            new_tasks = generate_daily_tasks(st.session_state.user_id)
-            if new_tasks:
-                st.rerun()
-            else:
-                st.error("Görevler oluşturulamadı. Lütfen sayfayı yenileyin.")
-                return
+            if tasks.empty:
+                # Görev oluşturma işlemi
+                new_tasks = generate_daily_tasks(st.session_state.user_id)
+                if new_tasks:
+                    st.rerun()
+                else:
+                    st.error("Görevler oluşturulamadı. Lütfen sayfayı yenileyin.")
+                    return
         
-        for _, task in tasks.iterrows():
-            try:
-                col1, col2, col3 = st.columns([3, 1, 1])
+            for _, task in tasks.iterrows():
+                try:
+                    col1, col2, col3 = st.columns([3, 1, 1])
                 
-                with col1:
-                    icon = {
-                        'study': '📚',
-                        'social': '👥',
-                        'motivation': '💪',
-                        'practice': '✍️'
-                    }.get(task['task_type'], '🎯')
+                    with col1:
+                        icon = {
+                            'study': '📚',
+                            'social': '👥',
+                            'motivation': '💪',
+                            'practice': '✍️'
+                        }.get(task['task_type'], '🎯')
                     
-                    st.write(f"{icon} {task['description']}")
+                        st.write(f"{icon} {task['description']}")
                 
-                with col2:
-                    xp_reward = task['xp_reward'] if task['xp_reward'] is not None else 0
-                    st.write(f"💫 {xp_reward} XP")
+                    with col2:
+                        xp_reward = task['xp_reward'] if task['xp_reward'] is not None else 0
+                        st.write(f"💫 {xp_reward} XP")
                 
-                with col3:
-                    if not task['completed']:
-                        if st.button("Tamamla", key=f"task_{task['id']}"):
-                            # Aynı bağlantıyı kullanarak güncelleme yapın
-                            c.execute('''
-                                UPDATE daily_tasks 
-                                SET completed = TRUE, date_completed = ?
-                                WHERE id = ?
-                            ''', (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), task['id']))
-                            conn.commit()
+                    with col3:
+                        if not task['completed']:
+                            if st.button("Tamamla", key=f"task_{task['id']}"):
+                                # Aynı bağlantıyı kullanarak güncelleme yapın
+                                with conn.transaction():
+                                    c.execute('''
+                                        UPDATE daily_tasks 
+                                        SET completed = TRUE, date_completed = ?
+                                        WHERE id = ?
+                                    ''', (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), task['id']))
                             
-                            # XP güncellemesi
-                            update_user_xp(st.session_state.user_id, xp_reward)
+                                # XP güncellemesi
+                                update_user_xp(st.session_state.user_id, xp_reward)
                             
-                            st.success("Görev tamamlandı! XP kazandın!")
-                            time.sleep(1)
-                            st.rerun()
-                    else:
-                        st.write("✅ Tamamlandı")
+                                st.success("Görev tamamlandı! XP kazandın!")
+                                time.sleep(1)
+                                st.rerun()
+                        else:
+                            st.write("✅ Tamamlandı")
             
-            except Exception as e:
-                print(f"Task display error: {str(e)}")
-                continue
+                except Exception as e:
+                    print(f"Task display error: {str(e)}")
+                    continue
         
     except Exception as e:
         st.error("Görevler yüklenirken bir hata oluştu. Lütfen sayfayı yenileyin.")
@@ -2191,23 +2165,21 @@ class StudyPlanGenerator:
         }
     
     def generate_study_plan(self, user_id):
-        conn = sqlite3.connect('motikoc.db')
-        user_data = pd.read_sql_query('''
-            SELECT grade, study_type, target_university, target_department,
-                   target_rank
-            FROM users WHERE id = ?
-        ''', conn, params=(user_id,))
-        
-        # Get recent study history
-        study_history = pd.read_sql_query('''
-            SELECT subject, AVG(performance_rating) as avg_performance,
-                   COUNT(*) as study_count
-            FROM study_logs
-            WHERE user_id = ? AND date >= date('now', '-30 days')
-            GROUP BY subject
-        ''', conn, params=(user_id,))
-        
-        conn.close()
+        with pooled_connection() as conn:
+            user_data = pd.read_sql_query('''
+                SELECT grade, study_type, target_university, target_department,
+                       target_rank
+                FROM users WHERE id = ?
+            ''', conn.raw, params=(user_id,))
+        
+            # Get recent study history
+            study_history = pd.read_sql_query('''
+                SELECT subject, AVG(performance_rating) as avg_performance,
+                       COUNT(*) as study_count
+                FROM study_logs
+                WHERE user_id = ? AND date >= date('now', '-30 days')
+                GROUP BY subject
+            ''', conn.raw, params=(user_id,))
 
         if user_data.empty:
             return None
@@ -2296,13 +2268,12 @@ class MotiKocChatbot:
     
     def generate_response(self, user_message, user_id):
         # Kullanıcı bilgilerini al
-        conn = sqlite3.connect('motikoc.db')
-        user_data = pd.read_sql_query('''
-            SELECT grade, study_type, target_university, target_department,
-                   target_rank
-            FROM users WHERE id = ?
-        ''', conn, params=(user_id,))
-        conn.close()
+        with pooled_connection() as conn:
+            user_data = pd.read_sql_query('''
+                SELECT grade, study_type, target_university, target_department,
+                       target_rank
+                FROM users WHERE id = ?
+            ''', conn.raw, params=(user_id,))
 
         if user_data.empty:
             return "Kullanıcı bilgileri bulunamadı."
@@ -2374,26 +2345,23 @@ def create_study_group():
         
         if submit:
             if group_name and group_type and description and subjects:
-                conn = sqlite3.connect('motikoc.db')
-                c = conn.cursor()
-                
-                c.execute('''
-                    INSERT INTO study_groups 
-                    (creator_id, name, group_type, max_members, description, subjects)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (st.session_state.user_id, group_name, group_type,
-                      max_members, description, ','.join(subjects)))
+                with pooled_connection() as conn, conn.transaction():
+                    c = conn.cursor()
                 
-                group_id = c.lastrowid
+                    c.execute('''
+                        INSERT INTO study_groups 
+                        (creator_id, name, group_type, max_members, description, subjects)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    ''', (st.session_state.user_id, group_name, group_type,
+                          max_members, description, ','.join(subjects)))
                 
-                # Add creator as first member
-                c.execute('''
-                    INSERT INTO group_members (group_id, user_id, role)
-                    VALUES (?, ?, 'admin')
-                ''', (group_id, st.session_state.user_id))
+                    group_id = c.lastrowid
                 
-                conn.commit()
-                conn.close()
+                    # Add creator as first member
+                    c.execute('''
+                        INSERT INTO group_members (group_id, user_id, role)
+                        VALUES (?, ?, 'admin')
+                    ''', (group_id, st.session_state.user_id))
                 
                 st.success("Çalışma grubu oluşturuldu!")
             else:
@@ -2410,14 +2378,13 @@ def show_study_groups():
     
     st.markdown("### 🌟 Katıldığınız Gruplar")
     
-    conn = sqlite3.connect('motikoc.db')
-    groups = pd.read_sql_query('''
-        SELECT sg.id, sg.name, sg.group_type, sg.description, sg.subjects, gm.role
-        FROM study_groups sg
-        JOIN group_members gm ON sg.id = gm.group_id
-        WHERE gm.user_id = ?
-    ''', conn, params=(st.session_state.user_id,))
-    conn.close()
+    with pooled_connection() as conn:
+        groups = pd.read_sql_query('''
+            SELECT sg.id, sg.name, sg.group_type, sg.description, sg.subjects, gm.role
+            FROM study_groups sg
+            JOIN group_members gm ON sg.id = gm.group_id
+            WHERE gm.user_id = ?
+        ''', conn.raw, params=(st.session_state.user_id,))
     
     if not groups.empty:
         for _, group in groups.iterrows():
@@ -2464,85 +2431,83 @@ def show_yks_rankings():
         ["Genel", "TYT Net", "AYT Net", "Çalışma Süresi"]
     )
     
-    conn = sqlite3.connect('motikoc.db')
-    
-    if ranking_type == "Genel":
-        rankings = pd.read_sql_query('''
-            SELECT u.username, ul.current_level, ul.total_xp,
-                   COUNT(DISTINCT s.id) as study_sessions,
-                   ROUND(AVG(s.performance_rating), 2) as avg_performance
-            FROM users u
-            LEFT JOIN user_levels ul ON u.id = ul.user_id
-            LEFT JOIN study_logs s ON u.id = s.user_id
-            GROUP BY u.id, u.username
-            ORDER BY ul.total_xp DESC
-            LIMIT 100
-        ''', conn)
-
-        if not rankings.empty:
-            for i, row in enumerate(rankings.itertuples(index=False), start=1):
-                st.markdown(f"""
-                <div class="custom-card" style="margin: 5px 0;">
-                    <h4>#{i} {row.username}</h4>
-                    <p>Seviye: {row.current_level} | XP: {row.total_xp:,}</p>
-                    <p>Çalışma: {row.study_sessions} seans | 
-                       Performans: {row.avg_performance}/5</p>
-                </div>
-                """, unsafe_allow_html=True)
-    
-    elif ranking_type in ["TYT Net", "AYT Net"]:
-        # Deneme sınavı sonuçlarına göre sıralama
-        exam_type = "TYT" if ranking_type == "TYT Net" else "AYT"
-        rankings = pd.read_sql_query('''
-            SELECT u.username, 
-                   MAX(e.total_net) as best_net,
-                   COUNT(e.id) as exam_count,
-                   ROUND(AVG(e.total_net), 2) as avg_net
-            FROM users u
-            JOIN mock_exams e ON u.id = e.user_id
-            WHERE e.exam_type = ?
-            GROUP BY u.id
-            ORDER BY best_net DESC
-            LIMIT 100
-        ''', conn, params=(exam_type,))
-
-        if not rankings.empty:
-            for i, row in enumerate(rankings.itertuples(index=False), start=1):
-                st.markdown(f"""
-                <div class="custom-card" style="margin: 5px 0;">
-                    <h4>#{i} {row.username}</h4>
-                    <p>En İyi Net: {row.best_net}</p>
-                    <p>Ortalama: {row.avg_net} | 
-                       Deneme Sayısı: {row.exam_count}</p>
-                </div>
-                """, unsafe_allow_html=True)
+    with pooled_connection() as conn:
+    
+        if ranking_type == "Genel":
+            rankings = pd.read_sql_query('''
+                SELECT u.username, ul.current_level, ul.total_xp,
+                       COUNT(DISTINCT s.id) as study_sessions,
+                       ROUND(AVG(s.performance_rating), 2) as avg_performance
+                FROM users u
+                LEFT JOIN user_levels ul ON u.id = ul.user_id
+                LEFT JOIN study_logs s ON u.id = s.user_id
+                GROUP BY u.id, u.username
+                ORDER BY ul.total_xp DESC
+                LIMIT 100
+            ''', conn.raw)
+
+            if not rankings.empty:
+                for i, row in enumerate(rankings.itertuples(index=False), start=1):
+                    st.markdown(f"""
+                    <div class="custom-card" style="margin: 5px 0;">
+                        <h4>#{i} {row.username}</h4>
+                        <p>Seviye: {row.current_level} | XP: {row.total_xp:,}</p>
+                        <p>Çalışma: {row.study_sessions} seans | 
+                           Performans: {row.avg_performance}/5</p>
+                    </div>
+                    """, unsafe_allow_html=True)
     
-    else:  # Çalışma Süresi
-        rankings = pd.read_sql_query('''
-            SELECT u.username,
-                   SUM(s.duration) as total_duration,
-                   COUNT(DISTINCT DATE(s.date)) as study_days,
-                   ROUND(AVG(s.performance_rating), 2) as avg_performance
-            FROM users u
-            JOIN study_logs s ON u.id = s.user_id
-            GROUP BY u.id
-            ORDER BY total_duration DESC
-            LIMIT 100
-        ''', conn)
-        
-        if not rankings.empty:
-            for i, row in enumerate(rankings.itertuples(index=False), start=1):
-                hours = cast(float, row.total_duration)
-                st.markdown(f"""
-                <div class="custom-card" style="margin: 5px 0;">
-                    <h4>#{i} {row.username}</h4>
-                    <p>Toplam: {hours:.1f} saat</p>
-                    <p>Çalışma Günü: {row.study_days} | 
-                       Performans: {row.avg_performance}/5</p>
-                </div>
-                """, unsafe_allow_html=True)
+        elif ranking_type in ["TYT Net", "AYT Net"]:
+            # Deneme sınavı sonuçlarına göre sıralama
+            exam_type = "TYT" if ranking_type == "TYT Net" else "AYT"
+            rankings = pd.read_sql_query('''
+                SELECT u.username, 
+                       MAX(e.total_net) as best_net,
+                       COUNT(e.id) as exam_count,
+                       ROUND(AVG(e.total_net), 2) as avg_net
+                FROM users u
+                JOIN mock_exams e ON u.id = e.user_id
+                WHERE e.exam_type = ?
+                GROUP BY u.id
+                ORDER BY best_net DESC
+                LIMIT 100
+            ''', conn.raw, params=(exam_type,))
+
+            if not rankings.empty:
+                for i, row in enumerate(rankings.itertuples(index=False), start=1):
+                    st.markdown(f"""
+                    <div class="custom-card" style="margin: 5px 0;">
+                        <h4>#{i} {row.username}</h4>
+                        <p>En İyi Net: {row.best_net}</p>
+                        <p>Ortalama: {row.avg_net} | 
+                           Deneme Sayısı: {row.exam_count}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
     
-    conn.close()
+        else:  # Çalışma Süresi
+            rankings = pd.read_sql_query('''
+                SELECT u.username,
+                       SUM(s.duration) as total_duration,
+                       COUNT(DISTINCT DATE(s.date)) as study_days,
+                       ROUND(AVG(s.performance_rating), 2) as avg_performance
+                FROM users u
+                JOIN study_logs s ON u.id = s.user_id
+                GROUP BY u.id
+                ORDER BY total_duration DESC
+                LIMIT 100
+            ''', conn.raw)
+        
+            if not rankings.empty:
+                for i, row in enumerate(rankings.itertuples(index=False), start=1):
+                    hours = cast(float, row.total_duration)
+                    st.markdown(f"""
+                    <div class="custom-card" style="margin: 5px 0;">
+                        <h4>#{i} {row.username}</h4>
+                        <p>Toplam: {hours:.1f} saat</p>
+                        <p>Çalışma Günü: {row.study_days} | 
+                           Performans: {row.avg_performance}/5</p>
+                    </div>
+                    """, unsafe_allow_html=True)
 
 
 
@@ -2553,60 +2518,58 @@ def show_friend_suggestions():
     </div>
     """, unsafe_allow_html=True)
     
-    conn = sqlite3.connect('motikoc.db')
+    with pooled_connection() as conn:
     
-    # Get current user's info
-    user_data = pd.read_sql_query('''
-        SELECT grade, study_type, target_university, city
-        FROM users WHERE id = ?
-    ''', conn, params=(st.session_state.user_id,))
-    
-    if not user_data.empty:
-        user_info = user_data.iloc[0]
-        
-        # Find similar users
-        suggestions = pd.read_sql_query('''
-            SELECT u.id, u.username, u.grade, u.study_type,
-                   u.target_university, u.city
-            FROM users u
-            LEFT JOIN friendships f ON 
-                (f.user_id = ? AND f.friend_id = u.id) OR
-                (f.friend_id = ? AND f.user_id = u.id)
-            WHERE u.id != ? AND f.id IS NULL
-            AND (u.grade = ? OR u.study_type = ? OR 
-                 u.target_university = ? OR u.city = ?)
-            LIMIT 10
-        ''', conn, params=(st.session_state.user_id, st.session_state.user_id,
-                          st.session_state.user_id, user_info['grade'],
-                          user_info['study_type'], user_info['target_university'],
-                          user_info['city']))
-        
-        if not suggestions.empty:
-            for _, suggestion in suggestions.iterrows():
-                col1, col2 = st.columns([3, 1])
+        # Get current user's info
+        user_data = pd.read_sql_query('''
+            SELECT grade, study_type, target_university, city
+            FROM users WHERE id = ?
+        ''', conn.raw, params=(st.session_state.user_id,))
+    
+        if not user_data.empty:
+            user_info = user_data.iloc[0]
+        
+            # Find similar users
+            suggestions = pd.read_sql_query('''
+                SELECT u.id, u.username, u.grade, u.study_type,
+                       u.target_university, u.city
+                FROM users u
+                LEFT JOIN friendships f ON 
+                    (f.user_id = ? AND f.friend_id = u.id) OR
+                    (f.friend_id = ? AND f.user_id = u.id)
+                WHERE u.id != ? AND f.id IS NULL
+                AND (u.grade = ? OR u.study_type = ? OR 
+                     u.target_university = ? OR u.city = ?)
+                LIMIT 10
+            ''', conn.raw, params=(st.session_state.user_id, st.session_state.user_id,
+                              st.session_state.user_id, user_info['grade'],
+                              user_info['study_type'], user_info['target_university'],
+                              user_info['city']))
+        
+            if not suggestions.empty:
+                for _, suggestion in suggestions.iterrows():
+                    col1, col2 = st.columns([3, 1])
                 
-                with col1:
-                    st.markdown(f"""
-                    <div class="custom-card" style="margin: 5px 0;">
-                        <h4>{suggestion['username']}</h4>
-                        <p>{suggestion['grade']} | {suggestion['study_type']}</p>
-                        <p>Hedef: {suggestion['target_university']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    with col1:
+                        st.markdown(f"""
+                        <div class="custom-card" style="margin: 5px 0;">
+                            <h4>{suggestion['username']}</h4>
+                            <p>{suggestion['grade']} | {suggestion['study_type']}</p>
+                            <p>Hedef: {suggestion['target_university']}</p>
+                        </div>
+                        """, unsafe_allow_html=True)
                 
-                with col2:
-                    if st.button("Arkadaş Ekle", key=f"add_{suggestion['id']}"):
-                        c = conn.cursor()
-                        c.execute('''
-                            INSERT INTO friendships (user_id, friend_id, status)
-                            VALUES (?, ?, 'pending')
-                        ''', (st.session_state.user_id, suggestion['id']))
-                        conn.commit()
-                        st.success("İstek gönderildi!")
-        else:
-            st.info("Öneri bulunamadı. Daha fazla arkadaş edinmek için daha fazla çalışın!")
-    
-    conn.close()
+                    with col2:
+                        if st.button("Arkadaş Ekle", key=f"add_{suggestion['id']}"):
+                            with conn.transaction():
+                                c = conn.cursor()
+                                c.execute('''
+                                    INSERT INTO friendships (user_id, friend_id, status)
+                                    VALUES (?, ?, 'pending')
+                                ''', (st.session_state.user_id, suggestion['id']))
+                            st.success("İstek gönderildi!")
+            else:
+                st.info("Öneri bulunamadı. Daha fazla arkadaş edinmek için daha fazla çalışın!")
 
 def show_achievements():
     st.markdown("""
@@ -2628,18 +2591,15 @@ def show_achievements():
         submit = st.form_submit_button("Paylaş")
         
         if submit and description:
-            conn = sqlite3.connect('motikoc.db')
-            c = conn.cursor()
-            
-            c.execute('''
-                INSERT INTO achievements 
-                (user_id, title, description, date)
-                VALUES (?, ?, ?, ?)
-            ''', (st.session_state.user_id, achievement_type, description,
-                  datetime.now().strftime('%Y-%m-%d')))
+            with pooled_connection() as conn, conn.transaction():
+                c = conn.cursor()
             
-            conn.commit()
-            conn.close()
+                c.execute('''
+                    INSERT INTO achievements 
+                    (user_id, title, description, date)
+                    VALUES (?, ?, ?, ?)
+                ''', (st.session_state.user_id, achievement_type, description,
+                      datetime.now().strftime('%Y-%m-%d')))
             
             # Award XP for sharing achievement
             update_user_xp(st.session_state.user_id, calculate_xp_for_activity('achievement_shared'))
@@ -2648,15 +2608,14 @@ def show_achievements():
             st.rerun()
     
     # Başarı akışı
-    conn = sqlite3.connect('motikoc.db')
-    achievements = pd.read_sql_query('''
-        SELECT a.*, u.username
-        FROM achievements a
-        JOIN users u ON a.user_id = u.id
-        ORDER BY a.date DESC
-        LIMIT 50
-    ''', conn)
-    conn.close()
+    with pooled_connection() as conn:
+        achievements = pd.read_sql_query('''
+            SELECT a.*, u.username
+            FROM achievements a
+            JOIN users u ON a.user_id = u.id
+            ORDER BY a.date DESC
+            LIMIT 50
+        ''', conn.raw)
     
     if not achievements.empty:
         for _, achievement in achievements.iterrows():
@@ -2711,25 +2670,23 @@ class YKSAIHelper:
         self.yks_helper = YKSHelper()
     
     def generate_study_recommendations(self, user_id):
-        conn = sqlite3.connect('motikoc.db')
-        
-        # Kullanıcı verilerini al
-        user_data = pd.read_sql_query('''
-            SELECT u.*, 
-                   COUNT(s.id) as total_sessions,
-                   COALESCE(AVG(s.performance_rating), 0.0) as avg_performance,
-                   GROUP_CONCAT(DISTINCT s.subject) as studied_subjects
-            FROM users u
-            LEFT JOIN study_logs s ON u.id = s.user_id
-            WHERE u.id = ?
-            GROUP BY u.id
-        ''', conn, params=(user_id,))
+        with pooled_connection() as conn:
+            # Kullanıcı verilerini al
+            user_data = pd.read_sql_query('''
+                SELECT u.*, 
+                       COUNT(s.id) as total_sessions,
+                       COALESCE(AVG(s.performance_rating), 0.0) as avg_performance,
+                       GROUP_CONCAT(DISTINCT s.subject) as studied_subjects
+                FROM users u
+                LEFT JOIN study_logs s ON u.id = s.user_id
+                WHERE u.id = ?
+                GROUP BY u.id
+            ''', conn.raw, params=(user_id,))
 
         print("girdiii")
 
         
         if user_data.empty:
-            conn.close()
             return None
         
         user_info = user_data.iloc[0]
@@ -3352,40 +3309,36 @@ def show_yks_ai_features():
             
             # Çözümü Kaydet
             if st.button("Bu Çözümü Kaydet"):
-                conn = sqlite3.connect('motikoc.db')
-                c = conn.cursor()
-                
-                # Çözümleri kaydetmek için yeni bir tablo oluştur
-                c.execute('''CREATE TABLE IF NOT EXISTS saved_solutions
-                           (id INTEGER PRIMARY KEY,
-                            user_id INTEGER,
-                            subject TEXT,
-                            question TEXT,
-                            solution TEXT,
-                            date TEXT,
-                            FOREIGN KEY(user_id) REFERENCES users(id))''')
+                with pooled_connection() as conn, conn.transaction():
+                    c = conn.cursor()
                 
-                # Çözümü JSON olarak kaydet
-                c.execute('''INSERT INTO saved_solutions 
-                           (user_id, subject, question, solution, date)
-                           VALUES (?, ?, ?, ?, ?)''',
-                        (st.session_state.user_id, subject, question_text,
-                         json.dumps(solution), datetime.now().strftime('%Y-%m-%d')))
+                    # Çözümleri kaydetmek için yeni bir tablo oluştur
+                    c.execute('''CREATE TABLE IF NOT EXISTS saved_solutions
+                               (id INTEGER PRIMARY KEY,
+                                user_id INTEGER,
+                                subject TEXT,
+                                question TEXT,
+                                solution TEXT,
+                                date TEXT,
+                                FOREIGN KEY(user_id) REFERENCES users(id))''')
                 
-                conn.commit()
-                conn.close()
+                    # Çözümü JSON olarak kaydet
+                    c.execute('''INSERT INTO saved_solutions 
+                               (user_id, subject, question, solution, date)
+                               VALUES (?, ?, ?, ?, ?)''',
+                            (st.session_state.user_id, subject, question_text,
+                             json.dumps(solution), datetime.now().strftime('%Y-%m-%d')))
                 
                 st.success("Çözüm kaydedildi! Daha sonra tekrar inceleyebilirsiniz.")
         
         # Kaydedilmiş çözümleri görüntüle
         st.markdown("### 📚 Kaydedilmiş Çözümleriniz")
-        conn = sqlite3.connect('motikoc.db')
-        saved_solutions = pd.read_sql_query('''
-            SELECT * FROM saved_solutions
-            WHERE user_id = ?
-            ORDER BY date DESC
-        ''', conn, params=(st.session_state.user_id,))
-        conn.close()
+        with pooled_connection() as conn:
+            saved_solutions = pd.read_sql_query('''
+                SELECT * FROM saved_solutions
+                WHERE user_id = ?
+                ORDER BY date DESC
+            ''', conn.raw, params=(st.session_state.user_id,))
         
         if not saved_solutions.empty:
             for _, solution in saved_solutions.iterrows():
@@ -3466,14 +3419,11 @@ def add_yks_specific_features():
     
     # Konular veritabanı tablosu
     def init_yks_tables():
-        conn = sqlite3.connect('motikoc.db')
-        c = conn.cursor()
-        
-        # YKS konuları zaten init_db() içinde oluşturuldu
-        # Bu fonksiyon isterseniz ek tablolar için genişletebilirsiniz
+        with pooled_connection() as conn:
+            c = conn.cursor()
         
-        conn.commit()
-        conn.close()
+            # YKS konuları zaten init_db() içinde oluşturuldu
+            # Bu fonksiyon isterseniz ek tablolar için genişletebilirsiniz
     
     return {
         'init_tables': init_yks_tables,
@@ -3816,26 +3766,9 @@ class UniversityRecommenderInterface:
         
         return UniversityRecommender(api_key=api_key)
     def _load_data(self) -> pd.DataFrame:
-        """Load and preprocess the un aiversaity data."""
+        """Get the shared, pre-typed university data."""
         try:
-            df = pd.read_csv('programs_data_with_links.csv')
-            
-            # Clean and convert 'Ücret (KDV Hariç)' to a numeric format
-            df['Ücret (KDV Hariç)'] = (
-                df['Ücret (KDV Hariç)']
-                .replace(r'[\D]', '', regex=True)  # Remove any non-digit characters
-                .astype(float)                     # Convert to float
-            )
-
-            
-            numeric_columns = [
-                'Başarı Sırası 2023', 'Taban Puan 2023', 'Kontenjan 2023',
-                'Yerleşen 2023'
-            ]
-            for col in numeric_columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            return df
+            return get_programs()
         except Exception as e:
             st.error(f"Veri yüklenirken hata oluştu: {str(e)}")
             return pd.DataFrame()
@@ -5099,96 +5032,89 @@ from io import BytesIO
 # Forum Tablolarını Başlatma
 def init_forum_tables():
     """Forum tablolarını başlat ve tüm gerekli tabloları oluştur"""
-    conn = sqlite3.connect('motikoc.db')
-    c = conn.cursor()
-    
     try:
-        # Forum kategorileri
-        c.execute('''CREATE TABLE IF NOT EXISTS forum_categories
-                     (id INTEGER PRIMARY KEY,
-                      name TEXT,
-                      description TEXT,
-                      icon TEXT,
-                      order_index INTEGER)''')
-        
-        # Sorular tablosu
-        c.execute('''CREATE TABLE IF NOT EXISTS forum_questions
-                     (id INTEGER PRIMARY KEY,
-                      user_id INTEGER,
-                      category_id INTEGER,
-                      title TEXT,
-                      content TEXT,
-                      tags TEXT,
-                      created_at TEXT,
-                      updated_at TEXT,
-                      view_count INTEGER DEFAULT 0,
-                      is_solved BOOLEAN DEFAULT FALSE,
-                      FOREIGN KEY(user_id) REFERENCES users(id),
-                      FOREIGN KEY(category_id) REFERENCES forum_categories(id))''')
-        
-        # Cevaplar tablosu
-        c.execute('''CREATE TABLE IF NOT EXISTS forum_answers
-                     (id INTEGER PRIMARY KEY,
-                      question_id INTEGER,
-                      user_id INTEGER,
-                      content TEXT,
-                      created_at TEXT,
-                      updated_at TEXT,
-                      is_accepted BOOLEAN DEFAULT FALSE,
-                      upvotes INTEGER DEFAULT 0,
-                      FOREIGN KEY(question_id) REFERENCES forum_questions(id),
-                      FOREIGN KEY(user_id) REFERENCES users(id))''')
-        
-        # Oylar tablosu
-        c.execute('''CREATE TABLE IF NOT EXISTS forum_votes
-                     (id INTEGER PRIMARY KEY,
-                      user_id INTEGER,
-                      content_type TEXT,
-                      content_id INTEGER,
-                      vote_type INTEGER,
-                      created_at TEXT,
-                      FOREIGN KEY(user_id) REFERENCES users(id))''')
-        
-        # Bildirimler tablosu
-        c.execute('''CREATE TABLE IF NOT EXISTS forum_notifications
-                     (id INTEGER PRIMARY KEY,
-                      user_id INTEGER,
-                      content TEXT,
-                      link TEXT,
-                      created_at TEXT,
-                      is_read BOOLEAN DEFAULT FALSE,
-                      FOREIGN KEY(user_id) REFERENCES users(id))''')
-        
-        # Forum kategorilerini temizle ve yeniden ekle
-        c.execute('DELETE FROM forum_categories')
-        
-        # Varsayılan kategoriler
-        default_categories = [
-            ('TYT Matematik', 'TYT matematik konuları ve soru çözümleri', '📐', 1),
-            ('TYT Türkçe', 'TYT Türkçe ve dil bilgisi konuları', '📚', 2),
-            ('TYT Fen Bilimleri', 'TYT Fizik, Kimya ve Biyoloji', '🔬', 3),
-            ('TYT Sosyal Bilimler', 'TYT Tarih, Coğrafya ve Felsefe', '🌍', 4),
-            ('AYT Matematik', 'AYT matematik konuları ve soru çözümleri', '🧮', 5),
-            ('AYT Fizik', 'AYT fizik konuları ve problemler', '⚡', 6),
-            ('AYT Kimya', 'AYT kimya konuları ve deneyler', '⚗️', 7),
-            ('AYT Biyoloji', 'AYT biyoloji konuları', '🧬', 8),
-            ('Genel YKS', 'YKS sınavı hakkında genel konular', '📋', 9),
-            ('Motivasyon', 'Motivasyon ve çalışma teknikleri', '💪', 10)
-        ]
-        
-        c.executemany('''
-            INSERT INTO forum_categories (name, description, icon, order_index)
-            VALUES (?, ?, ?, ?)
-        ''', default_categories)
+        with pooled_connection() as conn, conn.transaction():
+            c = conn.cursor()
+            # Forum kategorileri
+            c.execute('''CREATE TABLE IF NOT EXISTS forum_categories
+                         (id INTEGER PRIMARY KEY,
+                          name TEXT,
+                          description TEXT,
+                          icon TEXT,
+                          order_index INTEGER)''')
+        
+            # Sorular tablosu
+            c.execute('''CREATE TABLE IF NOT EXISTS forum_questions
+                         (id INTEGER PRIMARY KEY,
+                          user_id INTEGER,
+                          category_id INTEGER,
+                          title TEXT,
+                          content TEXT,
+                          tags TEXT,
+                          created_at TEXT,
+                          updated_at TEXT,
+                          view_count INTEGER DEFAULT 0,
+                          is_solved BOOLEAN DEFAULT FALSE,
+                          FOREIGN KEY(user_id) REFERENCES users(id),
+                          FOREIGN KEY(category_id) REFERENCES forum_categories(id))''')
+        
+            # Cevaplar tablosu
+            c.execute('''CREATE TABLE IF NOT EXISTS forum_answers
+                         (id INTEGER PRIMARY KEY,
+                          question_id INTEGER,
+                          user_id INTEGER,
+                          content TEXT,
+                          created_at TEXT,
+                          updated_at TEXT,
+                          is_accepted BOOLEAN DEFAULT FALSE,
+                          upvotes INTEGER DEFAULT 0,
+                          FOREIGN KEY(question_id) REFERENCES forum_questions(id),
+                          FOREIGN KEY(user_id) REFERENCES users(id))''')
+        
+            # Oylar tablosu
+            c.execute('''CREATE TABLE IF NOT EXISTS forum_votes
+                         (id INTEGER PRIMARY KEY,
+                          user_id INTEGER,
+                          content_type TEXT,
+                          content_id INTEGER,
+                          vote_type INTEGER,
+                          created_at TEXT,
+                          FOREIGN KEY(user_id) REFERENCES users(id))''')
+        
+            # Bildirimler tablosu
+            c.execute('''CREATE TABLE IF NOT EXISTS forum_notifications
+                         (id INTEGER PRIMARY KEY,
+                          user_id INTEGER,
+                          content TEXT,
+                          link TEXT,
+                          created_at TEXT,
+                          is_read BOOLEAN DEFAULT FALSE,
+                          FOREIGN KEY(user_id) REFERENCES users(id))''')
+        
+            # Forum kategorilerini temizle ve yeniden ekle
+            c.execute('DELETE FROM forum_categories')
+        
+            # Varsayılan kategoriler
+            default_categories = [
+                ('TYT Matematik', 'TYT matematik konuları ve soru çözümleri', '📐', 1),
+                ('TYT Türkçe', 'TYT Türkçe ve dil bilgisi konuları', '📚', 2),
+                ('TYT Fen Bilimleri', 'TYT Fizik, Kimya ve Biyoloji', '🔬', 3),
+                ('TYT Sosyal Bilimler', 'TYT Tarih, Coğrafya ve Felsefe', '🌍', 4),
+                ('AYT Matematik', 'AYT matematik konuları ve soru çözümleri', '🧮', 5),
+                ('AYT Fizik', 'AYT fizik konuları ve problemler', '⚡', 6),
+                ('AYT Kimya', 'AYT kimya konuları ve deneyler', '⚗️', 7),
+                ('AYT Biyoloji', 'AYT biyoloji konuları', '🧬', 8),
+                ('Genel YKS', 'YKS sınavı hakkında genel konular', '📋', 9),
+                ('Motivasyon', 'Motivasyon ve çalışma teknikleri', '💪', 10)
+            ]
         
-        conn.commit()
+            c.executemany('''
+                INSERT INTO forum_categories (name, description, icon, order_index)
+                VALUES (?, ?, ?, ?)
+            ''', default_categories)
         
     except Exception as e:
         print(f"Tablo oluşturma hatası: {str(e)}")
-        conn.rollback()
-    
-    finally:
-        conn.close()
 
 # Forum Ana Sayfası
 def show_forum():
@@ -5264,10 +5190,10 @@ def show_all_questions():
     with col3:
         show_all = st.checkbox("Tümünü Göster", value=False, key="show_all_questions_checkbox")
     
+    # Veritabanı bağlantısı
+    conn = pooled_connection()
+    
     try:
-        # Veritabanı bağlantısı
-        conn = sqlite3.connect('motikoc.db')
-        
         # SQL sorgusu
         query = '''
             SELECT 
@@ -5406,8 +5332,8 @@ def show_ask_question_form():
     st.subheader("❓ Yeni Soru Sor")
     
     # Kategori seçimi
-    conn = sqlite3.connect('motikoc.db')
-    categories = conn.execute('SELECT id, name, icon FROM forum_categories ORDER BY order_index').fetchall()
+    with pooled_connection() as conn:
+        categories = conn.execute('SELECT id, name, icon FROM forum_categories ORDER BY order_index').fetchall()
     category_options = {f"{cat[2]} {cat[1]}": cat[0] for cat in categories}
     
     with st.form("ask_question_form"):
@@ -5460,25 +5386,24 @@ def show_ask_question_form():
                     now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                     
                     # Soruyu kaydet
-                    c = conn.cursor()
-                    c.execute('''
-                        INSERT INTO forum_questions 
-                        (user_id, category_id, title, content, tags, created_at, updated_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        st.session_state.user_id,
-                        category_options[selected_category],
-                        title,
-                        content,
-                        tags,
-                        now,
-                        now
-                    ))
-                    
-                    # Son eklenen sorunun ID'sini al
-                    question_id = c.lastrowid
+                    with pooled_connection() as conn, conn.transaction():
+                        c = conn.cursor()
+                        c.execute('''
+                            INSERT INTO forum_questions 
+                            (user_id, category_id, title, content, tags, created_at, updated_at)
+                            VALUES (?, ?, ?, ?, ?, ?, ?)
+                        ''', (
+                            st.session_state.user_id,
+                            category_options[selected_category],
+                            title,
+                            content,
+                            tags,
+                            now,
+                            now
+                        ))
                     
-                    conn.commit()
+                        # Son eklenen sorunun ID'sini al
+                        question_id = c.lastrowid
                     
                     # XP kazandır
                     update_user_xp(st.session_state.user_id, calculate_xp_for_activity('forum_question'))
@@ -5494,8 +5419,6 @@ def show_ask_question_form():
                     
                 except Exception as e:
                     st.error(f"Soru eklenirken bir hata oluştu: {str(e)}")
-                finally:
-                    conn.close()
 
 # Arama Fonksiyonu
 def show_search_questions():
@@ -5525,10 +5448,10 @@ def show_search_questions():
         
         with col1:
             # Kategori filtresi
-            conn = sqlite3.connect('motikoc.db')
-            categories = conn.execute(
-                'SELECT id, name, icon FROM forum_categories ORDER BY name'
-            ).fetchall()
+            with pooled_connection() as conn:
+                categories = conn.execute(
+                    'SELECT id, name, icon FROM forum_categories ORDER BY name'
+                ).fetchall()
             
             category_options = {"Tüm Kategoriler": None}
             category_options.update({
@@ -5677,104 +5600,102 @@ def show_search_questions():
             query += f" LIMIT {results_per_page}"
             
             # Sorguyu çalıştır
-            conn = sqlite3.connect('motikoc.db')
-            results = conn.execute(query, params).fetchall()
-            
-            # Sonuçları göster
-            st.markdown(f"### 🔎 Arama Sonuçları ({len(results)} sonuç)")
-            
-            if results:
-                for result in results:
-                    question_id = result[0]
-                    # Oy durumu kontrolü
-                    user_vote = conn.execute('''
-                        SELECT vote_type FROM forum_votes 
-                        WHERE user_id = ? AND content_type = 'question' AND content_id = ?
-                    ''', (st.session_state.user_id, question_id)).fetchone()
+            with pooled_connection() as conn:
+                results = conn.execute(query, params).fetchall()
+            
+                # Sonuçları göster
+                st.markdown(f"### 🔎 Arama Sonuçları ({len(results)} sonuç)")
+            
+                if results:
+                    for result in results:
+                        question_id = result[0]
+                        # Oy durumu kontrolü
+                        user_vote = conn.execute('''
+                            SELECT vote_type FROM forum_votes 
+                            WHERE user_id = ? AND content_type = 'question' AND content_id = ?
+                        ''', (st.session_state.user_id, question_id)).fetchone()
                     
-                    if user_vote:
-                        user_vote = user_vote[0]
-                    else:
-                        user_vote = 0  # Hiç oy vermemiş
+                        if user_vote:
+                            user_vote = user_vote[0]
+                        else:
+                            user_vote = 0  # Hiç oy vermemiş
                     
-                    with st.container():
-                        col1, col2, col3 = st.columns([5, 1, 1])
+                        with st.container():
+                            col1, col2, col3 = st.columns([5, 1, 1])
                         
-                        with col1:
-                            st.markdown(f"""
-                            <div style='
-                                padding: 15px;
-                                border-radius: 10px;
-                                background-color: rgba(255, 255, 255, 0.05);
-                                margin-bottom: 10px;
-                            '>
-                                <div style='display: flex; justify-content: space-between;'>
-                                    <h3>{result[1]}</h3>
-                                    <span>{result[9]} {result[8]}</span>
-                                </div>
-                                <p style='
-                                    color: #B0B0B0;
-                                    font-size: 14px;
-                                    margin: 5px 0;
-                                '>{result[2][:200]}...</p>
+                            with col1:
+                                st.markdown(f"""
                                 <div style='
-                                    display: flex;
-                                    justify-content: space-between;
-                                    color: #B0B0B0;
-                                    font-size: 14px;
-                                    margin-top: 10px;
+                                    padding: 15px;
+                                    border-radius: 10px;
+                                    background-color: rgba(255, 255, 255, 0.05);
+                                    margin-bottom: 10px;
                                 '>
-                                    <span>
-                                        👤 {result[7]} | 
-                                        💬 {result[10]} cevap | 
-                                        👁️ {result[6]} görüntülenme | 
-                                        👍 {result[10]} oy | 👎 {result[11]} oy
-                                    </span>
-                                    <span>📅 {result[4]}</span>
+                                    <div style='display: flex; justify-content: space-between;'>
+                                        <h3>{result[1]}</h3>
+                                        <span>{result[9]} {result[8]}</span>
+                                    </div>
+                                    <p style='
+                                        color: #B0B0B0;
+                                        font-size: 14px;
+                                        margin: 5px 0;
+                                    '>{result[2][:200]}...</p>
+                                    <div style='
+                                        display: flex;
+                                        justify-content: space-between;
+                                        color: #B0B0B0;
+                                        font-size: 14px;
+                                        margin-top: 10px;
+                                    '>
+                                        <span>
+                                            👤 {result[7]} | 
+                                            💬 {result[10]} cevap | 
+                                            👁️ {result[6]} görüntülenme | 
+                                            👍 {result[10]} oy | 👎 {result[11]} oy
+                                        </span>
+                                        <span>📅 {result[4]}</span>
+                                    </div>
                                 </div>
-                            </div>
-                            """, unsafe_allow_html=True)
+                                """, unsafe_allow_html=True)
                         
-                        with col2:
-                            # Upvote butonu
-                            if user_vote == 1:
-                                upvote_label = "👍 Beğenildi"
-                            else:
-                                upvote_label = "👍 Beğen"
-                            if st.button(upvote_label, key=f"search_upvote_question_{question_id}"):
-                                vote_question(question_id, 1)
-                                st.rerun()
+                            with col2:
+                                # Upvote butonu
+                                if user_vote == 1:
+                                    upvote_label = "👍 Beğenildi"
+                                else:
+                                    upvote_label = "👍 Beğen"
+                                if st.button(upvote_label, key=f"search_upvote_question_{question_id}"):
+                                    vote_question(question_id, 1)
+                                    st.rerun()
                         
-                        with col3:
-                            # Downvote butonu
-                            if user_vote == -1:
-                                downvote_label = "👎 Beğenilmedi"
-                            else:
-                                downvote_label = "👎 Beğenme"
-                            if st.button(downvote_label, key=f"search_downvote_question_{question_id}"):
-                                vote_question(question_id, -1)
-                                st.rerun()
+                            with col3:
+                                # Downvote butonu
+                                if user_vote == -1:
+                                    downvote_label = "👎 Beğenilmedi"
+                                else:
+                                    downvote_label = "👎 Beğenme"
+                                if st.button(downvote_label, key=f"search_downvote_question_{question_id}"):
+                                    vote_question(question_id, -1)
+                                    st.rerun()
                         
-                        with col1:
-                            # Oy sayısını göster
-                            st.markdown(f"**👍 {result[10]}  👎 {result[11]}**")
+                            with col1:
+                                # Oy sayısını göster
+                                st.markdown(f"**👍 {result[10]}  👎 {result[11]}**")
                         
-                        # Detay butonu
-                        if st.button("Detayları Gör", key=f"search_view_question_{question_id}"):
-                            st.session_state.current_question = question_id
-                            st.session_state.current_page = "question_detail"
-                            st.rerun()
+                            # Detay butonu
+                            if st.button("Detayları Gör", key=f"search_view_question_{question_id}"):
+                                st.session_state.current_question = question_id
+                                st.session_state.current_page = "question_detail"
+                                st.rerun()
                     
-                    # Etiketler
-                    if result[3]:  # tags
-                        st.markdown("**Etiketler:**")
-                        for tag in result[3].split():
-                            st.markdown(f"`{tag}`", unsafe_allow_html=True)
-            
-            else:
-                st.info("Arama kriterlerinize uygun sonuç bulunamadı.")
+                        # Etiketler
+                        if result[3]:  # tags
+                            st.markdown("**Etiketler:**")
+                            for tag in result[3].split():
+                                st.markdown(f"`{tag}`", unsafe_allow_html=True)
             
-            conn.close()
+                else:
+                    st.info("Arama kriterlerinize uygun sonuç bulunamadı.")
             
         except Exception as e:
             st.error(f"Arama sırasında bir hata oluştu: {str(e)}")
@@ -5786,9 +5707,10 @@ def show_categories():
     """Forum kategorilerini benzersiz olarak göster"""
     st.subheader("📚 Kategoriler")
     
+    # Veritabanı bağlantısı
+    conn = pooled_connection()
+    
     try:
-        # Veritabanı bağlantısı
-        conn = sqlite3.connect('motikoc.db')
         c = conn.cursor()
         
         # Benzersiz kategorileri çek
@@ -5866,7 +5788,7 @@ def show_categories():
 # Seçilen Kategorideki Soruları Gösterme Fonksiyonu
 def show_category_questions(category_id):
     """Seçilen kategorideki soruları göster"""
-    conn = sqlite3.connect('motikoc.db')
+    conn = pooled_connection()
     
     try:
         # Kategori bilgilerini al
@@ -6034,16 +5956,16 @@ def show_category_questions(category_id):
 # Soru Detay Sayfası
 def show_question_detail(question_id):
     """Soru detay sayfası"""
-    conn = sqlite3.connect('motikoc.db')
+    conn = pooled_connection()
     
     try:
         # Görüntülenme sayısını artır
-        conn.execute('''
-            UPDATE forum_questions 
-            SET view_count = view_count + 1 
-            WHERE id = ?
-        ''', (question_id,))
-        conn.commit()
+        with conn.transaction():
+            conn.execute('''
+                UPDATE forum_questions 
+                SET view_count = view_count + 1 
+                WHERE id = ?
+            ''', (question_id,))
         
         # Soru detaylarını getir
         question = conn.execute('''
@@ -6154,13 +6076,12 @@ def show_question_detail(question_id):
                     now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                     
                     # Cevabı kaydet
-                    conn.execute('''
-                        INSERT INTO forum_answers 
-                        (question_id, user_id, content, created_at, updated_at)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (question_id, st.session_state.user_id, answer_content, now, now))
-                    
-                    conn.commit()
+                    with conn.transaction():
+                        conn.execute('''
+                            INSERT INTO forum_answers 
+                            (question_id, user_id, content, created_at, updated_at)
+                            VALUES (?, ?, ?, ?, ?)
+                        ''', (question_id, st.session_state.user_id, answer_content, now, now))
                     
                     # XP kazandır
                     update_user_xp(st.session_state.user_id, calculate_xp_for_activity('forum_answer'))
@@ -6181,7 +6102,7 @@ def show_question_detail(question_id):
 # Cevapları Gösterme Fonksiyonu
 def show_answers(question_id):
     """Soru cevaplarını göster"""
-    conn = sqlite3.connect('motikoc.db')
+    conn = pooled_connection()
     
     try:
         # Cevapları getir
@@ -6304,155 +6225,134 @@ def show_answers(question_id):
 # Cevap Oy Fonksiyonu
 def vote_answer(answer_id, vote_type):
     """Cevabı oyla"""
-    conn = sqlite3.connect('motikoc.db')
-    c = conn.cursor()
-    
     try:
-        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Önceki oyu kontrol et
-        existing_vote = c.execute('''
-            SELECT id, vote_type 
-            FROM forum_votes 
-            WHERE user_id = ? AND content_type = 'answer' AND content_id = ?
-        ''', (st.session_state.user_id, answer_id)).fetchone()
-        
-        if existing_vote:
-            if existing_vote[1] == vote_type:
-                # Aynı oy tipi - oyu kaldır
-                c.execute('DELETE FROM forum_votes WHERE id = ?', (existing_vote[0],))
+        with pooled_connection() as conn, conn.transaction():
+            c = conn.cursor()
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+            # Önceki oyu kontrol et
+            existing_vote = c.execute('''
+                SELECT id, vote_type 
+                FROM forum_votes 
+                WHERE user_id = ? AND content_type = 'answer' AND content_id = ?
+            ''', (st.session_state.user_id, answer_id)).fetchone()
+        
+            if existing_vote:
+                if existing_vote[1] == vote_type:
+                    # Aynı oy tipi - oyu kaldır
+                    c.execute('DELETE FROM forum_votes WHERE id = ?', (existing_vote[0],))
+                else:
+                    # Farklı oy tipi - oyu güncelle
+                    c.execute('''
+                        UPDATE forum_votes 
+                        SET vote_type = ?, created_at = ?
+                        WHERE id = ?
+                    ''', (vote_type, now, existing_vote[0]))
             else:
-                # Farklı oy tipi - oyu güncelle
+                # Yeni oy ekle
                 c.execute('''
-                    UPDATE forum_votes 
-                    SET vote_type = ?, created_at = ?
-                    WHERE id = ?
-                ''', (vote_type, now, existing_vote[0]))
-        else:
-            # Yeni oy ekle
-            c.execute('''
-                INSERT INTO forum_votes 
-                (user_id, content_type, content_id, vote_type, created_at)
-                VALUES (?, 'answer', ?, ?, ?)
-            ''', (st.session_state.user_id, answer_id, vote_type, now))
-        
-        conn.commit()
+                    INSERT INTO forum_votes 
+                    (user_id, content_type, content_id, vote_type, created_at)
+                    VALUES (?, 'answer', ?, ?, ?)
+                ''', (st.session_state.user_id, answer_id, vote_type, now))
         
     except Exception as e:
         st.error(f"Oylama sırasında bir hata oluştu: {str(e)}")
-    finally:
-        conn.close()
 
 # Soru Oylama Fonksiyonu
 def vote_question(question_id, vote_type):
     """Soruyu oyla"""
-    conn = sqlite3.connect('motikoc.db')
-    c = conn.cursor()
-    
     try:
-        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Önceki oyu kontrol et
-        existing_vote = c.execute('''
-            SELECT id, vote_type 
-            FROM forum_votes 
-            WHERE user_id = ? AND content_type = 'question' AND content_id = ?
-        ''', (st.session_state.user_id, question_id)).fetchone()
-        
-        if existing_vote:
-            if existing_vote[1] == vote_type:
-                # Aynı oy tipi - oyu kaldır
-                c.execute('DELETE FROM forum_votes WHERE id = ?', (existing_vote[0],))
+        with pooled_connection() as conn, conn.transaction():
+            c = conn.cursor()
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+            # Önceki oyu kontrol et
+            existing_vote = c.execute('''
+                SELECT id, vote_type 
+                FROM forum_votes 
+                WHERE user_id = ? AND content_type = 'question' AND content_id = ?
+            ''', (st.session_state.user_id, question_id)).fetchone()
+        
+            if existing_vote:
+                if existing_vote[1] == vote_type:
+                    # Aynı oy tipi - oyu kaldır
+                    c.execute('DELETE FROM forum_votes WHERE id = ?', (existing_vote[0],))
+                else:
+                    # Farklı oy tipi - oyu güncelle
+                    c.execute('''
+                        UPDATE forum_votes 
+                        SET vote_type = ?, created_at = ?
+                        WHERE id = ?
+                    ''', (vote_type, now, existing_vote[0]))
             else:
-                # Farklı oy tipi - oyu güncelle
+                # Yeni oy ekle
                 c.execute('''
-                    UPDATE forum_votes 
-                    SET vote_type = ?, created_at = ?
-                    WHERE id = ?
-                ''', (vote_type, now, existing_vote[0]))
-        else:
-            # Yeni oy ekle
-            c.execute('''
-                INSERT INTO forum_votes 
-                (user_id, content_type, content_id, vote_type, created_at)
-                VALUES (?, 'question', ?, ?, ?)
-            ''', (st.session_state.user_id, question_id, vote_type, now))
-        
-        conn.commit()
+                    INSERT INTO forum_votes 
+                    (user_id, content_type, content_id, vote_type, created_at)
+                    VALUES (?, 'question', ?, ?, ?)
+                ''', (st.session_state.user_id, question_id, vote_type, now))
         
     except Exception as e:
         st.error(f"Oylama sırasında bir hata oluştu: {str(e)}")
-    finally:
-        conn.close()
 
 # Cevabı Kabul Etme Fonksiyonu
 def accept_answer(question_id, answer_id):
     """Cevabı doğru cevap olarak işaretle"""
-    conn = sqlite3.connect('motikoc.db')
-    c = conn.cursor()
-    
     try:
-        # Diğer kabul edilmiş cevapları resetle
-        c.execute('''
-            UPDATE forum_answers 
-            SET is_accepted = FALSE 
-            WHERE question_id = ?
-        ''', (question_id,))
-        
-        # Yeni cevabı kabul et
-        c.execute('''
-            UPDATE forum_answers 
-            SET is_accepted = TRUE 
-            WHERE id = ?
-        ''', (answer_id,))
+        with pooled_connection() as conn, conn.transaction():
+            c = conn.cursor()
+            # Diğer kabul edilmiş cevapları resetle
+            c.execute('''
+                UPDATE forum_answers 
+                SET is_accepted = FALSE 
+                WHERE question_id = ?
+            ''', (question_id,))
         
-        # Soruyu çözüldü olarak işaretle
-        c.execute('''
-            UPDATE forum_questions 
-            SET is_solved = TRUE 
-            WHERE id = ?
-        ''', (question_id,))
+            # Yeni cevabı kabul et
+            c.execute('''
+                UPDATE forum_answers 
+                SET is_accepted = TRUE 
+                WHERE id = ?
+            ''', (answer_id,))
         
-        conn.commit()
+            # Soruyu çözüldü olarak işaretle
+            c.execute('''
+                UPDATE forum_questions 
+                SET is_solved = TRUE 
+                WHERE id = ?
+            ''', (question_id,))
         
     except Exception as e:
         st.error(f"Cevap kabul edilirken bir hata oluştu: {str(e)}")
-    finally:
-        conn.close()
 
 # Bildirim Gönderme Fonksiyonu
 def send_notification(user_id, content, link=None):
     """Kullanıcıya bildirim gönder"""
-    conn = sqlite3.connect('motikoc.db')
-    c = conn.cursor()
-    
     try:
-        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        c.execute('''
-            INSERT INTO forum_notifications 
-            (user_id, content, link, created_at)
-            VALUES (?, ?, ?, ?)
-        ''', (user_id, content, link, now))
+        with pooled_connection() as conn, conn.transaction():
+            c = conn.cursor()
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        conn.commit()
+            c.execute('''
+                INSERT INTO forum_notifications 
+                (user_id, content, link, created_at)
+                VALUES (?, ?, ?, ?)
+            ''', (user_id, content, link, now))
         
     except Exception as e:
         print(f"Bildirim gönderilirken hata oluştu: {str(e)}")
-    finally:
-        conn.close()
 
 # Kullanıcı Bildirimlerini Gösterme Fonksiyonu
 def show_user_notifications():
     """Kullanıcı bildirimlerini göster"""
-    conn = sqlite3.connect('motikoc.db')
-    
     try:
-        notifications = conn.execute('''
-            SELECT * FROM forum_notifications
-            WHERE user_id = ? AND is_read = FALSE
-            ORDER BY created_at DESC
-        ''', (st.session_state.user_id,)).fetchall()
+        with pooled_connection() as conn:
+            notifications = conn.execute('''
+                SELECT * FROM forum_notifications
+                WHERE user_id = ? AND is_read = FALSE
+                ORDER BY created_at DESC
+            ''', (st.session_state.user_id,)).fetchall()
         
         if notifications:
             st.sidebar.markdown("### 🔔 Bildirimler")
@@ -6485,29 +6385,21 @@ def show_user_notifications():
     
     except Exception as e:
         st.error(f"Bildirimler yüklenirken bir hata oluştu: {str(e)}")
-    
-    finally:
-        conn.close()
 
 # Bildirimi Okundu Olarak İşaretleme Fonksiyonu
 def mark_notification_read(notification_id):
     """Bildirimi okundu olarak işaretle"""
-    conn = sqlite3.connect('motikoc.db')
-    c = conn.cursor()
-    
     try:
-        c.execute('''
-            UPDATE forum_notifications
-            SET is_read = TRUE
-            WHERE id = ? AND user_id = ?
-        ''', (notification_id, st.session_state.user_id))
-        
-        conn.commit()
+        with pooled_connection() as conn, conn.transaction():
+            c = conn.cursor()
+            c.execute('''
+                UPDATE forum_notifications
+                SET is_read = TRUE
+                WHERE id = ? AND user_id = ?
+            ''', (notification_id, st.session_state.user_id))
         
     except Exception as e:
         print(f"Bildirim güncellenirken hata oluştu: {str(e)}")
-    finally:
-        conn.close()
 
 # Ana Menü Güncelleme Fonksiyonu
 def update_main_menu():
@@ -2,7 +2,8 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 import logging
 from dataclasses import dataclass
-from core.database import DatabaseManager, DatabaseError, db_transaction
+from core.database import DatabaseManager, DatabaseError, DatabaseWriter, db_transaction, read_snapshot
+from core import queries
 import sqlite3
 
 # Configure logging
@@ -78,61 +79,59 @@ class GamificationService:
             return 0
     
     def update_user_xp(self, user_id: int, xp_earned: int) -> LevelInfo:
-        """Update user XP with improved transaction handling"""
+        """Update user XP through the single writer (inline inside an open transaction)"""
         try:
-            with db_transaction() as conn:
-                cursor = conn.cursor()
-                
-                # Get current level info
-                cursor.execute('''
-                    SELECT current_level, current_xp, total_xp 
-                    FROM user_levels 
-                    WHERE user_id = ?
-                ''', (user_id,))
-                
-                result = cursor.fetchone()
-                if not result:
-                    # Initialize new user level
-                    cursor.execute('''
-                        INSERT INTO user_levels (user_id, current_level, current_xp, total_xp)
-                        VALUES (?, 1, 0, 0)
-                    ''', (user_id,))
-                    current_level, current_xp, total_xp = 1, 0, 0
-                else:
-                    current_level, current_xp, total_xp = result
-                
-                # Update XP
-                new_total_xp = total_xp + xp_earned
-                new_current_xp = current_xp + xp_earned
-                level_up = False
-                
-                # Check for level up with configurable multiplier
-                while new_current_xp >= self._calculate_xp_for_level(current_level):
-                    new_current_xp -= self._calculate_xp_for_level(current_level)
-                    current_level += 1
-                    level_up = True
-                
-                # Update database
-                cursor.execute('''
-                    UPDATE user_levels 
-                    SET current_level = ?, 
-                        current_xp = ?, 
-                        total_xp = ?,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE user_id = ?
-                ''', (current_level, new_current_xp, new_total_xp, user_id))
-                
-                return LevelInfo(
-                    level=current_level,
-                    current_xp=new_current_xp,
-                    total_xp=new_total_xp,
-                    level_up=level_up,
-                    xp_for_next=self._calculate_xp_for_level(current_level)
-                )
-                
+            return DatabaseWriter.wait(DatabaseWriter.get_instance().submit(
+                lambda cursor: self._apply_xp(cursor, user_id, xp_earned)
+            ))
         except Exception as e:
             logger.error(f"Error updating user XP: {e}")
             raise
+
+    def _apply_xp(self, cursor: sqlite3.Cursor, user_id: int, xp_earned: int) -> LevelInfo:
+        """Read-modify-write of the user's level row on the given cursor"""
+        # Get current level info
+        cursor.execute(queries.USER_LEVEL, (user_id,))
+        
+        result = cursor.fetchone()
+        if not result:
+            # Initialize new user level
+            cursor.execute('''
+                INSERT INTO user_levels (user_id, current_level, current_xp, total_xp)
+                VALUES (?, 1, 0, 0)
+            ''', (user_id,))
+            current_level, current_xp, total_xp = 1, 0, 0
+        else:
+            current_level, current_xp, total_xp = result
+        
+        # Update XP
+        new_total_xp = total_xp + xp_earned
+        new_current_xp = current_xp + xp_earned
+        level_up = False
+        
+        # Check for level up with configurable multiplier
+        while new_current_xp >= self._calculate_xp_for_level(current_level):
+            new_current_xp -= self._calculate_xp_for_level(current_level)
+            current_level += 1
+            level_up = True
+        
+        # Update database
+        cursor.execute('''
+            UPDATE user_levels 
+            SET current_level = ?, 
+                current_xp = ?, 
+                total_xp = ?,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE user_id = ?
+        ''', (current_level, new_current_xp, new_total_xp, user_id))
+        
+        return LevelInfo(
+            level=current_level,
+            current_xp=new_current_xp,
+            total_xp=new_total_xp,
+            level_up=level_up,
+            xp_for_next=self._calculate_xp_for_level(current_level)
+        )
     
     def check_and_award_achievements(self, user_id: int) -> List[Achievement]:
         """Check and award achievements with improved performance"""
@@ -211,9 +210,7 @@ class GamificationService:
                 
                 for badge in badges:
                     # Award badge if not already awarded
-                    cursor.execute('''
-                        SELECT 1 FROM user_badges WHERE user_id = ? AND badge_id = ?
-                    ''', (user_id, badge['id']))
+                    cursor.execute(queries.HAS_BADGE, (user_id, badge['id']))
                     
                     if not cursor.fetchone():
                         cursor.execute('''
@@ -246,8 +243,8 @@ class GamificationService:
         try:
             if requirement_type == 'study_hours':
                 cursor.execute('''
-                    SELECT SUM(duration) / 60.0
-                    FROM study_logs
+                    SELECT SUM(total_duration) / 60.0
+                    FROM user_daily_stats
                     WHERE user_id = ?
                     AND date >= date('now', '-30 days')
                 ''', (user_id,))
@@ -255,38 +252,19 @@ class GamificationService:
                 return total_hours >= requirement_value
 
             elif requirement_type == 'streak_days':
-                cursor.execute('''
-                    WITH consecutive_days AS (
-                        SELECT date,
-                               date(date, '-' || ROW_NUMBER() OVER (ORDER BY date) || ' days') as group_date
-                        FROM (SELECT DISTINCT date FROM study_logs WHERE user_id = ?)
-                    )
-                    SELECT COUNT(*) as streak_length
-                    FROM (
-                        SELECT group_date, COUNT(*) as streak
-                        FROM consecutive_days
-                        GROUP BY group_date
-                        ORDER BY COUNT(*) DESC
-                        LIMIT 1
-                    )
-                ''', (user_id,))
+                cursor.execute(queries.LONGEST_STREAK, (user_id,))
                 max_streak = cursor.fetchone()[0] or 0
                 return max_streak >= requirement_value
 
             elif requirement_type == 'daily_questions':
-                cursor.execute('''
-                    SELECT COUNT(*)
-                    FROM question_stats
-                    WHERE user_id = ?
-                    AND date(last_practice) = date('now')
-                ''', (user_id,))
+                cursor.execute(queries.QUESTIONS_TODAY, (user_id,))
                 daily_questions = cursor.fetchone()[0] or 0
                 return daily_questions >= requirement_value
 
             elif requirement_type == 'performance_rating':
                 cursor.execute('''
-                    SELECT AVG(performance_rating)
-                    FROM study_logs
+                    SELECT SUM(rating_sum) * 1.0 / NULLIF(SUM(rating_count), 0)
+                    FROM user_daily_stats
                     WHERE user_id = ?
                     AND date >= date('now', '-7 days')
                 ''', (user_id,))
@@ -310,7 +288,7 @@ class GamificationService:
                 'all_time': "date('1970-01-01')"
             }.get(timeframe, "date('now', '-7 days')")
 
-            with db_transaction() as conn:
+            with read_snapshot() as conn:
                 cursor = conn.cursor()
                 cursor.execute(f'''
                     WITH UserStats AS (
@@ -320,12 +298,12 @@ class GamificationService:
                             ul.current_level,
                             ul.total_xp,
                             COUNT(DISTINCT sl.date) as study_days,
-                            SUM(sl.duration) / 60.0 as study_hours,
-                            COALESCE(AVG(sl.performance_rating), 0) as avg_performance,
+                            SUM(sl.total_duration) / 60.0 as study_hours,
+                            COALESCE(SUM(sl.rating_sum) * 1.0 / NULLIF(SUM(sl.rating_count), 0), 0) as avg_performance,
                             COUNT(DISTINCT ua.achievement_id) as achievements
                         FROM users u
                         JOIN user_levels ul ON u.id = ul.user_id
-                        LEFT JOIN study_logs sl ON u.id = sl.user_id AND sl.date >= {date_filter}
+                        LEFT JOIN user_daily_stats sl ON u.id = sl.user_id AND sl.date >= {date_filter}
                         LEFT JOIN user_achievements ua ON u.id = ua.user_id
                         GROUP BY u.id, u.username, ul.current_level, ul.total_xp
                     )
@@ -355,9 +333,7 @@ class GamificationService:
                 logger.warning(f"Bonus amount {bonus_amount} exceeds maximum {max_bonus}")
                 bonus_amount = max_bonus
 
-            with db_transaction() as conn:
-                cursor = conn.cursor()
-                
+            def work(cursor: sqlite3.Cursor):
                 # Log the bonus
                 cursor.execute('''
                     INSERT INTO xp_bonuses (user_id, amount, reason, awarded_at)
@@ -365,8 +341,10 @@ class GamificationService:
                 ''', (user_id, bonus_amount, reason))
 
                 # Update user XP
-                self.update_user_xp(user_id, bonus_amount)
-                return True
+                self._apply_xp(cursor, user_id, bonus_amount)
+
+            DatabaseWriter.wait(DatabaseWriter.get_instance().submit(work))
+            return True
 
         except Exception as e:
             logger.error(f"Error awarding bonus XP: {e}")
@@ -375,7 +353,7 @@ class GamificationService:
     def get_user_achievements_progress(self, user_id: int) -> Dict[str, Any]:
         """Get detailed achievement progress for user"""
         try:
-            with db_transaction() as conn:
+            with read_snapshot() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     WITH UserProgress AS (
@@ -390,15 +368,15 @@ class GamificationService:
                                 ELSE COALESCE(
                                     CASE a.requirement_type
                                         WHEN 'study_hours' THEN (
-                                            SELECT COALESCE(SUM(duration) / 60.0 / a.requirement_value * 100, 0)
-                                            FROM study_logs
+                                            SELECT COALESCE(SUM(total_duration) / 60.0 / a.requirement_value * 100, 0)
+                                            FROM user_daily_stats
                                             WHERE user_id = ?
                                         )
                                         WHEN 'streak_days' THEN (
                                             SELECT COALESCE(COUNT(*) * 100 / a.requirement_value, 0)
                                             FROM (
                                                 SELECT DISTINCT date
-                                                FROM study_logs
+                                                FROM user_daily_stats
                                                 WHERE user_id = ?
                                             )
                                         )
@@ -445,16 +423,16 @@ class GamificationService:
     def get_activity_summary(self, user_id: int, days: int = 30) -> Dict[str, Any]:
         """Get user activity summary with streaks and patterns"""
         try:
-            with db_transaction() as conn:
+            with read_snapshot() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     WITH daily_activity AS (
                         SELECT 
                             date,
-                            SUM(duration) / 60.0 as hours,
-                            AVG(performance_rating) as avg_performance,
-                            COUNT(*) as sessions
-                        FROM study_logs
+                            SUM(total_duration) / 60.0 as hours,
+                            SUM(rating_sum) * 1.0 / NULLIF(SUM(rating_count), 0) as avg_performance,
+                            SUM(session_count) as sessions
+                        FROM user_daily_stats
                         WHERE user_id = ? AND date >= date('now', ? || ' days')
                         GROUP BY date
                     )
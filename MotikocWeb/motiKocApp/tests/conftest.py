@@ -0,0 +1,96 @@
+# tests/conftest.py
+"""Shared test setup: the app directory on sys.path and a throwaway database"""
+import atexit
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+
+import pandas as pd
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+# Keep metrics exports and the slow-query log out of the working tree
+os.environ.setdefault('DB_METRICS_FILE', '')
+os.environ.setdefault('DB_SLOW_QUERY_LOG', '')
+
+from core import database  # noqa: E402
+
+# Point the pool, the writer and the migration lock at a temporary database
+_DB_DIR = tempfile.mkdtemp(prefix='motikoc-tests-')
+atexit.register(shutil.rmtree, _DB_DIR, ignore_errors=True)
+database.DATABASE_NAME = os.path.join(_DB_DIR, 'motikoc.db')
+database.DB_MIGRATION_LOCK_FILE = f'{database.DATABASE_NAME}.migrate.lock'
+
+_user_ids = itertools.count(1)
+
+
+@pytest.fixture(scope='session')
+def db():
+    """The core.database module with the test schema migrated"""
+    database.init_db()
+    return database
+
+
+@pytest.fixture
+def user_id(db):
+    """A fresh user row"""
+    name = f'user{next(_user_ids)}'
+    with db.db_transaction() as conn:
+        cursor = conn.execute(
+            '''INSERT INTO users (username, password, name, email, grade, study_type)
+               VALUES (?, ?, ?, ?, ?, ?)''',
+            (name, 'x', name, f'{name}@example.com', '12', 'sayisal')
+        )
+        return cursor.lastrowid
+
+
+
+PROGRAMS_CSV = os.path.join(APP_DIR, 'programs_data_with_links.csv')
+PROGRAMS_SNAPSHOT = os.path.join(APP_DIR, 'programs_data.parquet')
+
+
+@pytest.fixture
+def programs_csv(tmp_path):
+    """A 200-row copy of the programs CSV in a temporary directory"""
+    path = tmp_path / 'programs.csv'
+    pd.read_csv(PROGRAMS_CSV, nrows=200).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def catalog():
+    """The process-wide ProgramCatalog serving the shipped dataset, without hot reload"""
+    from features.university.data import ProgramCatalog
+
+    previous = ProgramCatalog._instance
+    ProgramCatalog._instance = ProgramCatalog(PROGRAMS_CSV, PROGRAMS_SNAPSHOT, reload_interval=0)
+    yield ProgramCatalog._instance
+    ProgramCatalog._instance = previous
+
+
+class FakeModel:
+    """Stands in for the Gemini model: records prompts and returns canned text"""
+
+    def __init__(self, text: str = '{}'):
+        self.text = text
+        self.prompts = []
+
+    def generate_content(self, prompt, stream=False):
+        self.prompts.append(prompt)
+        response = type('Response', (), {'text': self.text})()
+        return [response] if stream else response
+
+
+@pytest.fixture
+def recommender(catalog):
+    """A UniversityRecommender whose LLM calls go to a FakeModel"""
+    from features.university.recommender import UniversityRecommender
+
+    recommender = UniversityRecommender(api_key='test')
+    recommender.model = FakeModel()
+    return recommender
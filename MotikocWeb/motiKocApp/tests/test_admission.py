@@ -0,0 +1,56 @@
+# tests/test_admission.py
+"""Placement probabilities from the per-program log-normal cutoff model"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from features.university.admission import (
+    LABEL_NAMES, AdmissionModel, assess_programs, get_admission_model, normal_cdf,
+)
+
+
+@pytest.fixture(scope='module')
+def model(catalog):
+    return get_admission_model()
+
+
+def test_normal_cdf_matches_known_values():
+    values = normal_cdf(np.array([-1.96, 0.0, 1.0]))
+    np.testing.assert_allclose(values, [0.025, 0.5, 0.8413], atol=1e-3)
+
+
+def test_probability_falls_as_the_rank_gets_worse(model):
+    rows = np.flatnonzero(~np.isnan(model.mu))[:200]
+    better = model.probabilities(1_000, rows=rows)
+    worse = model.probabilities(500_000, rows=rows)
+    assert (better >= worse).all()
+    assert ((better >= 0) & (better <= 1)).all()
+
+
+def test_programs_without_history_are_unknown(model):
+    missing = np.flatnonzero(np.isnan(model.mu))
+    assert len(missing)
+    assessment = model.assess(50_000, rows=missing[:10])
+    assert np.isnan(assessment.probability).all()
+    assert set(assessment.label) == {'unknown'}
+
+
+def test_labels_follow_the_probability_thresholds():
+    labels = AdmissionModel.labels(np.array([0.95, 0.5, 0.2, 0.01, np.nan]))
+    assert labels.tolist() == ['safe', 'target', 'reach', 'unlikely', 'unknown']
+
+
+def test_rank_samples_average_their_probabilities(model):
+    rows = np.flatnonzero(~np.isnan(model.mu))[:50]
+    samples = [20_000, 40_000]
+    averaged = model.probabilities(samples, rows=rows)
+    expected = np.mean([model.probabilities(sample, rows=rows) for sample in samples], axis=0)
+    np.testing.assert_allclose(averaged, expected)
+
+
+def test_assess_programs_adds_display_columns(catalog):
+    df = catalog.snapshot().df.head(20)
+    assessed = assess_programs(df, 50_000)
+    assert list(assessed.index) == list(df.index)
+    assert set(assessed['Tercih Durumu']) <= set(LABEL_NAMES.values())
+    assert pd.api.types.is_float_dtype(assessed['Yerleşme Olasılığı'])
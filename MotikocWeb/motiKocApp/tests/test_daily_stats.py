@@ -0,0 +1,71 @@
+# tests/test_daily_stats.py
+"""user_daily_stats stays equal to an aggregate over study_logs through every change"""
+from core.database import db_read, db_transaction
+
+_ROLLUP_FROM_LOGS = '''
+    SELECT date, subject, COUNT(*), SUM(duration),
+           COALESCE(SUM(performance_rating), 0), COUNT(performance_rating),
+           SUM(COALESCE(performance_rating >= 4, 0))
+    FROM study_logs
+    WHERE user_id = ?
+    GROUP BY date, subject
+    ORDER BY date, subject
+'''
+
+_ROLLUP = '''
+    SELECT date, subject, session_count, total_duration, rating_sum, rating_count, success_count
+    FROM user_daily_stats
+    WHERE user_id = ?
+    ORDER BY date, subject
+'''
+
+
+def _assert_rollup_matches(user_id):
+    with db_read() as conn:
+        expected = [tuple(row) for row in conn.execute(_ROLLUP_FROM_LOGS, (user_id,))]
+        actual = [tuple(row) for row in conn.execute(_ROLLUP, (user_id,))]
+    assert actual == expected
+
+
+def _log(conn, user_id, subject, duration, date, rating):
+    return conn.execute(
+        '''INSERT INTO study_logs (user_id, subject, duration, date, performance_rating)
+           VALUES (?, ?, ?, ?, ?)''',
+        (user_id, subject, duration, date, rating)
+    ).lastrowid
+
+
+def test_inserts_accumulate_per_day_and_subject(db, user_id):
+    with db_transaction() as conn:
+        _log(conn, user_id, 'Matematik', 60, '2024-05-01', 5)
+        _log(conn, user_id, 'Matematik', 30, '2024-05-01', 2)
+        _log(conn, user_id, 'Fizik', 45, '2024-05-01', None)
+        _log(conn, user_id, 'Matematik', 20, '2024-05-02', 4)
+    _assert_rollup_matches(user_id)
+    with db_read() as conn:
+        row = conn.execute(
+            '''SELECT session_count, total_duration, success_count FROM user_daily_stats
+               WHERE user_id = ? AND date = '2024-05-01' AND subject = 'Matematik' ''',
+            (user_id,)
+        ).fetchone()
+    assert tuple(row) == (2, 90, 1)
+
+
+def test_updates_move_sessions_between_rows(db, user_id):
+    with db_transaction() as conn:
+        log_id = _log(conn, user_id, 'Kimya', 40, '2024-05-03', 3)
+        _log(conn, user_id, 'Kimya', 10, '2024-05-03', 5)
+        conn.execute(
+            "UPDATE study_logs SET subject = 'Biyoloji', date = '2024-05-04', performance_rating = 5 WHERE id = ?",
+            (log_id,)
+        )
+    _assert_rollup_matches(user_id)
+
+
+def test_deleting_the_last_session_removes_its_row(db, user_id):
+    with db_transaction() as conn:
+        log_id = _log(conn, user_id, 'Tarih', 25, '2024-05-05', 1)
+        conn.execute('DELETE FROM study_logs WHERE id = ?', (log_id,))
+    _assert_rollup_matches(user_id)
+    with db_read() as conn:
+        assert conn.execute(_ROLLUP, (user_id,)).fetchall() == []
@@ -0,0 +1,77 @@
+# tests/test_filter_engine.py
+"""Single-pass vectorized FilterCriteria evaluation, checked against plain pandas filters"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from features.university.filter_engine import (
+    RANK_COLUMN, SCORE_COLUMN, ProgramFilterEngine, filter_programs, get_filter_engine,
+)
+from features.university.recommender import FilterCriteria
+from features.university.search_index import fold_turkish
+
+
+@pytest.fixture(scope='module')
+def programs(catalog):
+    return catalog.snapshot().df
+
+
+@pytest.fixture(scope='module')
+def engine(catalog):
+    return get_filter_engine()
+
+
+def _ranked(df):
+    return df.sort_values(RANK_COLUMN, kind='stable', na_position='last')
+
+
+def test_range_filters_match_pandas(programs, engine):
+    criteria = FilterCriteria(min_ranking=10_000, max_ranking=50_000, min_score=300)
+    expected = programs[
+        programs[RANK_COLUMN].between(10_000, 50_000) & (programs[SCORE_COLUMN] >= 300)
+    ]
+    assert set(engine.select(criteria)) == set(expected.index)
+
+
+def test_city_and_score_type_filters_match_pandas(programs, engine):
+    criteria = FilterCriteria(cities=['İzmir'], score_types=['SAY'])
+    city = programs['Şehir'].map(lambda value: fold_turkish(str(value)) == 'izmir')
+    score_type = programs['Puan Türü'].map(lambda value: 'say' in fold_turkish(str(value)))
+    expected = programs[city & score_type]
+    assert len(expected)
+    assert set(engine.select(criteria)) == set(expected.index)
+
+
+def test_rows_are_ordered_by_rank_with_missing_last(programs, engine):
+    rows = engine.select(FilterCriteria(score_types=['TYT']))
+    ranks = programs[RANK_COLUMN].to_numpy()[rows]
+    present = ranks[~np.isnan(ranks)]
+    assert (np.diff(present) >= 0).all()
+    assert np.isnan(ranks[len(present):]).all()
+
+
+def test_limit_returns_the_best_ranked_prefix(engine):
+    criteria = FilterCriteria(score_types=['EA'])
+    assert engine.select(criteria, limit=25).tolist() == engine.select(criteria)[:25].tolist()
+
+
+def test_within_restricts_to_the_given_rows(engine):
+    within = np.arange(0, 500, dtype=np.int64)
+    rows = engine.select(FilterCriteria(score_types=['SAY']), within=within)
+    assert set(rows) <= set(within)
+
+
+def test_filter_programs_on_a_slice_keeps_its_rows(programs):
+    subset = programs[programs['Şehir'] == 'Ankara']
+    result = filter_programs(subset, FilterCriteria(max_ranking=100_000))
+    assert set(result.index) <= set(subset.index)
+    pd.testing.assert_frame_equal(result, _ranked(subset[subset[RANK_COLUMN] <= 100_000]))
+
+
+def test_scholarship_filter_reads_the_program_name():
+    engine = ProgramFilterEngine(pd.DataFrame({
+        'Program Adı': ['Hukuk (Burslu)', 'Hukuk (%50 İndirimli)', 'Hukuk (Ücretli)'],
+        RANK_COLUMN: [100.0, 200.0, 300.0],
+    }))
+    assert engine.select(FilterCriteria(scholarship_percentage=100)).tolist() == [0]
+    assert engine.select(FilterCriteria(scholarship_percentage=50)).tolist() == [1]
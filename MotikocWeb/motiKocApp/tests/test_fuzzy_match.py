@@ -0,0 +1,78 @@
+# tests/test_fuzzy_match.py
+"""Typo and suffix tolerant resolution of free text to canonical names"""
+import pytest
+
+from features.university.filter_engine import filter_programs
+from features.university.fuzzy_match import FuzzyMatcher, _ChoiceIndex, get_fuzzy_matcher
+from features.university.recommender import FilterCriteria
+
+
+@pytest.fixture(scope='module')
+def matcher(catalog):
+    return get_fuzzy_matcher()
+
+
+def _names(matches):
+    return [match.name for match in matches]
+
+
+def test_kpss_line_of_a_program_is_the_same_name():
+    index = _ChoiceIndex([
+        'Bilgisayar Programcılığı',
+        'Bilgisayar Programcılığı (%50 İndirimli)\nKPSS',
+        'Bilgisayar Programcılığı (Uzaktan Öğretim) KPSS',
+    ], strip_suffixes=True)
+    assert index.names == ['Bilgisayar Programcılığı']
+    assert 'kpss' not in index.vocabulary
+
+
+def test_university_names_keep_their_suffixes():
+    index = _ChoiceIndex(['ABC ÜNİVERSİTESİ (İSTANBUL)'], strip_suffixes=False)
+    assert index.names == ['ABC ÜNİVERSİTESİ (İSTANBUL)']
+
+
+def test_prefix_typo_and_stem_matches():
+    index = _ChoiceIndex(['Bilgisayar Mühendisliği', 'Yazılım Mühendisliği', 'Psikoloji'],
+                         strip_suffixes=True)
+    assert _names(index.resolve('bilgisyar müh')) == ['Bilgisayar Mühendisliği']
+    assert _names(index.resolve('psikolji')) == ['Psikoloji']
+    assert _names(index.resolve('yazılımcılık')) == ['Yazılım Mühendisliği']
+    assert index.resolve('müh')[0].score == 100.0
+
+
+def test_every_query_token_must_match():
+    index = _ChoiceIndex(['Bilgisayar Mühendisliği', 'Psikoloji'], strip_suffixes=True)
+    assert index.resolve('bilgisayar xqzw') == []
+    assert index.resolve('') == []
+
+
+def test_short_tokens_are_not_guessed():
+    index = _ChoiceIndex(['Tıp'], strip_suffixes=True)
+    assert _names(index.resolve('tip')) == ['Tıp']
+    assert index.resolve('tap') == []
+
+
+def test_equal_scores_prefer_the_shortest_name():
+    index = _ChoiceIndex(['Hukuk Fakültesi Hukuk', 'Hukuk'], strip_suffixes=True)
+    assert _names(index.resolve('hukuk')) == ['Hukuk', 'Hukuk Fakültesi Hukuk']
+
+
+def test_misspelled_university_resolves_on_the_snapshot(matcher):
+    matches = matcher.resolve('Üniversite', 'hacetepe')
+    assert _names(matches)[0] == 'HACETTEPE ÜNİVERSİTESİ'
+    assert matcher.resolve('Şehir', 'ankara') == []
+
+
+def test_no_kpss_variant_among_program_names(matcher):
+    assert not [name for name in matcher.choices['Program Adı'].names if 'KPSS' in name]
+
+
+def test_matcher_is_built_once_per_snapshot(catalog, matcher):
+    assert get_fuzzy_matcher() is matcher
+    assert isinstance(matcher, FuzzyMatcher)
+
+
+def test_filter_falls_back_to_fuzzy_names(catalog):
+    df = catalog.snapshot().df
+    rows = filter_programs(df, FilterCriteria(universities=['hacetepe']))
+    assert len(rows) and set(rows['Üniversite']) == {'HACETTEPE ÜNİVERSİTESİ'}
@@ -0,0 +1,91 @@
+# tests/test_hot_reload.py
+"""Background rebuild of the programs snapshot and its atomic swap"""
+import os
+
+import pandas as pd
+import pytest
+
+from features.university import data
+from features.university.data import ProgramCatalog
+from features.university.filter_engine import get_filter_engine
+
+
+@pytest.fixture
+def reloading(programs_csv, tmp_path, monkeypatch):
+    monkeypatch.setattr(data, 'PROGRAMS_RELOAD_SETTLE', 0.01)
+    catalog = ProgramCatalog(programs_csv, str(tmp_path / 'programs.parquet'), reload_interval=60)
+    catalog.snapshot()
+    return catalog
+
+
+def _shrink(path, rows=150):
+    pd.read_csv(path).head(rows).to_csv(path, index=False)
+
+
+def test_reload_swaps_in_the_changed_csv(reloading, programs_csv):
+    old = reloading.snapshot()
+    _shrink(programs_csv)
+    reloading.reload()
+    new = reloading.snapshot()
+    assert new is not old and new.source_hash != old.source_hash
+    assert len(old.df) == 200 and len(new.df) == 150
+
+
+def test_reloaded_snapshot_is_warmed_before_the_swap(reloading, programs_csv):
+    _shrink(programs_csv)
+    reloading.reload()
+    engine = reloading.snapshot().derived('filter_engine', lambda df: None)
+    assert engine is not None and engine.size == 150
+
+
+def test_pinned_run_keeps_its_snapshot(reloading, programs_csv):
+    with reloading.pinned() as pinned:
+        _shrink(programs_csv)
+        reloading.reload()
+        assert reloading.snapshot() is pinned
+        with reloading.pinned() as nested:
+            assert nested is pinned
+    assert reloading.snapshot() is not pinned
+
+
+def test_touched_but_unchanged_csv_is_not_swapped(reloading, programs_csv):
+    old = reloading.snapshot()
+    stat = os.stat(programs_csv)
+    os.utime(programs_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    reloading.reload()
+    assert reloading.snapshot() is old
+    # The new stat is remembered, so the next check does not rebuild again
+    assert reloading._loaded_stat == data._source_stat(programs_csv)
+
+
+def test_checks_wait_for_the_interval(reloading, programs_csv):
+    old = reloading.snapshot()
+    _shrink(programs_csv)
+    assert reloading.snapshot() is old
+    assert reloading._reload_thread is None
+
+
+def test_failed_reload_keeps_serving_the_old_snapshot(reloading, programs_csv, monkeypatch):
+    old = reloading.snapshot()
+
+    def fail(*args, **kwargs):
+        raise ValueError('broken csv')
+
+    monkeypatch.setattr(data, 'load_snapshot', fail)
+    _shrink(programs_csv)
+    reloading.reload()
+    assert reloading.snapshot() is old
+
+
+def test_deleted_csv_is_not_reloaded(reloading, programs_csv):
+    old = reloading.snapshot()
+    os.unlink(programs_csv)
+    reloading.reload()
+    assert reloading.snapshot() is old
+
+
+def test_without_reload_interval_the_csv_is_never_checked(catalog):
+    assert catalog.reload_interval == 0
+    catalog.reload()
+    assert catalog._reload_thread is None
+    assert get_filter_engine() is catalog.snapshot().derived('filter_engine', lambda df: None)
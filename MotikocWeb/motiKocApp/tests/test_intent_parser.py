@@ -0,0 +1,55 @@
+# tests/test_intent_parser.py
+"""Local intent parser fast path ahead of the LLM intent call"""
+import pytest
+
+from features.university.intent_parser import parse_intent
+
+
+@pytest.mark.parametrize('question, fields', [
+    ("İstanbul'da 50 bin sıralamanın altındaki bilgisayar mühendisliği",
+     {'programs': ['Bilgisayar Mühendisliği'], 'cities': ['İstanbul'], 'max_ranking': 50000}),
+    ("Ankara'da 400 puan üstü hukuk",
+     {'programs': ['Hukuk'], 'cities': ['Ankara'], 'min_score': 400.0}),
+    ('İngilizce vakıf üniversiteleri 200.000 TL altında',
+     {'university_types': ['VAKIF'], 'language_types': ['İngilizce'], 'max_fee': 200000.0}),
+    ('hacetepe tıp',
+     {'programs': ['Tıp'], 'universities': ['HACETTEPE ÜNİVERSİTESİ']}),
+])
+def test_questions_parse_to_criteria(catalog, question, fields):
+    parsed = parse_intent(question)
+    assert parsed.fields == fields
+    assert parsed.confidence == 1.0
+    assert parsed.unknown == []
+
+
+def test_score_type_phrase_starting_with_a_number(catalog):
+    # Regression: '2' never reached the phrase table, so '2 yıllık' stayed unexplained
+    parsed = parse_intent('2 yıllık bilgisayar programcılığı')
+    assert parsed.fields == {'programs': ['Bilgisayar Programcılığı'], 'score_types': ['TYT']}
+    assert parsed.confidence == 1.0
+
+
+def test_number_inside_a_phrase_is_not_a_bound(catalog):
+    parsed = parse_intent('2 yıllık bölümler 300 puan üstü')
+    assert parsed.fields['score_types'] == ['TYT']
+    assert parsed.fields['min_score'] == 300.0
+    assert 'max_ranking' not in parsed.fields and 'min_ranking' not in parsed.fields
+
+
+def test_open_question_has_low_confidence(catalog):
+    parsed = parse_intent('Bana gelecek vadeden meslekleri anlatır mısın?')
+    assert parsed.confidence < 0.8
+    assert parsed.unknown
+
+
+def test_confident_question_skips_the_llm(recommender, catalog):
+    df = catalog.snapshot().df
+    filtered, _ = recommender.process_question("Ankara'da 400 puan üstü hukuk", df)
+    assert recommender.model.prompts == []
+    assert recommender.last_criteria.min_score == 400.0
+    assert (filtered['Şehir'] == 'Ankara').all()
+
+
+def test_unclear_question_falls_back_to_the_llm(recommender, catalog):
+    recommender.process_question('Bana gelecek vadeden meslekleri anlatır mısın?', catalog.snapshot().df)
+    assert len(recommender.model.prompts) == 1
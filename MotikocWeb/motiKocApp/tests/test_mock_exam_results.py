@@ -0,0 +1,62 @@
+# tests/test_mock_exam_results.py
+"""mock_exam_subject_results is derived from mock_exams.subject_results by triggers"""
+import json
+
+from core.database import db_read, db_transaction
+
+
+def _add_exam(conn, user_id, subject_results):
+    return conn.execute(
+        '''INSERT INTO mock_exams (user_id, exam_type, exam_date, total_time, subject_results)
+           VALUES (?, 'TYT', '2024-05-01', 165, ?)''',
+        (user_id, subject_results)
+    ).lastrowid
+
+
+def _subject_rows(exam_id):
+    with db_read() as conn:
+        return {
+            row[0]: tuple(row[1:])
+            for row in conn.execute(
+                '''SELECT subject, correct, incorrect, empty, net
+                   FROM mock_exam_subject_results WHERE exam_id = ?''',
+                (exam_id,)
+            )
+        }
+
+
+def test_insert_explodes_subject_results(db, user_id):
+    with db_transaction() as conn:
+        exam_id = _add_exam(conn, user_id, json.dumps({
+            'Türkçe': {'correct': 30, 'incorrect': 8, 'empty': 2},
+            'Matematik': {'correct': 20},
+        }))
+    assert _subject_rows(exam_id) == {
+        'Türkçe': (30, 8, 2, 28.0),
+        'Matematik': (20, 0, 0, 20.0),
+    }
+
+
+def test_update_replaces_the_subject_rows(db, user_id):
+    with db_transaction() as conn:
+        exam_id = _add_exam(conn, user_id, json.dumps({'Fizik': {'correct': 5, 'incorrect': 4}}))
+        conn.execute(
+            'UPDATE mock_exams SET subject_results = ? WHERE id = ?',
+            (json.dumps({'Kimya': {'correct': 7}}), exam_id)
+        )
+    assert _subject_rows(exam_id) == {'Kimya': (7, 0, 0, 7.0)}
+
+
+def test_malformed_results_are_skipped_not_rejected(db, user_id):
+    with db_transaction() as conn:
+        broken = _add_exam(conn, user_id, 'not json')
+        partial = _add_exam(conn, user_id, json.dumps({'Biyoloji': 12, 'Tarih': {'correct': 3}}))
+    assert _subject_rows(broken) == {}
+    assert _subject_rows(partial) == {'Tarih': (3, 0, 0, 3.0)}
+
+
+def test_delete_clears_the_subject_rows(db, user_id):
+    with db_transaction() as conn:
+        exam_id = _add_exam(conn, user_id, json.dumps({'Coğrafya': {'correct': 4}}))
+        conn.execute('DELETE FROM mock_exams WHERE id = ?', (exam_id,))
+    assert _subject_rows(exam_id) == {}
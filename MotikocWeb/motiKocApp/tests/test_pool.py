@@ -0,0 +1,56 @@
+# tests/test_pool.py
+"""Lazy, elastic connection pool: growth, exhaustion, idle eviction and health checks"""
+import pytest
+
+from core.database import DatabaseConnectionPool, DatabaseError
+
+
+def test_pool_opens_connections_on_demand(db):
+    pool = DatabaseConnectionPool(max_connections=3, min_connections=0)
+    assert pool.stats()['size'] == 0
+
+    first = pool.get_connection()
+    second = pool.get_connection()
+    assert pool.stats()['size'] == 2
+    assert pool.stats()['in_use'] == 2
+
+    pool.return_connection(first)
+    assert pool.get_connection() is first
+    assert pool.stats()['created'] == 2
+    pool.return_connection(first)
+    pool.return_connection(second)
+
+
+def test_exhausted_pool_times_out(db):
+    pool = DatabaseConnectionPool(max_connections=1, min_connections=0)
+    conn = pool.get_connection()
+    with pytest.raises(DatabaseError):
+        pool.get_connection(timeout=0.05)
+    pool.return_connection(conn)
+    assert pool.get_connection(timeout=0.05) is conn
+    pool.return_connection(conn)
+
+
+def test_idle_connections_above_the_minimum_are_evicted(db):
+    pool = DatabaseConnectionPool(max_connections=4, min_connections=1, idle_ttl=0)
+    connections = [pool.get_connection() for _ in range(3)]
+    for conn in connections:
+        pool.return_connection(conn)
+    pool.evict_idle()
+    stats = pool.stats()
+    assert stats['size'] == 1
+    assert stats['evicted'] == 2
+
+
+def test_unhealthy_connection_is_replaced_on_checkout(db):
+    pool = DatabaseConnectionPool(max_connections=1, min_connections=0)
+    conn = pool.get_connection()
+    pool.return_connection(conn)
+    # Broken while idle, e.g. closed underneath the pool
+    conn.close()
+
+    replacement = pool.get_connection()
+    assert replacement is not conn
+    assert replacement.execute('SELECT 1').fetchone()[0] == 1
+    assert pool.stats()['failed_checks'] == 1
+    pool.return_connection(replacement)
@@ -0,0 +1,89 @@
+# tests/test_preference_list.py
+"""Expected-utility tercih list optimizer"""
+import itertools
+
+import numpy as np
+import pytest
+
+from features.university.preference_list import (
+    MAX_PREFERENCES, PreferenceProfile, build_preference_list, optimize_preference_list,
+    preference_table,
+)
+
+
+def _expected_utility(utility, probability, positions):
+    """EU of listing `positions` best-liked first, evaluated directly"""
+    value, reach = 0.0, 1.0
+    for i in sorted(positions, key=lambda i: -utility[i]):
+        value += reach * probability[i] * utility[i]
+        reach *= 1.0 - probability[i]
+    return value
+
+
+def test_dynamic_program_matches_brute_force():
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        utility = rng.uniform(0.1, 1.0, 8)
+        probability = rng.uniform(0.0, 1.0, 8)
+        positions, value = optimize_preference_list(utility, probability, size=3)
+        best = max(
+            _expected_utility(utility, probability, subset)
+            for h in range(4) for subset in itertools.combinations(range(8), h)
+        )
+        assert value == pytest.approx(best)
+        assert _expected_utility(utility, probability, positions) == pytest.approx(best)
+
+
+def test_list_is_ordered_best_liked_first():
+    utility = np.array([0.2, 0.9, 0.5, 0.7])
+    probability = np.array([0.9, 0.1, 0.5, 0.3])
+    positions, _ = optimize_preference_list(utility, probability, size=4)
+    assert list(utility[positions]) == sorted(utility[positions], reverse=True)
+
+
+def test_empty_candidates_give_an_empty_list():
+    positions, value = optimize_preference_list(np.array([]), np.array([]))
+    assert len(positions) == 0 and value == 0.0
+
+
+@pytest.fixture(scope='module')
+def every_program(catalog):
+    return build_preference_list(50_000, PreferenceProfile(prestige=1.0))
+
+
+def test_list_has_at_most_24_programs(every_program):
+    assert 0 < len(every_program.rows) <= MAX_PREFERENCES
+    assert 0 < every_program.placement_probability <= 1
+
+
+def test_each_program_is_listed_once(catalog):
+    # Regression: '...\nKPSS' rows repeat a program under the same YÖP code
+    codes = catalog.snapshot().df['YÖP']
+    duplicated = np.flatnonzero(codes.duplicated(keep=False).to_numpy())
+    preferences = build_preference_list(
+        1_500_000, PreferenceProfile(prestige=1.0), within=duplicated)
+    listed = codes.to_numpy()[preferences.rows]
+    assert len(listed) > 1
+    assert len(set(listed)) == len(listed)
+
+
+def test_profile_limits_the_candidates(catalog):
+    profile = PreferenceProfile(programs={'Hukuk': 1.0}, cities={'Ankara': 0.5}, score_types=['EA'])
+    preferences = build_preference_list(30_000, profile)
+    df = catalog.snapshot().df.iloc[preferences.rows]
+    assert len(df)
+    assert df['Program Adı'].str.contains('Hukuk').all()
+    assert (df['Puan Türü'] == 'EA').all()
+
+
+def test_within_restricts_the_rows(catalog):
+    within = np.arange(0, 2_000)
+    preferences = build_preference_list(100_000, PreferenceProfile(prestige=1.0), within=within)
+    assert len(preferences.rows)
+    assert set(preferences.rows) <= set(within)
+
+
+def test_preference_table_numbers_the_entries(every_program):
+    table = preference_table(every_program)
+    assert table['Tercih Sırası'].tolist() == list(range(1, len(table) + 1))
+    assert table['Bu Tercihe Yerleşme'].sum() == pytest.approx(every_program.placement_probability)
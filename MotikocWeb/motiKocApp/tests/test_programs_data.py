@@ -0,0 +1,88 @@
+# tests/test_programs_data.py
+"""Typed Parquet snapshot of the programs dataset and its process-wide catalog"""
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from features.university import data
+from features.university.data import (
+    ProgramCatalog, clean_programs, get_programs, load_snapshot, parse_quota, parse_turkish_number,
+)
+
+
+def test_parse_turkish_number():
+    parsed = parse_turkish_number(pd.Series(['87.500 TL', '77.270,9 TL', 'Ücretsiz', None]))
+    assert parsed.tolist()[:2] == [87500.0, 77270.9]
+    assert parsed.iloc[2:].isna().all()
+
+
+def test_parse_quota_adds_the_school_first_quota():
+    parsed = parse_quota(pd.Series(['50 + 2', '60', '', None]))
+    assert parsed.tolist()[:2] == [52.0, 60.0]
+    assert parsed.iloc[2:].isna().all()
+
+
+def test_clean_programs_types_numeric_columns():
+    df = clean_programs(pd.DataFrame({
+        'Program Adı': ['  Tıp  '],
+        'Kontenjan 2024': ['100 + 5'],
+        'Başarı Sırası 2024': ['1234'],
+        'Ücret (KDV Hariç)': ['1.250.000 TL'],
+    }))
+    assert df.loc[0, 'Program Adı'] == 'Tıp'
+    assert df.loc[0, 'Kontenjan 2024'] == 105.0
+    assert df['Başarı Sırası 2024'].dtype == 'float64'
+    assert df.loc[0, 'Ücret (KDV Hariç)'] == 1250000.0
+
+
+def test_snapshot_is_built_once_and_reused(programs_csv, tmp_path, monkeypatch):
+    snapshot_path = str(tmp_path / 'programs.parquet')
+    first = load_snapshot(programs_csv, snapshot_path)
+    assert os.path.exists(snapshot_path)
+    assert len(first.df) == 200
+
+    def fail(*args, **kwargs):
+        raise AssertionError('snapshot rebuilt')
+
+    monkeypatch.setattr(data, 'build_snapshot', fail)
+    second = load_snapshot(programs_csv, snapshot_path)
+    assert second.source_hash == first.source_hash
+    pd.testing.assert_frame_equal(second.df, first.df)
+
+
+def test_snapshot_is_rebuilt_when_the_csv_changes(programs_csv, tmp_path):
+    snapshot_path = str(tmp_path / 'programs.parquet')
+    first = load_snapshot(programs_csv, snapshot_path)
+    pd.read_csv(programs_csv).head(50).to_csv(programs_csv, index=False)
+
+    second = load_snapshot(programs_csv, snapshot_path)
+    assert second.source_hash != first.source_hash
+    assert len(second.df) == 50
+
+
+def test_snapshot_of_an_older_format_is_rebuilt(programs_csv, tmp_path, monkeypatch):
+    snapshot_path = str(tmp_path / 'programs.parquet')
+    load_snapshot(programs_csv, snapshot_path)
+    monkeypatch.setattr(data, 'SNAPSHOT_FORMAT', data.SNAPSHOT_FORMAT + '-next')
+
+    load_snapshot(programs_csv, snapshot_path)
+    metadata = pq.read_schema(snapshot_path).metadata
+    assert metadata[b'motikoc.format'] == data.SNAPSHOT_FORMAT.encode()
+
+
+def test_catalog_shares_one_dataframe(catalog):
+    assert ProgramCatalog.get_instance() is catalog
+    assert get_programs() is get_programs()
+
+
+def test_derived_structures_are_built_once_per_snapshot(catalog):
+    calls = []
+
+    def builder(df):
+        calls.append(len(df))
+        return object()
+
+    snapshot = catalog.snapshot()
+    assert snapshot.derived('test.builder', builder) is snapshot.derived('test.builder', builder)
+    assert calls == [len(snapshot.df)]
@@ -0,0 +1,118 @@
+# tests/test_refinement.py
+"""Follow-up questions that narrow or replace the current answer, with undo/redo"""
+import json
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from features.university.filter_engine import get_filter_engine
+from features.university.recommender import FilterCriteria
+from features.university.refinement import (
+    MAX_REFINEMENT_STEPS, RefinementDelta, RefinementSession, RefinementStep, parse_refinement,
+    refine,
+)
+
+
+@pytest.fixture
+def start(catalog):
+    criteria = FilterCriteria(programs=['Bilgisayar Mühendisliği'])
+    return RefinementStep.from_rows('bilgisayar mühendisliği', criteria,
+                                    get_filter_engine().select(criteria))
+
+
+def _rows(criteria):
+    return set(get_filter_engine().select(criteria).tolist())
+
+
+def test_follow_ups_parse_to_deltas(catalog):
+    assert parse_refinement('sadece devlet olanlar') == RefinementDelta(
+        include={'university_types': ['DEVLET']})
+    assert parse_refinement('İstanbul dışı') == RefinementDelta(exclude={'cities': ['İstanbul']})
+    assert parse_refinement('vakıf olmayanlar') == RefinementDelta(
+        exclude={'university_types': ['VAKIF']})
+    assert parse_refinement('Ankara ve İzmir').include['cities'] == ['Ankara', 'İzmir']
+    assert parse_refinement('bunu bana anlatır mısın') is None
+
+
+def test_bitset_round_trips_the_rows(start):
+    assert start.count == len(start.rows())
+    assert set(start.rows().tolist()) == _rows(start.criteria)
+    assert len(start.bits) == -(-len(start.mask()) // 8)
+
+
+def test_narrowing_filters_within_the_current_rows(start):
+    step = refine(start, parse_refinement('sadece devlet olanlar'), 'sadece devlet olanlar')
+    expected = _rows(replace(start.criteria, university_types=['DEVLET']))
+    assert 0 < step.count < start.count
+    assert set(step.rows().tolist()) == expected
+    assert step.criteria.university_types == ['DEVLET']
+
+
+def test_exclusion_removes_rows_and_is_kept_for_later_steps(start):
+    step = refine(start, parse_refinement('İstanbul dışı'), 'İstanbul dışı')
+    istanbul = _rows(replace(start.criteria, cities=['İstanbul']))
+    assert istanbul and not istanbul & set(step.rows().tolist())
+    assert step.count == start.count - len(istanbul)
+    assert step.excluded == {'cities': ('İstanbul',)}
+
+    # A later re-filter of the whole data keeps excluding İstanbul
+    wider = refine(step, RefinementDelta(include={'programs': ['Yazılım Mühendisliği']}), 'yazılım')
+    assert not istanbul & set(wider.rows().tolist())
+
+
+def test_replacing_a_value_refilters_the_whole_snapshot(start):
+    ankara = refine(start, parse_refinement("Ankara'dakiler"), "Ankara'dakiler")
+    izmir = refine(ankara, RefinementDelta(include={'cities': ['İzmir']}), 'İzmir')
+    assert set(izmir.rows().tolist()) == _rows(replace(start.criteria, cities=['İzmir']))
+
+
+def test_manual_filters_apply_on_a_refilter(start):
+    ankara = refine(start, RefinementDelta(include={'cities': ['Ankara']}), 'Ankara')
+    manual = FilterCriteria(university_types=['DEVLET'])
+    izmir = refine(ankara, RefinementDelta(include={'cities': ['İzmir']}), 'İzmir', manual)
+    expected = _rows(replace(start.criteria, cities=['İzmir'], university_types=['DEVLET']))
+    assert set(izmir.rows().tolist()) == expected
+
+
+def test_undo_redo_and_dropping_undone_steps(start):
+    session = RefinementSession()
+    session.reset(start)
+    assert not session.can_undo and not session.can_redo
+    second = replace(start, question='second')
+    session.push(second)
+    assert session.undo() is start and session.can_redo
+    assert session.redo() is second and not session.can_redo
+
+    session.undo()
+    third = replace(start, question='third')
+    session.push(third)
+    assert session.steps == [start, third]
+
+
+def test_stack_keeps_the_latest_steps(start):
+    session = RefinementSession()
+    for i in range(MAX_REFINEMENT_STEPS + 5):
+        session.push(replace(start, question=str(i)))
+    assert len(session.steps) == MAX_REFINEMENT_STEPS
+    assert session.current.question == str(MAX_REFINEMENT_STEPS + 4)
+
+
+def test_refine_question_summarizes_the_change(recommender, start):
+    step, response = recommender.refine_question('sadece devlet olanlar', start)
+    assert step is not None and step.response == response
+    assert response.startswith(f"Önceki {start.count} sonuç {step.count} sonuca güncellendi")
+    assert recommender.model.prompts == []
+
+
+def test_refine_question_falls_back_to_the_llm(recommender, start):
+    recommender.model.text = json.dumps({'tercih_edilen_sehirler': ['Ankara']})
+    step, _ = recommender.refine_question('bunu bana anlatır mısın', start)
+    assert len(recommender.model.prompts) == 1
+    assert set(step.rows().tolist()) == _rows(replace(start.criteria, cities=['Ankara']))
+
+
+def test_refine_question_rejects_an_answer_from_an_older_snapshot(recommender, start):
+    stale = replace(start, source_hash='older')
+    step, response = recommender.refine_question('sadece devlet olanlar', stale)
+    assert step is None and 'güncellendi' in response
@@ -0,0 +1,47 @@
+# tests/test_schema.py
+"""Versioned schema migrations and the once-per-process init_db()"""
+import sqlite3
+
+from core import database
+from core.database import SCHEMA_MIGRATIONS, SCHEMA_VERSION, init_db, schema_fingerprint
+
+
+def _connect():
+    return sqlite3.connect(database.DATABASE_NAME)
+
+
+def test_init_db_records_every_migration(db):
+    conn = _connect()
+    try:
+        assert conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION
+        rows = conn.execute('SELECT version, name, fingerprint FROM schema_migrations ORDER BY version').fetchall()
+    finally:
+        conn.close()
+    assert [(version, name) for version, name, _ in rows] == [
+        (version, name) for version, name, _ in SCHEMA_MIGRATIONS
+    ]
+    assert all(fingerprint == schema_fingerprint(version) for version, _, fingerprint in rows)
+
+
+def test_init_db_is_a_flag_check_once_migrated(db, monkeypatch):
+    def fail():
+        raise AssertionError('migrations ran again')
+
+    monkeypatch.setattr(database, '_run_migrations', fail)
+    init_db()
+
+
+def test_run_migrations_skips_an_up_to_date_schema(db, monkeypatch):
+    applied = []
+    monkeypatch.setattr(database, 'SCHEMA_MIGRATIONS', [
+        (version, name, lambda cursor, version=version: applied.append(version))
+        for version, name, _ in SCHEMA_MIGRATIONS
+    ])
+    database._run_migrations()
+    assert applied == []
+
+
+def test_fingerprint_covers_the_migration_history():
+    fingerprints = {schema_fingerprint(version) for version, _, _ in SCHEMA_MIGRATIONS}
+    assert len(fingerprints) == len(SCHEMA_MIGRATIONS)
+    assert schema_fingerprint(SCHEMA_VERSION) == schema_fingerprint()
@@ -0,0 +1,102 @@
+# tests/test_score_rank.py
+"""Score -> rank curves and the mock exam rank estimates built on them"""
+import json
+
+import numpy as np
+import pytest
+
+from features.performance.analytics import PerformanceAnalytics
+from features.university.score_rank import (
+    BASE_SCORE, ScoreRankCurve, get_score_rank_curves, isotonic_decreasing, placement_scores,
+)
+
+
+@pytest.fixture(scope='module')
+def curve():
+    scores = np.linspace(200.0, 400.0, 201)
+    return ScoreRankCurve(scores, 1e6 * np.exp(-0.02 * (scores - 200.0)))
+
+
+def test_isotonic_fit_pools_violators():
+    fitted = isotonic_decreasing(np.array([5.0, 6.0, 3.0, 4.0, 1.0]), np.ones(5))
+    assert fitted.tolist() == [5.5, 5.5, 3.5, 3.5, 1.0]
+    assert (np.diff(fitted) <= 0).all()
+
+
+def test_curve_reproduces_its_points(curve):
+    np.testing.assert_allclose(curve.ranks(np.array([250.0, 300.0])),
+                               1e6 * np.exp(-0.02 * np.array([50.0, 100.0])), rtol=1e-3)
+
+
+def test_scores_above_the_best_cutoff_are_not_clamped(curve):
+    # Regression: every score above the fitted range used to read as its top rank
+    top, above, far_above = curve.ranks(np.array([400.0, 420.0, 480.0]))
+    assert far_above < above < top
+    assert above == pytest.approx(top * np.exp(-0.02 * 20.0), rel=1e-2)
+
+
+def test_scores_below_the_worst_cutoff_are_extrapolated(curve):
+    bottom, below = curve.ranks(np.array([200.0, 180.0]))
+    assert below > bottom
+
+
+def test_ranks_are_floored_at_one_and_keep_nan(curve):
+    best, missing = curve.ranks(np.array([5000.0, np.nan]))
+    assert best == 1.0
+    assert np.isnan(missing)
+
+
+def test_dataset_curves_are_monotone(catalog):
+    curves = get_score_rank_curves()
+    scores = np.arange(150.0, 560.0, 5.0)
+    for score_type in ('TYT', 'SAY', 'EA'):
+        ranks = curves.ranks(score_type, scores)
+        assert not np.isnan(ranks).any()
+        assert (np.diff(ranks) <= 0).all()
+
+
+def test_placement_scores_weight_tyt_and_field_nets():
+    assert placement_scores([120.0])[0] == pytest.approx(BASE_SCORE + 400.0)
+    assert placement_scores([120.0], [80.0])[0] == pytest.approx(BASE_SCORE + 400.0)
+    assert placement_scores([60.0], [40.0], obp=50.0)[0] == pytest.approx(BASE_SCORE + 80.0 + 120.0 + 50.0)
+
+
+def _add_exam(db, user_id, exam_type, exam_date, subjects):
+    with db.db_transaction() as conn:
+        conn.execute(
+            '''INSERT INTO mock_exams (user_id, exam_type, exam_date, total_time, subject_results)
+               VALUES (?, ?, ?, 180, ?)''',
+            (user_id, exam_type, exam_date, json.dumps(subjects))
+        )
+
+
+def test_mock_exams_get_a_score_type_and_rank(db, catalog, user_id):
+    _add_exam(db, user_id, 'TYT', '2024-03-01', {'Türkçe': {'correct': 30}, 'Matematik': {'correct': 25}})
+    _add_exam(db, user_id, 'AYT', '2024-03-02', {
+        'Edebiyat': {'correct': 20}, 'Tarih': {'correct': 8}, 'Matematik': {'correct': 25},
+    })
+    data = PerformanceAnalytics(user_id)._get_mock_exam_data()
+    by_type = {exam['exam_type']: exam for exam in data['exams']}
+    assert by_type['TYT']['score_type'] == 'TYT'
+    assert by_type['AYT']['score_type'] == 'EA'
+    assert all(exam['rank'] > 0 for exam in data['exams'])
+
+
+def test_one_failing_score_type_does_not_stop_the_others(monkeypatch, caplog):
+    from features.performance import analytics
+
+    def estimate(score_type, scores):
+        if score_type == 'TYT':
+            raise ValueError('no curve')
+        return np.full(len(scores), 1234.0)
+
+    monkeypatch.setattr(analytics, 'estimate_ranks', estimate)
+    exams = [
+        {'id': 1, 'exam_type': 'TYT', 'exam_date': '2024-01-01'},
+        {'id': 2, 'exam_type': 'AYT', 'exam_date': '2024-01-02'},
+    ]
+    totals = {1: {'net': 80.0}, 2: {'net': 50.0, 'subjects': 'Matematik|Fizik'}}
+    PerformanceAnalytics.__new__(PerformanceAnalytics)._estimate_exam_ranks(exams, totals)
+    assert 'rank' not in exams[0]
+    assert exams[1]['rank'] == 1234
+    assert 'Error estimating TYT ranks' in caplog.text
@@ -0,0 +1,69 @@
+# tests/test_search_index.py
+"""Turkish-aware inverted token index over the program text columns"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from features.university.search_index import (
+    ProgramTokenIndex, fold_turkish, intersect, program_languages, tokenize, union,
+)
+
+
+@pytest.fixture
+def index():
+    return ProgramTokenIndex(pd.DataFrame({
+        'Program Adı': ['Bilgisayar Mühendisliği (İngilizce)', 'Bilgisayar Programcılığı',
+                        'Tıp', 'Makine Mühendisliği'],
+        'Üniversite': ['ANKARA ÜNİVERSİTESİ', 'ANKARA MEDİPOL ÜNİVERSİTESİ',
+                       'İSTANBUL ÜNİVERSİTESİ', 'ISPARTA UYGULAMALI BİLİMLER ÜNİVERSİTESİ'],
+        'Fakülte': ['Mühendislik Fakültesi', 'Meslek Yüksekokulu', 'Tıp Fakültesi',
+                    'Teknoloji Fakültesi'],
+        'Şehir': ['Ankara', 'Ankara', 'İstanbul', 'Isparta'],
+    }))
+
+
+def test_fold_turkish_handles_dotted_and_dotless_i():
+    assert fold_turkish('İSTANBUL') == fold_turkish('Istanbul') == fold_turkish('ıstanbul') == 'istanbul'
+    assert fold_turkish('Mühendisliği') == 'muhendisligi'
+    assert tokenize('Bilgisayar Müh. (İngilizce)') == ['bilgisayar', 'muh', 'ingilizce']
+
+
+def test_program_languages_reads_the_name_suffix():
+    languages = program_languages(pd.Series(['Tıp (İngilizce)', 'Tıp', 'İşletme (Almanca)']))
+    assert languages.iloc[0] == 'İngilizce'
+    assert pd.isna(languages.iloc[1])
+    assert languages.iloc[2] == 'Almanca'
+
+
+def test_intersect_and_union_of_sorted_row_ids():
+    a = np.array([1, 3, 5, 7], dtype=np.int32)
+    b = np.array([3, 4, 5], dtype=np.int32)
+    assert intersect([a, b]).tolist() == [3, 5]
+    assert union([a, b]).tolist() == [1, 3, 4, 5, 7]
+    assert intersect([]).tolist() == []
+
+
+def test_city_matches_regardless_of_case_and_dots(index):
+    assert index.search({'Şehir': ['istanbul']}).tolist() == [2]
+    assert index.search({'Şehir': ['ISPARTA']}).tolist() == [3]
+
+
+def test_last_word_of_a_phrase_may_be_unfinished(index):
+    assert index.search({'Program Adı': ['bilgisayar müh']}).tolist() == [0]
+    assert index.search({'Program Adı': ['mühendisliği']}).tolist() == [0, 3]
+
+
+def test_whole_university_name_does_not_match_longer_names(index):
+    assert index.search({'Üniversite': ['Ankara Üniversitesi']}).tolist() == [0]
+    assert index.search({'Üniversite': ['Ankara']}).tolist() == [0, 1]
+
+
+def test_and_across_columns_or_within_a_column(index):
+    rows = index.search({'Şehir': ['Ankara', 'İstanbul'], 'Fakülte': ['fakültesi']})
+    assert rows.tolist() == [0, 2]
+    assert index.search({'Şehir': []}) is None
+    assert index.search({'Şehir': ['İzmir']}).tolist() == []
+
+
+def test_as_mask_has_one_flag_per_row(index):
+    assert index.as_mask(np.array([1, 3])).tolist() == [False, True, False, True]
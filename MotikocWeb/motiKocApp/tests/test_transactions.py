@@ -0,0 +1,56 @@
+# tests/test_transactions.py
+"""Ambient transaction propagation: nested db_transaction calls share one connection"""
+import pytest
+
+from core.database import DatabaseConnectionPool, DatabaseError, current_connection, db_read, db_transaction
+
+
+def _goal_titles(user_id):
+    with db_read() as conn:
+        return [row[0] for row in conn.execute(
+            'SELECT title FROM goals WHERE user_id = ? ORDER BY id', (user_id,))]
+
+
+def _add_goal(conn, user_id, title):
+    conn.execute(
+        'INSERT INTO goals (user_id, title, deadline) VALUES (?, ?, ?)',
+        (user_id, title, '2030-01-01')
+    )
+
+
+def test_nested_transaction_reuses_the_outer_connection(db):
+    pool = DatabaseConnectionPool.get_instance()
+    with db_transaction() as outer:
+        in_use = pool.stats()['in_use']
+        with db_transaction() as inner:
+            assert inner is outer
+            assert current_connection() is outer
+            assert pool.stats()['in_use'] == in_use
+    assert current_connection() is None
+
+
+def test_failed_nested_transaction_rolls_back_only_its_savepoint(db, user_id):
+    with db_transaction() as conn:
+        _add_goal(conn, user_id, 'kept')
+        with pytest.raises(DatabaseError):
+            with db_transaction() as inner:
+                _add_goal(inner, user_id, 'discarded')
+                raise ValueError('boom')
+    assert _goal_titles(user_id) == ['kept']
+
+
+def test_outer_failure_discards_committed_savepoints(db, user_id):
+    with pytest.raises(DatabaseError):
+        with db_transaction() as conn:
+            with db_transaction() as inner:
+                _add_goal(inner, user_id, 'nested')
+            raise ValueError('boom')
+    assert _goal_titles(user_id) == []
+
+
+def test_reads_inside_a_transaction_see_its_uncommitted_writes(db, user_id):
+    with db_transaction() as conn:
+        _add_goal(conn, user_id, 'pending')
+        with db_read() as reader:
+            assert reader is conn
+        assert _goal_titles(user_id) == ['pending']
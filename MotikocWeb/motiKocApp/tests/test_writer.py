@@ -0,0 +1,96 @@
+# tests/test_writer.py
+"""Single-writer queue with group commit, and the process write lock it shares"""
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from core import database
+from core.database import DatabaseError, DatabaseManager, DatabaseWriter, pooled_connection
+
+
+def _lock_is_free() -> bool:
+    """Whether another thread can take the (re-entrant) process write lock"""
+    acquired = []
+
+    def probe():
+        acquired.append(database._write_lock.acquire(timeout=1))
+        if acquired[0]:
+            database._write_lock.release()
+
+    thread = threading.Thread(target=probe)
+    thread.start()
+    thread.join()
+    return acquired[0]
+
+
+def _mood_notes(user_id):
+    return [row[0] for row in DatabaseManager.read_query(
+        'SELECT notes FROM mood_logs WHERE user_id = ? ORDER BY id', (user_id,), fetch_all=True)]
+
+
+def _log_mood(user_id, notes):
+    return DatabaseWriter.get_instance().execute(
+        "INSERT INTO mood_logs (user_id, date, mood, stress_level, notes) VALUES (?, date('now'), 3, 3, ?)",
+        (user_id, notes)
+    )
+
+
+def test_concurrent_writes_all_commit(db, user_id):
+    futures = [_log_mood(user_id, f'note {i}') for i in range(20)]
+    results = [DatabaseWriter.wait(future) for future in futures]
+    assert all(result.rowcount == 1 for result in results)
+    assert len({result.lastrowid for result in results}) == 20
+    assert _mood_notes(user_id) == [f'note {i}' for i in range(20)]
+
+
+def test_failing_write_does_not_fail_its_batch(db, user_id):
+    good = _log_mood(user_id, 'good')
+    bad = DatabaseWriter.get_instance().execute('INSERT INTO no_such_table VALUES (1)')
+    after = _log_mood(user_id, 'after')
+    DatabaseWriter.wait(good)
+    DatabaseWriter.wait(after)
+    with pytest.raises(DatabaseError):
+        DatabaseWriter.wait(bad)
+    assert _mood_notes(user_id) == ['good', 'after']
+
+
+def test_write_abandoned_while_queued_is_never_applied(db, user_id):
+    writer = DatabaseWriter.get_instance()
+    database._write_lock.acquire()
+    try:
+        blocked = _log_mood(user_id, 'blocked')
+        # Let the writer take the first batch and block on the lock
+        time.sleep(writer.batch_window * 10)
+        late = _log_mood(user_id, 'late')
+        with pytest.raises(DatabaseError, match='not applied'):
+            DatabaseWriter.wait(late, timeout=0.05)
+    finally:
+        database._write_lock.release()
+    DatabaseWriter.wait(blocked)
+    DatabaseWriter.wait(_log_mood(user_id, 'next'))
+    assert _mood_notes(user_id) == ['blocked', 'next']
+
+
+def test_transaction_releases_the_write_lock_on_error(db, user_id):
+    with pooled_connection() as conn:
+        with pytest.raises(sqlite3.IntegrityError):
+            with conn.transaction():
+                conn.execute('INSERT INTO user_levels (user_id) VALUES (?)', (user_id,))
+                conn.execute('INSERT INTO user_levels (user_id) VALUES (?)', (user_id,))
+        assert _lock_is_free()
+    rows = DatabaseManager.read_query(
+        'SELECT COUNT(*) FROM user_levels WHERE user_id = ?', (user_id,))
+    assert rows[0] == 0
+
+
+def test_legacy_cursor_writes_do_not_take_the_write_lock(db, user_id):
+    with pooled_connection() as conn:
+        with pytest.raises(sqlite3.IntegrityError):
+            cursor = conn.cursor()
+            cursor.execute('INSERT INTO user_levels (user_id) VALUES (?)', (user_id,))
+            cursor.execute('INSERT INTO user_levels (user_id) VALUES (?)', (user_id,))
+        assert _lock_is_free()
+        conn.rollback()
+    DatabaseWriter.wait(_log_mood(user_id, 'unblocked'), timeout=1)
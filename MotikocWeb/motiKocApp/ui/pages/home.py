@@ -10,6 +10,7 @@ from ..components.cards import Card, AlertCard, StatCard
 from services.ai_service import AIService
 from services.gamification import GamificationService, Achievement, LevelInfo
 from core.database import DatabaseManager, db_transaction, DatabaseError
+from core import queries
 
 T = TypeVar('T', bound=Dict[str, Any])
 
@@ -98,17 +99,17 @@ class HomePage:
             study_stats_query = cast(Optional[Row], self.db_manager.execute_query('''
                 SELECT 
                     COUNT(DISTINCT date) as study_days,
-                    COALESCE(SUM(duration), 0) as total_minutes,
-                    COALESCE(AVG(duration), 0) as avg_duration
-                FROM study_logs 
+                    COALESCE(SUM(total_duration), 0) as total_minutes,
+                    COALESCE(SUM(total_duration) * 1.0 / SUM(session_count), 0) as avg_duration
+                FROM user_daily_stats 
                 WHERE user_id = ?
             ''', (self.user_id,), fetch_all=False))
             
             study_stats = self._row_to_dict(study_stats_query) if study_stats_query else {}
 
             subject_distribution_query = cast(Optional[List[Row]], self.db_manager.execute_query('''
-                SELECT subject, COALESCE(SUM(duration), 0) as duration
-                FROM study_logs
+                SELECT subject, COALESCE(SUM(total_duration), 0) as duration
+                FROM user_daily_stats
                 WHERE user_id = ?
                 GROUP BY subject
             ''', (self.user_id,), fetch_all=True))
@@ -189,11 +190,8 @@ class HomePage:
     def _get_daily_tasks(self) -> List[TaskInfo]:
         """Get user's daily tasks from database"""
         try:
-            tasks_query = cast(Optional[List[Row]], self.db_manager.execute_query('''
-                SELECT * FROM daily_tasks
-                WHERE user_id = ? AND date_created = date('now')
-                ORDER BY completed ASC, task_type ASC
-            ''', (self.user_id,), fetch_all=True))
+            tasks_query = cast(Optional[List[Row]], self.db_manager.execute_query(
+                queries.DAILY_TASKS, (self.user_id,), fetch_all=True))
             
             if not tasks_query:
                 return []
@@ -256,13 +254,11 @@ class HomePage:
             return
 
         try:
+            # Task update and XP awards share one connection and commit together
             with db_transaction() as conn:
                 # Get task details
-                task_query = cast(Optional[Row], self.db_manager.execute_query('''
-                    SELECT xp_reward, task_type, description
-                    FROM daily_tasks
-                    WHERE id = ? AND user_id = ? AND completed = FALSE
-                ''', (task_id, self.user_id), fetch_all=False))
+                task_query = cast(Optional[Row], self.db_manager.execute_query(
+                    queries.OPEN_DAILY_TASK, (task_id, self.user_id), fetch_all=False))
 
                 task_dict = self._row_to_dict(task_query)
                 if not task_dict:
@@ -288,22 +284,22 @@ class HomePage:
                     xp_reward
                 )
 
-                # Check for achievements
-                earned_achievements = self.gamification_service.check_and_award_achievements(self.user_id)
+            # Update UI
+            AlertCard.success(f"Görev tamamlandı! +{xp_reward} XP kazandın!")
 
-                # Update UI
-                AlertCard.success(f"Görev tamamlandı! +{xp_reward} XP kazandın!")
+            if level_info.level_up:
+                st.balloons()
+                AlertCard.success(f"🎉 Yeni seviyeye ulaştın: {level_info.level}!")
 
-                if level_info.level_up:
-                    st.balloons()
-                    AlertCard.success(f"🎉 Yeni seviyeye ulaştın: {level_info.level}!")
+            # Check for achievements once the task is committed
+            earned_achievements = self.gamification_service.check_and_award_achievements(self.user_id)
 
-                for achievement in earned_achievements:
-                    st.balloons()
-                    AlertCard.success(f"🏆 Yeni başarı kazandın: {achievement.title}")
+            for achievement in earned_achievements:
+                st.balloons()
+                AlertCard.success(f"🏆 Yeni başarı kazandın: {achievement.title}")
 
-                # Refresh page
-                st.rerun()
+            # Refresh page
+            st.rerun()
 
         except DatabaseError as e:
             st.error(f"Görev tamamlanırken bir hata oluştu: {str(e)}")
@@ -313,34 +309,11 @@ class HomePage:
     def _get_performance_data(self) -> Dict[str, Any]:
         """Get user's performance data and question statistics"""
         try:
-            current_stats_query = cast(Optional[Row], self.db_manager.execute_query('''
-                SELECT 
-                    AVG(sl.performance_rating) as avg_performance,
-                    SUM(sl.duration) as total_minutes,
-                    COUNT(DISTINCT sl.date) as study_days,
-                    SUM(qs.correct) as correct_questions,
-                    SUM(qs.incorrect) as incorrect_questions
-                FROM study_logs sl
-                LEFT JOIN question_stats qs ON sl.user_id = qs.user_id 
-                AND sl.date = qs.last_practice
-                WHERE sl.user_id = ? 
-                AND sl.date >= date('now', '-7 days')
-            ''', (self.user_id,), fetch_all=False))
+            current_stats_query = cast(Optional[Row], self.db_manager.execute_query(
+                queries.WEEKLY_PERFORMANCE, (self.user_id, self.user_id, self.user_id), fetch_all=False))
 
-            previous_stats_query = cast(Optional[Row], self.db_manager.execute_query('''
-                SELECT 
-                    AVG(sl.performance_rating) as avg_performance,
-                    SUM(sl.duration) as total_minutes,
-                    COUNT(DISTINCT sl.date) as study_days,
-                    SUM(qs.correct) as correct_questions,
-                    SUM(qs.incorrect) as incorrect_questions
-                FROM study_logs sl
-                LEFT JOIN question_stats qs ON sl.user_id = qs.user_id 
-                AND sl.date = qs.last_practice
-                WHERE sl.user_id = ? 
-                AND sl.date >= date('now', '-14 days')
-                AND sl.date < date('now', '-7 days')
-            ''', (self.user_id,), fetch_all=False))
+            previous_stats_query = cast(Optional[Row], self.db_manager.execute_query(
+                queries.PREVIOUS_WEEK_PERFORMANCE, (self.user_id, self.user_id, self.user_id), fetch_all=False))
 
             current = self._row_to_dict(current_stats_query)
             previous = self._row_to_dict(previous_stats_query)
@@ -379,18 +352,8 @@ class HomePage:
     def _get_question_stats(self) -> List[Dict[str, Any]]:
         """Get detailed question statistics by topic"""
         try:
-            stats_query = cast(Optional[List[Row]], self.db_manager.execute_query('''
-                SELECT 
-                    subject,
-                    topic,
-                    SUM(correct) as correct,
-                    SUM(incorrect) as incorrect,
-                    AVG(average_time) as avg_time
-                FROM question_stats
-                WHERE user_id = ?
-                GROUP BY subject, topic
-                ORDER BY subject, topic
-            ''', (self.user_id,), fetch_all=True))
+            stats_query = cast(Optional[List[Row]], self.db_manager.execute_query(
+                queries.QUESTION_STATS_BY_TOPIC, (self.user_id,), fetch_all=True))
             
             return self._rows_to_dict_list(stats_query)
         except DatabaseError as e:
@@ -509,45 +472,8 @@ class HomePage:
     def _get_user_stats(self) -> Dict[str, Any]:
         """Get comprehensive user statistics for AI motivation"""
         try:
-            stats_query = cast(Optional[Row], self.db_manager.execute_query('''
-                WITH recent_activity AS (
-                    SELECT 
-                        COUNT(DISTINCT sl.date) as study_streak,
-                        SUM(sl.duration) as total_minutes,
-                        AVG(sl.performance_rating) as avg_performance,
-                        SUM(qs.correct) as total_correct,
-                        SUM(qs.incorrect) as total_incorrect
-                    FROM study_logs sl
-                    LEFT JOIN question_stats qs ON sl.user_id = qs.user_id
-                    WHERE sl.user_id = ?
-                    AND sl.date >= date('now', '-30 days')
-                ),
-                goal_stats AS (
-                    SELECT COUNT(*) as active_goals
-                    FROM goals
-                    WHERE user_id = ?
-                    AND completed = FALSE
-                ),
-                level_info AS (
-                    SELECT 
-                        current_level,
-                        current_xp
-                    FROM user_levels
-                    WHERE user_id = ?
-                ),
-                mock_exam_stats AS (
-                    SELECT 
-                        COUNT(*) as total_exams,
-                        MAX(exam_date) as last_exam
-                    FROM mock_exams
-                    WHERE user_id = ?
-                )
-                SELECT *
-                FROM recent_activity
-                CROSS JOIN goal_stats
-                CROSS JOIN level_info
-                CROSS JOIN mock_exam_stats
-            ''', (self.user_id, self.user_id, self.user_id, self.user_id), fetch_all=False))
+            stats_query = cast(Optional[Row], self.db_manager.execute_query(
+                queries.USER_STATS, (self.user_id, self.user_id, self.user_id, self.user_id, self.user_id), fetch_all=False))
 
             stats = self._row_to_dict(stats_query)
 
@@ -670,16 +596,8 @@ class HomePage:
     def _get_recent_xp_gains(self) -> List[Dict[str, Any]]:
         """Get recent XP gains"""
         try:
-            gains_query = cast(Optional[List[Row]], self.db_manager.execute_query('''
-                SELECT 
-                    amount,
-                    reason,
-                    awarded_at
-                FROM xp_bonuses
-                WHERE user_id = ?
-                ORDER BY awarded_at DESC
-                LIMIT 3
-            ''', (self.user_id,), fetch_all=True))
+            gains_query = cast(Optional[List[Row]], self.db_manager.execute_query(
+                queries.RECENT_XP_BONUSES, (self.user_id,), fetch_all=True))
             
             return self._rows_to_dict_list(gains_query)
         except DatabaseError as e:
@@ -6,6 +6,7 @@ from sqlite3 import Row
 
 from ..components.cards import AlertCard
 from core.database import DatabaseManager, DatabaseError, db_transaction
+from core import queries
 from utils.validators import (
     validate_email,
     validate_password,
@@ -581,10 +582,8 @@ class SettingsPage:
     def _get_study_preferences(self) -> Dict[str, Any]:
         """Get user study preferences from database"""
         try:
-            prefs_query = cast(Optional[Row], self.db_manager.execute_query('''
-                SELECT * FROM study_preferences
-                WHERE user_id = ?
-            ''', (self.user_id,), fetch_all=False))
+            prefs_query = cast(Optional[Row], self.db_manager.execute_query(
+                queries.STUDY_PREFERENCES, (self.user_id,), fetch_all=False))
             
             return self._row_to_dict(prefs_query)
         except DatabaseError as e: